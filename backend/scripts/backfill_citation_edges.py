@@ -93,12 +93,22 @@ def main():
     # would wrongly drop a reciprocal A->B / B->A pair or an opposite-
     # relationship_type edge on the same pair. This in-memory set just avoids
     # redundant work within the run; the INSERT OR IGNORE below is the durable
-    # guard.
+    # guard. Databases with the integer citation store are read from
+    # work_citations by work id instead of re-reading every text node id.
+    has_store = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'work_citations'"
+    ).fetchone() is not None
     existing_edges = set()
-    for row in conn.execute(
-        "SELECT source_id, target_id, relationship_type FROM citation_edges"
-    ):
-        existing_edges.add((row["source_id"], row["target_id"], row["relationship_type"]))
+    if has_store:
+        for row in conn.execute(
+            "SELECT source_work_id, target_work_id FROM work_citations WHERE relationship = 0"
+        ):
+            existing_edges.add((row[0], row[1]))
+    else:
+        for row in conn.execute(
+            "SELECT source_id, target_id, relationship_type FROM citation_edges"
+        ):
+            existing_edges.add((row["source_id"], row["target_id"], row["relationship_type"]))
     log(f"existing edges: {len(existing_edges)}")
 
     limit_clause = f" LIMIT {int(args.limit)}" if args.limit else ""
@@ -152,7 +162,10 @@ def main():
                 target_token = normalize_openalex_id(reference)
                 if not target_token or target_token == source_token or target_token not in corpus:
                     continue
-                edge = (source_token, target_token, "references")
+                if has_store:
+                    edge = (source_work_id, corpus[target_token])
+                else:
+                    edge = (source_token, target_token, "references")
                 if edge in existing_edges:
                     continue
                 existing_edges.add(edge)
@@ -163,20 +176,19 @@ def main():
         if new_rows:
             # OR IGNORE so the directed UNIQUE(source_id, target_id,
             # relationship_type) constraint is the source of truth even across
-            # runs/races. Count real insertions via total_changes — rowcount is
-            # unreliable for executemany with OR IGNORE (can be 0 or -1 even when
-            # rows were inserted), which would otherwise over-count the summary.
-            before = conn.total_changes
-            conn.executemany(
-                """
+            # runs/races. Count real insertions per statement: a single INSERT's
+            # rowcount is 1 or 0 and, unlike total_changes, leaves out the rows
+            # the citation-store triggers write alongside each edge.
+            insert_sql = """
                 INSERT OR IGNORE INTO citation_edges
                   (source_id, target_id, relationship_type, source_table, target_table,
                    source_row_id, target_row_id, run_id, created_at)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))
-                """,
-                new_rows,
-            )
-            added += conn.total_changes - before
+                """
+            cursor = conn.cursor()
+            for row in new_rows:
+                cursor.execute(insert_sql, row)
+                added += max(0, cursor.rowcount)
         if seen_work_ids:
             conn.executemany(
                 "UPDATE works SET refs_fetched = 1 WHERE id = ?",
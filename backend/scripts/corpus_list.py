@@ -34,31 +34,137 @@ def status_from_row(data):
         return "downloaded"
     if download in {"queued", "in_progress"}:
         return "queued_download"
-    if download == "failed":
+    if download in {"failed", "quarantined"}:
         return "failed_download"
     if metadata == "in_progress":
         return "enriching"
-    if metadata == "failed":
+    if metadata in {"failed", "quarantined"}:
         return "failed_enrichment"
     if metadata == "matched":
         return "matched"
     return "raw"
 
 
-def normalize_year(value):
-    if value is None:
-        return 0
+def normalize_id(value):
     try:
         return int(value)
     except (TypeError, ValueError):
         return 0
 
 
-def normalize_id(value):
+# Columns the corpus table renders; everything else (payload JSON, abstracts,
+# lease bookkeeping) stays on disk.
+LIST_COLUMNS = (
+    "id", "title", "authors", "year", "doi", "openalex_id", "file_path",
+    "metadata_status", "download_status", "metadata_source", "source",
+    "origin_type", "origin_key", "source_pdf", "run_id",
+)
+SOURCE_EXPR = "COALESCE(w.origin_key, w.source_pdf, w.metadata_source, w.source, '')"
+# Must match idx_works_year_sort so the listing walks the index in order. The
+# cursor carries this value as read back from SQL, never a Python re-parse of year.
+YEAR_SORT_EXPR = "COALESCE(CAST(w.year AS INTEGER), 0)"
+
+# SQL twin of status_from_row(): download state wins over metadata state, and
+# values are compared trimmed and lowercased like the Python side.
+_WHITESPACE = "' ' || char(9, 10, 13)"
+_DOWNLOAD = f"lower(trim(COALESCE(w.download_status, 'not_requested'), {_WHITESPACE}))"
+_METADATA = f"lower(trim(COALESCE(w.metadata_status, 'pending'), {_WHITESPACE}))"
+_NO_DOWNLOAD = f"{_DOWNLOAD} NOT IN ('downloaded', 'queued', 'in_progress', 'failed', 'quarantined')"
+STATUS_PREDICATES = {
+    "downloaded": f"{_DOWNLOAD} = 'downloaded'",
+    "queued_download": f"{_DOWNLOAD} IN ('queued', 'in_progress')",
+    "failed_download": f"{_DOWNLOAD} IN ('failed', 'quarantined')",
+    "enriching": f"{_NO_DOWNLOAD} AND {_METADATA} = 'in_progress'",
+    "failed_enrichment": f"{_NO_DOWNLOAD} AND {_METADATA} IN ('failed', 'quarantined')",
+    "matched": f"{_NO_DOWNLOAD} AND {_METADATA} = 'matched'",
+    "raw": f"{_NO_DOWNLOAD} AND {_METADATA} NOT IN ('in_progress', 'failed', 'quarantined', 'matched')",
+}
+
+
+def encode_cursor(sort_year, work_id):
+    return f"{normalize_id(sort_year)}:{normalize_id(work_id)}"
+
+
+def decode_cursor(value):
+    """Parse a ``year:id`` cursor; returns None for a missing or malformed one."""
+    if not value:
+        return None
+    year, sep, work_id = str(value).partition(":")
+    if not sep:
+        return None
     try:
-        return int(value)
-    except (TypeError, ValueError):
-        return 0
+        return int(year), int(work_id)
+    except ValueError:
+        return None
+
+
+def build_filters(args):
+    clauses = []
+    params = []
+    if args.corpus_id is not None:
+        # A correlated probe keeps the scan on idx_works_year_sort; an IN list
+        # would drive from corpus_works and sort the whole corpus per page.
+        clauses.append("EXISTS (SELECT 1 FROM corpus_works cw WHERE cw.corpus_id = ? AND cw.work_id = w.id)")
+        params.append(args.corpus_id)
+    if args.status:
+        clauses.append(f"({STATUS_PREDICATES[args.status]})")
+    if args.year_from is not None:
+        clauses.append("CAST(w.year AS INTEGER) >= ?")
+        params.append(args.year_from)
+    if args.year_to is not None:
+        clauses.append("CAST(w.year AS INTEGER) <= ?")
+        params.append(args.year_to)
+    if args.source:
+        clauses.append(f"LOWER({SOURCE_EXPR}) LIKE ? ESCAPE '\\'")
+        needle = args.source.strip().lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        params.append(f"%{needle}%")
+    return clauses, params
+
+
+def fetch_page(conn, args):
+    """One page in (year, id) DESC order plus the cursor for the next one."""
+    clauses, params = build_filters(args)
+    cursor = decode_cursor(args.cursor)
+    if cursor is not None:
+        # Expanded rather than a row-value compare so the planner can seek the index.
+        clauses.append(f"{YEAR_SORT_EXPR} <= ? AND ({YEAR_SORT_EXPR} < ? OR w.id < ?)")
+        year, work_id = cursor
+        params.extend([year, year, work_id])
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    limit = max(args.limit, 0)
+    offset = 0 if cursor is not None else max(args.offset, 0)
+    columns = ", ".join(f"w.{name}" for name in LIST_COLUMNS)
+    # One extra row tells us whether another page exists without a COUNT.
+    rows = conn.execute(
+        f"""
+        SELECT {columns}, {YEAR_SORT_EXPR} AS sort_year
+        FROM works w
+        {where}
+        ORDER BY {YEAR_SORT_EXPR} DESC, w.id DESC
+        LIMIT ? OFFSET ?
+        """,
+        [*params, limit + 1, offset],
+    ).fetchall()
+    rows = [dict(row) for row in rows]
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        if rows:
+            next_cursor = encode_cursor(rows[-1]["sort_year"], rows[-1]["id"])
+    for row in rows:
+        row.pop("sort_year", None)
+    return rows, next_cursor
+
+
+def count_matching(conn, args, status_counts):
+    """Total rows for the current filters, read from the counters when possible."""
+    if status_counts is not None and args.year_from is None and args.year_to is None and not args.source:
+        if args.status:
+            return status_counts.get(args.status, 0)
+        return sum(status_counts.values())
+    clauses, params = build_filters(args)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    return conn.execute(f"SELECT COUNT(*) FROM works w {where}", params).fetchone()[0]
 
 
 def table_exists(conn, table_name):
@@ -69,6 +175,46 @@ def table_exists(conn, table_name):
     return row is not None
 
 
+def load_status_counts(conn, corpus_id):
+    """Status counts from the trigger-maintained corpus_status_counts table.
+
+    Returns None when the database predates the table, so callers fall back to
+    counting the listed rows.
+    """
+    if not table_exists(conn, "corpus_status_counts"):
+        return None
+    rows = conn.execute(
+        """
+        SELECT metadata_status, download_status, n
+        FROM corpus_status_counts
+        WHERE corpus_id = ? AND n > 0
+        """,
+        (corpus_id if corpus_id is not None else 0,),
+    ).fetchall()
+    counts = Counter()
+    for row in rows:
+        counts[status_from_row(dict(row))] += int(row["n"])
+    return counts
+
+
+def scan_status_counts(conn, corpus_id):
+    """Fallback for databases without the counters: one grouped pass over works."""
+    corpus_filter = "WHERE id IN (SELECT work_id FROM corpus_works WHERE corpus_id = ?)" if corpus_id is not None else ""
+    rows = conn.execute(
+        f"""
+        SELECT metadata_status, download_status, COUNT(*) AS n
+        FROM works
+        {corpus_filter}
+        GROUP BY metadata_status, download_status
+        """,
+        () if corpus_id is None else (corpus_id,),
+    ).fetchall()
+    counts = Counter()
+    for row in rows:
+        counts[status_from_row(dict(row))] += int(row["n"])
+    return counts
+
+
 def load_pdf_source_labels(conn, corpus_id):
     if not table_exists(conn, "ingest_source_metadata"):
         return {}
@@ -101,18 +247,27 @@ def load_search_source_labels(conn):
     }
 
 
-def load_seed_provenance(conn, corpus_id, pdf_source_labels, search_source_labels):
+def load_seed_provenance(conn, corpus_id, pdf_source_labels, search_source_labels, work_ids=None):
     if not table_exists(conn, "seed_candidates_in_corpus"):
         return {}
+    params = [corpus_id]
+    work_filter = ""
+    if work_ids is not None:
+        ids = sorted({normalize_id(work_id) for work_id in work_ids} - {0})
+        if not ids:
+            return {}
+        work_filter = f"AND work_id IN ({','.join('?' * len(ids))})"
+        params.extend(ids)
     rows = conn.execute(
-        """
+        f"""
         SELECT work_id, source_type, source_key, marked_at
         FROM seed_candidates_in_corpus
         WHERE corpus_id = ?
           AND work_id IS NOT NULL
+          {work_filter}
         ORDER BY marked_at DESC
         """,
-        (corpus_id,),
+        params,
     ).fetchall()
     provenance = {}
     for row in rows:
@@ -183,6 +338,11 @@ def main():
     parser.add_argument("--limit", type=int, default=200)
     parser.add_argument("--offset", type=int, default=0)
     parser.add_argument("--corpus-id", type=int, default=None)
+    parser.add_argument("--cursor", default="", help="Opaque next_cursor from the previous page; overrides --offset.")
+    parser.add_argument("--status", default="", choices=["", *STATUS_PREDICATES])
+    parser.add_argument("--year-from", type=int, default=None)
+    parser.add_argument("--year-to", type=int, default=None)
+    parser.add_argument("--source", default="")
     args = parser.parse_args()
 
     if "RAG_FEEDER_STUB" in __import__("os").environ:
@@ -207,26 +367,19 @@ def main():
 
     conn = sqlite3.connect(args.db_path)
     conn.row_factory = sqlite3.Row
+    status_counts = load_status_counts(conn, args.corpus_id)
+    rows, next_cursor = fetch_page(conn, args)
+    total = count_matching(conn, args, status_counts)
+    if status_counts is None:
+        status_counts = scan_status_counts(conn, args.corpus_id)
     pdf_source_labels = load_pdf_source_labels(conn, args.corpus_id)
     search_source_labels = load_search_source_labels(conn)
-    seed_provenance = load_seed_provenance(conn, args.corpus_id, pdf_source_labels, search_source_labels)
-
-    if args.corpus_id is not None:
-        rows = conn.execute(
-            """
-            SELECT w.*
-            FROM works w
-            JOIN corpus_works cw ON cw.work_id = w.id
-            WHERE cw.corpus_id = ?
-            """,
-            (args.corpus_id,),
-        ).fetchall()
-    else:
-        rows = conn.execute("SELECT * FROM works").fetchall()
+    seed_provenance = load_seed_provenance(
+        conn, args.corpus_id, pdf_source_labels, search_source_labels, work_ids=[row["id"] for row in rows]
+    )
 
     items = []
-    for row in rows:
-        data = dict(row)
+    for data in rows:
         status = status_from_row(data)
         source = data.get("origin_key") or data.get("source_pdf") or data.get("metadata_source") or data.get("source")
         source_info = source_label_for_work(data, args.corpus_id, pdf_source_labels, search_source_labels, seed_provenance)
@@ -252,7 +405,6 @@ def main():
 
     conn.close()
 
-    status_counts = Counter(item.get("status") for item in items)
     stage_totals = {
         "raw": sum(status_counts.get(status, 0) for status in ("raw", "extract_references_from_pdf", "pending")),
         "metadata": sum(status_counts.get(status, 0) for status in ("matched", "queued_download", "enriching")),
@@ -261,17 +413,12 @@ def main():
         "failed_download": status_counts.get("failed_download", 0),
     }
 
-    items.sort(key=lambda x: (normalize_year(x.get("year")), normalize_id(x.get("id"))), reverse=True)
-    total = len(items)
-    start = max(args.offset, 0)
-    end = start + max(args.limit, 0)
-    items = items[start:end]
-
     print(
         json.dumps(
             {
                 "items": items,
                 "total": total,
+                "next_cursor": next_cursor,
                 "stage_totals": stage_totals,
                 "status_counts": dict(status_counts),
             }
@@ -65,19 +65,25 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 sys.path.append('/usr/src/app/scripts')
 
 import sqlite3
+import asyncio
 import json
 import time
 import argparse
 import random
 import socket
 import hashlib
+import signal
+import subprocess
 from collections import Counter, defaultdict
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
-from dl_lit.db_manager import DatabaseManager
-from dl_lit.utils import get_global_rate_limiter
+from dl_lit.connection_pool import ResultSink
+from dl_lit.db_manager import PIPELINE_JOB_CLASSES, DatabaseManager
+from dl_lit.async_enrichment import AsyncEnrichmentEngine
+from dl_lit.utils import get_concurrency_limits, get_global_rate_limiter
+from dl_lit.wakeup import DEFAULT_WAKEUP_POLL_MS, JobWakeup
 from dl_lit.OpenAlexScraper import OpenAlexCrossrefSearcher, process_single_reference
 from dl_lit.new_dl import BibliographyEnhancer
 from dl_lit.scraper_lab import execute_scraper_job
@@ -120,8 +126,47 @@ def parse_duplicate_merge_marker(message: str | None) -> dict | None:
         data[key.strip()] = value.strip()
     return data or None
 
+DAEMON_NAMES = {"enrich": "enrich", "download": "download"}
+
+# How often a concurrent enrich batch checks whether it should yield to other jobs.
+ENRICH_YIELD_CHECK_SECONDS = 1.0
+
+
+def ensure_heartbeat_table(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS daemon_heartbeat (
+            daemon_name TEXT PRIMARY KEY,
+            worker_id TEXT,
+            status TEXT,
+            details_json TEXT,
+            last_seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    conn.commit()
+
+
+def write_heartbeat(conn: sqlite3.Connection, daemon_name: str, worker_id: str, status: str, details: dict | None) -> None:
+    conn.execute(
+        """
+        INSERT INTO daemon_heartbeat (daemon_name, worker_id, status, details_json, last_seen_at, updated_at)
+        VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+        ON CONFLICT(daemon_name) DO UPDATE SET
+            worker_id = excluded.worker_id,
+            status = excluded.status,
+            details_json = excluded.details_json,
+            last_seen_at = CURRENT_TIMESTAMP,
+            updated_at = CURRENT_TIMESTAMP
+        """,
+        (daemon_name, worker_id, str(status or "idle"), json.dumps(details or {})),
+    )
+    conn.commit()
+
+
 class PipelineDaemon:
-    def __init__(self, db_path: str, role: str = "all"):
+    def __init__(self, db_path: str, role: str = "all", instance: int | None = None):
         self.db_path = db_path
         self.role = str(role or "all").strip().lower()
         self.db = DatabaseManager(db_path)
@@ -130,6 +175,8 @@ class PipelineDaemon:
         self.heartbeat_conn.execute("PRAGMA busy_timeout = 3000")
         self.heartbeat_lock = threading.RLock()
         self.rate_limiter = get_global_rate_limiter()
+        # AIMD in-flight limits per upstream (OpenAlex, Crossref, Semantic Scholar, downloads).
+        self.concurrency = get_concurrency_limits()
         self.mailto = os.getenv("RAG_FEEDER_MAILTO", "spott@wzb.eu")
         self.searcher = OpenAlexCrossrefSearcher(mailto=self.mailto, rate_limiter=self.rate_limiter)
         
@@ -141,18 +188,35 @@ class PipelineDaemon:
             db_manager=self.db, 
             rate_limiter=self.rate_limiter, 
             email=self.mailto, 
-            output_folder=self.download_dir
+            output_folder=self.download_dir,
+            concurrency=self.concurrency,
         )
-        self.db_lock = threading.RLock()
+        # Download threads read through per-thread connections and hand writes to a
+        # single group-commit writer, so no process-wide DB lock is needed.
+        self.db_pool = self.db.enable_connection_pool()
+        # Per-item state transitions are buffered and committed in groups
+        # (RAG_FEEDER_RESULT_FLUSH_ITEMS / RAG_FEEDER_RESULT_FLUSH_MS).
+        self.result_sink = ResultSink(self.db_pool)
+        # The streaming enrich pipeline while one runs; its stage depths go into heartbeats.
+        self.enrich_pipeline = None
         self.running = True
-        self.daemon_name = {
-            "enrich": "enrich",
-            "download": "download",
-        }.get(self.role, "pipeline")
+        # Children of a DaemonSupervisor heartbeat as "<role>.<n>"; the supervisor
+        # publishes the combined row under the plain role name.
+        self.daemon_name = DAEMON_NAMES.get(self.role, "pipeline")
+        if instance is not None:
+            self.daemon_name = f"{self.daemon_name}.{int(instance)}"
         self.heartbeat_interval_seconds = max(1, int(os.getenv("RAG_FEEDER_DAEMON_HEARTBEAT_SECONDS", "3") or "3"))
         self._last_heartbeat_at = 0.0
         self.worker_id = f"daemon:{socket.gethostname()}:{os.getpid()}"
         self.job_timeout_seconds = max(60, int(os.getenv("RAG_FEEDER_PIPELINE_JOB_TIMEOUT", "1800") or "1800"))
+        # Idle workers block on a wake-up socket / data_version watch and only re-check
+        # for claimable work (a read, no write lock) this often when nothing signals.
+        self.idle_recheck_seconds = max(0.1, float(os.getenv("RAG_FEEDER_IDLE_RECHECK_SECONDS", "5") or "5"))
+        self.wakeup = JobWakeup(
+            db_path,
+            f"{self.daemon_name}-{os.getpid()}",
+            poll_ms=int(os.getenv("RAG_FEEDER_WAKEUP_POLL_MS", str(DEFAULT_WAKEUP_POLL_MS)) or DEFAULT_WAKEUP_POLL_MS),
+        )
         self._ensure_heartbeat_table()
         if self.role == "all":
             self._recover_stale_running_jobs()
@@ -161,48 +225,27 @@ class PipelineDaemon:
 
     def _ensure_heartbeat_table(self):
         with self.heartbeat_lock:
-            cur = self.heartbeat_conn.cursor()
-            cur.execute(
-                """
-                CREATE TABLE IF NOT EXISTS daemon_heartbeat (
-                    daemon_name TEXT PRIMARY KEY,
-                    worker_id TEXT,
-                    status TEXT,
-                    details_json TEXT,
-                    last_seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-                """
-            )
-            self.heartbeat_conn.commit()
+            ensure_heartbeat_table(self.heartbeat_conn)
 
     def _heartbeat(self, status: str, details: dict | None = None, force: bool = False):
         now = time.time()
         if not force and (now - self._last_heartbeat_at) < self.heartbeat_interval_seconds:
             return
         with self.heartbeat_lock:
-            cur = self.heartbeat_conn.cursor()
-            cur.execute(
-                """
-                INSERT INTO daemon_heartbeat (daemon_name, worker_id, status, details_json, last_seen_at, updated_at)
-                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
-                ON CONFLICT(daemon_name) DO UPDATE SET
-                    worker_id = excluded.worker_id,
-                    status = excluded.status,
-                    details_json = excluded.details_json,
-                    last_seen_at = CURRENT_TIMESTAMP,
-                    updated_at = CURRENT_TIMESTAMP
-                """,
-                (
-                    self.daemon_name,
-                    self.worker_id,
-                    str(status or "idle"),
-                    json.dumps(details or {}),
-                ),
-            )
-            self.heartbeat_conn.commit()
+            write_heartbeat(self.heartbeat_conn, self.daemon_name, self.worker_id, status, details)
         self._last_heartbeat_at = now
 
+    def _with_live_stats(self, details: dict) -> dict:
+        details = dict(details)
+        pipeline = getattr(self, "enrich_pipeline", None)
+        if pipeline is not None:
+            details["pipeline"] = pipeline.stats()
+        concurrency = getattr(self, "concurrency", None)
+        limits = concurrency.stats() if concurrency is not None else {}
+        if limits:
+            details["concurrency"] = limits
+        return details
+
     def _start_job_heartbeat(self, job: dict):
         stop_event = threading.Event()
         details = {
@@ -210,11 +253,12 @@ class PipelineDaemon:
             "job_id": int(job["id"]),
             "job_type": str(job["job_type"]),
             "corpus_id": job.get("corpus_id"),
+            "schedule": job.get("schedule"),
         }
 
         def beat():
             while not stop_event.wait(self.heartbeat_interval_seconds):
-                self._heartbeat("running", details, force=True)
+                self._heartbeat("running", self._with_live_stats(details), force=True)
 
         thread = threading.Thread(target=beat, name=f"job-heartbeat-{job['id']}", daemon=True)
         thread.start()
@@ -231,7 +275,7 @@ class PipelineDaemon:
 
         def beat():
             while not stop_event.wait(self.heartbeat_interval_seconds):
-                self._heartbeat("running", payload, force=True)
+                self._heartbeat("running", self._with_live_stats(payload), force=True)
 
         thread = threading.Thread(target=beat, name=f"direct-heartbeat-{self.role}", daemon=True)
         thread.start()
@@ -249,7 +293,7 @@ class PipelineDaemon:
              WHERE status = 'running'
                AND (
                     started_at IS NULL
-                    OR datetime(started_at) <= datetime('now', ?)
+                    OR started_at <= datetime('now', ?)
                )
             """,
             (f"-{self.job_timeout_seconds} seconds",),
@@ -259,43 +303,74 @@ class PipelineDaemon:
         if requeued:
             log(f"Recovered {requeued} stale pipeline job(s) older than {self.job_timeout_seconds}s.")
 
+    def _role_job_filter(self) -> str:
+        if self.role == "enrich":
+            return "AND job_type IN ('enrich', 'pipeline_tick', 'scrape_eurlex', 'scrape_expert_groups')"
+        if self.role == "download":
+            return "AND job_type = 'download'"
+        return ""
+
+    def _age_pending_jobs(self, cur) -> int:
+        """Promote pending jobs one priority class for every aging period they have waited."""
+        aging_seconds = max(1, int(os.getenv("RAG_FEEDER_JOB_AGING_SECONDS", "300") or "300"))
+        promotable = ", ".join(str(value) for value in sorted(PIPELINE_JOB_CLASSES) if value > 0)
+        cur.execute(
+            f"""
+            UPDATE pipeline_jobs
+               SET priority_class = priority_class - 1,
+                   aged_at = CURRENT_TIMESTAMP
+             WHERE status = 'pending'
+               AND priority_class IN ({promotable})
+               AND aged_at <= datetime('now', ?)
+            """,
+            (f"-{aging_seconds} seconds",),
+        )
+        return int(cur.rowcount or 0)
+
     def fetch_next_job(self):
-        """Fetch the next pending job from the queue with interactive-priority ordering."""
+        """Claim the next pending job by priority class, then fair-share start tag.
+
+        Interactive corpus jobs come before background and maintenance work,
+        and waiting jobs age upwards (``RAG_FEEDER_JOB_AGING_SECONDS``).
+        Within a class, the lowest start tag wins. That is weighted fair
+        queuing across corpora: see ``create_fair_share_scheduling``.
+        Corpora at their ``max_running`` cap are skipped. Flows without a cap
+        use ``RAG_FEEDER_CORPUS_MAX_RUNNING_JOBS``, where 0 means no cap. The
+        claimed job carries a ``schedule`` dict saying why it was picked.
+        """
         cur = self.db.conn.cursor()
-        role_filter = ""
-        if self.role == "enrich":
-            role_filter = "AND job_type IN ('enrich', 'pipeline_tick', 'scrape_eurlex', 'scrape_expert_groups')"
-        elif self.role == "download":
-            role_filter = "AND job_type = 'download'"
+        role_filter = self._role_job_filter()
+        default_cap = max(0, int(os.getenv("RAG_FEEDER_CORPUS_MAX_RUNNING_JOBS", "0") or "0"))
         try:
             cur.execute("BEGIN IMMEDIATE")
+            self._age_pending_jobs(cur)
             cur.execute(
                 f"""
-                SELECT id, corpus_id, job_type, parameters_json
+                SELECT id, corpus_id, job_type, parameters_json, priority_class, start_tag, created_at
                 FROM pipeline_jobs
                 WHERE status = 'pending'
                   {role_filter}
-                ORDER BY
-                    CASE
-                        WHEN job_type = 'download' AND corpus_id IS NOT NULL THEN 0
-                        WHEN job_type = 'enrich' AND corpus_id IS NOT NULL THEN 1
-                        WHEN job_type = 'download' THEN 2
-                        WHEN job_type = 'enrich' THEN 3
-                        WHEN job_type = 'pipeline_tick' AND corpus_id IS NOT NULL THEN 4
-                        WHEN job_type = 'pipeline_tick' THEN 5
-                        ELSE 6
-                    END ASC,
-                    created_at ASC,
-                    id ASC
+                  AND NOT EXISTS (
+                      SELECT 1
+                      FROM pipeline_fair_share f
+                      WHERE f.flow_id = COALESCE(pipeline_jobs.corpus_id, 0)
+                        AND f.running >= COALESCE(f.max_running, NULLIF(?, 0), f.running + 1)
+                  )
+                ORDER BY priority_class ASC, start_tag ASC, id ASC
                 LIMIT 1
-                """
+                """,
+                (default_cap,),
             )
             row = cur.fetchone()
             if not row:
                 self.db.conn.commit()
                 return None
 
-            job_id, corpus_id, job_type, params_json = row
+            job_id, corpus_id, job_type, params_json, priority_class, start_tag, created_at = row
+            cur.execute(
+                "SELECT virtual_time FROM pipeline_scheduler WHERE id = 1"
+            )
+            virtual_time = (cur.fetchone() or (0.0,))[0]
             cur.execute(
                 """
                 UPDATE pipeline_jobs
@@ -310,18 +385,61 @@ class PipelineDaemon:
             if int(cur.rowcount or 0) != 1:
                 self.db.conn.rollback()
                 return None
+            cur.execute(
+                "SELECT weight, max_running, running FROM pipeline_fair_share WHERE flow_id = ?",
+                (int(corpus_id or 0),),
+            )
+            weight, max_running, running = cur.fetchone() or (1.0, None, 1)
 
             self.db.conn.commit()
             return {
                 "id": job_id,
                 "corpus_id": corpus_id,
                 "job_type": job_type,
-                "params": json.loads(params_json) if params_json else {}
+                "params": json.loads(params_json) if params_json else {},
+                "schedule": {
+                    "class": PIPELINE_JOB_CLASSES.get(priority_class, priority_class),
+                    "start_tag": start_tag,
+                    "virtual_time": virtual_time,
+                    "flow": int(corpus_id or 0),
+                    "weight": weight,
+                    "running": running,
+                    "max_running": max_running or default_cap or None,
+                    "queued_at": created_at,
+                },
             }
         except Exception:
             self.db.conn.rollback()
             raise
 
+    def _has_pending_role_jobs(self) -> bool:
+        cur = self.db.conn.cursor()
+        cur.execute(f"SELECT 1 FROM pipeline_jobs WHERE status = 'pending' {self._role_job_filter()} LIMIT 1")
+        return cur.fetchone() is not None
+
+    def _has_claimable_work(self) -> bool:
+        """Read-only check for a pending job or ready queue item this worker would claim."""
+        if self._has_pending_role_jobs():
+            return True
+        if self.role == "enrich":
+            return self.db.has_ready_work("enrich_queue")
+        if self.role == "download":
+            return self.db.has_ready_work("download_queue")
+        return False
+
+    def _wait_for_work(self) -> str:
+        """Block until a producer notifies this worker or a read finds claimable work."""
+        while self.running:
+            reason = self.wakeup.wait(self.idle_recheck_seconds)
+            if reason == "notify":
+                return reason
+            # data_version moves on every foreign commit (heartbeats included) and
+            # backoff windows expire without one, so confirm with a read first.
+            if self._has_claimable_work():
+                return reason
+            self._heartbeat("idle", self._with_live_stats({"state": "waiting", "role": self.role}))
+        return "stopped"
+
     def _has_pending_interactive_jobs(self) -> bool:
         cur = self.db.conn.cursor()
         cur.execute(
@@ -368,13 +486,25 @@ class PipelineDaemon:
         return int(cur.rowcount or 0) > 0
 
     def enqueue_job(self, corpus_id: int | None, job_type: str, params: dict) -> int:
+        """Queue a job, merging it into a compatible pending one; returns the job id.
+
+        Goes through the ``pipeline_job_requests`` view like the backend, so
+        both coalesce by the same rule (see ``create_job_coalescing``).
+        """
         cur = self.db.conn.cursor()
-        cur.execute(
-            "INSERT INTO pipeline_jobs (corpus_id, job_type, status, parameters_json) VALUES (?, ?, 'pending', ?)",
-            (corpus_id, job_type, json.dumps(params or {})),
-        )
-        self.db.conn.commit()
-        return int(cur.lastrowid)
+        try:
+            cur.execute("BEGIN IMMEDIATE")
+            cur.execute(
+                "INSERT INTO pipeline_job_requests (corpus_id, job_type, parameters_json) VALUES (?, ?, ?)",
+                (corpus_id, job_type, json.dumps(params or {})),
+            )
+            cur.execute("SELECT last_enqueued_id FROM pipeline_scheduler WHERE id = 1")
+            job_id = int(cur.fetchone()[0])
+            self.db.conn.commit()
+        except Exception:
+            self.db.conn.rollback()
+            raise
+        return job_id
 
     def mark_job_failed(self, job_id: int, error_msg: str):
         cur = self.db.conn.cursor()
@@ -395,45 +525,32 @@ class PipelineDaemon:
 
     # --- MARKING LOGIC ---
     def do_mark(self, corpus_id: int, limit: int):
-        cur = self.db.conn.cursor()
-        if corpus_id is None:
-            cur.execute(
-                """
-                SELECT COUNT(*)
-                FROM works
-                WHERE COALESCE(metadata_status, 'pending') IN ('pending', 'in_progress')
-                  AND COALESCE(download_status, 'not_requested') = 'not_requested'
-                """
-            )
-            available = int(cur.fetchone()[0])
-        else:
-            cur.execute(
-                """
-                SELECT COUNT(*)
-                FROM works w
-                JOIN corpus_works cw ON cw.work_id = w.id
-                WHERE cw.corpus_id = ?
-                  AND COALESCE(w.metadata_status, 'pending') IN ('pending', 'in_progress')
-                  AND COALESCE(w.download_status, 'not_requested') = 'not_requested'
-                """, (corpus_id,)
-            )
-            available = int(cur.fetchone()[0])
+        # Read the trigger-maintained per-corpus counters rather than counting works.
+        counts = self.db.get_corpus_status_counts(corpus_id)
+        available = sum(
+            n for (metadata_status, download_status), n in counts.items()
+            if metadata_status in ("pending", "in_progress") and download_status == "not_requested"
+        )
 
         # Canonical works no longer require a separate raw-marking step.
         return {"requested": limit, "marked": 0, "available": available, "ids": []}
 
     # --- ENRICHMENT LOGIC ---
+    @staticmethod
+    def _reference_for_entry(entry) -> dict:
+        return {
+            "title": entry.get("title"), "authors": entry.get("authors") or [],
+            "doi": entry.get("doi"), "year": entry.get("year"),
+            "container-title": entry.get("source"), "volume": entry.get("volume"),
+            "issue": entry.get("issue"), "pages": entry.get("pages"),
+            "abstract": entry.get("abstract"), "keywords": entry.get("keywords"),
+        }
+
     def _enrich_single(self, entry, fetch_refs, fetch_cites, max_cites, rel_down, rel_up, max_rel):
         attempts = 3
         last_diag = {}
         for attempt in range(attempts):
-            ref = {
-                "title": entry.get("title"), "authors": entry.get("authors") or [],
-                "doi": entry.get("doi"), "year": entry.get("year"),
-                "container-title": entry.get("source"), "volume": entry.get("volume"),
-                "issue": entry.get("issue"), "pages": entry.get("pages"),
-                "abstract": entry.get("abstract"), "keywords": entry.get("keywords"),
-            }
+            ref = self._reference_for_entry(entry)
             enriched, diag = process_single_reference(
                 ref, self.searcher, self.rate_limiter,
                 fetch_references=fetch_refs, fetch_citations=fetch_cites,
@@ -450,6 +567,40 @@ class PipelineDaemon:
         status = (last_diag or {}).get("status") or "no_match"
         return int(entry["id"]), None, {"status": status, "attempts": attempt + 1, "diagnostics": last_diag}
 
+    async def _enrich_single_async(self, engine, entry, options: dict):
+        """``_enrich_single`` on the async engine; a failed match also tries the raw download off-loop."""
+        attempts = 3
+        last_diag = {}
+        enriched = None
+        for attempt in range(attempts):
+            enriched, diag = await engine.process_reference(
+                self._reference_for_entry(entry), return_diagnostics=True, **options
+            )
+            last_diag = diag or {}
+            if enriched or last_diag.get("status") != "api_error":
+                break
+            await asyncio.sleep(0.5 * (2 ** attempt) + random.uniform(0, 0.15))
+
+        if enriched:
+            return enriched, {"status": "matched", "attempts": attempt + 1, "diagnostics": last_diag}, None
+        enrich_meta = {"status": last_diag.get("status") or "no_match", "attempts": attempt + 1, "diagnostics": last_diag}
+        raw_attempt = await asyncio.to_thread(self._attempt_raw_download, entry)
+        return None, enrich_meta, raw_attempt
+
+    def _enrich_yield_reason(self, corpus_id, processed: int, remaining: int) -> str | None:
+        """Why an enrich batch should hand the worker back before its remaining rows, if it should."""
+        if self._has_pending_corpus_download_jobs():
+            log(
+                f"Yielding enrich batch after {processed} item(s); {remaining} pending work row(s) remain and a corpus download job is pending."
+            )
+            return "pending_download"
+        if corpus_id is None and self._has_pending_interactive_jobs():
+            log(
+                f"Yielding global enrich batch after {processed} item(s); {remaining} pending work row(s) remain and an interactive corpus job is waiting."
+            )
+            return "interactive_backlog"
+        return None
+
     def _attempt_raw_download(self, entry: dict) -> tuple[bool, dict]:
         pending_work_id = int(entry["id"])
         ref = {
@@ -489,14 +640,15 @@ class PipelineDaemon:
         except Exception:
             checksum = ""
 
-        with self.db_lock:
-            downloaded_id, move_error = self.db.mark_raw_work_downloaded(
+        downloaded_id, move_error = self.db_pool.write(
+            lambda db: db.mark_raw_work_downloaded(
                 pending_work_id,
                 download_result,
                 fp,
                 checksum,
                 download_result.get("download_source", "unknown"),
             )
+        )
 
         if move_error or not downloaded_id:
             return False, {
@@ -514,33 +666,93 @@ class PipelineDaemon:
             "route": download_result.get("download_route"),
         }
 
-    def do_enrich(self, corpus_id: int, limit: int, workers: int, expansion: dict, pending_work_ids: list[int] | None = None):
-        target_ids = [int(value) for value in (pending_work_ids or []) if str(value).strip().isdigit() and int(value) > 0]
-        to_process = self.db.claim_enrich_batch(
-            limit=max(1, int(limit or 1)),
-            corpus_id=corpus_id,
-            claimed_by=self.worker_id,
-            lease_seconds=15 * 60,
-            target_ids=target_ids,
+    def _persist_enrich_failure(self, db, pending_work_id: int, raw_download_result: dict | None, category: str | None = None) -> dict:
+        # API errors are retried with backoff (and quarantined if they keep
+        # failing); a clean "no match" fails the work outright as before.
+        state, _ = db.record_stage_failure(pending_work_id, "metadata", category or "no_match", "Metadata fetch failed")
+        result_payload = {"pending_work_id": pending_work_id, "action": "failed_enrichment"}
+        if state in {"pending", "quarantined"}:
+            result_payload["retry_state"] = state
+        if raw_download_result:
+            result_payload["raw_download"] = raw_download_result
+        return {"failed": 1, "result": result_payload}
+
+    def _persist_enrichment(self, db, pending_work_id: int, enriched: dict, *, expand_related: bool, max_related: int) -> dict:
+        wid, err = db.apply_enriched_metadata(
+            pending_work_id, enriched, expand_related=expand_related, max_related_per_source=max_related
         )
-        for row in to_process:
+        if not wid:
+            dup = parse_duplicate_merge_marker(err)
+            if not dup:
+                db.record_stage_failure(pending_work_id, "metadata", "promotion_failed", err or "promotion_failed")
+                return {
+                    "failed": 1,
+                    "error": err or f"Promotion failed for pending work {pending_work_id}",
+                    "result": {"pending_work_id": pending_work_id, "action": "promotion_failed", "error": err},
+                }
+            canonical_table = dup.get("table") or ""
+            canonical_id_raw = dup.get("id") or ""
+            queue_id_raw = dup.get("queue_id") or ""
+            queued_flag = (dup.get("queued") or "") == "1"
+            db.delete_work(pending_work_id)
+            return {
+                "duplicates_merged": 1,
+                "queued": 1 if canonical_table == "works" and queued_flag else 0,
+                "result": {
+                    "pending_work_id": pending_work_id,
+                    "action": "duplicate_merged",
+                    "canonical_table": canonical_table,
+                    "canonical_id": int(canonical_id_raw) if canonical_id_raw.isdigit() else None,
+                    "queue_id": int(queue_id_raw) if queue_id_raw.isdigit() else None,
+                    "queued": queued_flag,
+                },
+            }
+
+        qid, qerr = db.enqueue_for_download(int(wid))
+        if qid:
+            return {
+                "promoted": 1,
+                "queued": 1,
+                "result": {"pending_work_id": pending_work_id, "work_id": int(wid), "queue_id": int(qid), "action": "queued"},
+            }
+        return {"promoted": 1, "result": {"pending_work_id": pending_work_id, "work_id": int(wid), "action": "enqueue_skipped"}}
+
+    @staticmethod
+    def _decode_claimed_rows(rows: list[dict]) -> list[dict]:
+        for row in rows:
             for key in ("authors", "keywords"):
                 if isinstance(row.get(key), str):
                     try:
                         row[key] = json.loads(row[key])
                     except Exception:
                         pass
-
-        if not to_process:
-            return {
-                "processed": 0,
-                "promoted": 0,
-                "queued": 0,
-                "failed": 0,
-                "duplicates_merged": 0,
-                "results": [],
-            }
-
+        return rows
+
+    def _claim_enrich_rows(self, limit: int, corpus_id, target_ids: list[int]) -> list[dict]:
+        """Claim through the pool writer so claims share its lock with the result sink."""
+        rows = self.db_pool.write(
+            lambda db: db.claim_enrich_batch(
+                limit=max(1, int(limit or 1)),
+                corpus_id=corpus_id,
+                claimed_by=self.worker_id,
+                lease_seconds=15 * 60,
+                target_ids=target_ids,
+            )
+        )
+        return self._decode_claimed_rows(rows)
+
+    def do_enrich(
+        self,
+        corpus_id: int,
+        limit: int,
+        workers: int,
+        expansion: dict,
+        pending_work_ids: list[int] | None = None,
+        *,
+        continuous: bool = False,
+    ):
+        target_ids = [int(value) for value in (pending_work_ids or []) if str(value).strip().isdigit() and int(value) > 0]
+        limit = max(1, int(limit or 1))
         processed, promoted, queued, failed, duplicates_merged = 0, 0, 0, 0, 0
         results, errors = [], []
         
@@ -551,99 +763,145 @@ class PipelineDaemon:
         max_cites = expansion.get("maxCitations", 100)
         max_rel = expansion.get("maxRelated", 30)
 
-        wave_size_cfg = int(os.getenv("RAG_FEEDER_ENRICH_WAVE_SIZE", "2") or "2")
-        wave_size = max(1, min(len(to_process), max(1, min(workers, 32)), wave_size_cfg))
-        remaining_entries = list(to_process)
         deferred_reason = None
-        remaining_ids = []
-
-        while remaining_entries:
-            batch_entries = remaining_entries[:wave_size]
-            remaining_entries = remaining_entries[wave_size:]
-
-            with ThreadPoolExecutor(max_workers=min(len(batch_entries), workers, 32)) as executor:
-                futures = {
-                    executor.submit(self._enrich_single, e, fetch_refs, fetch_cites, max_cites, rel_down, rel_up, max_rel): e
-                    for e in batch_entries
-                }
-                for future in as_completed(futures):
-                    entry = futures[future]
-                    pending_work_id = int(entry["id"])
-                    processed += 1
-                    try:
-                        _, enriched, enrich_meta = future.result()
-                    except Exception as exc:
-                        enriched, enrich_meta = None, {"status": "api_error"}
-                        errors.append(str(exc))
-
-                    if not enriched:
-                        raw_downloaded, raw_download_result = self._attempt_raw_download(entry)
-                        if raw_downloaded:
-                            results.append(raw_download_result)
-                            continue
-                        failed += 1
-                        reason = "Metadata fetch failed"
-                        moved_id, err = self.db.mark_metadata_failed(pending_work_id, reason)
-                        result_payload = {"pending_work_id": pending_work_id, "action": "failed_enrichment"}
-                        if raw_download_result:
-                            result_payload["raw_download"] = raw_download_result
-                        results.append(result_payload)
-                        continue
-
-                    wid, err = self.db.apply_enriched_metadata(
-                        pending_work_id, enriched, expand_related=(rel_down > 1 and fetch_refs), max_related_per_source=max_rel
+        unstarted_ids, remaining_ids = [], []
+        remaining_limit = 0
+
+        pending_writes = []
+
+        def record(entry, enriched, enrich_meta, raw_attempt=None):
+            nonlocal processed
+            pending_work_id = int(entry["id"])
+            processed += 1
+            if (enrich_meta or {}).get("error"):
+                errors.append(enrich_meta["error"])
+            if not enriched:
+                raw_downloaded, raw_download_result = raw_attempt or self._attempt_raw_download(entry)
+                if raw_downloaded:
+                    results.append(raw_download_result)
+                    return None
+                pending_writes.append(
+                    self.result_sink.add(
+                        lambda db, pid=pending_work_id, raw=raw_download_result, cat=(enrich_meta or {}).get("status"): (
+                            self._persist_enrich_failure(db, pid, raw, cat)
+                        )
                     )
-                    if not wid:
-                        dup = parse_duplicate_merge_marker(err)
-                        if dup:
-                            duplicates_merged += 1
-                            canonical_table = dup.get("table") or ""
-                            canonical_id_raw = dup.get("id") or ""
-                            queue_id_raw = dup.get("queue_id") or ""
-                            queued_flag = (dup.get("queued") or "") == "1"
-                            if canonical_table == "works" and queued_flag:
-                                queued += 1
-                            results.append(
-                                {
-                                    "pending_work_id": pending_work_id,
-                                    "action": "duplicate_merged",
-                                    "canonical_table": canonical_table,
-                                    "canonical_id": int(canonical_id_raw) if canonical_id_raw.isdigit() else None,
-                                    "queue_id": int(queue_id_raw) if queue_id_raw.isdigit() else None,
-                                    "queued": queued_flag,
-                                }
-                            )
-                        else:
-                            failed += 1
-                            errors.append(err or f"Promotion failed for pending work {pending_work_id}")
-                            self.db.reset_enrich_claim(pending_work_id, state="pending", error=err or "promotion_failed", selected=0)
-                            results.append({"pending_work_id": pending_work_id, "action": "promotion_failed", "error": err})
-                        if dup:
-                            self.db.delete_work(pending_work_id)
-                        continue
-
-                    promoted += 1
-                    qid, qerr = self.db.enqueue_for_download(int(wid))
-                    if qid:
-                        queued += 1
-                        results.append({"pending_work_id": pending_work_id, "work_id": int(wid), "queue_id": int(qid), "action": "queued"})
-                    else:
-                        results.append({"pending_work_id": pending_work_id, "work_id": int(wid), "action": "enqueue_skipped"})
+                )
+                return pending_writes[-1]
 
-            if remaining_entries and self._has_pending_corpus_download_jobs():
-                deferred_reason = "pending_download"
-                remaining_ids = [int(entry["id"]) for entry in remaining_entries]
-                log(
-                    f"Yielding enrich batch after {processed} item(s); {len(remaining_ids)} pending work row(s) remain and a corpus download job is pending."
+            pending_writes.append(
+                self.result_sink.add(
+                    lambda db, pid=pending_work_id, data=enriched: self._persist_enrichment(
+                        db, pid, data, expand_related=(rel_down > 1 and fetch_refs), max_related=max_rel
+                    )
                 )
-                break
-            if corpus_id is None and remaining_entries and self._has_pending_interactive_jobs():
-                deferred_reason = "interactive_backlog"
-                remaining_ids = [int(entry["id"]) for entry in remaining_entries]
-                log(
-                    f"Yielding global enrich batch after {processed} item(s); {len(remaining_ids)} pending work row(s) remain and an interactive corpus job is waiting."
+            )
+            return pending_writes[-1]
+
+        # RAG_FEEDER_ENRICH_ENGINE=threads keeps the older claim-once ThreadPoolExecutor waves.
+        if os.getenv("RAG_FEEDER_ENRICH_ENGINE", "async").strip().lower() != "threads":
+            options = {
+                "fetch_references": fetch_refs, "fetch_citations": fetch_cites,
+                "max_citations": max_cites, "related_depth": rel_down,
+                "related_depth_upstream": rel_up, "max_related_per_reference": max_rel,
+            }
+            pipeline = StreamingEnrichPipeline(
+                self,
+                corpus_id=corpus_id,
+                limit=None if continuous else limit,
+                target_ids=target_ids,
+                options=options,
+                record=record,
+                continuous=continuous,
+            )
+            self.enrich_pipeline = pipeline
+            try:
+                pipeline.run()
+            finally:
+                self.enrich_pipeline = None
+            claimed = pipeline.claimed
+            deferred_reason = pipeline.deferred_reason
+            unstarted_ids = pipeline.unstarted_ids
+            if deferred_reason and not continuous:
+                unclaimed_budget = max(0, limit - claimed)
+                if target_ids:
+                    unclaimed = [value for value in target_ids if value not in pipeline.claimed_ids]
+                    remaining_ids = unstarted_ids + unclaimed[:unclaimed_budget]
+                    remaining_limit = len(remaining_ids)
+                else:
+                    remaining_ids = list(unstarted_ids)
+                    remaining_limit = len(unstarted_ids) + unclaimed_budget
+        else:
+            to_process = self._decode_claimed_rows(
+                self.db.claim_enrich_batch(
+                    limit=limit,
+                    corpus_id=corpus_id,
+                    claimed_by=self.worker_id,
+                    lease_seconds=15 * 60,
+                    target_ids=target_ids,
                 )
-                break
+            )
+            claimed = len(to_process)
+            remaining_entries = list(to_process)
+            wave_size_cfg = int(os.getenv("RAG_FEEDER_ENRICH_WAVE_SIZE", "2") or "2")
+            wave_size = max(1, min(len(to_process), max(1, min(workers, 32)), wave_size_cfg))
+            while remaining_entries:
+                batch_entries = remaining_entries[:wave_size]
+                remaining_entries = remaining_entries[wave_size:]
+
+                with ThreadPoolExecutor(max_workers=min(len(batch_entries), workers, 32)) as executor:
+                    futures = {
+                        executor.submit(self._enrich_single, e, fetch_refs, fetch_cites, max_cites, rel_down, rel_up, max_rel): e
+                        for e in batch_entries
+                    }
+                    for future in as_completed(futures):
+                        entry = futures[future]
+                        try:
+                            _, enriched, enrich_meta = future.result()
+                        except Exception as exc:
+                            enriched, enrich_meta = None, {"status": "api_error", "error": str(exc)}
+                        record(entry, enriched, enrich_meta)
+
+                if remaining_entries:
+                    deferred_reason = self._enrich_yield_reason(corpus_id, processed, len(remaining_entries))
+                    if deferred_reason:
+                        unstarted_ids = [int(entry["id"]) for entry in remaining_entries]
+                        remaining_ids = list(unstarted_ids)
+                        remaining_limit = len(remaining_ids)
+                        break
+
+        if not claimed:
+            return {
+                "processed": 0,
+                "promoted": 0,
+                "queued": 0,
+                "failed": 0,
+                "duplicates_merged": 0,
+                "results": [],
+            }
+
+        # Rows claimed but never started go straight back to the queue instead of
+        # sitting out their lease; a continuation job (or another worker) takes them.
+        if unstarted_ids:
+            self.db_pool.write(lambda db: db.release_enrich_claims(unstarted_ids, self.worker_id))
+
+        # Results are committed in groups by the sink while enrichment runs; rows whose write
+        # is lost to a crash are still leased by this worker and get reclaimed on expiry.
+        self.result_sink.flush()
+        for pending in pending_writes:
+            try:
+                outcome = pending.result()
+            except Exception as exc:
+                failed += 1
+                errors.append(str(exc))
+                continue
+            promoted += outcome.get("promoted", 0)
+            queued += outcome.get("queued", 0)
+            failed += outcome.get("failed", 0)
+            duplicates_merged += outcome.get("duplicates_merged", 0)
+            if outcome.get("error"):
+                errors.append(outcome["error"])
+            results.append(outcome["result"])
 
         return {
             "processed": processed,
@@ -652,9 +910,10 @@ class PipelineDaemon:
             "failed": failed,
             "duplicates_merged": duplicates_merged,
             "targeted_ids": target_ids,
-            "deferred": bool(remaining_ids),
+            "deferred": bool(deferred_reason),
             "deferred_reason": deferred_reason,
             "remaining_pending_work_ids": remaining_ids,
+            "remaining_limit": remaining_limit,
             "errors": errors,
             "results": results,
         }
@@ -669,21 +928,20 @@ class PipelineDaemon:
         elif isinstance(authors_raw, list):
             authors = authors_raw
 
-        # DatabaseManager uses a shared sqlite connection. Keep DB mutations and lookups serialized
-        # while still allowing network/download work to run in parallel.
-        with self.db_lock:
-            dup_table, dup_id, dup_field = self.db.check_if_exists(
-                doi=row.get("doi"), openalex_id=row.get("openalex_id"), title=row.get("title"),
-                authors=authors, editors=row.get("editors"), year=row.get("year"), exclude_id=qid, exclude_table="works"
-            )
+        # Lookups use this thread's read-only connection; mutations go through the
+        # pool's single writer so network/download work runs fully in parallel.
+        reader = self.db_pool.reader()
+        dup_table, dup_id, dup_field = reader.check_if_exists(
+            doi=row.get("doi"), openalex_id=row.get("openalex_id"), title=row.get("title"),
+            authors=authors, editors=row.get("editors"), year=row.get("year"), exclude_id=qid, exclude_table="works"
+        )
         if dup_table == "works" and dup_id is not None:
-            existing = self.db.get_entry_by_id("works", int(dup_id)) or {}
+            existing = reader.get_entry_by_id("works", int(dup_id), with_payloads=False) or {}
             if str(existing.get("download_status") or "").strip().lower() != "downloaded":
                 dup_table = None
                 dup_id = None
         if dup_table == "works" and dup_id is not None:
-            with self.db_lock:
-                ok, msg = self.db.merge_duplicate_queued_work(qid, dup_table, dup_id, dup_field)
+            ok, msg = self.result_sink.write(lambda db: db.merge_duplicate_queued_work(qid, dup_table, dup_id, dup_field))
             return "skipped", {"queue_id": qid, "action": "dropped_duplicate"}
 
         ref = {
@@ -699,6 +957,7 @@ class PipelineDaemon:
         try:
             result = self.enhancer.enhance_bibliography(ref, self.download_dir)
         except Exception as exc:
+            self.result_sink.write(lambda db: db.mark_download_failed(qid, "enhancer_exception"))
             return "error", {
                 "queue_id": qid,
                 "action": "failed",
@@ -723,11 +982,11 @@ class PipelineDaemon:
                 with open(fp, "rb") as fh: checksum = hashlib.sha256(fh.read()).hexdigest()
             except: pass
             
-            with self.db_lock:
-                downloaded_id, move_error = self.db.move_entry_to_downloaded(qid, result, fp, checksum, result.get("download_source", "unknown"))
+            downloaded_id, move_error = self.result_sink.write(
+                lambda db: db.move_entry_to_downloaded(qid, result, fp, checksum, result.get("download_source", "unknown"))
+            )
             if move_error or not downloaded_id:
-                with self.db_lock:
-                    self.db.mark_download_failed(qid, "move_to_downloaded_failed")
+                self.result_sink.write(lambda db: db.mark_download_failed(qid, "move_to_downloaded_failed"))
                 return "failed", {
                     "queue_id": qid,
                     "action": "failed",
@@ -748,8 +1007,7 @@ class PipelineDaemon:
         else:
             failure_category = download_result.get("download_failure_category") or "download_failed"
             failure_detail = download_result.get("download_failure_detail") or download_result.get("download_reason") or "download_failed"
-            with self.db_lock:
-                self.db.mark_download_failed(qid, failure_category)
+            self.result_sink.write(lambda db: db.mark_download_failed(qid, failure_category))
             return "failed", {
                 "queue_id": qid,
                 "action": "failed",
@@ -778,13 +1036,12 @@ class PipelineDaemon:
         source_stats = defaultdict(lambda: {"attempts": 0, "successes": 0, "failures": 0, "duration_ms": 0})
         failure_reasons = Counter()
 
-        # Download multiple files concurrently. Be careful not to overwhelm the disk or rate limiters.
-        # Max out at min(limit, configured cap) parallel downloads.
-        # Keep env configurable so operators can tune throughput without code changes.
-        max_workers_cfg = int(os.getenv("RAG_FEEDER_DOWNLOAD_WORKERS", "16") or "16")
-        max_workers_cfg = max(1, min(max_workers_cfg, 128))
-        max_download_workers = min(len(rows), max_workers_cfg)
-        
+        # Download multiple files concurrently. The pool is sized for the ceiling
+        # (RAG_FEEDER_DOWNLOAD_MAX_CONCURRENCY); the enhancer's adaptive
+        # "download:<host>" limits decide how many requests each host gets at once,
+        # so a throttling mirror only slows the rows that are waiting on it.
+        max_download_workers = min(len(rows), self.concurrency.ceiling("download"))
+
         with ThreadPoolExecutor(max_workers=max_download_workers) as executor:
             futures = {executor.submit(self._download_single, row): row for row in rows}
             for future in as_completed(futures):
@@ -849,8 +1106,10 @@ class PipelineDaemon:
 
     def _run_direct_enrich_cycle(self):
         default_limit = max(1, int(os.getenv("RAG_FEEDER_ENRICH_BATCH_SIZE", "10") or "10"))
-        default_workers = max(1, int(os.getenv("RAG_FEEDER_ENRICH_WORKERS", "6") or "6"))
-        result = self.do_enrich(None, default_limit, default_workers, {})
+        # Only the threads engine sizes a pool from this; it follows the adaptive OpenAlex limit.
+        default_workers = self.concurrency.get("openalex").current
+        # The streaming pipeline keeps claiming until the backlog drains or a job is waiting.
+        result = self.do_enrich(None, default_limit, default_workers, {}, continuous=True)
         return result if (result or {}).get("processed", 0) > 0 else None
 
     def _run_direct_download_cycle(self):
@@ -867,6 +1126,7 @@ class PipelineDaemon:
                 "job_id": int(job["id"]),
                 "job_type": str(job["job_type"]),
                 "corpus_id": job.get("corpus_id"),
+                "schedule": job.get("schedule"),
             },
             force=True,
         )
@@ -883,10 +1143,13 @@ class PipelineDaemon:
                 pending_work_ids = params.get("pending_work_ids") or []
                 result = self.do_enrich(corpus_id, limit, workers, expansion, pending_work_ids=pending_work_ids)
                 remaining_ids = [int(value) for value in (result or {}).get("remaining_pending_work_ids") or [] if str(value).isdigit()]
-                if remaining_ids:
+                remaining_limit = int((result or {}).get("remaining_limit") or 0)
+                if remaining_limit > 0:
                     continuation_params = dict(params)
-                    continuation_params["pending_work_ids"] = remaining_ids
-                    continuation_params["limit"] = len(remaining_ids)
+                    # Untargeted jobs continue by budget; their unstarted rows are back in the queue.
+                    if pending_work_ids:
+                        continuation_params["pending_work_ids"] = remaining_ids
+                    continuation_params["limit"] = remaining_limit
                     continuation_id = self.enqueue_job(corpus_id, "enrich", continuation_params)
                     result["continuation_job_id"] = continuation_id
 
@@ -1013,7 +1276,7 @@ class PipelineDaemon:
                             force=True,
                         )
                         continue
-                    time.sleep(5)
+                    self._wait_for_work()
                 except KeyboardInterrupt:
                     log("Received shutdown signal. Exiting gracefully...")
                     self.running = False
@@ -1022,6 +1285,7 @@ class PipelineDaemon:
                     log(f"Critical error in main loop: {e}")
                     self._heartbeat("error", {"state": "loop_exception", "error": str(e)}, force=True)
                     time.sleep(10)
+            self.wakeup.close()
             return
 
         while self.running:
@@ -1035,7 +1299,7 @@ class PipelineDaemon:
                     elif self.role == "download":
                         direct_result = self._run_direct_download_cycle()
                     if not direct_result:
-                        time.sleep(5)
+                        self._wait_for_work()
                     continue
                 self._process_job(job)
                     
@@ -1047,12 +1311,323 @@ class PipelineDaemon:
                 log(f"Critical error in main loop: {e}")
                 self._heartbeat("error", {"state": "loop_exception", "error": str(e)}, force=True)
                 time.sleep(10)
+        self.wakeup.close()
+
+class StreamingEnrichPipeline:
+    """One enrich run as three asyncio stages joined by queues: claim -> enrich -> persist.
+
+    The claimer leases rows with ``claim_enrich_batch`` in chunks and tops
+    ``claim_queue`` back up whenever it falls to half its capacity
+    (``RAG_FEEDER_ENRICH_QUEUE_SIZE``, default one row per consumer). So no
+    consumer waits for a wave or a batch boundary. Each of the consumers
+    takes one row at a time through the async engine; there is one per
+    in-flight slot. Outcomes go to ``persist_queue``, whose stage hands them
+    to ``record`` and from there to the daemon's group-commit sink.
+    ``stats()`` reports every stage's depth for the heartbeat.
+
+    ``limit`` caps the rows claimed. ``None`` keeps claiming until the queue
+    is drained. Once something has been processed, the claimer checks about
+    every ``ENRICH_YIELD_CHECK_SECONDS`` whether the daemon should yield,
+    and stops claiming if so. Rows still queued are then left unstarted and
+    reported in ``unstarted_ids``. In ``continuous`` mode, any pending job
+    for this role is also a reason to yield.
+    """
+
+    def __init__(self, daemon, *, corpus_id, limit, target_ids, options: dict, record, continuous: bool = False):
+        self.daemon = daemon
+        self.corpus_id = corpus_id
+        self.limit = None if limit is None else max(1, int(limit))
+        self.target_ids = list(target_ids or [])
+        self.options = options
+        self.record = record
+        self.continuous = continuous
+        self.claimed = 0
+        self.claimed_ids: set[int] = set()
+        self.processed = 0
+        self.enriching = 0
+        self.persisting = 0
+        self.consumers = 0
+        self.capacity = 0
+        self.deferred_reason = None
+        self.unstarted_ids: list[int] = []
+        self.claim_queue = None
+        self.persist_queue = None
+        self._room = None
+        self._persist_lock = threading.Lock()
+
+    def stats(self) -> dict:
+        return {
+            "claimed": self.claimed,
+            "processed": self.processed,
+            "claim_queue": self.claim_queue.qsize() if self.claim_queue else 0,
+            "claim_queue_capacity": self.capacity,
+            "consumers": self.consumers,
+            "enriching": self.enriching,
+            "persist_queue": self.persist_queue.qsize() if self.persist_queue else 0,
+            "persisting": self.persisting,
+            "sink_buffered": self.daemon.result_sink.depth(),
+        }
+
+    def run(self) -> None:
+        asyncio.run(self._run())
+
+    async def _run(self):
+        async with AsyncEnrichmentEngine(self.daemon.searcher, self.daemon.rate_limiter) as engine:
+            self.consumers = engine.max_in_flight if self.limit is None else min(engine.max_in_flight, self.limit)
+            queue_size = int(os.getenv("RAG_FEEDER_ENRICH_QUEUE_SIZE", "0") or "0")
+            self.capacity = max(1, queue_size or self.consumers)
+            self.claim_queue = asyncio.Queue(self.capacity)
+            self.persist_queue = asyncio.Queue()
+            self._room = asyncio.Event()
+            consumers = [asyncio.create_task(self._consume(engine)) for _ in range(self.consumers)]
+            persister = asyncio.create_task(self._persist())
+            try:
+                await self._claim()
+            finally:
+                for _ in consumers:
+                    await self.claim_queue.put(None)
+                await asyncio.gather(*consumers)
+                await self.persist_queue.put(None)
+                await persister
+
+    async def _wait_for_room(self) -> None:
+        self._room.clear()
+        try:
+            await asyncio.wait_for(self._room.wait(), ENRICH_YIELD_CHECK_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _claim(self) -> None:
+        low_water = self.capacity // 2
+        checked_at = time.monotonic()
+        while True:
+            budget = None if self.limit is None else self.limit - self.claimed
+            queued = self.claim_queue.qsize()
+            if budget == 0 and queued == 0:
+                return
+            now = time.monotonic()
+            if self.processed and now - checked_at >= ENRICH_YIELD_CHECK_SECONDS:
+                checked_at = now
+                self.deferred_reason = await asyncio.to_thread(self._yield_reason)
+                if self.deferred_reason:
+                    return
+            if queued > low_water or budget == 0:
+                await self._wait_for_room()
+                continue
+            want = self.capacity - queued if budget is None else min(self.capacity - queued, budget)
+            rows = await asyncio.to_thread(self.daemon._claim_enrich_rows, want, self.corpus_id, self.target_ids)
+            if not rows:
+                # Backlog drained; whatever is queued still gets processed.
+                self.limit = self.claimed
+                continue
+            self.claimed += len(rows)
+            for row in rows:
+                self.claimed_ids.add(int(row["id"]))
+                self.claim_queue.put_nowait(row)
+
+    def _yield_reason(self) -> str | None:
+        queued = self.claim_queue.qsize()
+        if self.continuous and self.daemon._has_pending_role_jobs():
+            log(f"Yielding streaming enrich after {self.processed} item(s); {queued} queued row(s) go back and a job is waiting.")
+            return "pending_job"
+        return self.daemon._enrich_yield_reason(self.corpus_id, self.processed, queued)
+
+    async def _consume(self, engine) -> None:
+        while True:
+            entry = await self.claim_queue.get()
+            if self.claim_queue.qsize() <= self.capacity // 2:
+                self._room.set()
+            if entry is None:
+                return
+            if self.deferred_reason:
+                self.unstarted_ids.append(int(entry["id"]))
+                continue
+            self.enriching += 1
+            try:
+                try:
+                    outcome = await self.daemon._enrich_single_async(engine, entry, self.options)
+                except Exception as exc:
+                    # The raw-download fallback blocks, so it runs here off-loop rather than in ``record``.
+                    meta = {"status": "api_error", "error": str(exc)}
+                    outcome = (None, meta, await asyncio.to_thread(self.daemon._attempt_raw_download, entry))
+            finally:
+                self.enriching -= 1
+            self.processed += 1
+            self.persist_queue.put_nowait((entry, *outcome))
+
+    async def _persist(self) -> None:
+        while True:
+            item = await self.persist_queue.get()
+            if item is None:
+                return
+            future = self.record(*item)
+            if future is not None:
+                with self._persist_lock:
+                    self.persisting += 1
+                future.add_done_callback(self._persisted)
+
+    def _persisted(self, _future) -> None:
+        with self._persist_lock:
+            self.persisting -= 1
+
+
+class DaemonSupervisor:
+    """Runs ``processes`` child daemons of one role and restarts them when they die.
+
+    Each child is a full PipelineDaemon in its own interpreter, so enrichment
+    parsing and scoring get one core per child instead of sharing one GIL.
+    Children claim through the usual lease columns under their own worker ids,
+    which keeps their batches disjoint. They heartbeat as ``<role>.<n>``; the
+    supervisor folds those rows into one heartbeat under the role's usual name.
+    """
+
+    # A child that ran this long before exiting is restarted at once; quicker
+    # exits count as crashes and back off exponentially up to the cap.
+    STABLE_SECONDS = 60
+    MAX_RESTART_DELAY = 60
+
+    def __init__(self, db_path: str, role: str, processes: int, *, poll_seconds: float = 1.0):
+        self.db_path = db_path
+        self.role = role
+        self.processes = max(1, int(processes))
+        self.poll_seconds = poll_seconds
+        self.daemon_name = DAEMON_NAMES.get(role, "pipeline")
+        self.worker_id = f"supervisor:{socket.gethostname()}:{os.getpid()}"
+        self.heartbeat_conn = sqlite3.connect(db_path, timeout=3.0)
+        self.heartbeat_conn.execute("PRAGMA busy_timeout = 3000")
+        ensure_heartbeat_table(self.heartbeat_conn)
+        self.running = True
+        self.children = {
+            index: {"process": None, "started_at": 0.0, "restart_at": 0.0, "crashes": 0, "restarts": 0, "last_exit": None}
+            for index in range(1, self.processes + 1)
+        }
+
+    def child_command(self, index: int) -> list[str]:
+        return [
+            sys.executable, os.path.abspath(__file__),
+            "--db-path", str(self.db_path), "--role", self.role, "--instance", str(index),
+        ]
+
+    def _start_child(self, index: int) -> None:
+        child = self.children[index]
+        child["process"] = subprocess.Popen(self.child_command(index))
+        child["started_at"] = time.monotonic()
+        log(f"Started {self.daemon_name}.{index} as pid {child['process'].pid}")
+
+    def poll_once(self) -> None:
+        """Reap exited children, (re)start the ones that are due, and publish the heartbeat."""
+        now = time.monotonic()
+        for index, child in self.children.items():
+            process = child["process"]
+            if process is not None and process.poll() is not None:
+                lived = now - child["started_at"]
+                child["crashes"] = 0 if lived >= self.STABLE_SECONDS else child["crashes"] + 1
+                delay = min(self.MAX_RESTART_DELAY, 2 ** (child["crashes"] - 1)) if child["crashes"] else 0
+                child.update(process=None, last_exit=process.returncode, restart_at=now + delay)
+                log(f"{self.daemon_name}.{index} (pid {process.pid}) exited with {process.returncode}; restarting in {delay}s")
+            if child["process"] is None and self.running and now >= child["restart_at"]:
+                if child["last_exit"] is not None:
+                    child["restarts"] += 1
+                self._start_child(index)
+        self._publish()
+
+    def _child_heartbeats(self) -> dict[str, tuple]:
+        names = [f"{self.daemon_name}.{index}" for index in self.children]
+        rows = self.heartbeat_conn.execute(
+            f"""SELECT daemon_name, status, details_json, last_seen_at FROM daemon_heartbeat
+                 WHERE daemon_name IN ({','.join('?' * len(names))})""",
+            names,
+        ).fetchall()
+        return {row[0]: row[1:] for row in rows}
+
+    def _publish(self, status: str | None = None) -> None:
+        heartbeats = self._child_heartbeats()
+        children = []
+        for index, child in self.children.items():
+            process = child["process"]
+            row_status, details_json, last_seen_at = heartbeats.get(f"{self.daemon_name}.{index}", (None, None, None))
+            try:
+                details = json.loads(details_json) if details_json else {}
+            except ValueError:
+                details = {}
+            children.append({
+                "instance": index,
+                "pid": process.pid if process is not None else None,
+                "alive": process is not None,
+                "status": row_status if process is not None else "restarting",
+                "state": details.get("state"),
+                "job_id": details.get("job_id"),
+                "last_seen_at": last_seen_at,
+                "restarts": child["restarts"],
+                "last_exit": child["last_exit"],
+            })
+        statuses = [entry["status"] for entry in children if entry["alive"]]
+        if status is None:
+            if "running" in statuses:
+                status = "running"
+            elif statuses and all(value == "error" for value in statuses):
+                status = "error"
+            else:
+                status = "idle" if statuses else "starting"
+        write_heartbeat(self.heartbeat_conn, self.daemon_name, self.worker_id, status, {
+            "mode": "supervisor",
+            "role": self.role,
+            "processes": self.processes,
+            "running": sum(1 for value in statuses if value == "running"),
+            "restarts": sum(child["restarts"] for child in self.children.values()),
+            "children": children,
+        })
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """Interrupt every child, wait for it to finish its batch, then kill stragglers."""
+        self.running = False
+        live = [child["process"] for child in self.children.values() if child["process"] is not None]
+        for process in live:
+            if process.poll() is None:
+                process.send_signal(signal.SIGINT)
+        deadline = time.monotonic() + timeout
+        for process in live:
+            try:
+                process.wait(timeout=max(0.1, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+        for child in self.children.values():
+            child["process"] = None
+        self._publish("stopped")
+
+    def run(self) -> None:
+        def _shutdown(signum, frame):
+            self.running = False
+
+        signal.signal(signal.SIGTERM, _shutdown)
+        signal.signal(signal.SIGINT, _shutdown)
+        log(f"Supervising {self.processes} {self.role} daemon processes.")
+        try:
+            while self.running:
+                self.poll_once()
+                time.sleep(self.poll_seconds)
+        finally:
+            self.stop()
+
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="DT Pipeline Daemon")
     parser.add_argument("--db-path", required=True, help="Path to SQLite DB")
     parser.add_argument("--role", choices=["all", "enrich", "download"], default="all", help="Worker role")
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=int(os.getenv("RAG_FEEDER_DAEMON_PROCESSES", "1") or "1"),
+        help="Run a supervisor with this many child daemons (enrich/download roles only)",
+    )
+    parser.add_argument("--instance", type=int, default=None, help=argparse.SUPPRESS)
     args = parser.parse_args()
-    
-    daemon = PipelineDaemon(args.db_path, role=args.role)
-    daemon.run()
+
+    if args.processes > 1 and args.instance is None:
+        if args.role == "all":
+            parser.error("--processes needs --role enrich or --role download")
+        DaemonSupervisor(args.db_path, args.role, args.processes).run()
+    else:
+        daemon = PipelineDaemon(args.db_path, role=args.role, instance=args.instance)
+        daemon.run()
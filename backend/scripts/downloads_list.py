@@ -29,12 +29,105 @@ STUB_ITEMS = [
 ]
 
 
+# Queue order: in-progress first, then queued, then the most recent downloads.
+# Each group is paged on its own so the listing walks idx_works_download_order;
+# the cursor's rank is the group's position here.
+DOWNLOAD_GROUPS = ("in_progress", "queued", "downloaded")
+# Must match idx_works_download_order. Compared as stored (ISO text), not via
+# datetime(), so the index supplies the order.
+STAMP_EXPR = "COALESCE(w.downloaded_at, '')"
+
+
+def decode_cursor(value):
+    """Parse a ``rank:stamp:id`` cursor; returns None for a missing or malformed one."""
+    if not value:
+        return None
+    rank, sep, rest = str(value).partition(":")
+    stamp, sep2, work_id = rest.rpartition(":")
+    if not sep or not sep2:
+        return None
+    try:
+        return int(rank), stamp, int(work_id)
+    except ValueError:
+        return None
+
+
+def fetch_page(conn, args):
+    """One page in queue order plus the cursor for the next one."""
+    cursor = decode_cursor(args.cursor)
+    offset = 0 if cursor is not None else max(args.offset, 0)
+    # One extra row tells us whether another page exists without a COUNT.
+    wanted = max(args.limit, 0) + 1
+    rows = []
+    for rank, status in enumerate(DOWNLOAD_GROUPS):
+        if len(rows) >= wanted:
+            break
+        if cursor is not None and rank < cursor[0]:
+            continue
+        clauses = ["w.download_status = ?"]
+        params = [status]
+        if args.corpus_id is not None:
+            clauses.append("EXISTS (SELECT 1 FROM corpus_works cw WHERE cw.corpus_id = ? AND cw.work_id = w.id)")
+            params.append(args.corpus_id)
+        if offset:
+            in_group = conn.execute(
+                f"SELECT COUNT(*) FROM works w WHERE {' AND '.join(clauses)}", params
+            ).fetchone()[0]
+            if in_group <= offset:
+                offset -= in_group
+                continue
+        if cursor is not None and rank == cursor[0]:
+            # Expanded rather than a row-value compare so the planner can seek the index.
+            clauses.append(f"{STAMP_EXPR} <= ? AND ({STAMP_EXPR} < ? OR w.id < ?)")
+            _, stamp, work_id = cursor
+            params.extend([stamp, stamp, work_id])
+        group_rows = conn.execute(
+            f"""
+            SELECT w.id, w.title, w.download_status, w.download_attempt_count, w.downloaded_at,
+                   {STAMP_EXPR} AS sort_stamp
+            FROM works w
+            WHERE {' AND '.join(clauses)}
+            ORDER BY {STAMP_EXPR} DESC, w.id DESC
+            LIMIT ? OFFSET ?
+            """,
+            [*params, wanted - len(rows), offset],
+        ).fetchall()
+        offset = 0
+        rows.extend((rank, dict(row)) for row in group_rows)
+
+    next_cursor = None
+    if len(rows) >= wanted:
+        rows = rows[:wanted - 1]
+        if rows:
+            rank, last = rows[-1]
+            next_cursor = f"{rank}:{last['sort_stamp']}:{last['id']}"
+    return [row for _, row in rows], next_cursor
+
+
+def count_downloads(conn, corpus_id, clauses, params):
+    has_counters = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'corpus_status_counts'"
+    ).fetchone()
+    if has_counters:
+        row = conn.execute(
+            """
+            SELECT COALESCE(SUM(n), 0) FROM corpus_status_counts
+            WHERE corpus_id = ? AND download_status IN ('queued', 'in_progress', 'downloaded')
+            """,
+            (corpus_id if corpus_id is not None else 0,),
+        ).fetchone()
+        return int(row[0])
+    where = " AND ".join(clauses)
+    return int(conn.execute(f"SELECT COUNT(*) FROM works w WHERE {where}", params).fetchone()[0])
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--db-path", required=True)
     parser.add_argument("--limit", type=int, default=200)
     parser.add_argument("--offset", type=int, default=0)
     parser.add_argument("--corpus-id", type=int, default=None)
+    parser.add_argument("--cursor", default="", help="Opaque next_cursor from the previous page; overrides --offset.")
     args = parser.parse_args()
 
     if os.environ.get("RAG_FEEDER_STUB") == "1":
@@ -45,36 +138,17 @@ def main():
     conn.row_factory = sqlite3.Row
 
     items = []
+    next_cursor = None
+    total = 0
     try:
+        clauses = ["w.download_status IN ('queued', 'in_progress', 'downloaded')"]
         params = []
-        corpus_join = ''
-        corpus_where = ''
         if args.corpus_id is not None:
-            corpus_join = 'JOIN corpus_works cw ON cw.work_id = w.id'
-            corpus_where = 'cw.corpus_id = ? AND'
+            clauses.append("w.id IN (SELECT work_id FROM corpus_works WHERE corpus_id = ?)")
             params.append(args.corpus_id)
-
-        rows = conn.execute(
-            f"""
-            SELECT w.id, w.title, w.download_status, w.download_attempt_count, w.downloaded_at
-            FROM works w
-            {corpus_join}
-            WHERE {corpus_where} w.download_status IN ('queued', 'in_progress', 'downloaded')
-            ORDER BY
-              CASE w.download_status
-                WHEN 'in_progress' THEN 0
-                WHEN 'queued' THEN 1
-                WHEN 'downloaded' THEN 2
-                ELSE 9
-              END,
-              CASE WHEN w.download_status = 'downloaded' THEN datetime(w.downloaded_at) END DESC,
-              w.id DESC
-            """,
-            params,
-        ).fetchall()
-
-        for row in rows:
-            data = dict(row)
+        total = count_downloads(conn, args.corpus_id, clauses, params)
+        rows, next_cursor = fetch_page(conn, args)
+        for data in rows:
             items.append(
                 {
                     "id": data.get("id"),
@@ -86,15 +160,11 @@ def main():
             )
     except sqlite3.Error:
         items = []
+        next_cursor = None
     finally:
         conn.close()
 
-    total = len(items)
-    start = max(args.offset, 0)
-    end = start + max(args.limit, 0)
-    items = items[start:end]
-
-    print(json.dumps({"items": items, "total": total}))
+    print(json.dumps({"items": items, "total": total, "next_cursor": next_cursor}))
 
 
 if __name__ == "__main__":
@@ -7,6 +7,12 @@ import zipfile
 from datetime import datetime
 from pathlib import Path
 
+from _bootstrap import ensure_import_paths
+
+ensure_import_paths(__file__)
+
+from dl_lit.payloads import hydrate_payloads  # noqa: E402
+
 
 VALID_STATUSES = {
     "downloaded",
@@ -112,8 +118,7 @@ def load_items(conn: sqlite3.Connection, corpus_id: int | None):
         ).fetchall()
 
     items_by_key = {}
-    for row in rows:
-        data = dict(row)
+    for data in hydrate_payloads(conn, [dict(row) for row in rows], kinds=("bibtex_entry_json",)):
         item = {
             "id": data.get("id"),
             "status": work_status(data),
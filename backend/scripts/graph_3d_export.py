@@ -9,6 +9,12 @@ import sqlite3
 from collections import Counter, defaultdict
 from datetime import datetime, timezone
 
+from _bootstrap import ensure_import_paths
+
+ensure_import_paths(__file__)
+
+from dl_lit.payloads import fetch_payloads  # noqa: E402
+
 try:
     import igraph
     import numpy as np
@@ -770,11 +776,12 @@ def fetch_openalex_json_for_kept_rows(conn, node_by_id):
     for offset in range(0, len(work_ids), 900):
         chunk = work_ids[offset : offset + 900]
         placeholders = ",".join("?" for _ in chunk)
+        stored = fetch_payloads(conn, chunk, kinds=("openalex_json",))
         for row in conn.execute(f"SELECT id, openalex_json FROM works WHERE id IN ({placeholders})", chunk):
             item = rows_by_work_id.get(int(row["id"]))
             if not item:
                 continue
-            item["openalex_json"] = row["openalex_json"]
+            item["openalex_json"] = row["openalex_json"] or stored.get(int(row["id"]), {}).get("openalex_json")
             item.pop("_openalex_json", None)
 
 
@@ -931,7 +938,17 @@ def main():
         relationship_counts[rel] += 1
         uf.union(source, target)
 
-    if conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='citation_edges'").fetchone():
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='work_citations'").fetchone():
+        # Integer-keyed store: edges map straight onto the loaded works by id.
+        for source_work_id, target_work_id, relationship in conn.execute(
+            "SELECT source_work_id, target_work_id, relationship FROM work_citations"
+        ):
+            add_edge(
+                work_id_to_node_id.get(source_work_id),
+                work_id_to_node_id.get(target_work_id),
+                "cited_by" if relationship == 1 else "references",
+            )
+    elif conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='citation_edges'").fetchone():
         for row in conn.execute("SELECT source_id, target_id, relationship_type FROM citation_edges"):
             add_edge(row["source_id"], row["target_id"], row["relationship_type"])
 
@@ -132,7 +132,7 @@ def main():
         )
 
         if tbl == "works" and eid is not None:
-            work_row = db.get_entry_by_id("works", int(eid)) or {}
+            work_row = db.get_entry_by_id("works", int(eid), with_payloads=False) or {}
             if args.corpus_id is not None:
                 db.add_corpus_item(args.corpus_id, "works", int(eid))
             metadata_status = str(work_row.get("metadata_status") or "pending").strip().lower()
@@ -1,9 +1,9 @@
 """Import a BibTeX or JSON seed file into the corpus (web-upload ingest path).
 
 Routes uploaded `.bib`/`.json` seed documents into the canonical `works` table
-as pending works and links each new work to the current corpus. Inserts go
-directly to the on-disk DB via DatabaseManager.create_pending_work (which
-returns the new row id), so this is safe to run while the enrich/download
+as pending works and links each resolved work to the current corpus. Inserts go
+directly to the on-disk DB via DatabaseManager.upsert_works_bulk (one
+transaction per chunk), so this is safe to run while the enrich/download
 workers are writing — unlike the in-memory rewrite used by the `import-bib`
 CLI command.
 
@@ -23,7 +23,7 @@ DL_LIT_PROJECT = ROOT / "dl_lit_project"
 if str(DL_LIT_PROJECT) not in sys.path:
     sys.path.insert(0, str(DL_LIT_PROJECT))
 
-from dl_lit.db_manager import DatabaseManager  # noqa: E402
+from dl_lit.db_manager import HIGH_CONFIDENCE_MATCH_FIELDS, DatabaseManager  # noqa: E402
 
 
 def _field(entry, *names):
@@ -93,37 +93,34 @@ def main():
                           "errors": [f"Failed to parse {args.kind}: {exc}"]}))
         return
 
+    # Seed files can carry thousands of entries; resolve and write them in
+    # chunks with one commit each instead of one fsync per reference.
     db = DatabaseManager(args.db_path)
     added = skipped = linked = 0
     errors = []
+    refs = []
+    for raw in entries:
+        if not isinstance(raw, dict):
+            skipped += 1
+            errors.append(f"Skipped non-object entry: {type(raw).__name__}")
+            continue
+        entry = dict(raw)
+        if args.source_label and not entry.get("source"):
+            entry["source"] = args.source_label
+        refs.append(entry)
     try:
-        for raw in entries:
-            if not isinstance(raw, dict):
-                skipped += 1
-                errors.append(f"Skipped non-object entry: {type(raw).__name__}")
-                continue
-            entry = dict(raw)
-            if args.source_label and not entry.get("source"):
-                entry["source"] = args.source_label
-            try:
-                row_id, err = db.create_pending_work(entry)
-            except Exception as exc:
-                skipped += 1
-                errors.append(str(exc))
-                continue
-            if row_id:
+        for outcome in db.upsert_works_bulk(refs, corpus_id=args.corpus_id):
+            if outcome["work_id"] and args.corpus_id is not None:
+                linked += 1
+            if outcome["status"] == "created" or (
+                outcome["status"] == "merged" and outcome["matched_field"] not in HIGH_CONFIDENCE_MATCH_FIELDS
+            ):
                 added += 1
-                if args.corpus_id is not None:
-                    db.add_corpus_item(args.corpus_id, "works", int(row_id))
-                    linked += 1
             else:
                 skipped += 1
-                if err and "Duplicate" not in err and "Title is required" not in err:
+                err = outcome["error"]
+                if err and "Title is required" not in err:
                     errors.append(err)
-        try:
-            db.conn.commit()
-        except Exception:
-            pass
     finally:
         try:
             db.close_connection()
@@ -3,27 +3,36 @@ import json
 import sqlite3
 
 
-def fetch_count(cur, where_sql="", params=()):
-    query = "SELECT COUNT(*) FROM works"
-    if where_sql:
-        query += f" WHERE {where_sql}"
-    cur.execute(query, params)
-    return int(cur.fetchone()[0] or 0)
-
-
-def fetch_corpus_count(cur, corpus_id, where_sql="", params=()):
-    query = """
-        SELECT COUNT(*)
-        FROM works w
-        JOIN corpus_works cw ON cw.work_id = w.id
-        WHERE cw.corpus_id = ?
+def fetch_status_counts(cur, corpus_id=None):
+    """Return (metadata_status, download_status, n) rows for a corpus or all works.
+
+    Reads the trigger-maintained corpus_status_counts table (corpus_id 0 = all
+    works); databases that predate it fall back to one grouped scan.
     """
-    final_params = [corpus_id]
-    if where_sql:
-        query += f" AND ({where_sql})"
-        final_params.extend(params)
-    cur.execute(query, final_params)
-    return int(cur.fetchone()[0] or 0)
+    has_counters = cur.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'corpus_status_counts'"
+    ).fetchone()
+    if has_counters:
+        cur.execute(
+            "SELECT metadata_status, download_status, n FROM corpus_status_counts WHERE corpus_id = ? AND n > 0",
+            (corpus_id if corpus_id is not None else 0,),
+        )
+        return cur.fetchall()
+    pair = "COALESCE(w.metadata_status, 'pending'), COALESCE(w.download_status, 'not_requested')"
+    if corpus_id is None:
+        cur.execute(f"SELECT {pair}, COUNT(*) FROM works w GROUP BY 1, 2")
+    else:
+        cur.execute(
+            f"""
+            SELECT {pair}, COUNT(*)
+            FROM works w
+            JOIN corpus_works cw ON cw.work_id = w.id
+            WHERE cw.corpus_id = ?
+            GROUP BY 1, 2
+            """,
+            (corpus_id,),
+        )
+    return cur.fetchall()
 
 
 def main():
@@ -35,17 +44,16 @@ def main():
     conn = sqlite3.connect(args.db_path)
     cur = conn.cursor()
 
-    if args.corpus_id is None:
-        count_fn = lambda where_sql="", params=(): fetch_count(cur, where_sql, params)
-    else:
-        count_fn = lambda where_sql="", params=(): fetch_corpus_count(cur, args.corpus_id, where_sql, params)
-
-    stats = {
-        "raw_pending": count_fn("metadata_status IN ('pending', 'in_progress')"),
-        "matched": count_fn("metadata_status = 'matched' AND COALESCE(download_status, 'not_requested') = 'not_requested'"),
-        "queued_download": count_fn("download_status IN ('queued', 'in_progress')"),
-        "downloaded": count_fn("download_status = 'downloaded'"),
-    }
+    stats = {"raw_pending": 0, "matched": 0, "queued_download": 0, "downloaded": 0}
+    for metadata_status, download_status, n in fetch_status_counts(cur, args.corpus_id):
+        if metadata_status in ("pending", "in_progress"):
+            stats["raw_pending"] += n
+        if metadata_status == "matched" and download_status == "not_requested":
+            stats["matched"] += n
+        if download_status in ("queued", "in_progress"):
+            stats["queued_download"] += n
+        if download_status == "downloaded":
+            stats["downloaded"] += n
     conn.close()
 
     print(json.dumps({"stats": stats, "source": "db"}))
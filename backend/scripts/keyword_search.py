@@ -22,7 +22,7 @@ from dl_lit.OpenAlexScraper import (
     fetch_referenced_work_details,
 )
 from dl_lit.db_manager import DatabaseManager
-from dl_lit.keyword_search import dedupe_results, search_openalex
+from dl_lit.keyword_search import cached_result_to_record, dedupe_results, search_openalex
 from dl_lit.utils import (
     OpenAlexRateLimitExceeded,
     get_global_rate_limiter,
@@ -517,6 +517,11 @@ def main():
     parser.add_argument('--field', default='default')
     parser.add_argument('--mailto', default=None)
     parser.add_argument('--enqueue', action='store_true')
+    parser.add_argument(
+        '--local-first',
+        action='store_true',
+        help='Skip OpenAlex when a recent run of the same query and filters returned only works already held locally.',
+    )
     parser.add_argument('--corpus-id', type=int, default=None)
     parser.add_argument('--related-depth', type=int, default=DEFAULT_RELATED_DEPTH)
     parser.add_argument('--related-depth-downstream', type=int, default=None)
@@ -587,9 +592,17 @@ def main():
             'include_upstream': args.include_upstream,
         }
         run_query_label = args.query if is_query_mode and args.query else (args.author or '[filtered-search]' if is_query_mode else '[seed-json]')
+        cached_run_id, cached_rows = None, []
+        if is_query_mode and args.local_first and args.query:
+            cached_run_id, cached_rows = db.find_cached_search_run(run_query_label, filters)
+        if cached_run_id is not None:
+            # Recorded separately so this run never serves as a cache entry itself.
+            filters['cached_run_id'] = cached_run_id
         run_id = db.create_search_run(query=run_query_label, filters=filters)
 
-        if is_query_mode:
+        if cached_run_id is not None:
+            base_items = []
+        elif is_query_mode:
             base_items = search_openalex(
                 query=args.query or '',
                 max_results=args.max_results,
@@ -617,8 +630,13 @@ def main():
             include_upstream=args.include_upstream,
         )
 
-        records = [openalex_result_to_record(item, run_id=run_id) for item in _dedupe_openalex_items(all_items)]
-        records = dedupe_results(records)
+        if cached_run_id is not None:
+            records = [cached_result_to_record(row, run_id=run_id) for row in cached_rows]
+            local_ids = [row['work_id'] for row in cached_rows]
+        else:
+            records = [openalex_result_to_record(item, run_id=run_id) for item in _dedupe_openalex_items(all_items)]
+            records = dedupe_results(records)
+            local_ids = db.local_work_ids(records)
 
         db.add_search_results(run_id, [
             {
@@ -627,8 +645,9 @@ def main():
                 'title': r.get('title'),
                 'year': r.get('year'),
                 'raw_json': r.get('openalex_json'),
+                'work_id': work_id,
             }
-            for r in records
+            for r, work_id in zip(records, local_ids)
         ])
 
         if args.enqueue:
@@ -637,10 +656,13 @@ def main():
 
         db.close_connection()
 
+    results = _render_results(records)
+    for result, work_id in zip(results, local_ids):
+        result['local_work_id'] = work_id
     payload = {
         'runId': run_id,
-        'results': _render_results(records),
-        'source': 'openalex',
+        'results': results,
+        'source': 'local' if cached_run_id is not None else 'openalex',
         'mode': mode_label,
         'expansion': expansion_stats,
     }
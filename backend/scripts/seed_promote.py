@@ -171,7 +171,7 @@ def _handle_existing(db: DatabaseManager, corpus_id: int, table_name: str, row_i
         _merge_candidate_into_existing(db, table_name, row_id, ref, matched_on)
     row_id = int(row_id)
     if table_name == "works":
-        work = db.get_entry_by_id("works", row_id) or {}
+        work = db.get_entry_by_id("works", row_id, with_payloads=False) or {}
         metadata_status = str(work.get("metadata_status") or "pending").strip().lower()
         download_status = str(work.get("download_status") or "not_requested").strip().lower()
         if download_status == "downloaded":
@@ -186,13 +186,13 @@ def _handle_existing(db: DatabaseManager, corpus_id: int, table_name: str, row_i
                 "work_id": row_id,
                 "queue_id": row_id,
             }, {"pending_work_id": None, "download_queued": True}
-        if download_status == "failed":
+        if download_status in {"failed", "quarantined"}:
             return {
                 "action": "failed_download_existing",
                 "work_id": row_id,
                 "failed_id": row_id,
             }, {"pending_work_id": None, "download_queued": False}
-        if metadata_status == "failed":
+        if metadata_status in {"failed", "quarantined"}:
             return {
                 "action": "failed_enrichment_existing",
                 "work_id": row_id,
@@ -272,7 +272,7 @@ def main():
         )
 
         if tbl and eid is not None and _has_openalex_metadata(candidate, ref):
-            existing = db.get_entry_by_id("works", int(eid)) if tbl == "works" else {}
+            existing = db.get_entry_by_id("works", int(eid), with_payloads=False) if tbl == "works" else {}
             existing_download_status = str(existing.get("download_status") or "not_requested").strip().lower()
             if existing_download_status == "failed":
                 result, _meta = _handle_existing(
@@ -15,6 +15,12 @@ from datetime import datetime
 from pathlib import Path
 from urllib.parse import quote
 
+from _bootstrap import ensure_import_paths
+
+ensure_import_paths(__file__)
+
+from dl_lit.payloads import hydrate_payloads  # noqa: E402
+
 
 DEFAULT_TARGET_NAME = "Anthropozän & Nachhaltiges Management"
 DEFAULT_CONTAINER_DB_PATH = "/usr/src/app/dl_lit_project/data/literature.db"
@@ -391,8 +397,8 @@ def summarize_text_scan(results: list[dict]) -> dict:
     return summary
 
 
-def pending_rows(conn: sqlite3.Connection, target_id: str, metadata_bib: Path) -> list[sqlite3.Row]:
-    return conn.execute(
+def pending_rows(conn: sqlite3.Connection, target_id: str, metadata_bib: Path) -> list[dict]:
+    rows = conn.execute(
         """
         SELECT DISTINCT w.*
           FROM works w
@@ -409,6 +415,7 @@ def pending_rows(conn: sqlite3.Connection, target_id: str, metadata_bib: Path) -
         """,
         (target_id, str(metadata_bib)),
     ).fetchall()
+    return hydrate_payloads(conn, [dict(row) for row in rows], kinds=("bibtex_entry_json",))
 
 
 def pending_counts(conn: sqlite3.Connection, target_id: str, metadata_bib: Path) -> dict:
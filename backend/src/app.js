@@ -3,6 +3,7 @@ import cors from 'cors';
 import multer from 'multer';
 import path from 'path';
 import fs from 'fs';
+import net from 'net';
 import os from 'os';
 import { fileURLToPath } from 'url';
 import { dirname } from 'path';
@@ -95,6 +96,10 @@ const GET_BIB_PAGES_SCRIPT = path.join(DL_LIT_CODE_DIR, 'get_bib_pages.py');
 const API_SCRAPER_SCRIPT = path.join(DL_LIT_CODE_DIR, 'APIscraper_v2.py');
 const DEFAULT_DB_PATH = path.join(DL_LIT_PROJECT_DIR, 'data', 'literature.db');
 const DB_PATH = process.env.RAG_FEEDER_DB_PATH || DEFAULT_DB_PATH;
+// Idle pipeline workers listen on Unix sockets here (see dl_lit/wakeup.py).
+const PIPELINE_WAKEUP_DIR =
+  process.env.RAG_FEEDER_WAKEUP_DIR ||
+  path.join(path.dirname(DB_PATH), `${path.basename(DB_PATH, path.extname(DB_PATH))}_wakeup`);
 const FRONTEND_URL = process.env.RAG_FEEDER_FRONTEND_URL || 'https://genkia.de';
 const SMTP_FROM = process.env.RAG_FEEDER_SMTP_FROM || process.env.SMTP_FROM || 'noreply@example.com';
 const PYTHON_SCRIPTS_DIR = path.join(__dirname, '..', 'scripts');
@@ -1150,9 +1155,10 @@ function statusFromWorkRow(data) {
   const download = String(data?.download_status || 'not_requested').trim().toLowerCase();
   if (download === 'downloaded') return 'downloaded';
   if (download === 'queued' || download === 'in_progress') return 'queued_download';
-  if (download === 'failed') return 'failed_download';
+  // Quarantined rows stopped retrying after repeated failures; they count as failed (see corpus_list.py).
+  if (download === 'failed' || download === 'quarantined') return 'failed_download';
   if (metadata === 'in_progress') return 'enriching';
-  if (metadata === 'failed') return 'failed_enrichment';
+  if (metadata === 'failed' || metadata === 'quarantined') return 'failed_enrichment';
   if (metadata === 'matched') return 'matched';
   return 'raw';
 }
@@ -2463,27 +2469,38 @@ export function createApp({ broadcast, broadcastEvent } = {}) {
     const empty = {
       corpus_id: scopedCorpusId,
       raw_pending: 0, enriching: 0, matched: 0, queued_download: 0,
-      downloading: 0, downloaded: 0, failed_enrichment: 0, failed_download: 0,
+      downloading: 0, downloaded: 0, failed_enrichment: 0, failed_download: 0, quarantined: 0,
     };
     if (!tableExists(authDb, 'works')) return empty;
-    // Single pass with conditional aggregation. The previous version ran 8
-    // separate COUNT(*) queries, each scanning the (corpus's) works — slow on a
-    // 100k-row table and contended when the workers hold the DB lock.
+    // Single pass with conditional aggregation. When the trigger-maintained
+    // corpus_status_counts table exists (corpus_id 0 = all works) this sums a
+    // handful of counter rows instead of scanning the (corpus's) works, which
+    // matters because dashboards poll this while the workers are writing.
+    const useCounters = tableExists(authDb, 'corpus_status_counts');
+    const weight = useCounters ? 't.n' : '1';
     const sums = `
-      SUM(CASE WHEN COALESCE(t.metadata_status, 'pending') = 'pending' THEN 1 ELSE 0 END) AS raw_pending,
-      SUM(CASE WHEN COALESCE(t.metadata_status, 'pending') = 'in_progress' THEN 1 ELSE 0 END) AS enriching,
-      SUM(CASE WHEN t.metadata_status = 'matched' AND COALESCE(t.download_status, 'not_requested') = 'not_requested' THEN 1 ELSE 0 END) AS matched,
-      SUM(CASE WHEN COALESCE(t.download_status, 'not_requested') = 'queued' THEN 1 ELSE 0 END) AS queued_download,
-      SUM(CASE WHEN COALESCE(t.download_status, 'not_requested') = 'in_progress' THEN 1 ELSE 0 END) AS downloading,
-      SUM(CASE WHEN t.download_status = 'downloaded' THEN 1 ELSE 0 END) AS downloaded,
-      SUM(CASE WHEN t.metadata_status = 'failed' THEN 1 ELSE 0 END) AS failed_enrichment,
-      SUM(CASE WHEN t.download_status = 'failed' THEN 1 ELSE 0 END) AS failed_download`;
+      SUM(CASE WHEN COALESCE(t.metadata_status, 'pending') = 'pending' THEN ${weight} ELSE 0 END) AS raw_pending,
+      SUM(CASE WHEN COALESCE(t.metadata_status, 'pending') = 'in_progress' THEN ${weight} ELSE 0 END) AS enriching,
+      SUM(CASE WHEN t.metadata_status = 'matched' AND COALESCE(t.download_status, 'not_requested') = 'not_requested' THEN ${weight} ELSE 0 END) AS matched,
+      SUM(CASE WHEN COALESCE(t.download_status, 'not_requested') = 'queued' THEN ${weight} ELSE 0 END) AS queued_download,
+      SUM(CASE WHEN COALESCE(t.download_status, 'not_requested') = 'in_progress' THEN ${weight} ELSE 0 END) AS downloading,
+      SUM(CASE WHEN t.download_status = 'downloaded' THEN ${weight} ELSE 0 END) AS downloaded,
+      SUM(CASE WHEN t.metadata_status IN ('failed', 'quarantined') THEN ${weight} ELSE 0 END) AS failed_enrichment,
+      SUM(CASE WHEN t.download_status IN ('failed', 'quarantined') THEN ${weight} ELSE 0 END) AS failed_download,
+      SUM(CASE WHEN 'quarantined' IN (t.metadata_status, t.download_status) THEN ${weight} ELSE 0 END) AS quarantined`;
     try {
-      const row = scopedCorpusId === null
-        ? authDb.prepare(`SELECT ${sums} FROM works t`).get()
-        : authDb.prepare(
-            `SELECT ${sums} FROM works t JOIN corpus_works cw ON cw.work_id = t.id WHERE cw.corpus_id = ?`
-          ).get(scopedCorpusId);
+      let row;
+      if (useCounters) {
+        row = authDb
+          .prepare(`SELECT ${sums} FROM corpus_status_counts t WHERE t.corpus_id = ?`)
+          .get(scopedCorpusId === null ? 0 : scopedCorpusId);
+      } else {
+        row = scopedCorpusId === null
+          ? authDb.prepare(`SELECT ${sums} FROM works t`).get()
+          : authDb.prepare(
+              `SELECT ${sums} FROM works t JOIN corpus_works cw ON cw.work_id = t.id WHERE cw.corpus_id = ?`
+            ).get(scopedCorpusId);
+      }
       return {
         corpus_id: scopedCorpusId,
         raw_pending: Number(row?.raw_pending || 0),
@@ -2494,6 +2511,7 @@ export function createApp({ broadcast, broadcastEvent } = {}) {
         downloaded: Number(row?.downloaded || 0),
         failed_enrichment: Number(row?.failed_enrichment || 0),
         failed_download: Number(row?.failed_download || 0),
+        quarantined: Number(row?.quarantined || 0),
       };
     } catch (error) {
       return empty;
@@ -2535,7 +2553,23 @@ export function createApp({ broadcast, broadcastEvent } = {}) {
       .get(String(jobType), corpusId ?? null, ...statuses);
   }
 
+  function notifyPipelineWorkers() {
+    let entries;
+    try {
+      entries = fs.readdirSync(PIPELINE_WAKEUP_DIR);
+    } catch {
+      return;
+    }
+    for (const name of entries) {
+      if (!name.endsWith('.sock')) continue;
+      const client = net.createConnection(path.join(PIPELINE_WAKEUP_DIR, name));
+      client.on('error', () => {});
+      client.end('job');
+    }
+  }
+
   function enqueuePipelineJob(corpusId, jobType, parameters = {}, { dedupeStatuses = [] } = {}) {
+    let inserted = false;
     const tx = authDb.transaction(() => {
       const existing = dedupeStatuses.length
         ? findExistingPipelineJob(jobType, corpusId, dedupeStatuses)
@@ -2543,16 +2577,31 @@ export function createApp({ broadcast, broadcastEvent } = {}) {
       if (existing) {
         return Number(existing.id);
       }
+      inserted = true;
+      const values = [corpusId ?? null, String(jobType), JSON.stringify(parameters || {})];
+      // The view merges the request into a compatible pending job, the same
+      // way the worker's enqueue_job does (dl_lit/db_manager.py, create_job_coalescing).
+      const coalescing = authDb
+        .prepare("SELECT 1 FROM sqlite_master WHERE type = 'view' AND name = 'pipeline_job_requests'")
+        .get();
+      if (coalescing) {
+        authDb
+          .prepare('INSERT INTO pipeline_job_requests (corpus_id, job_type, parameters_json) VALUES (?, ?, ?)')
+          .run(...values);
+        return Number(authDb.prepare('SELECT last_enqueued_id FROM pipeline_scheduler WHERE id = 1').get().last_enqueued_id);
+      }
       return Number(
         authDb
           .prepare(
             "INSERT INTO pipeline_jobs (corpus_id, job_type, status, parameters_json) VALUES (?, ?, 'pending', ?)"
           )
-          .run(corpusId ?? null, String(jobType), JSON.stringify(parameters || {}))
+          .run(...values)
           .lastInsertRowid
       );
     });
-    return tx();
+    const jobId = tx();
+    if (inserted) notifyPipelineWorkers();
+    return jobId;
   }
 
   const extractionQueueStates = new Map();
@@ -2788,6 +2837,17 @@ export function createApp({ broadcast, broadcastEvent } = {}) {
 
   function countQueuedDownloads(corpusId) {
     try {
+      if (tableExists(authDb, 'corpus_status_counts')) {
+        const row = authDb
+          .prepare(
+            `SELECT COALESCE(SUM(n), 0) AS count
+             FROM corpus_status_counts
+             WHERE corpus_id = ?
+               AND download_status IN ('queued', 'in_progress')`
+          )
+          .get(corpusId === undefined || corpusId === null ? 0 : corpusId);
+        return Number(row?.count || 0);
+      }
       if (corpusId !== undefined && corpusId !== null) {
         const row = authDb
           .prepare(
@@ -4810,9 +4870,19 @@ export function createApp({ broadcast, broadcastEvent } = {}) {
     }
     const limit = coerceInt(req.query?.limit, 200);
     const offset = coerceInt(req.query?.offset, 0);
+    const cursor = String(req.query?.cursor || '').trim();
+    const statusFilter = String(req.query?.status || '').trim().toLowerCase();
+    const yearFrom = coerceInt(req.query?.year_from || req.query?.yearFrom, null);
+    const yearTo = coerceInt(req.query?.year_to || req.query?.yearTo, null);
+    const sourceFilter = String(req.query?.source || '').trim();
     const dbPath = DB_PATH;
 
     const args = ['--db-path', dbPath, '--limit', String(limit), '--offset', String(offset)];
+    if (cursor) args.push('--cursor', cursor);
+    if (statusFilter) args.push('--status', statusFilter);
+    if (yearFrom !== null) args.push('--year-from', String(yearFrom));
+    if (yearTo !== null) args.push('--year-to', String(yearTo));
+    if (sourceFilter) args.push('--source', sourceFilter);
     try {
       const payload = await runPythonJson(CORPUS_LIST_SCRIPT, args, { dbPath, corpusId: req.corpusId });
       return res.json(payload);
@@ -4908,7 +4978,9 @@ export function createApp({ broadcast, broadcastEvent } = {}) {
     const offset = coerceInt(req.query?.offset, 0);
     const dbPath = DB_PATH;
 
+    const cursor = String(req.query?.cursor || '').trim();
     const args = ['--db-path', dbPath, '--limit', String(limit), '--offset', String(offset)];
+    if (cursor) args.push('--cursor', cursor);
     try {
       const payload = await runPythonJson(DOWNLOADS_LIST_SCRIPT, args, { dbPath, corpusId: req.corpusId });
       return res.json(payload);
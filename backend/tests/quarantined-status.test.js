@@ -0,0 +1,92 @@
+import fs from 'node:fs'
+import os from 'node:os'
+import path from 'node:path'
+import Database from 'better-sqlite3'
+import request from 'supertest'
+
+describe('quarantined works', () => {
+  let app = null
+  let authToken = ''
+  let currentCorpusId = null
+  let originalDbPath
+  let tempDir = ''
+
+  beforeAll(async () => {
+    tempDir = fs.mkdtempSync(path.join(os.tmpdir(), 'dt-quarantine-'))
+    originalDbPath = process.env.RAG_FEEDER_DB_PATH
+    process.env.RAG_FEEDER_DB_PATH = path.join(tempDir, 'quarantine.db')
+    process.env.RAG_FEEDER_JWT_SECRET = 'quarantine-secret'
+    process.env.RAG_ADMIN_USER = 'quarantine-admin'
+    process.env.RAG_ADMIN_PASSWORD = 'quarantine-password'
+    const { createApp } = await import('../src/app.js')
+    app = createApp({ broadcast: () => {} })
+
+    const login = await request(app).post('/api/auth/login').send({
+      username: process.env.RAG_ADMIN_USER,
+      password: process.env.RAG_ADMIN_PASSWORD,
+    })
+    authToken = login.body.token
+    currentCorpusId = login.body?.user?.last_corpus_id || null
+  })
+
+  afterAll(() => {
+    if (originalDbPath === undefined) {
+      delete process.env.RAG_FEEDER_DB_PATH
+    } else {
+      process.env.RAG_FEEDER_DB_PATH = originalDbPath
+    }
+    delete process.env.RAG_FEEDER_JWT_SECRET
+    delete process.env.RAG_ADMIN_USER
+    delete process.env.RAG_ADMIN_PASSWORD
+    if (tempDir && fs.existsSync(tempDir)) {
+      try {
+        fs.rmSync(tempDir, { recursive: true, force: true })
+      } catch {
+        // best effort cleanup
+      }
+    }
+  })
+
+  const seedWork = (title, metadataStatus, downloadStatus) => {
+    const db = new Database(process.env.RAG_FEEDER_DB_PATH)
+    try {
+      const result = db
+        .prepare(
+          `INSERT INTO works (title, normalized_title, metadata_status, download_status)
+           VALUES (?, ?, ?, ?)`
+        )
+        .run(title, title.toLowerCase(), metadataStatus, downloadStatus)
+      const workId = Number(result.lastInsertRowid)
+      db.prepare('INSERT OR IGNORE INTO corpus_works (corpus_id, work_id) VALUES (?, ?)').run(currentCorpusId, workId)
+      return workId
+    } finally {
+      db.close()
+    }
+  }
+
+  test('count and display as failed', async () => {
+    const enrichment = seedWork('Quarantined lookup', 'quarantined', 'not_requested')
+    const download = seedWork('Quarantined download', 'matched', 'quarantined')
+
+    const status = await request(app)
+      .get('/api/pipeline/daemon/status')
+      .set('Authorization', `Bearer ${authToken}`)
+    expect(status.status).toBe(200)
+    expect(status.body.backlog.failed_enrichment).toBe(1)
+    expect(status.body.backlog.failed_download).toBe(1)
+    expect(status.body.backlog.quarantined).toBe(2)
+    expect(status.body.backlog.matched).toBe(0)
+
+    const enrichmentNode = await request(app)
+      .get(`/api/graph/3d/node/${enrichment}`)
+      .set('Authorization', `Bearer ${authToken}`)
+    expect(enrichmentNode.status).toBe(200)
+    expect(enrichmentNode.body.status).toBe('failed_enrichment')
+
+    const downloadNode = await request(app)
+      .get(`/api/graph/3d/node/${download}`)
+      .set('Authorization', `Bearer ${authToken}`)
+    expect(downloadNode.status).toBe(200)
+    expect(downloadNode.body.status).toBe('failed_download')
+  })
+})
@@ -8,7 +8,7 @@ from pathlib import Path
 import argparse
 import concurrent.futures
 import os
-from .utils import OpenAlexRateLimitExceeded, get_global_rate_limiter, openalex_request_json
+from .utils import OpenAlexRateLimitExceeded, get_concurrency_limits, get_global_rate_limiter, openalex_request_json
 
 try:
     from rapidfuzz import fuzz
@@ -69,6 +69,60 @@ def convert_inverted_index_to_text(inverted_index):
     text = " ".join(word for word, _ in word_positions)
     return text
 
+def _related_work_details(work, include_links=False):
+    """Reduce an OpenAlex work to the fields stored for related works."""
+    work_details = {
+        'openalex_id': work.get("id"),
+        'title': work.get("display_name"),
+        'authors': [a.get('author', {}).get('display_name') for a in work.get('authorships', [])],
+        'year': work.get("publication_year"),
+        'doi': work.get("doi"),
+        'type': work.get("type"),
+    }
+    if include_links:
+        work_details['referenced_works'] = work.get("referenced_works") or []
+        work_details['cited_by_api_url'] = work.get("cited_by_api_url")
+    return work_details
+
+
+def _related_select_fields(include_links=False):
+    select_fields = "id,title,display_name,authorships,publication_year,doi,type"
+    if include_links:
+        select_fields += ",referenced_works,cited_by_api_url"
+    return select_fields
+
+
+def _citing_works_url(cited_by_url, mailto, include_links=False, api_key=None):
+    url = f"{cited_by_url}&select={_related_select_fields(include_links)}&per-page=100&mailto={mailto}"
+    if api_key:
+        url = f"{url}&api_key={quote_plus(api_key)}"
+    return url
+
+
+def _referenced_work_batches(referenced_work_ids, batch_size=50):
+    """Split referenced work IDs into OpenAlex pipe-query batches (at most 50 IDs each)."""
+    batches = []
+    for i in range(0, len(referenced_work_ids), batch_size):
+        batch = referenced_work_ids[i:i+batch_size]
+        work_ids = []
+        for work_id in batch:
+            if isinstance(work_id, str):
+                work_ids.append(work_id)
+            elif isinstance(work_id, dict) and work_id.get('id'):
+                work_ids.append(work_id['id'])
+        if work_ids:
+            batches.append(work_ids)
+    return batches
+
+
+def _referenced_batch_url(work_ids, mailto, include_links=False):
+    ids_query = "|".join(work_ids)
+    return (
+        f"https://api.openalex.org/works?filter=openalex_id:{ids_query}"
+        f"&select={_related_select_fields(include_links)}&per-page=50&mailto={mailto}"
+    )
+
+
 def fetch_citing_work_ids(
     cited_by_url,
     rate_limiter,
@@ -87,12 +141,7 @@ def fetch_citing_work_ids(
         return []
 
     citing_work_ids = []
-    select_fields = "id,title,display_name,authorships,publication_year,doi,type"
-    if include_links:
-        select_fields += ",referenced_works,cited_by_api_url"
-    url = f"{cited_by_url}&select={select_fields}&per-page=100&mailto={mailto}"
-    if api_key:
-        url = f"{url}&api_key={quote_plus(api_key)}"
+    url = _citing_works_url(cited_by_url, mailto, include_links, api_key)
     page = 1
 
     print(f"Fetching citing works from: {cited_by_url} (max: {max_citations})")
@@ -114,20 +163,8 @@ def fetch_citing_work_ids(
             for work in results:
                 if len(citing_work_ids) >= max_citations:
                     break
-                    
                 # Extract work details, not just ID
-                work_details = {
-                    'openalex_id': work.get("id"),
-                    'title': work.get("display_name"),
-                    'authors': [a.get('author', {}).get('display_name') for a in work.get('authorships', [])],
-                    'year': work.get("publication_year"),
-                    'doi': work.get("doi"),
-                    'type': work.get("type")
-                }
-                if include_links:
-                    work_details['referenced_works'] = work.get("referenced_works") or []
-                    work_details['cited_by_api_url'] = work.get("cited_by_api_url")
-                citing_work_ids.append(work_details)
+                citing_work_ids.append(_related_work_details(work, include_links))
 
             # Check for next page
             meta = data.get("meta", {})
@@ -168,30 +205,12 @@ def fetch_referenced_work_details(
     if not referenced_work_ids:
         return []
 
-    # Process in batches of 50 (OpenAlex limit for pipe queries)
-    batch_size = 50
-    batches = []
-    
-    for i in range(0, len(referenced_work_ids), batch_size):
-        batch = referenced_work_ids[i:i+batch_size]
-        work_ids = []
-        for work_id in batch:
-            if isinstance(work_id, str):
-                work_ids.append(work_id)
-            elif isinstance(work_id, dict) and work_id.get('id'):
-                work_ids.append(work_id['id'])
-        if work_ids:
-            batches.append(work_ids)
-
+    batches = _referenced_work_batches(referenced_work_ids)
     if not batches:
         return []
 
     def _fetch_batch(work_ids):
-        ids_query = "|".join(work_ids)
-        select_fields = "id,title,display_name,authorships,publication_year,doi,type"
-        if include_links:
-            select_fields += ",referenced_works,cited_by_api_url"
-        url = f"https://api.openalex.org/works?filter=openalex_id:{ids_query}&select={select_fields}&per-page=50&mailto={mailto}"
+        url = _referenced_batch_url(work_ids, mailto, include_links)
         
         try:
             http = session or requests
@@ -204,22 +223,7 @@ def fetch_referenced_work_details(
                 rate_limiter=rate_limiter,
                 retries=3,
             )
-            
-            batch_results = []
-            for work in data.get("results", []):
-                work_details = {
-                    'openalex_id': work.get("id"),
-                    'title': work.get("display_name"),
-                    'authors': [a.get('author', {}).get('display_name') for a in work.get('authorships', [])],
-                    'year': work.get("publication_year"),
-                    'doi': work.get("doi"),
-                    'type': work.get("type"),
-                }
-                if include_links:
-                    work_details['referenced_works'] = work.get("referenced_works") or []
-                    work_details['cited_by_api_url'] = work.get("cited_by_api_url")
-                batch_results.append(work_details)
-            return batch_results
+            return [_related_work_details(work, include_links) for work in data.get("results", [])]
             
         except OpenAlexRateLimitExceeded as e:
             print(f"OpenAlex quota exhausted while fetching referenced work details: {str(e)}")
@@ -562,33 +566,44 @@ class OpenAlexCrossrefSearcher:
             'semantic_scholar_json': item,
         }
 
-    def search_semantic_scholar_match(self, title):
+    def _semantic_scholar_match_request(self, title):
+        """``(url, params)`` for a Semantic Scholar title match, or a finished result dict."""
         if not title:
             return {"step": "s2_match", "results": [], "success": False, "error": "Title required for Semantic Scholar match"}
         params = {
             'query': title,
             'fields': 'title,year,authors,externalIds,venue,url,publicationTypes,openAccessPdf,paperId',
         }
+        print("\nStep s2_match: Semantic Scholar title match")
+        print(f"Query: {title}")
+        return f'{self.semantic_scholar_base_url}/paper/search/match', params
+
+    def _semantic_scholar_match_result(self, data):
+        if isinstance(data, dict) and isinstance(data.get('data'), list):
+            raw_item = data['data'][0] if data['data'] else None
+        else:
+            raw_item = data
+        result = self._semantic_scholar_to_openalex_like(raw_item)
+        return {"step": "s2_match", "results": [result] if result else [], "success": True}
+
+    def search_semantic_scholar_match(self, title):
+        request = self._semantic_scholar_match_request(title)
+        if isinstance(request, dict):
+            return request
+        url, params = request
         try:
-            print("\nStep s2_match: Semantic Scholar title match")
-            print(f"Query: {title}")
             self.rate_limiter.wait_if_needed('semantic_scholar')
-            response = self.semantic_scholar_session.get(
-                f'{self.semantic_scholar_base_url}/paper/search/match',
-                params=params,
-                headers=self.semantic_scholar_headers,
-                timeout=self.semantic_scholar_timeout,
-            )
+            with get_concurrency_limits().get('semantic_scholar').track() as probe:
+                response = probe.response = self.semantic_scholar_session.get(
+                    url,
+                    params=params,
+                    headers=self.semantic_scholar_headers,
+                    timeout=self.semantic_scholar_timeout,
+                )
             if response.status_code == 404:
                 return {"step": "s2_match", "results": [], "success": True}
             response.raise_for_status()
-            data = response.json()
-            if isinstance(data, dict) and isinstance(data.get('data'), list):
-                raw_item = data['data'][0] if data['data'] else None
-            else:
-                raw_item = data
-            result = self._semantic_scholar_to_openalex_like(raw_item)
-            return {"step": "s2_match", "results": [result] if result else [], "success": True}
+            return self._semantic_scholar_match_result(response.json())
         except requests.exceptions.RequestException as e:
             return {"step": "s2_match", "results": [], "success": False, "error": str(e)}
         except Exception as e:
@@ -643,15 +658,12 @@ class OpenAlexCrossrefSearcher:
             print(f"Crossref error: {e}")
             return []
 
-    def search(self, title, year, container_title, abstract, keywords, step, rate_limiter=None, doi=None):
-        """
-        Search OpenAlex and Crossref with different strategies based on step number.
-        Step 0: DOI-first search (if DOI available)
-        Steps 1-7: use OpenAlex filter queries
-        Step 8: use Crossref search
-        Step 9: use OpenAlex search parameter for container_title
+    def _step_request(self, title, year, container_title, step, doi=None):
+        """What ``search`` fetches for ``step``.
+
+        Returns ``("openalex", url, params)`` or ``("crossref", url, None)``, or a
+        finished result dict when the step cannot run for this reference.
         """
-        rate_limiter = rate_limiter or self.rate_limiter
         # Step 0: DOI-first search - highest priority
         if step == 0:
             doi = normalize_doi(doi)
@@ -665,32 +677,9 @@ class OpenAlexCrossrefSearcher:
                 'per-page': 1
             }
             params = self._with_openalex_auth(params)
-            
-            try:
-                print(f"\nStep {step}: DOI Direct Search")
-                print(f"DOI: {doi}")
-                data = openalex_request_json(
-                    url=self.base_url,
-                    params=params,
-                    headers=self.headers,
-                    timeout=self.openalex_timeout,
-                    session=self.openalex_session,
-                    rate_limiter=rate_limiter,
-                    retries=3,
-                )
-                
-                results = data.get('results', [])
-                if results:
-                    print(f"DOI match found: {results[0].get('display_name', 'N/A')}")
-                    return {"step": step, "results": results, "success": True, "meta": data.get('meta')}
-                else:
-                    print(f"No DOI match found in OpenAlex")
-                    return {"step": step, "results": [], "success": True} # Success but no results
-                    
-            except requests.exceptions.RequestException as e:
-                return {"step": step, "results": [], "success": False, "error": str(e)}
-            except Exception as e:
-                return {"step": step, "results": [], "success": False, "error": f"Unexpected DOI search error: {str(e)}"}
+            print(f"\nStep {step}: DOI Direct Search")
+            print(f"DOI: {doi}")
+            return "openalex", self.base_url, params
         
         if not title and not container_title:
             return {"step": step, "results": [], "success": False}
@@ -726,68 +715,23 @@ class OpenAlexCrossrefSearcher:
         
         # Step 8: Crossref search
         elif step == 8:
-            try:
-                print(f"\nStep {step}: Crossref Search")
-                query = []
-                if title:
-                    query.append(f'title:{quote_plus(title)}')
-                if container:
-                    query.append(f'container-title:{quote_plus(container)}')
-                if year:
-                    query.append(f'published:{year}')
-                    
-                if not query:
-                    return {"step": step, "results": [], "success": False}
-                    
-                query_string = '+'.join(query)
-                url = f'https://api.crossref.org/works?query={query_string}&rows=10'
-                
-                print(f"Crossref Query: {url}")
+            print(f"\nStep {step}: Crossref Search")
+            query = []
+            if title:
+                query.append(f'title:{quote_plus(title)}')
+            if container:
+                query.append(f'container-title:{quote_plus(container)}')
+            if year:
+                query.append(f'published:{year}')
                 
-                rate_limiter.wait_if_needed('crossref')
-                response = self.crossref_session.get(url, headers=self.crossref_headers, timeout=self.crossref_timeout)
-                response.raise_for_status()
-                data = response.json()
+            if not query:
+                return {"step": step, "results": [], "success": False}
                 
-                if data['message']['items']:
-                    # Convert Crossref results to OpenAlex-like format
-                    results = []
-                    for item in data['message']['items']:
-                        # Get publication year from the most specific date available
-                        pub_year = None
-                        for date_field in ['published-print', 'published-online', 'published']:
-                            if date_parts := item.get(date_field, {}).get('date-parts', [[None]])[0]:
-                                pub_year = date_parts[0]
-                                if pub_year:
-                                    break
-
-                        result = {
-                            'id': f"crossref:{item.get('DOI', '')}",
-                            'doi': item.get('DOI'),
-                            'display_name': item.get('title', [''])[0],
-                            'publication_year': pub_year,
-                            'type': item.get('type'),
-                            'authorships': [
-                                {
-                                    'author': {
-                                        'display_name': f"{author.get('given', '')} {author.get('family', '')}"
-                                    }
-                                }
-                                for author in item.get('author', [])
-                            ],
-                            'referenced_works': [], # Crossref doesn't provide this directly
-                            'abstract_inverted_index': None, # Crossref doesn't provide this
-                            'keywords': [], # Crossref doesn't provide this
-                            'cited_by_api_url': item.get('is-referenced-by-count', 0) > 0 and f"https://api.crossref.org/works/{item.get('DOI')}/references" or None
-                        }
-                        results.append(result)
-                    return {"step": step, "results": results, "success": True}
-                else:
-                    return {"step": step, "results": [], "success": True} # Success but no results
-            except requests.exceptions.RequestException as e:
-                return {"step": step, "results": [], "success": False, "error": str(e)}
-            except Exception as e:
-                return {"step": step, "results": [], "success": False, "error": f"Unexpected Crossref error: {str(e)}"}
+            query_string = '+'.join(query)
+            url = f'https://api.crossref.org/works?query={query_string}&rows=10'
+            
+            print(f"Crossref Query: {url}")
+            return "crossref", url, None
 
         # Step 9: use search parameter for container_title
         elif step == 9:
@@ -804,20 +748,103 @@ class OpenAlexCrossrefSearcher:
             return {"step": step, "results": [], "success": False, "error": "Invalid step"}
 
         # Common OpenAlex request logic for steps 1-7 and 9
-        if step != 8:
-            if step in [1,2,3,4,5,6]: # Filter based queries
-                 params = {
-                    'filter': query + (f",publication_year:{year}" if year and step in [1,2,3] else ""),
-                    'select': self.fields,
-                    'per-page': 10
+        if step in [1,2,3,4,5,6]: # Filter based queries
+            params = {
+                'filter': query + (f",publication_year:{year}" if year and step in [1,2,3] else ""),
+                'select': self.fields,
+                'per-page': 10
+            }
+            params = self._with_openalex_auth(params)
+
+        print(f"\nStep {step}: OpenAlex Query")
+        print(f"Params: {params}")
+        return "openalex", self.base_url, params
+
+    def _step_result(self, step, service, data):
+        """Turn the JSON fetched for ``step`` into a ``search`` result dict."""
+        if step == 0:
+            results = data.get('results', [])
+            if results:
+                print(f"DOI match found: {results[0].get('display_name', 'N/A')}")
+                return {"step": step, "results": results, "success": True, "meta": data.get('meta')}
+            print(f"No DOI match found in OpenAlex")
+            return {"step": step, "results": [], "success": True} # Success but no results
+
+        if service == "crossref":
+            if not data['message']['items']:
+                return {"step": step, "results": [], "success": True} # Success but no results
+            # Convert Crossref results to OpenAlex-like format
+            results = []
+            for item in data['message']['items']:
+                # Get publication year from the most specific date available
+                pub_year = None
+                for date_field in ['published-print', 'published-online', 'published']:
+                    if date_parts := item.get(date_field, {}).get('date-parts', [[None]])[0]:
+                        pub_year = date_parts[0]
+                        if pub_year:
+                            break
+
+                result = {
+                    'id': f"crossref:{item.get('DOI', '')}",
+                    'doi': item.get('DOI'),
+                    'display_name': item.get('title', [''])[0],
+                    'publication_year': pub_year,
+                    'type': item.get('type'),
+                    'authorships': [
+                        {
+                            'author': {
+                                'display_name': f"{author.get('given', '')} {author.get('family', '')}"
+                            }
+                        }
+                        for author in item.get('author', [])
+                    ],
+                    'referenced_works': [], # Crossref doesn't provide this directly
+                    'abstract_inverted_index': None, # Crossref doesn't provide this
+                    'keywords': [], # Crossref doesn't provide this
+                    'cited_by_api_url': item.get('is-referenced-by-count', 0) > 0 and f"https://api.crossref.org/works/{item.get('DOI')}/references" or None
                 }
-                 params = self._with_openalex_auth(params)
+                results.append(result)
+            return {"step": step, "results": results, "success": True}
 
-            try:
-                print(f"\nStep {step}: OpenAlex Query")
-                print(f"Params: {params}")
+        return {"step": step, "results": data.get('results', []), "success": True, "meta": data.get('meta')}
+
+    @staticmethod
+    def _step_error(step, error, *, unexpected=False):
+        if not unexpected:
+            return {"step": step, "results": [], "success": False, "error": str(error)}
+        if step == 0:
+            label = "DOI search"
+        elif step == 8:
+            label = "Crossref"
+        else:
+            label = "OpenAlex"
+        return {"step": step, "results": [], "success": False, "error": f"Unexpected {label} error: {str(error)}"}
+
+    def search(self, title, year, container_title, abstract, keywords, step, rate_limiter=None, doi=None):
+        """
+        Search OpenAlex and Crossref with different strategies based on step number.
+        Step 0: DOI-first search (if DOI available)
+        Steps 1-7: use OpenAlex filter queries
+        Step 8: use Crossref search
+        Step 9: use OpenAlex search parameter for container_title
+        """
+        rate_limiter = rate_limiter or self.rate_limiter
+        request = self._step_request(title, year, container_title, step, doi=doi)
+        if isinstance(request, dict):
+            return request
+        service, url, params = request
+        try:
+            if service == "crossref":
+                rate_limiter.wait_if_needed('crossref')
+                with get_concurrency_limits().get('crossref').track() as probe:
+                    response = probe.response = self.crossref_session.get(
+                        url, headers=self.crossref_headers, timeout=self.crossref_timeout
+                    )
+                response.raise_for_status()
+                data = response.json()
+            else:
                 data = openalex_request_json(
-                    url=self.base_url,
+                    url=url,
                     params=params,
                     headers=self.headers,
                     timeout=self.openalex_timeout,
@@ -825,11 +852,11 @@ class OpenAlexCrossrefSearcher:
                     rate_limiter=rate_limiter,
                     retries=3,
                 )
-                return {"step": step, "results": data.get('results', []), "success": True, "meta": data.get('meta')}
-            except requests.exceptions.RequestException as e:
-                return {"step": step, "results": [], "success": False, "error": str(e)}
-            except Exception as e:
-                return {"step": step, "results": [], "success": False, "error": f"Unexpected OpenAlex error: {str(e)}"}
+            return self._step_result(step, service, data)
+        except requests.exceptions.RequestException as e:
+            return self._step_error(step, e)
+        except Exception as e:
+            return self._step_error(step, e, unexpected=True)
 
 def normalize_doi(raw_doi: str | None) -> str | None:
     """Normalize DOI strings to a bare, lowercase form."""
@@ -972,10 +999,9 @@ def _build_enrichment_payload(ref, best_result):
     }
 
 
-def process_single_reference(
+def reference_lookup_flow(
     ref,
     searcher,
-    rate_limiter,
     fetch_references=True,
     fetch_citations=False,
     max_citations=100,
@@ -984,7 +1010,12 @@ def process_single_reference(
     max_related_per_reference: int = 40,
     return_diagnostics: bool = False,
 ):
-    """Process a single reference to find its OpenAlex entry and potentially citing works."""
+    """Match one reference, yielding each lookup it needs instead of performing it.
+
+    Yields ``(operation, kwargs)`` pairs (see ``run_lookup_operation``) and is
+    sent back each result, so the blocking and the asyncio drivers share one
+    decision flow.
+    """
     diagnostics = {
         "had_api_error": False,
         "api_errors": [],
@@ -1099,7 +1130,7 @@ def process_single_reference(
     if normalized_doi:
         print(f"\nProcessing reference with DOI: {normalized_doi}")
         diagnostics["attempted_steps"].append(0)
-        results = searcher.search(title, year, container_title, abstract, keywords, 0, rate_limiter=rate_limiter, doi=normalized_doi)
+        results = yield _search_operation(title, year, container_title, abstract, keywords, 0, doi=normalized_doi)
         if not results.get("success") and str(results.get("error") or "") not in non_api_errors:
             _record_api_error(0, results)
         
@@ -1111,11 +1142,9 @@ def process_single_reference(
             final_enrichment = _build_enrichment_payload(ref, best_result)
             
             # Fetch related works if requested
-            final_enrichment = _fetch_related_works(
+            final_enrichment = yield from _related_works_flow(
                 final_enrichment,
                 best_result,
-                searcher,
-                rate_limiter,
                 fetch_references,
                 fetch_citations,
                 max_citations,
@@ -1143,7 +1172,7 @@ def process_single_reference(
     ref_year = ref.get('year')
 
     diagnostics["attempted_steps"].append("s2_match")
-    s2_results = searcher.search_semantic_scholar_match(title)
+    s2_results = yield ("s2_match", {"title": title})
     if not s2_results.get("success") and str(s2_results.get("error") or "") not in non_api_errors:
         _record_api_error("s2_match", s2_results)
     if s2_results.get('success') and s2_results.get('results'):
@@ -1157,11 +1186,9 @@ def process_single_reference(
         best_s2_result = _select_best_result(s2_unique_results, ref, ref_authors, ref_editors, ref_year)
         if best_s2_result is not None:
             final_enrichment = _build_enrichment_payload(ref, best_s2_result)
-            final_enrichment = _fetch_related_works(
+            final_enrichment = yield from _related_works_flow(
                 final_enrichment,
                 best_s2_result,
-                searcher,
-                rate_limiter,
                 fetch_references,
                 fetch_citations,
                 max_citations,
@@ -1182,9 +1209,9 @@ def process_single_reference(
     for step in regular_steps:
         diagnostics["attempted_steps"].append(step)
         if step == "s2_match":
-            results = searcher.search_semantic_scholar_match(title)
+            results = yield ("s2_match", {"title": title})
         else:
-            results = searcher.search(title, year, container_title, abstract, keywords, step, rate_limiter=rate_limiter)
+            results = yield _search_operation(title, year, container_title, abstract, keywords, step)
         if not results.get("success") and str(results.get("error") or "") not in non_api_errors:
             _record_api_error(step, results)
         
@@ -1209,7 +1236,7 @@ def process_single_reference(
         }
         for crossref_doi in sorted({d for d in crossref_dois if d}):
             diagnostics["attempted_steps"].append("crossref_doi_resolve")
-            doi_lookup = searcher.search(None, None, None, None, None, 0, rate_limiter=rate_limiter, doi=crossref_doi)
+            doi_lookup = yield _search_operation(None, None, None, None, None, 0, doi=crossref_doi)
             if not doi_lookup.get("success") and str(doi_lookup.get("error") or "") not in non_api_errors:
                 _record_api_error("crossref_doi_resolve", doi_lookup)
             if doi_lookup.get('success') and doi_lookup.get('results'):
@@ -1229,11 +1256,9 @@ def process_single_reference(
             final_enrichment = _build_enrichment_payload(ref, best_result)
             
             # Fetch related works if requested
-            final_enrichment = _fetch_related_works(
+            final_enrichment = yield from _related_works_flow(
                 final_enrichment,
                 best_result,
-                searcher,
-                rate_limiter,
                 fetch_references,
                 fetch_citations,
                 max_citations,
@@ -1252,6 +1277,89 @@ def process_single_reference(
         return None, diagnostics
     return None
 
+def _search_operation(title, year, container_title, abstract, keywords, step, doi=None):
+    return (
+        "search",
+        {
+            "title": title,
+            "year": year,
+            "container_title": container_title,
+            "abstract": abstract,
+            "keywords": keywords,
+            "step": step,
+            "doi": doi,
+        },
+    )
+
+
+def run_lookup_operation(operation, searcher, rate_limiter):
+    """Perform one operation yielded by a lookup flow with blocking requests."""
+    kind, kwargs = operation
+    if kind == "search":
+        return searcher.search(**kwargs, rate_limiter=rate_limiter)
+    if kind == "s2_match":
+        return searcher.search_semantic_scholar_match(kwargs["title"])
+    mailto = searcher.headers.get('User-Agent', 'spott@wzb.eu').split('/')[-1]
+    if kind == "referenced_details":
+        return fetch_referenced_work_details(
+            kwargs["referenced_work_ids"],
+            rate_limiter,
+            mailto,
+            include_links=kwargs["include_links"],
+            session=searcher.openalex_session,
+            timeout=searcher.openalex_timeout,
+            api_key=searcher.api_key,
+        )
+    if kind == "citing_ids":
+        return fetch_citing_work_ids(
+            kwargs["cited_by_url"],
+            rate_limiter,
+            mailto,
+            kwargs["max_citations"],
+            include_links=kwargs["include_links"],
+            session=searcher.openalex_session,
+            timeout=searcher.openalex_timeout,
+            api_key=searcher.api_key,
+        )
+    raise ValueError(f"Unknown lookup operation: {kind}")
+
+
+def run_lookup_flow(flow, searcher, rate_limiter):
+    """Drive a lookup flow to completion, one blocking request at a time."""
+    try:
+        operation = next(flow)
+        while True:
+            operation = flow.send(run_lookup_operation(operation, searcher, rate_limiter))
+    except StopIteration as done:
+        return done.value
+
+
+def process_single_reference(
+    ref,
+    searcher,
+    rate_limiter,
+    fetch_references=True,
+    fetch_citations=False,
+    max_citations=100,
+    related_depth: int = 1,
+    related_depth_upstream: int = 1,
+    max_related_per_reference: int = 40,
+    return_diagnostics: bool = False,
+):
+    """Process a single reference to find its OpenAlex entry and potentially citing works."""
+    flow = reference_lookup_flow(
+        ref,
+        searcher,
+        fetch_references=fetch_references,
+        fetch_citations=fetch_citations,
+        max_citations=max_citations,
+        related_depth=related_depth,
+        related_depth_upstream=related_depth_upstream,
+        max_related_per_reference=max_related_per_reference,
+        return_diagnostics=return_diagnostics,
+    )
+    return run_lookup_flow(flow, searcher, rate_limiter)
+
 def _normalize_openalex_id(value: str | None) -> str | None:
     if not value:
         return None
@@ -1260,11 +1368,9 @@ def _normalize_openalex_id(value: str | None) -> str | None:
     return value
 
 
-def _fetch_related_works(
+def _related_works_flow(
     enrichment_data,
     openalex_result,
-    searcher,
-    rate_limiter,
     fetch_references=True,
     fetch_citations=False,
     max_citations=100,
@@ -1272,7 +1378,7 @@ def _fetch_related_works(
     related_depth: int = 1,
     max_related_per_reference: int = 40,
 ):
-    """Helper function to fetch referenced works and citing works for an enriched entry."""
+    """Lookup flow that fetches referenced works and citing works for an enriched entry."""
     
     # Keep raw parent graph pointers even when related expansion is disabled.
     enrichment_data['referenced_work_ids'] = list(openalex_result.get('referenced_works') or [])
@@ -1285,14 +1391,9 @@ def _fetch_related_works(
     # Fetch referenced works if requested
     if fetch_references and openalex_result.get('referenced_works'):
         print(f"Fetching details for {len(openalex_result['referenced_works'])} referenced works...")
-        enrichment_data['referenced_works'] = fetch_referenced_work_details(
-            openalex_result['referenced_works'], 
-            rate_limiter,
-            searcher.headers.get('User-Agent', 'spott@wzb.eu').split('/')[-1],
-            include_links=related_depth > 1,
-            session=searcher.openalex_session,
-            timeout=searcher.openalex_timeout,
-            api_key=searcher.api_key,
+        enrichment_data['referenced_works'] = yield (
+            "referenced_details",
+            {"referenced_work_ids": openalex_result['referenced_works'], "include_links": related_depth > 1},
         )
 
         if related_depth > 1 and enrichment_data['referenced_works']:
@@ -1318,14 +1419,9 @@ def _fetch_related_works(
                 secondary_ids.update(cleaned_ids)
 
             if secondary_ids:
-                secondary_details = fetch_referenced_work_details(
-                    list(secondary_ids),
-                    rate_limiter,
-                    searcher.headers.get('User-Agent', 'spott@wzb.eu').split('/')[-1],
-                    include_links=False,
-                    session=searcher.openalex_session,
-                    timeout=searcher.openalex_timeout,
-                    api_key=searcher.api_key,
+                secondary_details = yield (
+                    "referenced_details",
+                    {"referenced_work_ids": list(secondary_ids), "include_links": False},
                 )
                 detail_map = {
                     _normalize_openalex_id(item.get('openalex_id')): item for item in secondary_details
@@ -1343,15 +1439,13 @@ def _fetch_related_works(
     # Fetch citing works if requested
     if fetch_citations and openalex_result.get('cited_by_api_url'):
         print(f"Fetching citing works (max: {max_citations})...")
-        enrichment_data['citing_works'] = fetch_citing_work_ids(
-            openalex_result['cited_by_api_url'],
-            rate_limiter,
-            searcher.headers.get('User-Agent', 'spott@wzb.eu').split('/')[-1],
-            max_citations,
-            include_links=related_depth_upstream > 1,
-            session=searcher.openalex_session,
-            timeout=searcher.openalex_timeout,
-            api_key=searcher.api_key,
+        enrichment_data['citing_works'] = yield (
+            "citing_ids",
+            {
+                "cited_by_url": openalex_result['cited_by_api_url'],
+                "max_citations": max_citations,
+                "include_links": related_depth_upstream > 1,
+            },
         )
         if related_depth_upstream > 1 and enrichment_data['citing_works']:
             print(f"Fetching second-level citing works (depth: {related_depth_upstream})...")
@@ -1359,19 +1453,42 @@ def _fetch_related_works(
                 cited_by_url = citing_work.get('cited_by_api_url')
                 if not cited_by_url:
                     continue
-                citing_work['citing_works_expanded'] = fetch_citing_work_ids(
-                    cited_by_url,
-                    rate_limiter,
-                    searcher.headers.get('User-Agent', 'spott@wzb.eu').split('/')[-1],
-                    min(max_related_per_reference, max_citations),
-                    include_links=False,
-                    session=searcher.openalex_session,
-                    timeout=searcher.openalex_timeout,
-                    api_key=searcher.api_key,
+                citing_work['citing_works_expanded'] = yield (
+                    "citing_ids",
+                    {
+                        "cited_by_url": cited_by_url,
+                        "max_citations": min(max_related_per_reference, max_citations),
+                        "include_links": False,
+                    },
                 )
     
     return enrichment_data
 
+def _fetch_related_works(
+    enrichment_data,
+    openalex_result,
+    searcher,
+    rate_limiter,
+    fetch_references=True,
+    fetch_citations=False,
+    max_citations=100,
+    related_depth_upstream: int = 1,
+    related_depth: int = 1,
+    max_related_per_reference: int = 40,
+):
+    """Helper function to fetch referenced works and citing works for an enriched entry."""
+    flow = _related_works_flow(
+        enrichment_data,
+        openalex_result,
+        fetch_references,
+        fetch_citations,
+        max_citations,
+        related_depth_upstream=related_depth_upstream,
+        related_depth=related_depth,
+        max_related_per_reference=max_related_per_reference,
+    )
+    return run_lookup_flow(flow, searcher, rate_limiter)
+
 def process_bibliography_files(bib_dir, output_dir, searcher, fetch_citations=True):
     """Process all JSON bibliography files in a directory using ThreadPoolExecutor."""
     Path(output_dir).mkdir(parents=True, exist_ok=True)
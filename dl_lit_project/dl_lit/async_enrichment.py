@@ -0,0 +1,324 @@
+import asyncio
+
+try:
+    import httpx
+except ImportError:
+    raise ImportError("Module 'httpx' not found. Install with 'pip install httpx'")
+
+from .OpenAlexScraper import (
+    _citing_works_url,
+    _referenced_batch_url,
+    _referenced_work_batches,
+    _related_work_details,
+    reference_lookup_flow,
+)
+from .utils import (
+    OpenAlexRateLimitExceeded,
+    _env_float,
+    _env_int,
+    _parse_header_seconds,
+    check_openalex_billable_block,
+    get_concurrency_limits,
+    get_global_rate_limiter,
+    openalex_retry_delay,
+    prepare_openalex_request,
+)
+
+
+# References in flight at once. The rate limiter, not this, is meant to be the bound.
+DEFAULT_MAX_IN_FLIGHT = 256
+
+# Statuses the blocking Crossref / Semantic Scholar sessions retry (see _build_retry_session).
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+async def wait_for_rate_limit(rate_limiter, service_name, units=1) -> None:
+    """Async ``wait_if_needed``: sleeps on the event loop instead of blocking the thread."""
+    if rate_limiter is None:
+        return
+    while True:
+        wait_seconds = rate_limiter.reserve(service_name, units)
+        if wait_seconds <= 0:
+            return
+        await asyncio.sleep(wait_seconds)
+
+
+async def openalex_request_json_async(
+    client: httpx.AsyncClient,
+    *,
+    endpoint: str | None = None,
+    url: str | None = None,
+    params: dict | None = None,
+    headers: dict | None = None,
+    timeout: float = 30,
+    rate_limiter=None,
+    retries: int = 3,
+    mailto: str | None = None,
+    concurrency_limit=None,
+):
+    """``openalex_request_json`` on an ``httpx.AsyncClient``; same quota and retry rules."""
+    request_url, request_params, request_headers, billable_request = prepare_openalex_request(
+        endpoint=endpoint, url=url, params=params, headers=headers, mailto=mailto
+    )
+    # httpx replaces a URL's query string with ``params``; requests merges them.
+    request_url = httpx.URL(request_url).copy_merge_params(request_params)
+    rate_limiter = rate_limiter or get_global_rate_limiter()
+    concurrency_limit = concurrency_limit or get_concurrency_limits().get('openalex')
+    wait_cap_seconds = _env_float('RAG_FEEDER_OPENALEX_MAX_WAIT_SEC', 15.0)
+
+    check_openalex_billable_block(rate_limiter, billable_request, wait_cap_seconds)
+
+    last_error = None
+    for attempt in range(retries):
+        try:
+            if rate_limiter:
+                check_openalex_billable_block(rate_limiter, billable_request, wait_cap_seconds)
+                await wait_for_rate_limit(rate_limiter, 'openalex')
+
+            async with concurrency_limit.track_async() as probe:
+                response = probe.response = await client.get(request_url, headers=request_headers, timeout=timeout)
+            delay = openalex_retry_delay(
+                response,
+                rate_limiter,
+                attempt=attempt,
+                retries=retries,
+                billable_request=billable_request,
+                wait_cap_seconds=wait_cap_seconds,
+            )
+            if delay is None:
+                return response.json()
+            await asyncio.sleep(delay)
+        except OpenAlexRateLimitExceeded:
+            raise
+        except httpx.HTTPError as exc:
+            last_error = exc
+            if attempt == retries - 1:
+                raise
+            await asyncio.sleep(2 ** attempt)
+
+    if last_error is not None:
+        raise last_error
+    raise RuntimeError('OpenAlex request failed after retries')
+
+
+class AsyncEnrichmentEngine:
+    """Runs ``process_single_reference`` for many references on one event loop.
+
+    Each reference walks the same ``reference_lookup_flow`` as the blocking
+    API. Its lookups go out on one pooled ``httpx.AsyncClient``, so hundreds
+    of references can wait on the network at once without a thread each.
+    Every request still passes through ``rate_limiter``; with the shared
+    limiter that is the cross-process budget. It then holds a slot of its
+    service's ``AdaptiveConcurrencyLimit`` from ``concurrency`` (the
+    process-wide ``get_concurrency_limits()`` by default), which widens
+    while the upstream keeps up and halves on 429s and timeouts.
+    ``max_in_flight`` (``RAG_FEEDER_ENRICH_MAX_IN_FLIGHT``) only caps
+    memory and open sockets.
+
+    Use as ``async with AsyncEnrichmentEngine(searcher) as engine``. The
+    client is closed on exit unless one was passed in.
+    """
+
+    def __init__(self, searcher, rate_limiter=None, *, max_in_flight: int | None = None, client=None, concurrency=None):
+        self.searcher = searcher
+        self.rate_limiter = rate_limiter or searcher.rate_limiter
+        self.concurrency = concurrency or get_concurrency_limits()
+        if max_in_flight is None:
+            max_in_flight = _env_int("RAG_FEEDER_ENRICH_MAX_IN_FLIGHT", DEFAULT_MAX_IN_FLIGHT)
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.mailto = searcher.headers.get('User-Agent', 'spott@wzb.eu').split('/')[-1]
+        self.client = client
+        self._owns_client = client is None
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+
+    async def __aenter__(self):
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_in_flight,
+                    max_keepalive_connections=min(self.max_in_flight, 64),
+                ),
+                follow_redirects=True,
+            )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        if self._owns_client and self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    async def process_reference(self, ref, **options):
+        """Async ``process_single_reference``; takes the same keyword options and returns the same value."""
+        async with self._slots:
+            return await self.run_flow(reference_lookup_flow(ref, self.searcher, **options))
+
+    async def process_references(self, refs, **options) -> list:
+        """``process_reference`` for every ref concurrently; results are in input order."""
+        return await asyncio.gather(*(self.process_reference(ref, **options) for ref in refs))
+
+    async def run_flow(self, flow):
+        try:
+            operation = next(flow)
+            while True:
+                operation = flow.send(await self.run_operation(operation))
+        except StopIteration as done:
+            return done.value
+
+    async def run_operation(self, operation):
+        """Async counterpart of ``OpenAlexScraper.run_lookup_operation``."""
+        kind, kwargs = operation
+        if kind == "search":
+            return await self.search(**kwargs)
+        if kind == "s2_match":
+            return await self.semantic_scholar_match(kwargs["title"])
+        if kind == "referenced_details":
+            return await self.referenced_work_details(kwargs["referenced_work_ids"], kwargs["include_links"])
+        if kind == "citing_ids":
+            return await self.citing_works(kwargs["cited_by_url"], kwargs["max_citations"], kwargs["include_links"])
+        raise ValueError(f"Unknown lookup operation: {kind}")
+
+    async def _get(self, service, url, *, params=None, headers=None, timeout=20, retries=5, backoff_factor=0.5):
+        """Rate-limited GET that retries throttling and 5xx like the blocking retry sessions."""
+        for attempt in range(retries + 1):
+            await wait_for_rate_limit(self.rate_limiter, service)
+            try:
+                async with self.concurrency.get(service).track_async() as probe:
+                    response = probe.response = await self.client.get(url, params=params, headers=headers, timeout=timeout)
+            except httpx.TransportError:
+                if attempt == retries:
+                    raise
+                await asyncio.sleep(backoff_factor * (2 ** attempt))
+                continue
+            if response.status_code not in _RETRY_STATUSES or attempt == retries:
+                return response
+            retry_after = _parse_header_seconds(response.headers.get('Retry-After'))
+            await asyncio.sleep(retry_after if retry_after is not None else backoff_factor * (2 ** attempt))
+        return response
+
+    async def _openalex_json(self, url, params=None, headers=None):
+        return await openalex_request_json_async(
+            self.client,
+            url=url,
+            params=params,
+            headers=headers,
+            timeout=self.searcher.openalex_timeout,
+            rate_limiter=self.rate_limiter,
+            retries=3,
+            concurrency_limit=self.concurrency.get('openalex'),
+        )
+
+    async def search(self, title, year, container_title, abstract, keywords, step, doi=None):
+        """Async ``OpenAlexCrossrefSearcher.search``."""
+        searcher = self.searcher
+        request = searcher._step_request(title, year, container_title, step, doi=doi)
+        if isinstance(request, dict):
+            return request
+        service, url, params = request
+        try:
+            if service == "crossref":
+                response = await self._get(
+                    'crossref', url, headers=searcher.crossref_headers, timeout=searcher.crossref_timeout
+                )
+                response.raise_for_status()
+                data = response.json()
+            else:
+                data = await self._openalex_json(url, params, searcher.headers)
+            return searcher._step_result(step, service, data)
+        except httpx.HTTPError as e:
+            return searcher._step_error(step, e)
+        except Exception as e:
+            return searcher._step_error(step, e, unexpected=True)
+
+    async def semantic_scholar_match(self, title):
+        """Async ``OpenAlexCrossrefSearcher.search_semantic_scholar_match``."""
+        searcher = self.searcher
+        request = searcher._semantic_scholar_match_request(title)
+        if isinstance(request, dict):
+            return request
+        url, params = request
+        try:
+            response = await self._get(
+                'semantic_scholar',
+                url,
+                params=params,
+                headers=searcher.semantic_scholar_headers,
+                timeout=searcher.semantic_scholar_timeout,
+            )
+            if response.status_code == 404:
+                return {"step": "s2_match", "results": [], "success": True}
+            response.raise_for_status()
+            return searcher._semantic_scholar_match_result(response.json())
+        except httpx.HTTPError as e:
+            return {"step": "s2_match", "results": [], "success": False, "error": str(e)}
+        except Exception as e:
+            return {"step": "s2_match", "results": [], "success": False, "error": f"Unexpected Semantic Scholar error: {str(e)}"}
+
+    async def _referenced_batch(self, work_ids, include_links):
+        api_key = self.searcher.api_key
+        try:
+            data = await self._openalex_json(
+                _referenced_batch_url(work_ids, self.mailto, include_links),
+                {'api_key': api_key} if api_key else None,
+                {"Accept": "application/json"},
+            )
+            return [_related_work_details(work, include_links) for work in data.get("results", [])]
+        except OpenAlexRateLimitExceeded as e:
+            print(f"OpenAlex quota exhausted while fetching referenced work details: {str(e)}")
+        except httpx.HTTPError as e:
+            print(f"Error fetching referenced work details: {str(e)}")
+        except Exception as e:
+            print(f"Unexpected error fetching referenced work details: {str(e)}")
+        return []
+
+    async def referenced_work_details(self, referenced_work_ids, include_links=False):
+        """Async ``fetch_referenced_work_details``; all batches are requested at once."""
+        batches = _referenced_work_batches(referenced_work_ids or [])
+        if not batches:
+            return []
+        fetched = await asyncio.gather(*(self._referenced_batch(batch, include_links) for batch in batches))
+        referenced_works = [work for batch in fetched for work in batch]
+        print(f"Fetched details for {len(referenced_works)} referenced works")
+        return referenced_works
+
+    async def citing_works(self, cited_by_url, max_citations=100, include_links=False):
+        """Async ``fetch_citing_work_ids``."""
+        if not cited_by_url:
+            return []
+        api_key = self.searcher.api_key
+        citing_works = []
+        url = _citing_works_url(cited_by_url, self.mailto, include_links, api_key)
+        print(f"Fetching citing works from: {cited_by_url} (max: {max_citations})")
+
+        while url and len(citing_works) < max_citations:
+            try:
+                data = await self._openalex_json(
+                    url, {'api_key': api_key} if api_key else None, {"Accept": "application/json"}
+                )
+            except OpenAlexRateLimitExceeded as e:
+                print(f"OpenAlex quota exhausted while fetching citing works: {str(e)}")
+                break
+            except httpx.HTTPError as e:
+                print(f"Error fetching citing works from {url}: {str(e)}")
+                break
+            except Exception as e:
+                print(f"Unexpected error fetching citing works from {url}: {str(e)}")
+                break
+            for work in data.get("results", []):
+                if len(citing_works) >= max_citations:
+                    break
+                citing_works.append(_related_work_details(work, include_links))
+            next_page = (data.get("meta") or {}).get("next_page")
+            url = next_page if next_page and len(citing_works) < max_citations else None
+
+        print(f"Finished fetching citing works. Found {len(citing_works)}")
+        return citing_works
+
+
+def process_references(refs, searcher, rate_limiter=None, *, max_in_flight: int | None = None, **options) -> list:
+    """Blocking entry point: enrich ``refs`` concurrently and return results in input order."""
+
+    async def _run():
+        async with AsyncEnrichmentEngine(searcher, rate_limiter, max_in_flight=max_in_flight) as engine:
+            return await engine.process_references(refs, **options)
+
+    return asyncio.run(_run())
@@ -0,0 +1,156 @@
+import json
+import os
+import re
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+DEFAULT_BULK_WORKERS = max(1, min(8, os.cpu_count() or 1))
+# Entries per BibTeX parse task; large enough to amortize the pickling round-trip.
+BIBTEX_CHUNK_ENTRIES = 2000
+# Secondary works indexes are dropped and rebuilt around a merge once it adds at
+# least this many rows and at least a quarter of the current table.
+DEFER_INDEX_MIN_ROWS = 5000
+
+_ENTRY_START = re.compile(r"^[ \t]*@", re.MULTILINE)
+_HEADER_BLOCK = re.compile(r"@\s*(string|preamble)\b", re.IGNORECASE)
+_COMMENT_BLOCK = re.compile(r"@\s*comment\b", re.IGNORECASE)
+
+
+@dataclass
+class BibRecord:
+    """Picklable stand-in for a parsed ``bibtexparser`` entry.
+
+    Exposes the ``key``/``entry_type``/``get``/``items`` surface that
+    ``DatabaseManager._bibtex_work_record`` reads from a library entry.
+    """
+
+    key: str | None
+    entry_type: str | None
+    fields: dict = field(default_factory=dict)
+    source_file: str | None = None
+
+    def get(self, name, default=None):
+        return self.fields.get(name, default)
+
+    def items(self):
+        return [("ENTRYTYPE", self.entry_type), ("ID", self.key), *self.fields.items()]
+
+    def field_value(self, *names):
+        for name in names:
+            value = self.fields.get(name)
+            if value not in (None, ""):
+                return str(value)
+        return None
+
+
+def split_bibtex(text: str, entries_per_chunk: int = BIBTEX_CHUNK_ENTRIES) -> list[str]:
+    """Cut a BibTeX file into chunks of whole entries.
+
+    ``@string`` and ``@preamble`` blocks are repeated at the top of every chunk so
+    macros still resolve; ``@comment`` blocks are dropped.
+    """
+    starts = [match.start() for match in _ENTRY_START.finditer(text)]
+    if not starts:
+        return []
+    blocks = [text[start:end] for start, end in zip(starts, starts[1:] + [len(text)])]
+    header = "".join(block for block in blocks if _HEADER_BLOCK.match(block.lstrip()))
+    entries = [
+        block for block in blocks
+        if not _HEADER_BLOCK.match(block.lstrip()) and not _COMMENT_BLOCK.match(block.lstrip())
+    ]
+    size = max(1, int(entries_per_chunk))
+    return [header + "".join(entries[i:i + size]) for i in range(0, len(entries), size)]
+
+
+def parse_bibtex_chunk(text: str, source_file: str | None = None) -> list[BibRecord]:
+    """Parse one chunk with bibtexparser (run inside a pool worker)."""
+    import bibtexparser
+
+    library = bibtexparser.parse_string(text)
+    records = []
+    for entry in library.entries:
+        values = {}
+        for item in entry.fields:
+            values[item.key] = item.value
+        records.append(BibRecord(entry.key, entry.entry_type, values, source_file))
+    return records
+
+
+def load_json_refs(path: str) -> list[dict]:
+    """Read a JSON list of reference dicts (run inside a pool worker)."""
+    with open(path, "r", encoding="utf-8") as handle:
+        data = json.load(handle)
+    if not isinstance(data, list):
+        raise ValueError(f"{path}: JSON content is not a list of entries.")
+    return [dict(item) for item in data if isinstance(item, dict)]
+
+
+def parse_inputs(paths, *, workers: int = DEFAULT_BULK_WORKERS) -> tuple[list[BibRecord], list[dict]]:
+    """Parse ``.bib`` and ``.json`` files, fanning the work out over a process pool.
+
+    BibTeX files are split into chunks of whole entries so one large file still
+    spreads across workers. Results keep input order.
+    """
+    tasks = []
+    for path in paths:
+        path = Path(path)
+        if path.suffix.lower() == ".json":
+            tasks.append((load_json_refs, (str(path),)))
+            continue
+        text = path.read_text(encoding="utf-8")
+        tasks.extend((parse_bibtex_chunk, (chunk, str(path.resolve()))) for chunk in split_bibtex(text))
+
+    if workers <= 1 or len(tasks) <= 1:
+        results = [fn(*args) for fn, args in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(fn, *args) for fn, args in tasks]
+            results = [future.result() for future in futures]
+
+    bib_records: list[BibRecord] = []
+    json_refs: list[dict] = []
+    for (fn, _args), result in zip(tasks, results):
+        (json_refs if fn is load_json_refs else bib_records).extend(result)
+    return bib_records, json_refs
+
+
+def open_staging_db(path: str | Path, columns: list[str]) -> sqlite3.Connection:
+    """Create a throwaway staging database tuned for loading, not for crash safety.
+
+    No journal and no fsyncs: the file is rebuilt from the inputs if anything
+    goes wrong, so durability only matters for the live database.
+    """
+    path = Path(path)
+    for suffix in ("", "-journal", "-wal", "-shm"):
+        Path(f"{path}{suffix}").unlink(missing_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA cache_size = -65536")
+    column_sql = ", ".join(f"{name}" for name in columns if name != "id")
+    conn.execute(f"CREATE TABLE new_works (id INTEGER PRIMARY KEY, {column_sql})")
+    conn.execute("CREATE TABLE new_payloads (work_id INTEGER NOT NULL, kind TEXT NOT NULL, codec TEXT NOT NULL, data BLOB)")
+    conn.execute("CREATE TABLE new_links (corpus_id INTEGER NOT NULL, work_id INTEGER NOT NULL)")
+    return conn
+
+
+def secondary_index_sql(conn: sqlite3.Connection, table: str) -> dict[str, str]:
+    """``{name: CREATE INDEX sql}`` for the plain (non-unique, non-partial) indexes on ``table``.
+
+    Unique and partial indexes stay in place: they enforce the DOI/OpenAlex
+    constraints the merge relies on.
+    """
+    out = {}
+    for name, sql in conn.execute(
+        "SELECT name, sql FROM main.sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+        (table,),
+    ).fetchall():
+        normalized = " ".join(sql.upper().split())
+        if normalized.startswith("CREATE UNIQUE") or " WHERE " in normalized:
+            continue
+        out[name] = sql
+    return out
@@ -0,0 +1,166 @@
+import json
+import os
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+
+
+CSR_DIRECTIONS = ("out", "in")
+_FETCH_ROWS = 100_000
+# Each direction is read in primary-key or index order, so the arrays fill in a
+# single streaming pass without sorting in Python.
+_CSR_QUERIES = {
+    "out": "SELECT source_work_id, target_work_id, relationship FROM work_citations "
+           "ORDER BY source_work_id, target_work_id",
+    "in": "SELECT target_work_id, source_work_id, relationship FROM work_citations INDEXED BY idx_work_citations_target "
+          "ORDER BY target_work_id, source_work_id",
+}
+
+
+def csr_dir_for(db_path: str | Path) -> Path:
+    """``data/literature.db`` -> ``data/literature_csr``."""
+    path = Path(db_path)
+    return path.with_name(f"{path.stem}_csr")
+
+
+def citation_store_fingerprint(conn: sqlite3.Connection) -> dict:
+    """Edge count and id sums of ``work_citations``; a cached export is stale when they differ."""
+    row = conn.execute(
+        "SELECT COUNT(*), COALESCE(SUM(source_work_id), 0), COALESCE(SUM(target_work_id), 0), "
+        "COALESCE(SUM(relationship), 0) FROM work_citations"
+    ).fetchone()
+    max_work_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM works").fetchone()[0]
+    return {
+        "edges": int(row[0]),
+        "source_sum": int(row[1]),
+        "target_sum": int(row[2]),
+        "relationship_sum": int(row[3]),
+        "max_work_id": int(max_work_id),
+    }
+
+
+class CitationCSR:
+    """Citation adjacency in compressed sparse row form, indexed by work id.
+
+    The neighbours of work ``w`` are ``targets[offsets[w]:offsets[w + 1]]``,
+    sorted ascending; ``relationships`` holds the matching relationship codes.
+    Arrays are memory-mapped ``uint32`` (``uint8`` for relationships) files, so
+    opening an export costs no parsing and pages load on first touch.
+    """
+
+    def __init__(self, offsets: np.ndarray, targets: np.ndarray, relationships: np.ndarray, meta: dict):
+        self.offsets = offsets
+        self.targets = targets
+        self.relationships = relationships
+        self.meta = meta
+
+    @property
+    def num_edges(self) -> int:
+        return int(self.offsets[-1])
+
+    @property
+    def max_work_id(self) -> int:
+        return len(self.offsets) - 2
+
+    def neighbors(self, work_id: int) -> np.ndarray:
+        if work_id < 0 or work_id > self.max_work_id:
+            return self.targets[:0]
+        return self.targets[self.offsets[work_id]:self.offsets[work_id + 1]]
+
+    def degrees(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    def edge_sources(self) -> np.ndarray:
+        """Source work id of every edge, aligned with ``targets``."""
+        return np.repeat(np.arange(len(self.offsets) - 1, dtype=np.uint32), self.degrees())
+
+    @classmethod
+    def open(cls, directory: str | Path, direction: str = "out") -> "CitationCSR":
+        directory = Path(directory)
+        meta = json.loads((directory / "meta.json").read_text())
+        edges = int(meta["edges"])
+        nodes = int(meta["max_work_id"]) + 2
+
+        def _map(name, dtype, count):
+            path = directory / f"{direction}_{name}.bin"
+            if count == 0:
+                return np.zeros(0, dtype=dtype)
+            return np.memmap(path, dtype=dtype, mode="r", shape=(count,))
+
+        return cls(_map("offsets", np.uint32, nodes), _map("targets", np.uint32, edges),
+                   _map("relationships", np.uint8, edges), meta)
+
+
+def export_citation_csr(conn: sqlite3.Connection, directory: str | Path, *, directions=CSR_DIRECTIONS) -> dict:
+    """Write ``work_citations`` as CSR arrays under ``directory``.
+
+    ``out`` lists what each work cites (``source -> target``); ``in`` lists the
+    works citing it. Files are written under temporary names and swapped in,
+    with ``meta.json`` last.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    # One read transaction so the fingerprint and every pass see the same edges.
+    own_transaction = not conn.in_transaction
+    if own_transaction:
+        conn.execute("BEGIN")
+    try:
+        meta = citation_store_fingerprint(conn)
+        for direction in directions:
+            _write_direction(conn, directory, direction, meta["max_work_id"] + 2, meta["edges"])
+    finally:
+        if own_transaction:
+            conn.commit()
+    meta["directions"] = list(directions)
+    meta_tmp = directory / "meta.json.tmp"
+    meta_tmp.write_text(json.dumps(meta, indent=2))
+    os.replace(meta_tmp, directory / "meta.json")
+    return meta
+
+
+def _write_direction(conn: sqlite3.Connection, directory: Path, direction: str, nodes: int, edges: int) -> None:
+    if max(nodes, edges) >= 2**32:
+        raise ValueError("Citation graph too large for uint32 CSR arrays")
+    files = {name: directory / f"{direction}_{name}.bin.tmp" for name in ("offsets", "targets", "relationships")}
+    targets = np.memmap(files["targets"], dtype=np.uint32, mode="w+", shape=(max(edges, 1),))
+    relationships = np.memmap(files["relationships"], dtype=np.uint8, mode="w+", shape=(max(edges, 1),))
+    counts = np.zeros(nodes, dtype=np.int64)
+    position = 0
+    cursor = conn.execute(_CSR_QUERIES[direction])
+    while rows := cursor.fetchmany(_FETCH_ROWS):
+        block = np.asarray(rows, dtype=np.int64)
+        end = position + len(block)
+        targets[position:end] = block[:, 1]
+        relationships[position:end] = block[:, 2]
+        counts += np.bincount(block[:, 0], minlength=nodes)[:nodes]
+        position = end
+    offsets = np.memmap(files["offsets"], dtype=np.uint32, mode="w+", shape=(nodes,))
+    offsets[0] = 0
+    offsets[1:] = np.cumsum(counts[:-1])
+    for array in (offsets, targets, relationships):
+        array.flush()
+    del offsets, targets, relationships
+    for name, path in files.items():
+        os.replace(path, directory / f"{direction}_{name}.bin")
+
+
+def load_citation_csr(conn: sqlite3.Connection, directory: str | Path, direction: str = "out") -> CitationCSR:
+    """Open the cached export under ``directory``, re-exporting it first when the store has changed."""
+    directory = Path(directory)
+    meta_path = directory / "meta.json"
+    fingerprint = citation_store_fingerprint(conn)
+    cached = None
+    if meta_path.exists():
+        try:
+            cached = json.loads(meta_path.read_text())
+        except ValueError:
+            cached = None
+    fresh = (
+        cached is not None
+        and direction in cached.get("directions", [])
+        and all(cached.get(key) == value for key, value in fingerprint.items())
+    )
+    if not fresh:
+        export_citation_csr(conn, directory)
+    return CitationCSR.open(directory, direction)
@@ -10,7 +10,11 @@ import hashlib
 import bibtexparser
 
 # Local application imports
-from .db_manager import DatabaseManager
+from .db_manager import SCHEMA_VERSION, DatabaseManager
+from .bulk_load import DEFAULT_BULK_WORKERS
+from .citation_graph import csr_dir_for, export_citation_csr
+from .snapshot import DEFAULT_SNAPSHOT_PAGES, DEFAULT_SNAPSHOT_SLEEP, SnapshotError, snapshot_database, snapshot_path_for
+from .retention import DEFAULT_COMPACT_AFTER_DAYS, DEFAULT_RETENTION_DAYS, DEFAULT_VACUUM_PAGES, archive_path_for, run_retention
 # For tests: patched in test_get_bib_pages. Lazy import in handler for runtime.
 extract_reference_sections = None
 from .OpenAlexScraper import (
@@ -332,6 +336,44 @@ def import_bib_command(bibtex_file, pdf_base_dir, db_path):
             db_manager.close_connection()
 
 
+@cli.command("bulk-import")
+@click.argument('input_files', nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False, readable=True))
+@click.option('--pdf-base-dir', type=click.Path(exists=True, file_okay=False, readable=True),
+              help='Optional base directory for resolving relative PDF paths in BibTeX files.')
+@click.option('--db-path', default=str(DEFAULT_DB_PATH), help='Path to the SQLite database file.')
+@click.option('--corpus-id', type=int, default=None, help='Corpus to add every imported work to.')
+@click.option('--workers', default=DEFAULT_BULK_WORKERS, show_default=True, help='Parser processes.')
+@click.option('--defer-indexes/--keep-indexes', default=None,
+              help='Rebuild secondary works indexes after the load instead of updating them per row '
+                   '(default: only for loads that grow the table by a quarter or more).')
+def bulk_import_command(input_files, pdf_base_dir, db_path, corpus_id, workers, defer_indexes):
+    """Bulk-load large .bib (downloaded works) and .json (pending works) files.
+
+    Parses in parallel, stages new works in a scratch database and merges them
+    into the live database in one short transaction, so the workers keep running.
+    """
+    db_manager = DatabaseManager(db_path=db_path)
+    try:
+        stats = db_manager.bulk_import_files(
+            input_files,
+            pdf_base_dir=pdf_base_dir,
+            corpus_id=corpus_id,
+            workers=workers,
+            defer_indexes=defer_indexes,
+        )
+    finally:
+        db_manager.close_connection()
+    click.echo(
+        f"{GREEN}Parsed {stats['bibtex_entries']} BibTeX and {stats['json_entries']} JSON entries: "
+        f"{stats['created']} created, {stats['merged']} merged into existing works.{RESET}",
+        err=True,
+    )
+    if stats["failed"]:
+        click.echo(f"{YELLOW}Skipped {stats['failed']} entries without a title.{RESET}", err=True)
+    if stats["indexes_rebuilt"]:
+        click.echo(f"Rebuilt {stats['indexes_rebuilt']} secondary index(es).", err=True)
+
+
 @cli.command("export-bibtex")
 @click.argument('output_bib_file', type=click.Path(dir_okay=False, writable=True, resolve_path=True))
 @click.option('--db-path', 
@@ -458,10 +500,12 @@ def extract_bib_pages_command(input_path, output_dir):
 @click.option('--db-path', 
               default=str(DEFAULT_DB_PATH), 
               help='Path to the SQLite database file.')
-def add_pending_works_command(json_file, source_pdf, db_path):
+@click.option('--near-duplicates/--no-near-duplicates', default=False, show_default=True,
+              help='Also fold in works whose titles only nearly match (MinHash/LSH, low confidence).')
+def add_pending_works_command(json_file, source_pdf, db_path, near_duplicates):
     """Loads extracted bibliography entries from a JSON file as pending works."""
     click.echo(f"Loading entries from {json_file} into the database...")
-    db_manager = DatabaseManager(db_path)
+    db_manager = DatabaseManager(db_path, identity_index=True, near_duplicates=near_duplicates)
     try:
         added, skipped, errors = db_manager.add_pending_works_from_json(json_file, source_pdf)
         click.echo(f"{GREEN}Successfully added {added} new entries.{RESET}")
@@ -559,9 +603,11 @@ def extract_bib_api_command(input_path, db_path, workers):
               default=str(DEFAULT_DB_PATH),
               help='Path to the SQLite database file.')
 @click.option('--enqueue/--no-enqueue', default=False, show_default=True, help='Enqueue results for download.')
-def keyword_search_command(query, max_results, year_from, year_to, field, mailto, db_path, enqueue):
+@click.option('--local-first/--no-local-first', default=False, show_default=True,
+              help='Skip OpenAlex when a recent run of the same query and filters returned only works already held locally.')
+def keyword_search_command(query, max_results, year_from, year_to, field, mailto, db_path, enqueue, local_first):
     """Run a keyword search against OpenAlex and persist results."""
-    from .keyword_search import search_openalex, openalex_result_to_record, dedupe_results
+    from .keyword_search import cached_result_to_record, search_openalex, openalex_result_to_record, dedupe_results
 
     db = DatabaseManager(db_path=db_path)
     try:
@@ -572,20 +618,31 @@ def keyword_search_command(query, max_results, year_from, year_to, field, mailto
             "field": field,
             "mailto": mailto,
         }
+        cached_run_id, cached_rows = db.find_cached_search_run(query, filters) if local_first else (None, [])
+        if cached_run_id is not None:
+            # Recorded separately so this run never serves as a cache entry itself.
+            filters["cached_run_id"] = cached_run_id
         run_id = db.create_search_run(query=query, filters=filters)
-        click.echo(f"Search run created (id={run_id}). Fetching results...")
-
-        raw_results = search_openalex(
-            query=query,
-            max_results=max_results,
-            year_from=year_from,
-            year_to=year_to,
-            field=field,
-            mailto=mailto,
-        )
 
-        records = [openalex_result_to_record(item, run_id=run_id) for item in raw_results]
-        records = dedupe_results(records)
+        if cached_run_id is not None:
+            click.echo(
+                f"Search run created (id={run_id}). Run {cached_run_id} returned only local works; skipping OpenAlex search."
+            )
+            records = [cached_result_to_record(row, run_id=run_id) for row in cached_rows]
+            local_ids = [row["work_id"] for row in cached_rows]
+        else:
+            click.echo(f"Search run created (id={run_id}). Fetching results...")
+            raw_results = search_openalex(
+                query=query,
+                max_results=max_results,
+                year_from=year_from,
+                year_to=year_to,
+                field=field,
+                mailto=mailto,
+            )
+            records = [openalex_result_to_record(item, run_id=run_id) for item in raw_results]
+            records = dedupe_results(records)
+            local_ids = db.local_work_ids(records)
 
         stored = db.add_search_results(run_id, [
             {
@@ -594,10 +651,14 @@ def keyword_search_command(query, max_results, year_from, year_to, field, mailto
                 "title": r.get("title"),
                 "year": r.get("year"),
                 "raw_json": r.get("openalex_json"),
+                "work_id": work_id,
             }
-            for r in records
+            for r, work_id in zip(records, local_ids)
         ])
+        held = sum(1 for work_id in local_ids if work_id)
         click.echo(f"Stored {stored} search results.")
+        if held:
+            click.echo(f"{held} of them are already in the local corpus.")
 
         if enqueue:
             added = 0
@@ -612,6 +673,35 @@ def keyword_search_command(query, max_results, year_from, year_to, field, mailto
         click.echo(f"{GREEN}Keyword search complete.{RESET}")
     finally:
         db.close_connection()
+
+
+@cli.command("search-local")
+@click.option('--query', required=True, help='Boolean keyword query (AND/OR/NOT), as for keyword-search.')
+@click.option('--corpus-id', type=int, default=None, help='Restrict results to one corpus.')
+@click.option('--limit', default=50, show_default=True, help='Maximum number of results.')
+@click.option('--offset', default=0, show_default=True, help='Number of ranked results to skip.')
+@click.option('--db-path',
+              type=click.Path(dir_okay=False, writable=True, resolve_path=True),
+              default=str(DEFAULT_DB_PATH),
+              help='Path to the SQLite database file.')
+@click.option('--output', type=click.Path(dir_okay=False, writable=True, resolve_path=True), default=None,
+              help='Write the results as JSON to this file instead of stdout.')
+def search_local_command(query, corpus_id, limit, offset, db_path, output):
+    """Full-text search over works already in the local database."""
+    db = DatabaseManager(db_path=db_path)
+    try:
+        rows, err = db.search_local(query, corpus_id=corpus_id, limit=limit, offset=offset)
+    finally:
+        db.close_connection()
+    if err:
+        click.echo(f"{RED}{err}{RESET}", err=True)
+        return
+    payload = json.dumps(rows, indent=2, ensure_ascii=False)
+    if output:
+        Path(output).write_text(payload, encoding="utf-8")
+        click.echo(f"{GREEN}Wrote {len(rows)} results to {output}{RESET}")
+    else:
+        click.echo(payload)
 @cli.command("process-downloads")
 @click.option('--db-path', default=str(DEFAULT_DB_PATH), type=click.Path(dir_okay=False, writable=True, resolve_path=True), help='Path to SQLite database file.')
 @click.option('--batch-size', default=50, show_default=True, help='Max number of matched works to enqueue.')
@@ -936,5 +1026,231 @@ def merge_log_command(db_path, limit, action, table_filter):
         if 'db_manager' in locals():
             db_manager.close_connection()
 
+@cli.command("dedupe-sweep")
+@click.option('--db-path', default=str(DEFAULT_DB_PATH), help='Path to the SQLite database file.')
+@click.option('--min-similarity', default=0.8, show_default=True, type=float,
+              help='Minimum character-shingle Jaccard similarity between titles.')
+@click.option('--output', 'output_path', default=None, type=click.Path(dir_okay=False, writable=True),
+              help='Write the merge plan as JSON to this file instead of stdout.')
+@click.option('--apply', 'apply_plan', is_flag=True, default=False,
+              help='Execute the plan through _merge_records instead of only emitting it.')
+def dedupe_sweep_command(db_path, min_similarity, output_path, apply_plan):
+    """Find near-duplicate works via MinHash/LSH title signatures and emit a merge plan."""
+    db_manager = DatabaseManager(db_path=db_path)
+    try:
+        index = db_manager.enable_near_duplicate_index()
+        index.min_similarity = min_similarity
+        plan = index.merge_plan()
+        click.echo(f"{CYAN}Near-duplicate sweep found {len(plan)} merge candidates.{RESET}", err=True)
+
+        payload = json.dumps(plan, indent=2)
+        if output_path:
+            Path(output_path).write_text(payload, encoding="utf-8")
+            click.echo(f"{GREEN}Merge plan written to {output_path}{RESET}", err=True)
+        elif not apply_plan:
+            click.echo(payload)
+
+        if apply_plan:
+            merged = 0
+            for step in plan:
+                ok, err = db_manager._merge_records(**step)
+                if ok:
+                    merged += 1
+                else:
+                    click.echo(
+                        f"{YELLOW}  ! works:{step['duplicate_id']} -> works:{step['canonical_id']} not merged: {err}{RESET}",
+                        err=True,
+                    )
+            index.sync()
+            click.echo(f"{GREEN}Merged {merged} of {len(plan)} planned duplicates.{RESET}", err=True)
+    finally:
+        db_manager.close_connection()
+
+
+@cli.command("compact-payloads")
+@click.option('--db-path', default=str(DEFAULT_DB_PATH), help='Path to the SQLite database file.')
+@click.option('--batch-size', default=500, show_default=True, help='Works moved per transaction.')
+@click.option('--vacuum/--no-vacuum', default=False, show_default=True,
+              help='VACUUM afterwards so the freed pages shrink the database file.')
+def compact_payloads_command(db_path, batch_size, vacuum):
+    """Move inline OpenAlex/Crossref/BibTeX JSON from works rows into compressed work_payloads."""
+    db_manager = DatabaseManager(db_path=db_path)
+    try:
+        moved = db_manager.compact_work_payloads(batch_size=batch_size)
+        click.echo(f"{GREEN}Moved payloads of {moved} works into work_payloads.{RESET}", err=True)
+        if vacuum and moved:
+            db_manager.conn.execute("VACUUM")
+            click.echo(f"{GREEN}Database vacuumed.{RESET}", err=True)
+    finally:
+        db_manager.close_connection()
+
+
+@cli.command("rebuild-status-counts")
+@click.option('--db-path', default=str(DEFAULT_DB_PATH), help='Path to the SQLite database file.')
+def rebuild_status_counts_command(db_path):
+    """Recompute the trigger-maintained corpus_status_counts table from works."""
+    db_manager = DatabaseManager(db_path=db_path)
+    try:
+        rows = db_manager.rebuild_corpus_status_counts()
+        click.echo(f"{GREEN}Rebuilt corpus_status_counts ({rows} counter rows).{RESET}", err=True)
+    finally:
+        db_manager.close_connection()
+
+@cli.command("quarantine")
+@click.option('--db-path', default=str(DEFAULT_DB_PATH), help='Path to the SQLite database file.')
+@click.option('--stage', type=click.Choice(['metadata', 'download']), default=None, help='Only this pipeline stage.')
+@click.option('--limit', default=100, show_default=True, help='Maximum number of works to list.')
+@click.option('--release', 'release_ids', type=int, multiple=True, help='Work id to put back in its queue (repeatable).')
+def quarantine_command(db_path, stage, limit, release_ids):
+    """List works quarantined after repeated failures, or release them."""
+    db_manager = DatabaseManager(db_path=db_path)
+    try:
+        if release_ids:
+            released = db_manager.release_quarantined(list(release_ids), stage=stage)
+            click.echo(f"{GREEN}Released {released} quarantined stage(s).{RESET}", err=True)
+            return
+        rows = db_manager.get_quarantined_works(stage=stage, limit=limit)
+    finally:
+        db_manager.close_connection()
+    if not rows:
+        click.echo(f"{GREEN}No quarantined works.{RESET}", err=True)
+        return
+    for row in rows:
+        click.echo(
+            f"{YELLOW}[{row['stage']}]{RESET} #{row['id']} {row['title']} "
+            f"- {row['failure_category']} x{row['failure_streak']} ({row['attempts']} attempts): {row['error'] or ''}"
+        )
+
+@cli.command("rebuild-queues")
+@click.option('--db-path', default=str(DEFAULT_DB_PATH), help='Path to the SQLite database file.')
+def rebuild_queues_command(db_path):
+    """Refill the trigger-maintained enrich_queue/download_queue tables from works."""
+    db_manager = DatabaseManager(db_path=db_path)
+    try:
+        rows = db_manager.rebuild_work_queues()
+        click.echo(f"{GREEN}Rebuilt work queues ({rows} queue rows).{RESET}", err=True)
+    finally:
+        db_manager.close_connection()
+
+@cli.command("rebuild-citation-store")
+@click.option('--db-path', default=str(DEFAULT_DB_PATH), help='Path to the SQLite database file.')
+def rebuild_citation_store_command(db_path):
+    """Refill the integer-keyed work_citations tables from citation_edges."""
+    db_manager = DatabaseManager(db_path=db_path)
+    try:
+        counts = db_manager.rebuild_citation_store()
+        click.echo(
+            f"{GREEN}Rebuilt citation store ({counts['resolved']} work edges, "
+            f"{counts['unresolved']} to works outside the database).{RESET}",
+            err=True,
+        )
+    finally:
+        db_manager.close_connection()
+
+@cli.command("export-citation-csr")
+@click.option('--db-path', default=str(DEFAULT_DB_PATH), help='Path to the SQLite database file.')
+@click.option('--out-dir', default=None, help='Directory for the CSR arrays (default: <db name>_csr next to the database).')
+@click.option('--direction', 'directions', type=click.Choice(['out', 'in']), multiple=True,
+              help='Adjacency to write: out (cites) and/or in (cited by). Default: both.')
+def export_citation_csr_command(db_path, out_dir, directions):
+    """Export work_citations as memory-mappable CSR offset/target arrays."""
+    out_dir = out_dir or str(csr_dir_for(db_path))
+    db_manager = DatabaseManager(db_path=db_path)
+    try:
+        meta = export_citation_csr(db_manager.conn, out_dir, directions=directions or ('out', 'in'))
+    finally:
+        db_manager.close_connection()
+    click.echo(
+        f"{GREEN}Wrote {meta['edges']} edge(s) over work ids up to {meta['max_work_id']} to {out_dir}.{RESET}",
+        err=True,
+    )
+
+@cli.command("retention")
+@click.option('--db-path', default=str(DEFAULT_DB_PATH), help='Path to the SQLite database file.')
+@click.option('--archive-path', default=None,
+              help='Archive database for expired rows (default: <db name>_archive.db next to the database).')
+@click.option('--jobs-days', default=DEFAULT_RETENTION_DAYS['pipeline_jobs'], show_default=True,
+              help='Archive finished pipeline jobs older than this many days (0 keeps all).')
+@click.option('--merge-log-days', default=DEFAULT_RETENTION_DAYS['merge_log'], show_default=True,
+              help='Archive merge_log rows older than this many days (0 keeps all).')
+@click.option('--ingest-days', default=DEFAULT_RETENTION_DAYS['ingest_entries'], show_default=True,
+              help='Archive ingest_entries older than this many days; they leave the seed lists (0 keeps all).')
+@click.option('--search-days', default=DEFAULT_RETENTION_DAYS['search_results'], show_default=True,
+              help='Archive results of search runs older than this many days; they leave the seed lists (0 keeps all).')
+@click.option('--compact-after-days', default=DEFAULT_COMPACT_AFTER_DAYS, show_default=True,
+              help='Reduce result_json of jobs finished this many days ago to a summary (0 disables).')
+@click.option('--vacuum-pages', default=DEFAULT_VACUUM_PAGES, show_default=True,
+              help='Free pages to return with PRAGMA incremental_vacuum afterwards (0 skips).')
+def retention_command(db_path, archive_path, jobs_days, merge_log_days, ingest_days, search_days, compact_after_days, vacuum_pages):
+    """Move old job, merge and seed history into the archive database."""
+    archive_path = archive_path or str(archive_path_for(db_path))
+    db_manager = DatabaseManager(db_path=db_path)
+    try:
+        stats = run_retention(
+            db_manager.conn,
+            archive_path,
+            days={
+                "pipeline_jobs": jobs_days,
+                "merge_log": merge_log_days,
+                "ingest_entries": ingest_days,
+                "search_results": search_days,
+            },
+            compact_after_days=compact_after_days,
+            vacuum_pages=vacuum_pages,
+        )
+    finally:
+        db_manager.close_connection()
+    archived = ", ".join(f"{table}: {count}" for table, count in stats["archived"].items()) or "nothing"
+    click.echo(
+        f"{GREEN}Compacted {stats['compacted_jobs']} job result(s); archived {archived} to {archive_path}; "
+        f"freed {stats['vacuumed_pages']} page(s).{RESET}",
+        err=True,
+    )
+
+@cli.command("snapshot")
+@click.option('--db-path', default=str(DEFAULT_DB_PATH), help='Path to the SQLite database file.')
+@click.option('--target', default=None,
+              help='Snapshot file to write (default: snapshots/<db name>_<timestamp>.db next to the database).')
+@click.option('--pages', default=DEFAULT_SNAPSHOT_PAGES, show_default=True, help='Pages copied per backup step.')
+@click.option('--sleep', default=DEFAULT_SNAPSHOT_SLEEP, show_default=True,
+              help='Seconds to pause between steps so writers can commit.')
+@click.option('--quick', is_flag=True, help='Verify with PRAGMA quick_check instead of a full integrity_check.')
+@click.option('--no-verify', is_flag=True, help='Skip the integrity check of the copy.')
+def snapshot_command(db_path, target, pages, sleep, quick, no_verify):
+    """Copy the live database to a snapshot file without blocking the workers."""
+    if not Path(db_path).exists():
+        raise click.ClickException(f"Database not found: {db_path}")
+    target = target or str(snapshot_path_for(db_path))
+    try:
+        stats = snapshot_database(db_path, target, pages=pages, sleep=sleep, verify=not no_verify, quick_check=quick)
+    except SnapshotError as exc:
+        raise click.ClickException(str(exc))
+    verified = "verified" if stats["verified"] else "not verified"
+    click.echo(
+        f"{GREEN}Snapshot written to {stats['path']} ({stats['bytes']} bytes, {stats['steps']} step(s), "
+        f"{stats['seconds']}s, {verified}).{RESET}",
+        err=True,
+    )
+
+@cli.command("migrate")
+@click.option('--db-path', default=str(DEFAULT_DB_PATH), help='Path to the SQLite database file.')
+@click.option('--check', is_flag=True, help='Only report the schema version without migrating.')
+def migrate_command(db_path, check):
+    """Apply pending schema migrations to the database."""
+    db_manager = DatabaseManager(db_path=db_path, auto_migrate=False)
+    try:
+        current = db_manager.schema_version()
+        if check:
+            color = GREEN if current >= SCHEMA_VERSION else YELLOW
+            click.echo(f"{color}Schema version {current} (latest {SCHEMA_VERSION}).{RESET}", err=True)
+            return
+        applied = db_manager.migrate()
+        if applied:
+            click.echo(f"{GREEN}Migrated schema from version {current} to {applied[-1]}.{RESET}", err=True)
+        else:
+            click.echo(f"{GREEN}Schema already at version {db_manager.schema_version()}.{RESET}", err=True)
+    finally:
+        db_manager.close_connection()
+
 if __name__ == "__main__":
     cli()
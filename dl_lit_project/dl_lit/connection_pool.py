@@ -0,0 +1,361 @@
+import copy
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+
+from dl_lit.near_duplicates import NearDuplicateIndex
+
+
+_SAVEPOINT = "dl_group_write"
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)) or default)
+    except ValueError:
+        return default
+
+
+class _GroupCursor:
+    """Cursor proxy that maps transaction-control statements onto the job savepoint."""
+
+    def __init__(self, owner: "_GroupCommitConnection", cursor: sqlite3.Cursor):
+        object.__setattr__(self, "_owner", owner)
+        object.__setattr__(self, "_cursor", cursor)
+
+    def execute(self, sql, parameters=()):
+        if self._owner._intercept(sql):
+            return self
+        self._cursor.execute(sql, parameters)
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        if self._owner._intercept(sql):
+            return self
+        self._cursor.executemany(sql, seq_of_parameters)
+        return self
+
+    def executescript(self, sql_script):
+        return self._owner.executescript(sql_script)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._cursor, name, value)
+
+
+class _GroupCommitConnection:
+    """Writer-connection proxy used while a group of queued writes is in flight.
+
+    ``DatabaseManager`` methods manage their own transactions (``commit()``,
+    ``rollback()``, ``BEGIN``/``COMMIT`` statements). Inside a group those become
+    no-ops or a rollback to the current job's savepoint, so every job keeps its
+    all-or-nothing behaviour while the group shares a single real COMMIT.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        object.__setattr__(self, "_conn", conn)
+
+    def _intercept(self, sql) -> bool:
+        statement = str(sql).strip().rstrip(";").strip().upper()
+        if statement.startswith("BEGIN") or statement in {"COMMIT", "END", "COMMIT TRANSACTION", "END TRANSACTION"}:
+            return True
+        if statement.startswith("ROLLBACK") and " TO " not in f" {statement} ":
+            self.rollback()
+            return True
+        return False
+
+    def commit(self):
+        return None
+
+    def rollback(self):
+        self._conn.execute(f"ROLLBACK TO {_SAVEPOINT}")
+
+    def cursor(self, *args, **kwargs):
+        return _GroupCursor(self, self._conn.cursor(*args, **kwargs))
+
+    def execute(self, sql, parameters=()):
+        cursor = self.cursor()
+        return cursor.execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        # sqlite3 COMMITs any open transaction before running a script, which
+        # would commit the whole group from inside one job.
+        raise sqlite3.ProgrammingError("executescript() is not allowed in a group-commit write; use execute()")
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._conn, name, value)
+
+
+class ConnectionPool:
+    """Thread-local read-only connections plus one writer thread with group commit.
+
+    ``reader()`` returns a ``DatabaseManager`` view bound to a read-only connection
+    owned by the calling thread; in WAL mode these never block each other or the
+    writer, so callers do not need a process-wide lock for lookups. Writes are
+    submitted as callables taking a writer-bound ``DatabaseManager``; the writer
+    thread drains whatever is queued (up to ``max_batch``, waiting at most
+    ``max_delay_ms`` for stragglers), runs each job inside its own savepoint and
+    commits the group once. A job's future resolves only after that COMMIT, so a
+    returned result is durable; a job that raises is rolled back on its own. If the
+    group's own SAVEPOINT/RELEASE or COMMIT fails, every job in it fails with that
+    error and the writer moves on to the next group.
+    """
+
+    def __init__(self, db, *, max_batch: int | None = None, max_delay_ms: int | None = None):
+        self.db = db
+        self.max_batch = max(1, max_batch if max_batch is not None else _env_int("RAG_FEEDER_DB_GROUP_COMMIT_MAX", 64))
+        self.max_delay = max(0, max_delay_ms if max_delay_ms is not None else _env_int("RAG_FEEDER_DB_GROUP_COMMIT_MS", 0)) / 1000.0
+        self._local = threading.local()
+        self._readers: list[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue()
+        self._inline_lock = threading.RLock()
+        self._closed = False
+        self._writer_thread = None
+        self._writer_conn = None
+        self._writer_view = None
+        if not db.is_in_memory:
+            self._writer_conn = self._connect()
+            self._writer_view = self._view(_GroupCommitConnection(self._writer_conn))
+            self._writer_thread = threading.Thread(target=self._writer_loop, name="dl-db-writer", daemon=True)
+            self._writer_thread.start()
+
+    def _connect(self, *, read_only: bool = False) -> sqlite3.Connection:
+        path = Path(self.db.db_path).resolve()
+        if read_only:
+            conn = sqlite3.connect(f"{path.as_uri()}?mode=ro", uri=True, timeout=30.0, check_same_thread=False)
+            conn.execute("PRAGMA query_only = ON")
+        else:
+            conn = sqlite3.connect(path, timeout=30.0, check_same_thread=False)
+            conn.execute("PRAGMA foreign_keys = ON")
+            conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA busy_timeout = 5000")
+        return conn
+
+    def _view(self, conn):
+        view = copy.copy(self.db)
+        view.conn = conn
+        view.identity_index = None
+        view.near_duplicate_index = NearDuplicateIndex(conn) if self.db.near_duplicate_index is not None else None
+        view._connection_pool = None
+        return view
+
+    def reader(self):
+        """Read-only ``DatabaseManager`` view for the calling thread."""
+        if self.db.is_in_memory:
+            # A private in-memory database cannot be shared across connections.
+            return self.db
+        view = getattr(self._local, "view", None)
+        if view is None:
+            conn = self._connect(read_only=True)
+            with self._readers_lock:
+                self._readers.append(conn)
+            view = self._view(conn)
+            self._local.view = view
+        return view
+
+    def submit(self, fn) -> Future:
+        """Queue ``fn(db)`` for the writer thread; the future resolves after COMMIT."""
+        future: Future = Future()
+        if self._closed:
+            future.set_exception(RuntimeError("Connection pool is closed"))
+            return future
+        if self._writer_thread is None:
+            with self._inline_lock:
+                try:
+                    future.set_result(fn(self.db))
+                except BaseException as exc:
+                    future.set_exception(exc)
+            return future
+        self._queue.put((fn, future))
+        return future
+
+    def submit_many(self, fns) -> list[Future]:
+        """Queue several writes that the writer commits together in one transaction."""
+        jobs = [(fn, Future()) for fn in fns]
+        if not jobs:
+            return []
+        if self._closed or self._writer_thread is None:
+            return [self.submit(fn) for fn, _ in jobs]
+        self._queue.put(jobs)
+        return [future for _, future in jobs]
+
+    def write(self, fn, timeout: float | None = None):
+        """Run ``fn(db)`` on the writer and wait for its committed result."""
+        return self.submit(fn).result(timeout=timeout)
+
+    def _writer_loop(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            # Explicit groups from submit_many arrive as lists and are never split.
+            batch = list(job) if isinstance(job, list) else [job]
+            stop = False
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                try:
+                    remaining = deadline - time.monotonic()
+                    nxt = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    stop = True
+                    break
+                batch.extend(nxt if isinstance(nxt, list) else [nxt])
+            try:
+                self._run_batch(batch)
+            except BaseException as exc:
+                # Never let one batch take the writer down: every later submit() would hang.
+                _fail_pending(batch, exc)
+            if stop:
+                return
+
+    def _run_batch(self, batch):
+        conn = self._writer_conn
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.Error as exc:
+            _fail_pending(batch, exc)
+            return
+
+        try:
+            outcomes = [(future, *self._run_job(fn)) for fn, future in batch]
+            conn.commit()
+        except BaseException as exc:
+            # A SAVEPOINT/RELEASE/ROLLBACK TO or the COMMIT itself failed (locked
+            # database, disk I/O, ...): nothing in the group is durable.
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                pass
+            _fail_pending(batch, exc)
+            return
+        for future, value, exc in outcomes:
+            if exc is not None:
+                future.set_exception(exc)
+            else:
+                future.set_result(value)
+
+    def _run_job(self, fn):
+        """Run one job in its own savepoint; returns ``(value, exception)``."""
+        conn = self._writer_conn
+        conn.execute(f"SAVEPOINT {_SAVEPOINT}")
+        try:
+            value = fn(self._writer_view)
+        except BaseException as exc:
+            conn.execute(f"ROLLBACK TO {_SAVEPOINT}")
+            conn.execute(f"RELEASE {_SAVEPOINT}")
+            return None, exc
+        conn.execute(f"RELEASE {_SAVEPOINT}")
+        return value, None
+
+    def close(self):
+        """Flush queued writes, stop the writer thread and close every connection."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._writer_thread is not None:
+            self._queue.put(None)
+            self._writer_thread.join()
+            self._writer_conn.close()
+        with self._readers_lock:
+            for conn in self._readers:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._readers.clear()
+
+
+class ResultSink:
+    """Buffers per-item state transitions and flushes them as one writer transaction.
+
+    ``add(fn)`` queues ``fn(db)``; the buffer is handed to the pool writer as a
+    single group once ``max_items`` transitions are pending or the oldest has waited
+    ``max_delay_ms``, whichever comes first (``flush()`` forces it). Each
+    transition still runs in its own savepoint, so one failing item does not undo
+    its neighbours.
+
+    Durability: a transition is durable only once its future has resolved. Anything
+    buffered or in flight when the process dies is lost, so callers must only route
+    transitions for rows they hold under a claim lease (``claim_enrich_batch`` /
+    ``claim_download_batch``); when the lease expires those rows become claimable
+    again and are simply processed a second time.
+    """
+
+    def __init__(self, pool: ConnectionPool, *, max_items: int | None = None, max_delay_ms: int | None = None):
+        self.pool = pool
+        self.max_items = max(1, max_items if max_items is not None else _env_int("RAG_FEEDER_RESULT_FLUSH_ITEMS", 32))
+        self.max_delay = max(0, max_delay_ms if max_delay_ms is not None else _env_int("RAG_FEEDER_RESULT_FLUSH_MS", 250)) / 1000.0
+        self._lock = threading.Lock()
+        self._pending: list[tuple] = []
+        self._timer: threading.Timer | None = None
+
+    def add(self, fn) -> Future:
+        """Buffer ``fn(db)``; the returned future resolves after the flush commits."""
+        proxy: Future = Future()
+        with self._lock:
+            self._pending.append((fn, proxy))
+            full = len(self._pending) >= self.max_items
+            if not full and self._timer is None:
+                self._timer = threading.Timer(self.max_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.flush()
+        return proxy
+
+    def write(self, fn, timeout: float | None = None):
+        """Buffer ``fn(db)`` and wait until its group has been committed."""
+        return self.add(fn).result(timeout=timeout)
+
+    def depth(self) -> int:
+        """Transitions buffered and not yet handed to the writer."""
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self) -> None:
+        """Hand every buffered transition to the writer as one transaction."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if not pending:
+            return
+        futures = self.pool.submit_many([fn for fn, _ in pending])
+        for (_, proxy), future in zip(pending, futures):
+            future.add_done_callback(lambda done, proxy=proxy: _chain(done, proxy))
+
+    def close(self) -> None:
+        self.flush()
+
+
+def _fail_pending(batch, exc: BaseException) -> None:
+    for _, future in batch:
+        if not future.done():
+            future.set_exception(exc)
+
+
+def _chain(source: Future, target: Future) -> None:
+    exc = source.exception()
+    if exc is not None:
+        target.set_exception(exc)
+    else:
+        target.set_result(source.result())
@@ -1,10 +1,18 @@
 import sqlite3
 import json
+import os
+import tempfile
 from pathlib import Path
 import re
 from datetime import datetime
 import time
 from dl_lit.utils import parse_bibtex_file_field
+from dl_lit.identity_index import IdentityMaps, WorkIdentityIndex
+from dl_lit.near_duplicates import NearDuplicateIndex
+from dl_lit.connection_pool import ConnectionPool
+from dl_lit.payloads import PAYLOAD_KINDS, decode_payload, encode_payload, fetch_payloads, hydrate_payloads
+from dl_lit.snapshot import snapshot_database
+from dl_lit.bulk_load import DEFAULT_BULK_WORKERS, DEFER_INDEX_MIN_ROWS, open_staging_db, parse_inputs, secondary_index_sql
 
 # ANSI escape codes for colors
 GREEN = "\033[92m"
@@ -14,16 +22,286 @@ BLUE = "\033[94m"
 CYAN = "\033[96m"
 RESET = "\033[0m"
 
+# Match fields strong enough to fold an incoming reference into an existing work
+# without inserting; weaker matches are logged as possible duplicates.
+HIGH_CONFIDENCE_MATCH_FIELDS = frozenset({"normalized_doi", "openalex_id", "title_authors_year", "alias_title_year"})
+
+# Failure categories that may succeed on a later attempt (API/network trouble,
+# lost writes). These go back to the queue with exponential backoff; any other
+# category fails the stage outright.
+RETRYABLE_FAILURE_CATEGORIES = frozenset({
+    "api_error", "rate_limited", "timeout", "connection_error", "request_error",
+    "server_error", "enhancer_exception", "promotion_failed", "move_to_downloaded_failed",
+})
+RETRY_BASE_SECONDS = 60
+RETRY_MAX_SECONDS = 6 * 60 * 60
+# Consecutive failures with the same category before a work is quarantined.
+QUARANTINE_AFTER_FAILURES = 3
+FAILURE_STAGES = {"metadata": "pending", "download": "queued"}
+
+# Ordered schema migrations as (version, description, DatabaseManager method).
+# Version 1 is the idempotent baseline DDL, so it also upgrades databases that
+# predate this registry. Append new steps; never rewrite one that has shipped.
+SCHEMA_MIGRATIONS = (
+    (1, "baseline schema", "_create_schema"),
+    (2, "enrich/download ready queues", "_create_work_queues"),
+    (3, "retry backoff and quarantine", "_add_retry_scheduling"),
+    (4, "integer-keyed citation store", "_create_citation_store"),
+    (5, "index-friendly year and job lookups", "_add_lookup_indexes"),
+    (6, "fair-share job scheduling", "_add_fair_share_scheduling"),
+    (7, "pipeline job coalescing", "_add_job_coalescing"),
+    (8, "identity change log", "_add_identity_change_log"),
+)
+SCHEMA_VERSION = SCHEMA_MIGRATIONS[-1][0]
+
+# Entries kept in work_identity_changes; an identity index that falls further
+# behind than this rebuilds instead of replaying the log.
+IDENTITY_CHANGE_LOG_KEEP = 10000
+
+# Reference keys that ``upsert_works_bulk`` and ``bulk_load`` turn into a work_aliases row.
+TRANSLATION_ALIAS_KEYS = ("translated_title", "translated_year", "translated_language", "translation_relationship")
+
+# relationship_type codes in work_citations; anything unknown counts as a reference.
+CITATION_RELATIONSHIPS = ("references", "cited_by")
+
+# Priority classes for pipeline_jobs.priority_class. A job enters the class its
+# type maps to and ages one class up every RAG_FEEDER_JOB_AGING_SECONDS it waits.
+PIPELINE_JOB_CLASSES = {0: "interactive", 1: "background", 2: "maintenance"}
+PIPELINE_JOB_CLASS_SQL = """CASE
+                        WHEN job_type IN ('download', 'enrich') AND corpus_id IS NOT NULL THEN 0
+                        WHEN job_type IN ('download', 'enrich') THEN 1
+                        WHEN job_type = 'pipeline_tick' AND corpus_id IS NOT NULL THEN 1
+                        ELSE 2
+                    END"""
+
+# Fair-queuing cost of a job: the rows it asks for (its "limit"), at least 1.
+PIPELINE_JOB_COST_SQL = """MAX(1.0, MIN(5000.0, COALESCE(
+                        CASE WHEN json_valid(parameters_json) THEN CAST(json_extract(parameters_json, '$.limit') AS REAL) END,
+                        1.0)))"""
+
+
+def create_fair_share_scheduling(conn: sqlite3.Connection, *, commit: bool = True) -> None:
+    """Start-time fair queuing for ``pipeline_jobs`` across corpora.
+
+    Every corpus is a flow in ``pipeline_fair_share``; global jobs share
+    flow 0. On insert, a job gets its ``priority_class`` and a
+    ``start_tag``. The tag is the later of the scheduler's virtual time
+    and its flow's last finish tag. The flow's finish tag then advances by
+    the job's cost over the flow's ``weight``. Claiming a job moves the
+    virtual time to its tag. A corpus that queues many large jobs
+    therefore pushes only its own tags into the future. A job from any
+    other corpus lands next to the one currently being served.
+
+    Triggers keep ``running`` per flow, so ``max_running`` caps can be
+    checked by primary key. They cover jobs inserted or updated by the
+    Node backend as well.
+    """
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA table_info(pipeline_jobs)")
+    columns = {row[1] for row in cursor.fetchall()}
+    if not columns:
+        return
+    for column, column_type in (("priority_class", "INTEGER"), ("start_tag", "REAL"), ("aged_at", "TIMESTAMP")):
+        if column not in columns:
+            cursor.execute(f"ALTER TABLE pipeline_jobs ADD COLUMN {column} {column_type}")
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS pipeline_fair_share (
+            flow_id INTEGER PRIMARY KEY,
+            weight REAL NOT NULL DEFAULT 1.0 CHECK (weight > 0),
+            max_running INTEGER,
+            running INTEGER NOT NULL DEFAULT 0,
+            finish_tag REAL NOT NULL DEFAULT 0
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS pipeline_scheduler (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            virtual_time REAL NOT NULL DEFAULT 0
+        )
+    """)
+    cursor.execute("INSERT OR IGNORE INTO pipeline_scheduler (id, virtual_time) VALUES (1, 0)")
+
+    # Jobs queued before this migration keep their old order: tag 0, ties broken by id.
+    cursor.execute(
+        f"""UPDATE pipeline_jobs
+               SET priority_class = {PIPELINE_JOB_CLASS_SQL},
+                   start_tag = 0,
+                   aged_at = COALESCE(created_at, CURRENT_TIMESTAMP)
+             WHERE priority_class IS NULL"""
+    )
+    cursor.execute(
+        """INSERT OR IGNORE INTO pipeline_fair_share (flow_id)
+           SELECT DISTINCT COALESCE(corpus_id, 0) FROM pipeline_jobs"""
+    )
+    cursor.execute(
+        """UPDATE pipeline_fair_share
+              SET running = (SELECT COUNT(*) FROM pipeline_jobs
+                              WHERE COALESCE(corpus_id, 0) = pipeline_fair_share.flow_id AND status = 'running')"""
+    )
+
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS pipeline_jobs_fair_ai AFTER INSERT ON pipeline_jobs BEGIN
+            INSERT OR IGNORE INTO pipeline_fair_share (flow_id) VALUES (COALESCE(new.corpus_id, 0));
+            UPDATE pipeline_jobs
+               SET priority_class = COALESCE(new.priority_class, {PIPELINE_JOB_CLASS_SQL}),
+                   start_tag = MAX(
+                       (SELECT virtual_time FROM pipeline_scheduler WHERE id = 1),
+                       (SELECT finish_tag FROM pipeline_fair_share WHERE flow_id = COALESCE(new.corpus_id, 0))
+                   ),
+                   aged_at = COALESCE(new.created_at, CURRENT_TIMESTAMP)
+             WHERE id = new.id;
+            UPDATE pipeline_fair_share
+               SET finish_tag = (SELECT start_tag + {PIPELINE_JOB_COST_SQL} / pipeline_fair_share.weight
+                                   FROM pipeline_jobs WHERE id = new.id),
+                   running = running + (new.status = 'running')
+             WHERE flow_id = COALESCE(new.corpus_id, 0);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS pipeline_jobs_fair_start AFTER UPDATE OF status ON pipeline_jobs
+        WHEN new.status = 'running' AND old.status IS NOT 'running'
+        BEGIN
+            UPDATE pipeline_fair_share SET running = running + 1 WHERE flow_id = COALESCE(new.corpus_id, 0);
+            UPDATE pipeline_scheduler SET virtual_time = MAX(virtual_time, COALESCE(new.start_tag, 0)) WHERE id = 1;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS pipeline_jobs_fair_stop AFTER UPDATE OF status ON pipeline_jobs
+        WHEN old.status = 'running' AND new.status IS NOT 'running'
+        BEGIN
+            UPDATE pipeline_fair_share SET running = MAX(running - 1, 0) WHERE flow_id = COALESCE(old.corpus_id, 0);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS pipeline_jobs_fair_ad AFTER DELETE ON pipeline_jobs
+        WHEN old.status = 'running'
+        BEGIN
+            UPDATE pipeline_fair_share SET running = MAX(running - 1, 0) WHERE flow_id = COALESCE(old.corpus_id, 0);
+        END
+    """)
+
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_pipeline_jobs_claim ON pipeline_jobs(status, priority_class, start_tag, id)"
+    )
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_pipeline_jobs_aging ON pipeline_jobs(status, aged_at)")
+    if commit:
+        conn.commit()
+
+
+# Parameters that must match for two pending jobs to merge: everything except
+# the row budget and the explicit row targets, which are combined instead.
+_JOB_SHAPE_SQL = "CASE WHEN json_valid({p}) THEN json_remove({p}, '$.limit', '$.pending_work_ids') END"
+_JOB_TARGETED_SQL = "(COALESCE(json_array_length({p}, '$.pending_work_ids'), 0) > 0)"
+_JOB_TARGET_UNION_SQL = """(SELECT json_group_array(work_id) FROM (
+                            SELECT CAST(value AS INTEGER) AS work_id FROM json_each({old}, '$.pending_work_ids')
+                            UNION
+                            SELECT CAST(value AS INTEGER) FROM json_each({new}, '$.pending_work_ids')
+                        ) WHERE work_id > 0)"""
+
+
+def create_job_coalescing(conn: sqlite3.Connection, *, commit: bool = True) -> None:
+    """Coalesce repeated job requests into the pending job they duplicate.
+
+    Writers insert into the ``pipeline_job_requests`` view instead of
+    ``pipeline_jobs``. The view's trigger looks for the oldest pending job
+    with the same corpus and type whose other parameters match. If one is
+    found, the request is merged into it: targeted enrich jobs take the
+    union of both ``pending_work_ids`` with ``limit`` set to its size, and
+    budget-only jobs add the two limits. Otherwise a new job is inserted.
+    Either way, ``pipeline_scheduler.last_enqueued_id`` holds the job's id
+    until the writer's transaction ends.
+
+    Keeping the rule in the schema means the daemon and the Node backend
+    merge the same way. A merged job keeps its queue position. Its flow's
+    finish tag moves by the added cost, so fair shares stay accurate.
+    """
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA table_info(pipeline_scheduler)")
+    columns = {row[1] for row in cursor.fetchall()}
+    if not columns:
+        return
+    if "last_enqueued_id" not in columns:
+        cursor.execute("ALTER TABLE pipeline_scheduler ADD COLUMN last_enqueued_id INTEGER")
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_pipeline_jobs_coalesce ON pipeline_jobs(corpus_id, job_type, status, id)"
+    )
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS pipeline_jobs_fair_au AFTER UPDATE OF parameters_json ON pipeline_jobs
+        WHEN old.status = 'pending' AND new.status = 'pending'
+        BEGIN
+            UPDATE pipeline_fair_share
+               SET finish_tag = finish_tag + (
+                       (SELECT {PIPELINE_JOB_COST_SQL} FROM (SELECT new.parameters_json AS parameters_json))
+                     - (SELECT {PIPELINE_JOB_COST_SQL} FROM (SELECT old.parameters_json AS parameters_json))
+                   ) / weight
+             WHERE flow_id = COALESCE(new.corpus_id, 0);
+        END
+    """)
+    cursor.execute("""
+        CREATE VIEW IF NOT EXISTS pipeline_job_requests AS
+        SELECT corpus_id, job_type, parameters_json FROM pipeline_jobs
+    """)
+    targets = _JOB_TARGET_UNION_SQL.format(old="parameters_json", new="new.parameters_json")
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS pipeline_job_requests_ii INSTEAD OF INSERT ON pipeline_job_requests BEGIN
+            UPDATE pipeline_scheduler
+               SET last_enqueued_id = (
+                       SELECT id FROM pipeline_jobs
+                        WHERE corpus_id IS new.corpus_id
+                          AND job_type = new.job_type
+                          AND status = 'pending'
+                          AND {_JOB_SHAPE_SQL.format(p="parameters_json")} = {_JOB_SHAPE_SQL.format(p="new.parameters_json")}
+                          AND {_JOB_TARGETED_SQL.format(p="parameters_json")} = {_JOB_TARGETED_SQL.format(p="new.parameters_json")}
+                        ORDER BY id
+                        LIMIT 1
+                   )
+             WHERE id = 1;
+            UPDATE pipeline_jobs
+               SET parameters_json = CASE
+                       WHEN {_JOB_TARGETED_SQL.format(p="parameters_json")} THEN
+                           json_set(parameters_json, '$.pending_work_ids', json({targets}),
+                                    '$.limit', json_array_length({targets}))
+                       WHEN json_type(parameters_json, '$.limit') IS NULL
+                        AND json_type(new.parameters_json, '$.limit') IS NULL THEN parameters_json
+                       ELSE json_set(parameters_json, '$.limit',
+                                     COALESCE(CAST(json_extract(parameters_json, '$.limit') AS INTEGER), 10)
+                                     + COALESCE(CAST(json_extract(new.parameters_json, '$.limit') AS INTEGER), 10))
+                   END
+             WHERE id = (SELECT last_enqueued_id FROM pipeline_scheduler WHERE id = 1);
+            INSERT INTO pipeline_jobs (corpus_id, job_type, status, parameters_json)
+            SELECT new.corpus_id, new.job_type, 'pending', new.parameters_json
+             WHERE (SELECT last_enqueued_id FROM pipeline_scheduler WHERE id = 1) IS NULL;
+            UPDATE pipeline_scheduler SET last_enqueued_id = last_insert_rowid()
+             WHERE id = 1 AND last_enqueued_id IS NULL;
+        END
+    """)
+    if commit:
+        conn.commit()
+
+
 class DatabaseManager:
     """Manages all SQLite database interactions for the literature management tool."""
 
-    def __init__(self, db_path: str | Path = "data/literature.db"):
+    def __init__(
+        self,
+        db_path: str | Path = "data/literature.db",
+        *,
+        identity_index: bool = False,
+        near_duplicates: bool = False,
+        auto_migrate: bool = True,
+    ):
         """Initializes the DatabaseManager, connects to the SQLite database,
         and ensures the necessary table schema is created.
 
         Args:
             db_path: Path to the SQLite database file. 
                      Defaults to 'data/literature.db' relative to project root.
+            identity_index: Keep an in-process hash index of duplicate-detection keys
+                     so ``_find_existing_work`` avoids per-tier SQL lookups.
+            near_duplicates: Consult the MinHash/LSH title index as a final,
+                     low-confidence duplicate tier ('title_minhash').
+            auto_migrate: Apply pending schema migrations on connect. When False an
+                     outdated database is left alone until ``migrate()`` runs.
         """
         self.is_in_memory = (str(db_path).lower() == ":memory:")
 
@@ -42,6 +320,9 @@ class DatabaseManager:
             timeout=30.0,
         )
         self.conn.execute("PRAGMA foreign_keys = ON")
+        # Only takes effect for a brand-new file (or the next full VACUUM); it lets
+        # retention runs hand freed pages back with PRAGMA incremental_vacuum.
+        self.conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
         # Improve concurrent-read/write behavior and reduce transient lock failures.
         try:
             self.conn.execute("PRAGMA journal_mode = WAL")
@@ -54,26 +335,74 @@ class DatabaseManager:
             print(f"{GREEN}[DB Manager] In-memory database connected.{RESET}")
         else:
             print(f"{GREEN}[DB Manager] Connected to database: {self.db_path.resolve()}{RESET}")
-        self._create_schema()
+        self._columns_cache: dict[str, set[str]] = {}
+        self._fts_available = False
+        self._ensure_schema(auto_migrate)
+        self.identity_index: WorkIdentityIndex | None = None
+        if identity_index:
+            self.enable_identity_index()
+        self.near_duplicate_index: NearDuplicateIndex | None = None
+        if near_duplicates:
+            self.enable_near_duplicate_index()
+        self._connection_pool: ConnectionPool | None = None
+
+    def enable_identity_index(self) -> WorkIdentityIndex:
+        """Turn on the in-memory identity index for duplicate lookups (built lazily)."""
+        if self.identity_index is None:
+            self.identity_index = WorkIdentityIndex(self.conn)
+        return self.identity_index
+
+    def disable_identity_index(self) -> None:
+        """Drop the identity index and fall back to SQL duplicate lookups."""
+        if self.identity_index is not None:
+            try:
+                self.identity_index.drop_triggers()
+            except sqlite3.Error:
+                pass
+            self.identity_index = None
+
+    def enable_near_duplicate_index(self) -> NearDuplicateIndex:
+        """Turn on fuzzy title matching and index any works not yet signed."""
+        if self.near_duplicate_index is None:
+            self.near_duplicate_index = NearDuplicateIndex(self.conn)
+            self.near_duplicate_index.sync()
+        return self.near_duplicate_index
+
+    def enable_connection_pool(self, **kwargs) -> ConnectionPool:
+        """Start per-thread read connections and the group-commit writer for threaded callers."""
+        if self._connection_pool is None:
+            self._connection_pool = ConnectionPool(self, **kwargs)
+        return self._connection_pool
 
     def _table_columns(self, table_name: str) -> set[str]:
         """Return concrete DB columns so payloads can carry extra API metadata safely."""
+        cached = self._columns_cache.get(table_name)
+        if cached is not None:
+            return cached
         cur = self.conn.cursor()
         cur.execute(f"PRAGMA table_info({table_name})")
-        return {str(row[1]) for row in cur.fetchall()}
+        columns = {str(row[1]) for row in cur.fetchall()}
+        if columns:
+            self._columns_cache[table_name] = columns
+        return columns
 
     def _ensure_column(self, table_name: str, column_name: str, column_type: str) -> None:
         if column_name not in self._table_columns(table_name):
             self.conn.execute(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type}")
+            self._columns_cache.pop(table_name, None)
 
     def _ensure_works_schema_columns(self) -> None:
         """Add canonical works columns introduced after the first schema version."""
         self._ensure_column("works", "open_access_url", "TEXT")
         self._ensure_column("works", "referenced_work_ids", "TEXT")
         self._ensure_column("works", "cited_by_api_url", "TEXT")
+        self._ensure_column("works", "downloaded_at", "TIMESTAMP")
 
     def close_connection(self):
         """Closes the database connection."""
+        if getattr(self, '_connection_pool', None) is not None:
+            self._connection_pool.close()
+            self._connection_pool = None
         if hasattr(self, 'conn') and self.conn:
             print(f"{GREEN}[DB Manager] Closing connection to {self.db_path}{RESET}")
             self.conn.close()
@@ -81,7 +410,63 @@ class DatabaseManager:
         else:
             print(f"{YELLOW}[DB Manager] Connection already closed or not established for {self.db_path}.{RESET}")
 
-    def _create_schema(self):
+    def schema_version(self) -> int:
+        """Schema version recorded in app_meta; 0 for databases that predate the registry."""
+        try:
+            row = self.conn.execute("SELECT value FROM app_meta WHERE key = 'schema_version'").fetchone()
+        except sqlite3.OperationalError:
+            return 0
+        try:
+            return int(row[0]) if row else 0
+        except (TypeError, ValueError):
+            return 0
+
+    def _ensure_schema(self, auto_migrate: bool) -> None:
+        """Bring the schema up to date; a current database costs one version read and no DDL."""
+        current = self.schema_version()
+        if current > SCHEMA_VERSION:
+            print(f"{YELLOW}[DB Manager] Database schema version {current} is newer than this code ({SCHEMA_VERSION}).{RESET}")
+        elif current < SCHEMA_VERSION:
+            if auto_migrate:
+                self.migrate()
+            else:
+                print(f"{YELLOW}[DB Manager] Database schema version {current} is behind {SCHEMA_VERSION}; run `dl_lit migrate`.{RESET}")
+        self._fts_available = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'works_fts' LIMIT 1"
+        ).fetchone() is not None
+
+    def migrate(self) -> list[int]:
+        """Apply pending schema migrations in order and return the versions applied.
+
+        All pending steps and the version bump share one ``BEGIN IMMEDIATE``
+        transaction; steps run with ``commit=False``. A concurrent migrator
+        waits for the lock and then finds nothing to do. A failing step rolls
+        the whole run back, leaving the schema and its version as they were.
+        """
+        self.conn.commit()
+        # Take the write lock before re-reading the version so concurrent first
+        # starts of several workers do not run the same steps twice.
+        self.conn.execute("BEGIN IMMEDIATE")
+        applied = []
+        try:
+            current = self.schema_version()
+            for version, description, method_name in SCHEMA_MIGRATIONS:
+                if version <= current:
+                    continue
+                print(f"{CYAN}[DB Manager] Applying schema migration {version}: {description}{RESET}")
+                getattr(self, method_name)(commit=False)
+                self._columns_cache.clear()
+                applied.append(version)
+            if applied:
+                self._set_meta("schema_version", str(applied[-1]), commit=False)
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            self._columns_cache.clear()
+            raise
+        return applied
+
+    def _create_schema(self, *, commit: bool = True):
         """Creates the database schema, including all necessary tables if they don't exist."""
         cursor = self.conn.cursor()
 
@@ -211,6 +596,36 @@ class DatabaseManager:
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS work_title_minhash (
+                work_id INTEGER PRIMARY KEY,
+                normalized_title TEXT,
+                signature BLOB,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS work_title_lsh (
+                band INTEGER NOT NULL,
+                bucket INTEGER NOT NULL,
+                work_id INTEGER NOT NULL,
+                PRIMARY KEY (band, bucket, work_id)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS work_payloads (
+                work_id INTEGER NOT NULL,
+                kind TEXT NOT NULL,
+                codec TEXT NOT NULL,
+                data BLOB NOT NULL,
+                PRIMARY KEY (work_id, kind)
+            )
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS work_payloads_ad AFTER DELETE ON works BEGIN
+                DELETE FROM work_payloads WHERE work_id = old.id;
+            END
+        """)
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS citation_edges (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -353,15 +768,23 @@ class DatabaseManager:
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_works_metadata_status ON works(metadata_status, metadata_lease_expires_at)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_works_download_status ON works(download_status, download_lease_expires_at)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_works_origin ON works(origin_type, origin_key)")
+        # Keyset order of the corpus listing (backend/scripts/corpus_list.py). CAST
+        # gives text years the integer key the listing's cursor carries.
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_works_year_sort ON works(COALESCE(CAST(year AS INTEGER), 0), id)")
+        # Per-status queue order of the download listing (backend/scripts/downloads_list.py).
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_works_download_order ON works(download_status, COALESCE(downloaded_at, ''), id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_corpus_works_corpus ON corpus_works(corpus_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_corpus_works_work ON corpus_works(work_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_work_aliases_title ON work_aliases(normalized_alias_title)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_work_title_lsh_work ON work_title_lsh(work_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_work_aliases_work ON work_aliases(work_table, work_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_duplicate_references_existing ON duplicate_references(existing_entry_table, existing_entry_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_citation_edges_source ON citation_edges(source_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_citation_edges_target ON citation_edges(target_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_ingest_entries_source ON ingest_entries(ingest_source)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_search_results_run ON search_results(search_run_id)")
+        self._create_fulltext_index(cursor)
+        self._create_status_counters(cursor)
 
         try:
             has_search_results = cursor.execute(
@@ -374,20 +797,658 @@ class DatabaseManager:
 
         meta_row = cursor.execute("SELECT value FROM app_meta WHERE key = 'works_schema_version'").fetchone()
         if not meta_row:
-            self._set_meta("works_schema_version", "1")
+            self._set_meta("works_schema_version", "1", commit=commit)
             meta_row = ("1",)
         if str(meta_row[0]) == "1":
-            self.conn.commit()
+            if commit:
+                self.conn.commit()
             print(f"{GREEN}[DB Manager] Canonical works schema verified successfully.{RESET}")
             return
 
+    def _create_fulltext_index(self, cursor) -> None:
+        """External-content FTS5 index over works text, kept in sync by triggers."""
+        if not {"title", "abstract", "authors", "keywords", "source"} <= self._table_columns("works"):
+            # Legacy works tables without the text columns cannot back the index.
+            return
+        existed = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'works_fts' LIMIT 1"
+        ).fetchone()
+        try:
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS works_fts USING fts5(
+                    title, abstract, authors, keywords, source,
+                    content='works', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+            """)
+        except sqlite3.OperationalError as e:
+            self._fts_available = False
+            print(f"{YELLOW}[DB Manager] FTS5 unavailable, local full-text search disabled: {e}{RESET}")
+            return
+        self._fts_available = True
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS works_fts_ai AFTER INSERT ON works BEGIN
+                INSERT INTO works_fts(rowid, title, abstract, authors, keywords, source)
+                VALUES (new.id, new.title, new.abstract, new.authors, new.keywords, new.source);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS works_fts_ad AFTER DELETE ON works BEGIN
+                INSERT INTO works_fts(works_fts, rowid, title, abstract, authors, keywords, source)
+                VALUES ('delete', old.id, old.title, old.abstract, old.authors, old.keywords, old.source);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS works_fts_au AFTER UPDATE OF title, abstract, authors, keywords, source ON works BEGIN
+                INSERT INTO works_fts(works_fts, rowid, title, abstract, authors, keywords, source)
+                VALUES ('delete', old.id, old.title, old.abstract, old.authors, old.keywords, old.source);
+                INSERT INTO works_fts(rowid, title, abstract, authors, keywords, source)
+                VALUES (new.id, new.title, new.abstract, new.authors, new.keywords, new.source);
+            END
+        """)
+        if not existed:
+            # Index rows written before the FTS table existed.
+            cursor.execute("INSERT INTO works_fts(works_fts) VALUES ('rebuild')")
+
+    def _create_status_counters(self, cursor) -> None:
+        """Per-corpus (metadata_status, download_status) counts kept current by triggers.
+
+        ``corpus_id = 0`` holds the totals over all works (corpora ids start at 1).
+        Links and works may be written in either order: each side only counts
+        pairs whose other half already exists.
+        """
+        if not {"metadata_status", "download_status"} <= self._table_columns("works"):
+            return
+        existed = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'corpus_status_counts' LIMIT 1"
+        ).fetchone()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS corpus_status_counts (
+                corpus_id INTEGER NOT NULL,
+                metadata_status TEXT NOT NULL,
+                download_status TEXT NOT NULL,
+                n INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (corpus_id, metadata_status, download_status)
+            ) WITHOUT ROWID
+        """)
+        old_pair = "COALESCE(old.metadata_status, 'pending'), COALESCE(old.download_status, 'not_requested')"
+        new_pair = "COALESCE(new.metadata_status, 'pending'), COALESCE(new.download_status, 'not_requested')"
+        work_pair = "COALESCE(metadata_status, 'pending'), COALESCE(download_status, 'not_requested')"
+        upsert = "ON CONFLICT(corpus_id, metadata_status, download_status) DO UPDATE SET n = n + excluded.n"
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS corpus_status_counts_works_ai AFTER INSERT ON works BEGIN
+                INSERT INTO corpus_status_counts (corpus_id, metadata_status, download_status, n)
+                SELECT corpus_id, {new_pair}, 1 FROM corpus_works WHERE work_id = new.id
+                UNION ALL SELECT 0, {new_pair}, 1 WHERE true
+                {upsert};
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS corpus_status_counts_works_ad AFTER DELETE ON works BEGIN
+                UPDATE corpus_status_counts SET n = n - 1
+                 WHERE (metadata_status, download_status) = ({old_pair})
+                   AND (corpus_id = 0 OR corpus_id IN (SELECT corpus_id FROM corpus_works WHERE work_id = old.id));
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS corpus_status_counts_works_au AFTER UPDATE OF metadata_status, download_status ON works
+            WHEN old.metadata_status IS NOT new.metadata_status OR old.download_status IS NOT new.download_status
+            BEGIN
+                UPDATE corpus_status_counts SET n = n - 1
+                 WHERE (metadata_status, download_status) = ({old_pair})
+                   AND (corpus_id = 0 OR corpus_id IN (SELECT corpus_id FROM corpus_works WHERE work_id = old.id));
+                INSERT INTO corpus_status_counts (corpus_id, metadata_status, download_status, n)
+                SELECT corpus_id, {new_pair}, 1 FROM corpus_works WHERE work_id = new.id
+                UNION ALL SELECT 0, {new_pair}, 1 WHERE true
+                {upsert};
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS corpus_status_counts_links_ai AFTER INSERT ON corpus_works BEGIN
+                INSERT INTO corpus_status_counts (corpus_id, metadata_status, download_status, n)
+                SELECT new.corpus_id, {work_pair}, 1 FROM works WHERE id = new.work_id
+                {upsert};
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS corpus_status_counts_links_ad AFTER DELETE ON corpus_works BEGIN
+                UPDATE corpus_status_counts SET n = n - 1
+                 WHERE corpus_id = old.corpus_id
+                   AND (metadata_status, download_status) = (SELECT {work_pair} FROM works WHERE id = old.work_id);
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS corpus_status_counts_links_au AFTER UPDATE OF corpus_id, work_id ON corpus_works BEGIN
+                UPDATE corpus_status_counts SET n = n - 1
+                 WHERE corpus_id = old.corpus_id
+                   AND (metadata_status, download_status) = (SELECT {work_pair} FROM works WHERE id = old.work_id);
+                INSERT INTO corpus_status_counts (corpus_id, metadata_status, download_status, n)
+                SELECT new.corpus_id, {work_pair}, 1 FROM works WHERE id = new.work_id
+                {upsert};
+            END
+        """)
+        if not existed:
+            self.rebuild_corpus_status_counts(commit=False)
+
+    def rebuild_corpus_status_counts(self, *, commit: bool = True) -> int:
+        """Recount ``corpus_status_counts`` from ``works``/``corpus_works`` (fixes drift)."""
+        cur = self.conn.cursor()
+        cur.execute("DELETE FROM corpus_status_counts")
+        cur.execute(
+            """INSERT INTO corpus_status_counts (corpus_id, metadata_status, download_status, n)
+               SELECT 0, COALESCE(metadata_status, 'pending'), COALESCE(download_status, 'not_requested'), COUNT(*)
+                 FROM works
+                GROUP BY 1, 2, 3"""
+        )
+        cur.execute(
+            """INSERT INTO corpus_status_counts (corpus_id, metadata_status, download_status, n)
+               SELECT cw.corpus_id, COALESCE(w.metadata_status, 'pending'), COALESCE(w.download_status, 'not_requested'), COUNT(*)
+                 FROM corpus_works cw
+                 JOIN works w ON w.id = cw.work_id
+                GROUP BY 1, 2, 3"""
+        )
+        rows = cur.execute("SELECT COUNT(*) FROM corpus_status_counts").fetchone()[0]
+        if commit:
+            self.conn.commit()
+        return int(rows)
+
+    # Readiness of a works row for each claim queue: NULL means "not queued",
+    # otherwise the epoch second it becomes claimable (0 = immediately). Rows
+    # held under a lease stay queued until the lease runs out, so reclaiming an
+    # abandoned claim is the same index range scan as a fresh claim.
+    _QUEUE_READY_SQL = {
+        "enrich_queue": """
+            CASE WHEN COALESCE({p}download_status, 'not_requested') = 'not_requested' THEN
+                CASE COALESCE({p}metadata_status, 'pending')
+                    WHEN 'pending' THEN {retry_at}
+                    WHEN 'in_progress' THEN {p}metadata_lease_expires_at
+                END
+            END""",
+        "download_queue": """
+            CASE {p}download_status
+                WHEN 'queued' THEN {retry_at}
+                WHEN 'in_progress' THEN {p}download_lease_expires_at
+            END""",
+    }
+    _QUEUE_WATCHED_COLUMNS = {
+        "enrich_queue": "metadata_status, download_status, metadata_lease_expires_at",
+        "download_queue": "download_status, download_lease_expires_at",
+    }
+    _QUEUE_STAGES = {"enrich_queue": "metadata", "download_queue": "download"}
+
+    def _queue_ready_sql(self, table: str, prefix: str) -> str:
+        """Readiness expression for ``table``, honoring retry backoff once migration 3 added it."""
+        stage = self._QUEUE_STAGES[table]
+        retry_at = "0"
+        if f"{stage}_next_eligible_at" in self._table_columns("works"):
+            retry_at = f"COALESCE({prefix}{stage}_next_eligible_at, 0)"
+        return self._QUEUE_READY_SQL[table].format(p=prefix, retry_at=retry_at)
+
+    def _queue_watched_columns(self, table: str) -> str:
+        column = f"{self._QUEUE_STAGES[table]}_next_eligible_at"
+        if column in self._table_columns("works"):
+            return f"{self._QUEUE_WATCHED_COLUMNS[table]}, {column}"
+        return self._QUEUE_WATCHED_COLUMNS[table]
+
+    def _create_work_queues(self, *, commit: bool = True) -> None:
+        """Ready queues for enrichment and download claims, kept current by triggers.
+
+        One row per (corpus, work) that a claim could pick up, plus a
+        ``corpus_id = 0`` row for unscoped claims, keyed so a claim is a range
+        scan of ``(corpus_id, priority, ready_at, work_id)`` instead of a scan
+        of ``works``. Lower ``priority`` is claimed first; everything is 0 today.
+        """
+        if not {"metadata_status", "download_status", "metadata_lease_expires_at", "download_lease_expires_at"} <= self._table_columns("works"):
+            return
+        cursor = self.conn.cursor()
+        for table in self._QUEUE_READY_SQL:
+            new_ready = self._queue_ready_sql(table, "new.")
+            old_ready = self._queue_ready_sql(table, "old.")
+            work_ready = self._queue_ready_sql(table, "")
+            insert_new = f"""
+                INSERT OR IGNORE INTO {table} (corpus_id, ready_at, work_id)
+                SELECT corpus_id, {new_ready}, new.id FROM corpus_works WHERE work_id = new.id AND {new_ready} IS NOT NULL
+                UNION ALL SELECT 0, {new_ready}, new.id WHERE {new_ready} IS NOT NULL;
+            """
+            insert_link = f"""
+                INSERT OR IGNORE INTO {table} (corpus_id, ready_at, work_id)
+                SELECT new.corpus_id, {work_ready}, id FROM works WHERE id = new.work_id AND {work_ready} IS NOT NULL;
+            """
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    corpus_id INTEGER NOT NULL,
+                    priority INTEGER NOT NULL DEFAULT 0,
+                    ready_at INTEGER NOT NULL,
+                    work_id INTEGER NOT NULL,
+                    PRIMARY KEY (corpus_id, priority, ready_at, work_id)
+                ) WITHOUT ROWID
+            """)
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_work ON {table}(work_id)")
+            cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {table}_works_ai AFTER INSERT ON works BEGIN {insert_new} END")
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_works_ad AFTER DELETE ON works BEGIN
+                    DELETE FROM {table} WHERE work_id = old.id;
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_works_au AFTER UPDATE OF {self._queue_watched_columns(table)} ON works
+                WHEN ({old_ready}) IS NOT ({new_ready})
+                BEGIN
+                    DELETE FROM {table} WHERE work_id = old.id;
+                    {insert_new}
+                END
+            """)
+            cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {table}_links_ai AFTER INSERT ON corpus_works BEGIN {insert_link} END")
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_links_ad AFTER DELETE ON corpus_works BEGIN
+                    DELETE FROM {table} WHERE work_id = old.work_id AND corpus_id = old.corpus_id;
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_links_au AFTER UPDATE OF corpus_id, work_id ON corpus_works BEGIN
+                    DELETE FROM {table} WHERE work_id = old.work_id AND corpus_id = old.corpus_id;
+                    {insert_link}
+                END
+            """)
+        self.rebuild_work_queues(commit=False)
+        if commit:
+            self.conn.commit()
+
+    def rebuild_work_queues(self, *, commit: bool = True) -> int:
+        """Refill ``enrich_queue``/``download_queue`` from ``works`` (fixes drift)."""
+        cur = self.conn.cursor()
+        total = 0
+        for table in self._QUEUE_READY_SQL:
+            ready = self._queue_ready_sql(table, "w.")
+            cur.execute(f"DELETE FROM {table}")
+            cur.execute(
+                f"""INSERT OR IGNORE INTO {table} (corpus_id, ready_at, work_id)
+                    SELECT 0, {ready}, w.id FROM works w WHERE {ready} IS NOT NULL
+                    UNION ALL
+                    SELECT cw.corpus_id, {ready}, w.id
+                      FROM corpus_works cw
+                      JOIN works w ON w.id = cw.work_id
+                     WHERE {ready} IS NOT NULL"""
+            )
+            total += int(cur.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0])
+        if commit:
+            self.conn.commit()
+        return total
+
+    def _add_retry_scheduling(self, *, commit: bool = True) -> None:
+        """Per-stage backoff and failure-streak columns; queue triggers start honoring them."""
+        if not {"metadata_status", "download_status"} <= self._table_columns("works"):
+            return
+        for stage in FAILURE_STAGES:
+            self._ensure_column("works", f"{stage}_next_eligible_at", "INTEGER")
+            self._ensure_column("works", f"{stage}_failure_category", "TEXT")
+            self._ensure_column("works", f"{stage}_failure_streak", "INTEGER NOT NULL DEFAULT 0")
+        for table in self._QUEUE_READY_SQL:
+            for suffix in ("works_ai", "works_ad", "works_au", "links_ai", "links_ad", "links_au"):
+                self.conn.execute(f"DROP TRIGGER IF EXISTS {table}_{suffix}")
+        self._create_work_queues(commit=commit)
+
+    # Resolves one citation_edges endpoint to a works.id: the recorded row id
+    # first, then the OpenAlex id, DOI or 'works:<id>' node id it was stored as.
+    _CITATION_ENDPOINT_SQL = """COALESCE(
+            (SELECT id FROM works WHERE id = {p}{side}_row_id AND {p}{side}_table = 'works'),
+            (SELECT id FROM works WHERE openalex_id = {p}{side}_id AND openalex_id IS NOT NULL AND openalex_id != ''),
+            (SELECT id FROM works WHERE normalized_doi = {p}{side}_id AND normalized_doi IS NOT NULL AND normalized_doi != ''),
+            (SELECT id FROM works WHERE {p}{side}_id LIKE 'works:%' AND id = CAST(substr({p}{side}_id, 7) AS INTEGER)))"""
+
+    def _citation_edge_sql(self, prefix: str) -> tuple[str, str, str]:
+        """(source work id, target work id, relationship code) expressions for a citation_edges row."""
+        return (
+            self._CITATION_ENDPOINT_SQL.format(p=prefix, side="source"),
+            self._CITATION_ENDPOINT_SQL.format(p=prefix, side="target"),
+            f"CASE {prefix}relationship_type WHEN 'cited_by' THEN 1 ELSE 0 END",
+        )
+
+    def _create_citation_store(self, *, commit: bool = True) -> None:
+        """Integer-keyed copy of ``citation_edges``, kept current by triggers.
+
+        ``work_citations`` holds edges whose ends are both works. Edges from a
+        work to something not (yet) in the corpus go to
+        ``work_citations_unresolved`` against an interned ``citation_external_ids``
+        string, and move over once a work with that OpenAlex id or DOI appears.
+        The text table stays the write path and the record of what was seen.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS citation_external_ids (
+                id INTEGER PRIMARY KEY,
+                external_id TEXT NOT NULL UNIQUE
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS work_citations (
+                source_work_id INTEGER NOT NULL,
+                target_work_id INTEGER NOT NULL,
+                relationship INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (source_work_id, target_work_id, relationship)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS work_citations_unresolved (
+                source_work_id INTEGER NOT NULL,
+                external_id INTEGER NOT NULL,
+                relationship INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (source_work_id, external_id, relationship)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_work_citations_target ON work_citations(target_work_id, source_work_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_work_citations_unresolved_external ON work_citations_unresolved(external_id)")
+        source, target, relationship = self._citation_edge_sql("new.")
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS work_citations_edges_ai AFTER INSERT ON citation_edges BEGIN
+                INSERT OR IGNORE INTO work_citations (source_work_id, target_work_id, relationship)
+                SELECT s, t, r FROM (SELECT {source} AS s, {target} AS t, {relationship} AS r)
+                 WHERE s IS NOT NULL AND t IS NOT NULL AND s != t;
+                INSERT OR IGNORE INTO citation_external_ids (external_id)
+                SELECT new.target_id FROM (SELECT {source} AS s, {target} AS t) WHERE s IS NOT NULL AND t IS NULL;
+                INSERT OR IGNORE INTO work_citations_unresolved (source_work_id, external_id, relationship)
+                SELECT s, x.id, r FROM (SELECT {source} AS s, {target} AS t, {relationship} AS r)
+                  JOIN citation_external_ids x ON x.external_id = new.target_id
+                 WHERE s IS NOT NULL AND t IS NULL;
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS work_citations_works_ad AFTER DELETE ON works BEGIN
+                DELETE FROM work_citations WHERE source_work_id = old.id;
+                DELETE FROM work_citations WHERE target_work_id = old.id;
+                DELETE FROM work_citations_unresolved WHERE source_work_id = old.id;
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS work_citations_works_au AFTER UPDATE OF openalex_id, normalized_doi ON works BEGIN
+                INSERT OR IGNORE INTO work_citations (source_work_id, target_work_id, relationship)
+                SELECT u.source_work_id, new.id, u.relationship
+                  FROM citation_external_ids x JOIN work_citations_unresolved u ON u.external_id = x.id
+                 WHERE x.external_id IN (new.openalex_id, new.normalized_doi) AND u.source_work_id != new.id;
+                DELETE FROM work_citations_unresolved WHERE external_id IN (
+                    SELECT id FROM citation_external_ids WHERE external_id IN (new.openalex_id, new.normalized_doi)
+                );
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS work_citations_works_ai AFTER INSERT ON works
+            WHEN new.openalex_id IS NOT NULL OR new.normalized_doi IS NOT NULL
+            BEGIN
+                INSERT OR IGNORE INTO work_citations (source_work_id, target_work_id, relationship)
+                SELECT u.source_work_id, new.id, u.relationship
+                  FROM citation_external_ids x JOIN work_citations_unresolved u ON u.external_id = x.id
+                 WHERE x.external_id IN (new.openalex_id, new.normalized_doi) AND u.source_work_id != new.id;
+                DELETE FROM work_citations_unresolved WHERE external_id IN (
+                    SELECT id FROM citation_external_ids WHERE external_id IN (new.openalex_id, new.normalized_doi)
+                );
+            END
+        """)
+        self.rebuild_citation_store(commit=False)
+        if commit:
+            self.conn.commit()
+
+    def _add_lookup_indexes(self, *, commit: bool = True) -> None:
+        """Index the lookups that used to wrap indexed columns in expressions.
+
+        ``year_int`` is ``year`` when it holds an integer, so title/year matches
+        compare integers on an index instead of casting every candidate row.
+        It replaces ``year`` in the title index. ``pipeline_jobs`` gets an
+        index for lease recovery.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("PRAGMA table_xinfo(works)")
+        if "year_int" not in {row[1] for row in cursor.fetchall()}:
+            cursor.execute(
+                "ALTER TABLE works ADD COLUMN year_int INTEGER "
+                "GENERATED ALWAYS AS (CASE WHEN typeof(year) = 'integer' THEN year END) VIRTUAL"
+            )
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_works_title_year_int ON works(normalized_title, year_int)")
+        cursor.execute("DROP INDEX IF EXISTS idx_works_title_year")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_pipeline_jobs_started ON pipeline_jobs(status, started_at)")
+        if commit:
+            self.conn.commit()
+
+    def _add_fair_share_scheduling(self, *, commit: bool = True) -> None:
+        """Per-corpus fair queuing for ``pipeline_jobs``; see ``create_fair_share_scheduling``."""
+        create_fair_share_scheduling(self.conn, commit=commit)
+
+    def _add_job_coalescing(self, *, commit: bool = True) -> None:
+        """Merge duplicate job requests at enqueue time; see ``create_job_coalescing``."""
+        create_job_coalescing(self.conn, commit=commit)
+
+    def _add_identity_change_log(self, *, commit: bool = True) -> None:
+        """Log identity-key updates and deletes so ``WorkIdentityIndex`` can catch up incrementally.
+
+        Inserts need no log entry: ids are AUTOINCREMENT, so an index finds new
+        works and aliases above its high-water marks. Triggers record
+        ``(table_name, row_id)`` when a row's identity keys change or it is
+        deleted, and trim the log to the last ``IDENTITY_CHANGE_LOG_KEEP``
+        entries.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS work_identity_changes (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                table_name TEXT NOT NULL,
+                row_id INTEGER NOT NULL
+            )
+        """)
+        watched = {
+            "works": ("normalized_doi", "openalex_id", "normalized_title", "normalized_authors", "year"),
+            "work_aliases": ("work_table", "work_id", "normalized_alias_title", "alias_year"),
+        }
+        trim = (
+            "DELETE FROM work_identity_changes "
+            f"WHERE seq <= (SELECT MAX(seq) FROM work_identity_changes) - {IDENTITY_CHANGE_LOG_KEEP};"
+        )
+        for table, columns in watched.items():
+            changed = " OR ".join(f"NEW.{column} IS NOT OLD.{column}" for column in columns)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS work_identity_changes_{table}_au
+                AFTER UPDATE OF {', '.join(columns)} ON {table}
+                WHEN {changed}
+                BEGIN
+                    INSERT INTO work_identity_changes (table_name, row_id) VALUES ('{table}', NEW.id);
+                    {trim}
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS work_identity_changes_{table}_ad AFTER DELETE ON {table} BEGIN
+                    INSERT INTO work_identity_changes (table_name, row_id) VALUES ('{table}', OLD.id);
+                    {trim}
+                END
+            """)
+        if commit:
+            self.conn.commit()
+
+    def set_pipeline_fair_share(self, corpus_id: int | None, *, weight: float | None = None, max_running: int | None = None) -> dict:
+        """Set a corpus's scheduling weight and/or cap on its running jobs; ``max_running=0`` lifts the cap.
+
+        Global jobs are the ``corpus_id=None`` flow. Arguments left as ``None`` keep their current value.
+        """
+        flow_id = int(corpus_id or 0)
+        cur = self.conn.cursor()
+        cur.execute("INSERT OR IGNORE INTO pipeline_fair_share (flow_id) VALUES (?)", (flow_id,))
+        if weight is not None:
+            if float(weight) <= 0:
+                raise ValueError("weight must be positive")
+            cur.execute("UPDATE pipeline_fair_share SET weight = ? WHERE flow_id = ?", (float(weight), flow_id))
+        if max_running is not None:
+            cap = max(0, int(max_running))
+            cur.execute("UPDATE pipeline_fair_share SET max_running = ? WHERE flow_id = ?", (cap or None, flow_id))
+        self.conn.commit()
+        row = cur.execute(
+            "SELECT weight, max_running, running, finish_tag FROM pipeline_fair_share WHERE flow_id = ?", (flow_id,)
+        ).fetchone()
+        return {"flow_id": flow_id, "weight": row[0], "max_running": row[1], "running": row[2], "finish_tag": row[3]}
+
+    def rebuild_citation_store(self, *, commit: bool = True) -> dict[str, int]:
+        """Refill ``work_citations`` and its unresolved side table from ``citation_edges``."""
+        cur = self.conn.cursor()
+        source, target, relationship = self._citation_edge_sql("e.")
+        resolved = f"SELECT {source} AS s, {target} AS t, {relationship} AS r, e.target_id AS x FROM citation_edges e"
+        cur.execute("DELETE FROM work_citations")
+        cur.execute("DELETE FROM work_citations_unresolved")
+        cur.execute(f"CREATE TEMP TABLE _citation_rebuild AS {resolved}")
+        try:
+            cur.execute(
+                """INSERT OR IGNORE INTO work_citations (source_work_id, target_work_id, relationship)
+                   SELECT s, t, r FROM _citation_rebuild WHERE s IS NOT NULL AND t IS NOT NULL AND s != t"""
+            )
+            cur.execute(
+                """INSERT OR IGNORE INTO citation_external_ids (external_id)
+                   SELECT x FROM _citation_rebuild WHERE s IS NOT NULL AND t IS NULL"""
+            )
+            cur.execute(
+                """INSERT OR IGNORE INTO work_citations_unresolved (source_work_id, external_id, relationship)
+                   SELECT b.s, x.id, b.r FROM _citation_rebuild b JOIN citation_external_ids x ON x.external_id = b.x
+                    WHERE b.s IS NOT NULL AND b.t IS NULL"""
+            )
+        finally:
+            cur.execute("DROP TABLE temp._citation_rebuild")
+        cur.execute(
+            """DELETE FROM citation_external_ids
+                WHERE id NOT IN (SELECT external_id FROM work_citations_unresolved)"""
+        )
+        counts = {
+            "resolved": int(cur.execute("SELECT COUNT(*) FROM work_citations").fetchone()[0]),
+            "unresolved": int(cur.execute("SELECT COUNT(*) FROM work_citations_unresolved").fetchone()[0]),
+        }
+        if commit:
+            self.conn.commit()
+        return counts
+
+    def record_stage_failure(
+        self,
+        work_id: int,
+        stage: str,
+        category: str | None,
+        error: str | None = None,
+        *,
+        now: int | None = None,
+    ) -> tuple[str | None, str | None]:
+        """Record a failed enrichment (``stage='metadata'``) or download attempt.
+
+        Retryable categories go back to pending/queued, eligible again after an
+        exponential backoff on the stage's attempt count. The
+        ``QUARANTINE_AFTER_FAILURES``-th consecutive failure with the same
+        category quarantines the work instead. Other categories mark the stage
+        failed. Returns ``(new_status, error)``.
+        """
+        if stage not in FAILURE_STAGES:
+            return None, f"Unknown stage: {stage}"
+        category = str(category or "unknown")
+        now = int(time.time()) if now is None else int(now)
+        cur = self.conn.cursor()
+        try:
+            row = cur.execute(
+                f"SELECT {stage}_attempt_count, {stage}_failure_category, {stage}_failure_streak FROM works WHERE id = ?",
+                (int(work_id),),
+            ).fetchone()
+            if not row:
+                return None, f"No entry found in works with ID {work_id}"
+            attempts, last_category, streak = int(row[0] or 0), row[1], int(row[2] or 0)
+            streak = streak + 1 if last_category == category else 1
+            next_eligible_at = None
+            if category not in RETRYABLE_FAILURE_CATEGORIES:
+                status = "failed"
+            elif streak >= QUARANTINE_AFTER_FAILURES:
+                status = "quarantined"
+            else:
+                status = FAILURE_STAGES[stage]
+                next_eligible_at = now + min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** max(0, attempts - 1))
+            notes_sql = ", status_notes = ?" if stage == "download" else ""
+            params = [status, error or category, category, streak, next_eligible_at]
+            if stage == "download":
+                params.append(error or category)
+            cur.execute(
+                f"""UPDATE works
+                       SET {stage}_status = ?,
+                           {stage}_error = ?,
+                           {stage}_failure_category = ?,
+                           {stage}_failure_streak = ?,
+                           {stage}_next_eligible_at = ?,
+                           {stage}_claimed_by = NULL,
+                           {stage}_claimed_at = NULL,
+                           {stage}_lease_expires_at = NULL
+                           {notes_sql}
+                     WHERE id = ?""",
+                params + [int(work_id)],
+            )
+            self.conn.commit()
+            if status == "quarantined":
+                print(f"{YELLOW}[DB Manager] Quarantined work ID {work_id} after {streak} '{category}' {stage} failures.{RESET}")
+            return status, None
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            return None, str(e)
+
+    def get_quarantined_works(self, stage: str | None = None, limit: int = 100) -> list[dict]:
+        """Quarantined works, most recently failed first."""
+        stages = [stage] if stage else list(FAILURE_STAGES)
+        parts = [
+            f"""SELECT id, title, '{name}' AS stage, {name}_failure_category AS failure_category,
+                       {name}_failure_streak AS failure_streak, {name}_attempt_count AS attempts,
+                       {name}_error AS error, {name}_last_attempt_at AS last_attempt_at
+                  FROM works WHERE {name}_status = 'quarantined'"""
+            for name in stages
+            if name in FAILURE_STAGES
+        ]
+        if not parts:
+            return []
+        cur = self.conn.cursor()
+        cur.row_factory = sqlite3.Row
+        cur.execute(
+            f"SELECT * FROM ({' UNION ALL '.join(parts)}) ORDER BY COALESCE(last_attempt_at, 0) DESC, id DESC LIMIT ?",
+            (int(limit),),
+        )
+        return [dict(row) for row in cur.fetchall()]
+
+    def release_quarantined(self, work_ids: list[int], stage: str | None = None) -> int:
+        """Put quarantined works back in their queue with a clean failure history."""
+        ids = [int(work_id) for work_id in work_ids]
+        if not ids:
+            return 0
+        placeholders = ",".join("?" * len(ids))
+        released = 0
+        cur = self.conn.cursor()
+        try:
+            for name, retry_status in FAILURE_STAGES.items():
+                if stage and name != stage:
+                    continue
+                cur.execute(
+                    f"""UPDATE works
+                           SET {name}_status = ?,
+                               {name}_failure_category = NULL,
+                               {name}_failure_streak = 0,
+                               {name}_next_eligible_at = NULL,
+                               {name}_attempt_count = 0
+                         WHERE id IN ({placeholders}) AND {name}_status = 'quarantined'""",
+                    [retry_status] + ids,
+                )
+                released += cur.rowcount
+            self.conn.commit()
+        except sqlite3.Error:
+            self.conn.rollback()
+            raise
+        return released
+
+    def get_corpus_status_counts(self, corpus_id: int | None = None) -> dict[tuple[str, str], int]:
+        """``{(metadata_status, download_status): n}`` for a corpus, or all works when None."""
+        cur = self.conn.cursor()
+        cur.execute(
+            "SELECT metadata_status, download_status, n FROM corpus_status_counts WHERE corpus_id = ? AND n > 0",
+            (int(corpus_id) if corpus_id is not None else 0,),
+        )
+        return {(row[0], row[1]): int(row[2]) for row in cur.fetchall()}
+
     def _get_meta(self, key: str) -> str | None:
         cur = self.conn.cursor()
         cur.execute("SELECT value FROM app_meta WHERE key = ?", (str(key),))
         row = cur.fetchone()
         return row[0] if row else None
 
-    def _set_meta(self, key: str, value: str) -> None:
+    def _set_meta(self, key: str, value: str, *, commit: bool = True) -> None:
         cur = self.conn.cursor()
         cur.execute(
             """INSERT INTO app_meta(key, value, updated_at)
@@ -395,7 +1456,8 @@ class DatabaseManager:
                ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = CURRENT_TIMESTAMP""",
             (str(key), str(value)),
         )
-        self.conn.commit()
+        if commit:
+            self.conn.commit()
 
     def _clean_json_text(self, value):
         if value is None:
@@ -415,6 +1477,7 @@ class DatabaseManager:
             "queued": 1,
             "not_requested": 0,
             "failed": 0,
+            "quarantined": 0,
         }
         if preferred_download_rank.get(str(incoming.get("download_status") or ""), -1) > preferred_download_rank.get(str(existing.get("download_status") or ""), -1):
             merged["download_status"] = incoming.get("download_status")
@@ -423,7 +1486,7 @@ class DatabaseManager:
             merged["downloaded_at"] = incoming.get("downloaded_at")
             merged["file_path"] = incoming.get("file_path") or existing.get("file_path")
             merged["file_checksum"] = incoming.get("file_checksum") or existing.get("file_checksum")
-        metadata_rank = {"matched": 3, "in_progress": 2, "pending": 1, "failed": 0}
+        metadata_rank = {"matched": 3, "in_progress": 2, "pending": 1, "failed": 0, "quarantined": 0}
         if metadata_rank.get(str(incoming.get("metadata_status") or ""), -1) > metadata_rank.get(str(existing.get("metadata_status") or ""), -1):
             merged["metadata_status"] = incoming.get("metadata_status")
             merged["metadata_source"] = incoming.get("metadata_source") or existing.get("metadata_source")
@@ -437,8 +1500,47 @@ class DatabaseManager:
         return merged
 
     def _find_existing_work(self, *, doi=None, openalex_id=None, title=None, authors=None, editors=None, year=None, exclude_id: int | None = None) -> tuple[int | None, str | None]:
-        cur = self.conn.cursor()
+        found_id, field = self._find_exact_work(
+            doi=doi, openalex_id=openalex_id, title=title, authors=authors, editors=editors, year=year, exclude_id=exclude_id
+        )
+        if found_id or self.near_duplicate_index is None:
+            return found_id, field
+        found_id, _ = self.near_duplicate_index.find(
+            self._normalize_text(title),
+            year=year,
+            normalized_doi=self._normalize_doi(doi),
+            openalex_id=self._normalize_openalex_id(openalex_id),
+            exclude_id=exclude_id,
+        )
+        return (found_id, "title_minhash") if found_id else (None, None)
+
+    @staticmethod
+    def _year_match_sql(year_str: str) -> tuple[str, object]:
+        """Predicate and parameter matching ``CAST(year AS TEXT) = year_str``.
+
+        Canonical integers go through the indexed ``year_int`` column; anything
+        else ('2020a', 'n.d.') keeps the text comparison.
+        """
+        try:
+            year_int = int(year_str)
+        except ValueError:
+            return "CAST(year AS TEXT) = ?", year_str
+        if str(year_int) != year_str:
+            return "CAST(year AS TEXT) = ?", year_str
+        return "year_int = ?", year_int
+
+    def _find_exact_work(self, *, doi=None, openalex_id=None, title=None, authors=None, editors=None, year=None, exclude_id: int | None = None) -> tuple[int | None, str | None]:
         normalized_contributors = self._normalize_contributor_fields(authors, editors)
+        if self.identity_index is not None:
+            return self.identity_index.find(
+                normalized_doi=self._normalize_doi(doi),
+                normalized_openalex=self._normalize_openalex_id(openalex_id),
+                normalized_title=self._normalize_text(title),
+                normalized_contributors=normalized_contributors,
+                year_str=str(year).strip() if year is not None and str(year).strip() else None,
+                exclude_id=exclude_id,
+            )
+        cur = self.conn.cursor()
         def _one(query, params, field):
             cur.execute(query, params)
             row = cur.fetchone()
@@ -467,8 +1569,9 @@ class DatabaseManager:
         year_str = str(year).strip() if year is not None and str(year).strip() else None
         if normalized_title:
             if year_str and normalized_contributors:
-                params = [normalized_title, normalized_contributors, year_str]
-                query = "SELECT id FROM works WHERE normalized_title = ? AND normalized_authors = ? AND CAST(year AS TEXT) = ?"
+                year_sql, year_param = self._year_match_sql(year_str)
+                params = [normalized_title, normalized_contributors, year_param]
+                query = f"SELECT id FROM works WHERE normalized_title = ? AND normalized_authors = ? AND {year_sql}"
                 if exclude_id:
                     query += " AND id != ?"
                     params.append(int(exclude_id))
@@ -485,8 +1588,9 @@ class DatabaseManager:
                 if found_id:
                     return found_id, field
             if year_str:
-                params = [normalized_title, year_str]
-                query = "SELECT id FROM works WHERE normalized_title = ? AND CAST(year AS TEXT) = ?"
+                year_sql, year_param = self._year_match_sql(year_str)
+                params = [normalized_title, year_param]
+                query = f"SELECT id FROM works WHERE normalized_title = ? AND {year_sql}"
                 if exclude_id:
                     query += " AND id != ?"
                     params.append(int(exclude_id))
@@ -507,20 +1611,107 @@ class DatabaseManager:
 
     def _insert_work_record(self, data: dict) -> int:
         columns = self._table_columns("works")
-        payload = {k: v for k, v in data.items() if v is not None and k in columns}
+        payload = {k: v for k, v in data.items() if v is not None and k in columns and k not in PAYLOAD_KINDS}
         cols = ", ".join(payload.keys())
         placeholders = ", ".join(["?"] * len(payload))
         cur = self.conn.cursor()
         cur.execute(f"INSERT INTO works ({cols}) VALUES ({placeholders})", tuple(payload.values()))
-        return int(cur.lastrowid)
+        new_id = int(cur.lastrowid)
+        self._write_work_payloads([(new_id, kind, data.get(kind)) for kind in PAYLOAD_KINDS if data.get(kind) is not None])
+        if self.near_duplicate_index is not None:
+            self.near_duplicate_index.index_works([(new_id, payload.get("normalized_title"))])
+        return new_id
 
     def _update_work_record(self, work_id: int, data: dict) -> None:
         columns = self._table_columns("works")
         payload = {k: v for k, v in data.items() if k != "id" and k in columns}
-        if not payload:
+        kinds = [kind for kind in PAYLOAD_KINDS if kind in data]
+        for kind in kinds:
+            # Payloads live in work_payloads; clear any legacy inline copy.
+            if kind in payload:
+                payload[kind] = None
+        if not payload and not kinds:
             return
-        assignments = ", ".join([f"{k} = ?" for k in payload.keys()]) + ", updated_at = CURRENT_TIMESTAMP"
+        assignments = ", ".join([f"{k} = ?" for k in payload.keys()] + ["updated_at = CURRENT_TIMESTAMP"])
         self.conn.cursor().execute(f"UPDATE works SET {assignments} WHERE id = ?", tuple(payload.values()) + (int(work_id),))
+        if "normalized_title" in payload and self.near_duplicate_index is not None:
+            self.near_duplicate_index.refresh([(int(work_id), payload["normalized_title"])])
+        if kinds:
+            current = fetch_payloads(self.conn, [work_id], kinds).get(int(work_id), {})
+            self._write_work_payloads(
+                [(int(work_id), kind, data.get(kind)) for kind in kinds if data.get(kind) != current.get(kind)]
+            )
+
+    def _write_work_payloads(self, items: list[tuple[int, str, str | None]]) -> None:
+        """Store ``(work_id, kind, text)`` payloads compressed; empty text deletes the kind."""
+        upserts = []
+        deletes = []
+        for work_id, kind, text in items:
+            if text in (None, ""):
+                deletes.append((int(work_id), kind))
+            else:
+                codec, data = encode_payload(text)
+                upserts.append((int(work_id), kind, codec, data))
+        cur = self.conn.cursor()
+        if deletes:
+            cur.executemany("DELETE FROM work_payloads WHERE work_id = ? AND kind = ?", deletes)
+        if upserts:
+            cur.executemany(
+                "INSERT OR REPLACE INTO work_payloads (work_id, kind, codec, data) VALUES (?, ?, ?, ?)",
+                upserts,
+            )
+
+    def get_work_payload(self, work_id: int, kind: str) -> str | None:
+        """Load one payload (e.g. ``'openalex_json'``) for a work without touching other columns."""
+        row = self.conn.execute(
+            "SELECT codec, data FROM work_payloads WHERE work_id = ? AND kind = ?",
+            (int(work_id), kind),
+        ).fetchone()
+        if row:
+            return decode_payload(row[0], row[1])
+        if kind in PAYLOAD_KINDS and kind in self._table_columns("works"):
+            legacy = self.conn.execute(f"SELECT {kind} FROM works WHERE id = ?", (int(work_id),)).fetchone()
+            return legacy[0] if legacy else None
+        return None
+
+    def get_work_payloads(self, work_ids, kinds=PAYLOAD_KINDS) -> dict[int, dict[str, str]]:
+        """Batched payload lookup as ``{work_id: {kind: text}}`` (compacted payloads only)."""
+        return fetch_payloads(self.conn, work_ids, kinds)
+
+    def hydrate_work_payloads(self, rows: list[dict], kinds=PAYLOAD_KINDS) -> list[dict]:
+        """Fill payload keys of ``works`` row dicts in place; see ``dl_lit.payloads``."""
+        return hydrate_payloads(self.conn, rows, kinds)
+
+    def compact_work_payloads(self, batch_size: int = 500) -> int:
+        """Move payloads still stored inline on ``works`` into ``work_payloads``.
+
+        Runs in batches with one commit each and returns the number of works moved;
+        run ``VACUUM`` afterwards to return the freed pages to the filesystem.
+        """
+        kinds = [kind for kind in PAYLOAD_KINDS if kind in self._table_columns("works")]
+        if not kinds:
+            return 0
+        where = " OR ".join(f"{kind} IS NOT NULL" for kind in kinds)
+        cur = self.conn.cursor()
+        moved = 0
+        while True:
+            cur.execute(f"SELECT id, {', '.join(kinds)} FROM works WHERE {where} LIMIT ?", (int(batch_size),))
+            rows = cur.fetchall()
+            if not rows:
+                return moved
+            items = [
+                (int(row[0]), kind, value)
+                for row in rows
+                for kind, value in zip(kinds, row[1:])
+                if value not in (None, "")
+            ]
+            self._write_work_payloads(items)
+            cur.executemany(
+                f"UPDATE works SET {', '.join(f'{kind} = NULL' for kind in kinds)} WHERE id = ?",
+                [(int(row[0]),) for row in rows],
+            )
+            self.conn.commit()
+            moved += len(rows)
 
     def _resolve_or_create_work(self, data: dict, *, allow_merge: bool = True, commit: bool = True) -> tuple[int, str | None]:
         existing_id, matched_field = self._find_existing_work(
@@ -771,6 +1962,9 @@ class DatabaseManager:
         """
         Adds entries from a JSON file (from API extraction) as pending works.
 
+        Without searcher-based duplicate resolution the entries are written through
+        ``upsert_works_bulk``; otherwise each entry goes through ``create_pending_work``.
+
         Args:
             json_file_path: Path to the JSON file containing a list of reference dicts.
             source_pdf: The original PDF file this JSON was extracted from.
@@ -794,6 +1988,19 @@ class DatabaseManager:
         added_count = 0
         skipped_count = 0
         errors = []
+        if not (resolve_potential_duplicates and searcher):
+            refs = [{**entry, "source_pdf": source_pdf} if source_pdf else dict(entry) for entry in entries]
+            for outcome in self.upsert_works_bulk(refs):
+                if outcome["status"] == "created" or (
+                    outcome["status"] == "merged" and outcome["matched_field"] not in HIGH_CONFIDENCE_MATCH_FIELDS
+                ):
+                    added_count += 1
+                else:
+                    skipped_count += 1
+                    if outcome["error"] and "Title is required" not in outcome["error"]:
+                        errors.append(outcome["error"])
+            return added_count, skipped_count, errors
+
         for entry in entries:
             entry = dict(entry)
             if source_pdf:
@@ -848,7 +2055,10 @@ class DatabaseManager:
             # After loading, ensure the schema is what we expect (e.g., if disk DB was old/different schema)
             # This also re-applies PRAGMA foreign_keys = ON if the backup didn't preserve it for the connection.
             self.conn.execute("PRAGMA foreign_keys = ON")
-            self._create_schema() # This ensures tables exist with IF NOT EXISTS, and indices are correct.
+            self._columns_cache.clear()
+            self._ensure_schema(True)  # Bring an older on-disk schema up to date.
+            if self.identity_index is not None:
+                self.identity_index.invalidate()
             return True
         except sqlite3.Error as e:
             print(f"{RED}[DB Manager] SQLite error during load_from_disk (backup method): {e}{RESET}")
@@ -1386,7 +2596,7 @@ class DatabaseManager:
             year=ref.get("year")
         )
         if tbl:
-            high_confidence = field in {"normalized_doi", "openalex_id", "title_authors_year", "alias_title_year"}
+            high_confidence = field in HIGH_CONFIDENCE_MATCH_FIELDS
             incoming_ref_for_merge = {
                 **ref,
                 "authors": json.dumps(authors_raw) if authors_raw else None,
@@ -1488,6 +2698,588 @@ class DatabaseManager:
         except sqlite3.IntegrityError as e:
             return None, f"IntegrityError inserting into works: {e}"
 
+    @staticmethod
+    def _bulk_outcome(index: int, status: str, work_id: int | None = None, matched_field: str | None = None, error: str | None = None) -> dict:
+        return {"index": index, "status": status, "work_id": work_id, "matched_field": matched_field, "error": error}
+
+    @staticmethod
+    def _integer_affinity(value):
+        """Mirror SQLite INTEGER column affinity so in-memory keys match stored values."""
+        if not isinstance(value, str):
+            return value
+        text = value.strip()
+        if not re.fullmatch(r"[+-]?(\d+(\.\d*)?|\.\d+)([eE][+-]?\d+)?", text):
+            return value
+        number = float(text)
+        return int(number) if number.is_integer() else number
+
+    def _fetch_works_where_in(self, column: str, values, into: dict[int, dict]) -> None:
+        """Load full ``works`` rows whose ``column`` is in ``values`` into ``into`` keyed by id."""
+        pending = sorted({value for value in values if value not in (None, "")}, key=str)
+        cur = self.conn.cursor()
+        for start in range(0, len(pending), 500):
+            part = pending[start:start + 500]
+            cur.execute(f"SELECT * FROM works WHERE {column} IN ({','.join('?' * len(part))})", part)
+            columns = [d[0] for d in cur.description]
+            for row in cur.fetchall():
+                record = dict(zip(columns, row))
+                into[int(record["id"])] = record
+
+    def upsert_works_bulk(
+        self,
+        refs: list[dict],
+        *,
+        corpus_id: int | None = None,
+        chunk_size: int = 500,
+    ) -> list[dict]:
+        """Insert or merge many raw references into ``works``, one transaction per chunk.
+
+        Applies the duplicate tiers and merge rules of ``create_pending_work`` (without
+        searcher-based identifier resolution), but resolves each chunk against one
+        batched candidate lookup and writes works, corpus memberships, aliases and
+        merge-log entries with ``executemany`` before a single commit. A chunk that
+        fails to write is retried row by row so one bad reference only fails itself.
+
+        Args:
+            refs: Reference dicts in the shape accepted by ``create_pending_work``.
+            corpus_id: Corpus to link every resolved work to; defaults to each ref's
+                own ``corpus_id``.
+            chunk_size: Number of references resolved and committed together.
+
+        Returns:
+            One outcome per ref in input order: a dict with ``index``, ``status``
+            ('created', 'merged' or 'failed'), ``work_id``, ``matched_field`` and ``error``.
+        """
+        refs = list(refs)
+        chunk_size = max(1, int(chunk_size or 1))
+        outcomes: list[dict] = []
+        for start in range(0, len(refs), chunk_size):
+            chunk = list(enumerate(refs[start:start + chunk_size], start=start))
+            try:
+                outcomes.extend(self._upsert_works_chunk(chunk, corpus_id))
+            except sqlite3.Error as e:
+                self.conn.rollback()
+                if len(chunk) == 1:
+                    outcomes.append(self._bulk_outcome(chunk[0][0], "failed", error=str(e)))
+                    continue
+                print(f"{YELLOW}[DB Manager] Bulk upsert chunk starting at {start} failed ({e}); retrying row by row.{RESET}")
+                for item in chunk:
+                    try:
+                        outcomes.extend(self._upsert_works_chunk([item], corpus_id))
+                    except sqlite3.Error as row_error:
+                        self.conn.rollback()
+                        outcomes.append(self._bulk_outcome(item[0], "failed", error=str(row_error)))
+        return outcomes
+
+    def _upsert_works_chunk(self, items: list[tuple[int, dict]], corpus_id: int | None) -> list[dict]:
+        """Resolve and write one ``upsert_works_bulk`` chunk inside a single transaction."""
+        cur = self.conn.cursor()
+        if not self.conn.in_transaction:
+            cur.execute("BEGIN IMMEDIATE")
+
+        outcomes: list[dict] = []
+        prepared: list[tuple[int, dict, dict]] = []
+        for index, ref in items:
+            if not isinstance(ref, dict):
+                outcomes.append(self._bulk_outcome(index, "failed", error=f"Reference is not an object: {type(ref).__name__}"))
+            elif not ref.get("title"):
+                outcomes.append(self._bulk_outcome(index, "failed", error="Title is required"))
+            else:
+                prepared.append((index, ref, self._build_raw_work_payload(ref)))
+
+        # Every row that could match any tier shares a DOI, OpenAlex ID or normalized
+        # title with some incoming ref, so three IN-queries cover the whole chunk.
+        rows: dict[int, dict] = {}
+        titles = [payload["normalized_title"] for _, _, payload in prepared]
+        self._fetch_works_where_in("normalized_doi", [payload["normalized_doi"] for _, _, payload in prepared], rows)
+        self._fetch_works_where_in("openalex_id", [payload["openalex_id"] for _, _, payload in prepared], rows)
+        self._fetch_works_where_in("normalized_title", titles, rows)
+        alias_rows = []
+        pending_titles = sorted({title for title in titles if title})
+        for start in range(0, len(pending_titles), 500):
+            part = pending_titles[start:start + 500]
+            cur.execute(
+                f"""SELECT id, work_table, work_id, normalized_alias_title, alias_year
+                      FROM work_aliases
+                     WHERE work_table = 'works' AND normalized_alias_title IN ({','.join('?' * len(part))})""",
+                part,
+            )
+            alias_rows.extend(cur.fetchall())
+        self._fetch_works_where_in("id", [row[2] for row in alias_rows if int(row[2]) not in rows], rows)
+        self.hydrate_work_payloads(list(rows.values()))
+        stored_payloads = {work_id: {kind: record.get(kind) for kind in PAYLOAD_KINDS} for work_id, record in rows.items()}
+
+        maps = IdentityMaps()
+        for record in rows.values():
+            maps.add_work(record["id"], record.get("normalized_doi"), record.get("openalex_id"), record.get("normalized_title"), record.get("normalized_authors"), record.get("year"))
+        for row in alias_rows:
+            maps.add_alias(*row)
+
+        # New rows get their ids up front so later refs in the chunk can match them.
+        max_id = cur.execute("SELECT COALESCE(MAX(id), 0) FROM works").fetchone()[0]
+        seq_row = cur.execute("SELECT seq FROM sqlite_sequence WHERE name = 'works'").fetchone()
+        next_id = max(int(max_id), int(seq_row[0]) if seq_row else 0) + 1
+        next_alias_id = int(cur.execute("SELECT COALESCE(MAX(id), 0) FROM work_aliases").fetchone()[0]) + 1
+
+        inserts: dict[int, dict] = {}
+        updates: set[int] = set()
+        corpus_params: list[tuple] = []
+        alias_params: list[tuple] = []
+        merge_log_params: list[tuple] = []
+        for index, ref, payload in prepared:
+            year = ref.get("year")
+            match_id, field = maps.lookup(
+                normalized_doi=payload["normalized_doi"],
+                normalized_openalex=payload["openalex_id"],
+                normalized_title=payload["normalized_title"],
+                normalized_contributors=payload["normalized_authors"],
+                year_str=str(year).strip() if year is not None and str(year).strip() else None,
+            )
+            if not match_id and self.near_duplicate_index is not None:
+                match_id, _ = self.near_duplicate_index.find(
+                    payload["normalized_title"],
+                    year=year,
+                    normalized_doi=payload["normalized_doi"],
+                    openalex_id=payload["openalex_id"],
+                )
+                if match_id:
+                    field = "title_minhash"
+                    if int(match_id) not in rows:
+                        self._fetch_works_where_in("id", [int(match_id)], rows)
+                        if int(match_id) in rows:
+                            record = self.hydrate_work_payloads([rows[int(match_id)]])[0]
+                            stored_payloads[int(match_id)] = {kind: record.get(kind) for kind in PAYLOAD_KINDS}
+            if match_id:
+                work_id = int(match_id)
+                merged = self._apply_work_merge_priority(inserts.get(work_id) or rows.get(work_id) or {}, payload)
+                if work_id in inserts:
+                    inserts[work_id] = merged
+                elif work_id in rows:
+                    rows[work_id] = merged
+                    updates.add(work_id)
+                if field not in HIGH_CONFIDENCE_MATCH_FIELDS:
+                    merge_log_params.append(("works", work_id, "incoming", None, field, "possible_duplicate", "low_confidence_match_inserted", None))
+                outcomes.append(self._bulk_outcome(index, "merged", work_id, field))
+            else:
+                work_id = next_id
+                next_id += 1
+                merged = {**payload, "id": work_id}
+                inserts[work_id] = merged
+                outcomes.append(self._bulk_outcome(index, "created", work_id))
+            maps.add_work(work_id, merged.get("normalized_doi"), merged.get("openalex_id"), merged.get("normalized_title"), merged.get("normalized_authors"), self._integer_affinity(merged.get("year")))
+
+            link_corpus_id = corpus_id or ref.get("corpus_id")
+            if link_corpus_id:
+                corpus_params.append((int(link_corpus_id), work_id))
+
+            translated_title = ref.get("translated_title")
+            normalized_alias = self._normalize_text(translated_title) if translated_title else None
+            if normalized_alias and field not in HIGH_CONFIDENCE_MATCH_FIELDS:
+                alias_year = self._integer_affinity(ref.get("translated_year"))
+                alias_params.append(
+                    (
+                        "works",
+                        work_id,
+                        translated_title,
+                        normalized_alias,
+                        ref.get("translated_language"),
+                        alias_year,
+                        ref.get("translation_relationship") or "translation",
+                    )
+                )
+                maps.add_alias(next_alias_id, "works", work_id, normalized_alias, alias_year)
+                next_alias_id += 1
+
+        columns = self._table_columns("works")
+        payload_items: list[tuple] = []
+        insert_groups: dict[tuple, list[tuple]] = {}
+        for work_id, record in inserts.items():
+            keys = tuple(sorted(k for k, v in record.items() if v is not None and k in columns and k not in PAYLOAD_KINDS))
+            insert_groups.setdefault(keys, []).append(tuple(record[k] for k in keys))
+            payload_items.extend((work_id, kind, record[kind]) for kind in PAYLOAD_KINDS if record.get(kind) is not None)
+        for keys, params in insert_groups.items():
+            cur.executemany(f"INSERT INTO works ({', '.join(keys)}) VALUES ({', '.join('?' * len(keys))})", params)
+        if inserts and self.near_duplicate_index is not None:
+            self.near_duplicate_index.index_works(
+                [(work_id, record.get("normalized_title")) for work_id, record in inserts.items()]
+            )
+
+        self._write_work_payloads(payload_items)
+        self._update_merged_works(rows, updates, stored_payloads)
+
+        if corpus_params:
+            cur.executemany(
+                """INSERT OR IGNORE INTO corpus_works (corpus_id, work_id, added_at)
+                   VALUES (?, ?, CURRENT_TIMESTAMP)""",
+                corpus_params,
+            )
+        if alias_params:
+            cur.executemany(
+                """INSERT OR IGNORE INTO work_aliases
+                   (work_table, work_id, alias_title, normalized_alias_title, alias_language, alias_year, relationship_type)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                alias_params,
+            )
+        if merge_log_params:
+            cur.executemany(
+                """INSERT INTO merge_log
+                   (canonical_table, canonical_id, duplicate_table, duplicate_id, match_field, action, notes, updates_json)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                merge_log_params,
+            )
+        self.conn.commit()
+        return sorted(outcomes, key=lambda outcome: outcome["index"])
+
+    def _update_merged_works(self, rows: dict[int, dict], work_ids, stored_payloads: dict[int, dict]) -> None:
+        """Write merged ``rows`` back with one ``executemany`` per changed-column set."""
+        columns = self._table_columns("works")
+        payload_items: list[tuple] = []
+        update_groups: dict[tuple, list[tuple]] = {}
+        for work_id in sorted(work_ids):
+            record = rows[work_id]
+            changed = [kind for kind in PAYLOAD_KINDS if record.get(kind) != stored_payloads.get(work_id, {}).get(kind)]
+            payload_items.extend((work_id, kind, record.get(kind)) for kind in changed)
+            # Changed payloads move to work_payloads, so their inline copy is cleared.
+            record = {**record, **{kind: None for kind in changed}}
+            keys = tuple(sorted(
+                k for k in record
+                if k not in {"id", "updated_at"} and k in columns and (k not in PAYLOAD_KINDS or k in changed)
+            ))
+            update_groups.setdefault(keys, []).append(tuple(record[k] for k in keys) + (work_id,))
+        cur = self.conn.cursor()
+        for keys, params in update_groups.items():
+            assignments = ", ".join(f"{k} = ?" for k in keys) + ", updated_at = CURRENT_TIMESTAMP"
+            cur.executemany(f"UPDATE works SET {assignments} WHERE id = ?", params)
+        if self.near_duplicate_index is not None:
+            self.near_duplicate_index.refresh(
+                [(work_id, rows[work_id].get("normalized_title")) for work_id in work_ids if "normalized_title" in rows[work_id]]
+            )
+        self._write_work_payloads(payload_items)
+
+    def bulk_load(
+        self,
+        records: list[dict],
+        *,
+        corpus_id: int | None = None,
+        staging_path: Path | str | None = None,
+        defer_indexes: bool | None = None,
+    ) -> dict:
+        """Merge a large batch of ``works`` records through an attached staging database.
+
+        ``records`` are ``works`` column dicts as built by ``_build_raw_work_payload``
+        or ``_bibtex_work_record``. They are resolved in input order with the tiers
+        and merge rules of ``upsert_works_bulk``, against identity maps of the whole
+        table loaded once. New works go to a journal-less, unsynced staging file and
+        reach ``works`` with a single ``INSERT ... SELECT``; matched works are updated
+        in place. Parsing and matching happen before the write lock is taken; under
+        it, staged ids are shifted past works other writers added meanwhile, staged
+        works that now share a DOI or OpenAlex ID with a live row merge into it, and
+        matched works are re-read so the merge applies to their current state.
+
+        Args:
+            records: Work column dicts; records without a title fail. A record's
+                ``translated_title`` (with ``translated_year``/``translated_language``)
+                becomes a ``work_aliases`` row as in ``upsert_works_bulk``.
+            corpus_id: Corpus to link every resolved work to; defaults to each
+                record's own ``corpus_id``.
+            staging_path: Staging database file (default: ``<db>.bulk-staging``,
+                removed afterwards).
+            defer_indexes: Drop the plain secondary ``works`` indexes for the copy and
+                rebuild them in the same transaction. ``None`` decides by size
+                (see ``bulk_load.DEFER_INDEX_MIN_ROWS``).
+
+        Returns:
+            Counts of ``created``/``merged``/``failed`` records, ``failures`` as
+            ``(index, error)`` pairs and whether indexes were rebuilt.
+        """
+        if staging_path is None:
+            if self.is_in_memory:
+                staging_path = Path(tempfile.gettempdir()) / f"dl_lit_bulk_{os.getpid()}.db"
+            else:
+                staging_path = Path(f"{self.db_path}.bulk-staging")
+        staging_path = Path(staging_path)
+        stats = {"created": 0, "merged": 0, "failed": 0, "failures": [], "indexes_rebuilt": 0}
+        self.conn.commit()
+        cur = self.conn.cursor()
+
+        maps = IdentityMaps()
+        maps.load(self.conn)
+        first_new_id = self._next_work_id(cur)
+        next_id = first_new_id
+
+        new_rows: dict[int, dict] = {}
+        # Matched live works: their merged state (for matching later records) and
+        # the records to replay onto the current row under the write lock.
+        existing_rows: dict[int, dict] = {}
+        existing_records: dict[int, list[tuple[int, dict]]] = {}
+        links: set[tuple[int, int]] = set()
+        alias_params: list[tuple] = []
+        merge_log_params: list[tuple] = []
+        for index, record in enumerate(records):
+            if not isinstance(record, dict) or not record.get("title"):
+                stats["failed"] += 1
+                stats["failures"].append((index, "Title is required"))
+                continue
+            year = record.get("year")
+            match_id, field = maps.lookup(
+                normalized_doi=record.get("normalized_doi"),
+                normalized_openalex=record.get("openalex_id"),
+                normalized_title=record.get("normalized_title"),
+                normalized_contributors=record.get("normalized_authors"),
+                year_str=str(year).strip() if year is not None and str(year).strip() else None,
+            )
+            if not match_id and self.near_duplicate_index is not None:
+                match_id, _ = self.near_duplicate_index.find(
+                    record.get("normalized_title"),
+                    year=year,
+                    normalized_doi=record.get("normalized_doi"),
+                    openalex_id=record.get("openalex_id"),
+                )
+                field = "title_minhash" if match_id else None
+            if match_id and int(match_id) not in new_rows and int(match_id) not in existing_rows:
+                self._fetch_works_where_in("id", [int(match_id)], existing_rows)
+                if int(match_id) not in existing_rows:
+                    # Deleted by another writer since the maps were loaded.
+                    match_id = None
+            if match_id:
+                work_id = int(match_id)
+                if work_id in new_rows:
+                    merged = new_rows[work_id] = self._apply_work_merge_priority(new_rows[work_id], record)
+                else:
+                    merged = existing_rows[work_id] = self._apply_work_merge_priority(existing_rows[work_id], record)
+                    existing_records.setdefault(work_id, []).append((index, record))
+                if field not in HIGH_CONFIDENCE_MATCH_FIELDS:
+                    merge_log_params.append(("works", work_id, "incoming", None, field, "possible_duplicate", "low_confidence_match_inserted", None))
+                stats["merged"] += 1
+            else:
+                work_id = next_id
+                next_id += 1
+                merged = new_rows[work_id] = {**record, "id": work_id}
+                stats["created"] += 1
+            maps.add_work(work_id, merged.get("normalized_doi"), merged.get("openalex_id"), merged.get("normalized_title"), merged.get("normalized_authors"), self._integer_affinity(merged.get("year")))
+            link_corpus_id = corpus_id or record.get("corpus_id")
+            if link_corpus_id:
+                links.add((int(link_corpus_id), work_id))
+            translated_title = record.get("translated_title")
+            normalized_alias = self._normalize_text(translated_title) if translated_title else None
+            if normalized_alias and field not in HIGH_CONFIDENCE_MATCH_FIELDS:
+                alias_year = self._integer_affinity(record.get("translated_year"))
+                alias_params.append(
+                    (
+                        "works",
+                        work_id,
+                        translated_title,
+                        normalized_alias,
+                        record.get("translated_language"),
+                        alias_year,
+                        record.get("translation_relationship") or "translation",
+                    )
+                )
+                # Negative keys: these aliases have no row id until they are written.
+                maps.add_alias(-len(alias_params), "works", work_id, normalized_alias, alias_year)
+
+        defaults = {
+            row[1]: row[4] for row in cur.execute("PRAGMA table_info(works)").fetchall()
+            if row[1] not in {"id", "created_at", "updated_at"} and row[1] not in PAYLOAD_KINDS
+        }
+        columns = list(defaults)
+        staging = open_staging_db(staging_path, columns)
+        try:
+            staging.executemany(
+                f"INSERT INTO new_works (id, {', '.join(columns)}) VALUES ({', '.join('?' * (len(columns) + 1))})",
+                (tuple([work_id] + [row.get(column) for column in columns]) for work_id, row in new_rows.items()),
+            )
+            staging.executemany(
+                "INSERT INTO new_payloads (work_id, kind, codec, data) VALUES (?, ?, ?, ?)",
+                (
+                    (work_id, kind, *encode_payload(row[kind]))
+                    for work_id, row in new_rows.items() for kind in PAYLOAD_KINDS if row.get(kind) not in (None, "")
+                ),
+            )
+            staging.executemany("INSERT INTO new_links (corpus_id, work_id) VALUES (?, ?)", sorted(links))
+            staging.commit()
+        finally:
+            staging.close()
+
+        if defer_indexes is None:
+            defer_indexes = len(new_rows) >= DEFER_INDEX_MIN_ROWS and len(new_rows) * 4 >= first_new_id
+        cur.execute("ATTACH DATABASE ? AS bulk_staging", (str(staging_path),))
+        created_ids: list[tuple[int, dict]] = []
+        try:
+            cur.execute("BEGIN IMMEDIATE")
+            # Other writers may have added works since resolution: move the staged
+            # ids past them, and merge staged works that now collide with one.
+            offset = max(0, self._next_work_id(cur) - first_new_id)
+            remap = self._bulk_claim_concurrent_duplicates(new_rows, existing_rows, existing_records)
+            stats["created"] -= len(remap)
+            stats["merged"] += len(remap)
+            vanished = self._bulk_refresh_existing(existing_rows, existing_records)
+            for work_id in vanished:
+                for index, _ in existing_records.pop(work_id):
+                    stats["merged"] -= 1
+                    stats["failed"] += 1
+                    stats["failures"].append((index, "Matched work was deleted during the load"))
+
+            def final_id(work_id):
+                if work_id in remap:
+                    return remap[work_id]
+                return work_id + offset if work_id >= first_new_id else work_id
+
+            if remap:
+                marks = ",".join("?" * len(remap))
+                cur.execute(f"DELETE FROM bulk_staging.new_works WHERE id IN ({marks})", list(remap))
+                cur.execute(f"DELETE FROM bulk_staging.new_payloads WHERE work_id IN ({marks})", list(remap))
+                cur.execute(f"DELETE FROM bulk_staging.new_links WHERE work_id IN ({marks})", list(remap))
+            dropped = secondary_index_sql(self.conn, "works") if defer_indexes else {}
+            for name in dropped:
+                cur.execute(f"DROP INDEX main.{name}")
+            # Staged NULLs stand for "not given", so declared column defaults still apply.
+            select_sql = ", ".join(
+                f"COALESCE({column}, {defaults[column]})" if defaults[column] is not None else column for column in columns
+            )
+            cur.execute(
+                f"INSERT INTO main.works (id, {', '.join(columns)}) "
+                f"SELECT id + ?, {select_sql} FROM bulk_staging.new_works ORDER BY id",
+                (offset,),
+            )
+            cur.execute(
+                """INSERT OR REPLACE INTO main.work_payloads (work_id, kind, codec, data)
+                   SELECT work_id + ?, kind, codec, data FROM bulk_staging.new_payloads""",
+                (offset,),
+            )
+            stored_payloads = {
+                work_id: {kind: row.get(kind) for kind in PAYLOAD_KINDS} for work_id, row in existing_rows.items()
+            }
+            merged_rows = {}
+            for work_id, items in existing_records.items():
+                merged = existing_rows[work_id]
+                for _, record in items:
+                    merged = self._apply_work_merge_priority(merged, record)
+                merged_rows[work_id] = merged
+            self._update_merged_works(merged_rows, merged_rows.keys(), stored_payloads)
+            cur.execute(
+                """INSERT OR IGNORE INTO main.corpus_works (corpus_id, work_id, added_at)
+                   SELECT corpus_id, CASE WHEN work_id >= ? THEN work_id + ? ELSE work_id END, CURRENT_TIMESTAMP
+                     FROM bulk_staging.new_links
+                    WHERE work_id NOT IN (SELECT value FROM json_each(?))""",
+                (first_new_id, offset, json.dumps(sorted(vanished))),
+            )
+            remapped_links = [(link_corpus, remap[work_id]) for link_corpus, work_id in links if work_id in remap]
+            if remapped_links:
+                cur.executemany(
+                    "INSERT OR IGNORE INTO corpus_works (corpus_id, work_id, added_at) VALUES (?, ?, CURRENT_TIMESTAMP)",
+                    remapped_links,
+                )
+            alias_params = [(table, final_id(work_id), *rest) for table, work_id, *rest in alias_params if work_id not in vanished]
+            if alias_params:
+                cur.executemany(
+                    """INSERT OR IGNORE INTO work_aliases
+                       (work_table, work_id, alias_title, normalized_alias_title, alias_language, alias_year, relationship_type)
+                       VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                    alias_params,
+                )
+            merge_log_params = [
+                (table, final_id(work_id), *rest) for table, work_id, *rest in merge_log_params if work_id not in vanished
+            ]
+            if merge_log_params:
+                cur.executemany(
+                    """INSERT INTO merge_log
+                       (canonical_table, canonical_id, duplicate_table, duplicate_id, match_field, action, notes, updates_json)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                    merge_log_params,
+                )
+            for sql in dropped.values():
+                cur.execute(sql)
+            self.conn.commit()
+            stats["indexes_rebuilt"] = len(dropped)
+            created_ids = [(final_id(work_id), row) for work_id, row in new_rows.items() if work_id not in remap]
+        except sqlite3.Error:
+            self.conn.rollback()
+            raise
+        finally:
+            cur.execute("DETACH DATABASE bulk_staging")
+            staging_path.unlink(missing_ok=True)
+
+        if created_ids and self.near_duplicate_index is not None:
+            self.near_duplicate_index.index_works(
+                [(work_id, row.get("normalized_title")) for work_id, row in created_ids]
+            )
+        return stats
+
+    @staticmethod
+    def _next_work_id(cur) -> int:
+        """The id the next ``works`` row gets: past both ``MAX(id)`` and the AUTOINCREMENT sequence."""
+        max_id = cur.execute("SELECT COALESCE(MAX(id), 0) FROM works").fetchone()[0]
+        seq_row = cur.execute("SELECT seq FROM sqlite_sequence WHERE name = 'works'").fetchone()
+        return max(int(max_id), int(seq_row[0]) if seq_row else 0) + 1
+
+    def _bulk_claim_concurrent_duplicates(self, new_rows: dict, existing_rows: dict, existing_records: dict) -> dict[int, int]:
+        """Map staged works whose DOI or OpenAlex ID a live row took meanwhile onto that row.
+
+        Resolution ran against the whole table, so any live hit here was written by
+        another writer after it. The staged work's merged record is replayed onto the
+        live row instead, which would otherwise fail the load on a unique index.
+        """
+        live: dict[int, dict] = {}
+        self._fetch_works_where_in("normalized_doi", [row.get("normalized_doi") for row in new_rows.values()], live)
+        self._fetch_works_where_in("openalex_id", [row.get("openalex_id") for row in new_rows.values()], live)
+        by_doi = {row["normalized_doi"]: work_id for work_id, row in live.items() if row.get("normalized_doi")}
+        by_openalex = {row["openalex_id"]: work_id for work_id, row in live.items() if row.get("openalex_id")}
+        remap = {}
+        for staged_id, row in new_rows.items():
+            target = by_doi.get(row.get("normalized_doi")) or by_openalex.get(row.get("openalex_id"))
+            if target is None:
+                continue
+            remap[staged_id] = target
+            existing_rows.setdefault(target, live[target])
+            existing_records.setdefault(target, []).append((-1, {k: v for k, v in row.items() if k != "id"}))
+        return remap
+
+    def _bulk_refresh_existing(self, existing_rows: dict, existing_records: dict) -> set[int]:
+        """Re-read the matched works under the write lock; returns ids deleted meanwhile."""
+        existing_rows.clear()
+        self._fetch_works_where_in("id", list(existing_records), existing_rows)
+        self.hydrate_work_payloads(list(existing_rows.values()))
+        return {work_id for work_id in existing_records if work_id not in existing_rows}
+
+    def bulk_import_files(
+        self,
+        paths,
+        *,
+        pdf_base_dir: Path | str | None = None,
+        corpus_id: int | None = None,
+        workers: int = DEFAULT_BULK_WORKERS,
+        defer_indexes: bool | None = None,
+    ) -> dict:
+        """Parse ``.bib``/``.json`` files in a process pool and ``bulk_load`` the result.
+
+        BibTeX entries become downloaded works exactly as in
+        ``add_bibtex_entry_to_downloaded``; JSON reference lists become pending
+        works as in ``add_pending_works_from_json``.
+        """
+        bib_records, json_refs = parse_inputs(paths, workers=workers)
+        records = []
+        for entry in bib_records:
+            original_json = json.dumps({"ID": entry.key, "ENTRYTYPE": entry.entry_type, **entry.fields})
+            records.append(self._bibtex_work_record(
+                entry,
+                pdf_base_dir=pdf_base_dir,
+                input_doi=entry.field_value("doi", "DOI"),
+                input_openalex_id=entry.field_value("openalex", "OPENALEX", "openalexid"),
+                original_bibtex_entry_json=original_json,
+                source_bibtex_file=entry.source_file,
+            ))
+        for ref in json_refs:
+            if not ref.get("title"):
+                records.append(None)
+                continue
+            translation = {key: ref[key] for key in TRANSLATION_ALIAS_KEYS if ref.get(key)}
+            records.append({**self._build_raw_work_payload(ref), **translation, "corpus_id": ref.get("corpus_id")})
+        stats = self.bulk_load(records, corpus_id=corpus_id, defer_indexes=defer_indexes)
+        stats["bibtex_entries"] = len(bib_records)
+        stats["json_entries"] = len(json_refs)
+        return stats
+
     def insert_ingest_entry(self, ref: dict, ingest_source: str | None = None) -> None:
         """Insert raw extracted entry for UI display, without dedupe enforcement."""
         cursor = self.conn.cursor()
@@ -1529,7 +3321,7 @@ class DatabaseManager:
             """SELECT id
                FROM works
                WHERE metadata_status = 'matched'
-                 AND COALESCE(download_status, 'not_requested') = 'not_requested'
+                 AND download_status = 'not_requested'
                ORDER BY id
                LIMIT ?""",
             (limit,),
@@ -1694,7 +3486,10 @@ class DatabaseManager:
                        download_claimed_by = NULL,
                        download_claimed_at = NULL,
                        download_lease_expires_at = NULL,
-                       download_error = NULL
+                       download_error = NULL,
+                       download_next_eligible_at = NULL,
+                       download_failure_category = NULL,
+                       download_failure_streak = 0
                    WHERE id = ?""",
                 (with_meta_id,),
             )
@@ -1720,7 +3515,10 @@ class DatabaseManager:
                           metadata_claimed_by = NULL,
                           metadata_claimed_at = NULL,
                           metadata_lease_expires_at = NULL,
-                          metadata_error = NULL
+                          metadata_error = NULL,
+                          metadata_next_eligible_at = NULL,
+                          metadata_failure_category = NULL,
+                          metadata_failure_streak = 0
                     WHERE id = ?""",
                 (no_meta_id,),
             )
@@ -1730,6 +3528,53 @@ class DatabaseManager:
             cur.execute("ROLLBACK")
             return None, f"Transaction failed: {e}"
 
+    def has_ready_work(self, queue: str, *, corpus_id: int | None = None, now: int | None = None) -> bool:
+        """Whether ``enrich_queue`` or ``download_queue`` has an item ready to claim.
+
+        A plain read, so idle workers can check before a claim takes the write lock.
+        """
+        if queue not in self._QUEUE_READY_SQL:
+            raise ValueError(f"Unknown work queue: {queue}")
+        now = int(time.time()) if now is None else int(now)
+        return bool(self._select_ready_queue_ids(self.conn.cursor(), queue, corpus_id=corpus_id, now=now, limit=1))
+
+    def _select_ready_queue_ids(
+        self,
+        cur,
+        table: str,
+        *,
+        corpus_id: int | None,
+        now: int,
+        limit: int,
+        attempts_column: str | None = None,
+        max_attempts: int | None = None,
+        target_ids: list[int] | None = None,
+    ) -> list[int]:
+        """Ids at the head of a ready queue; callers re-check eligibility when claiming."""
+        join_sql = ""
+        filters = ["q.corpus_id = ?", "q.ready_at <= ?"]
+        params: list = [int(corpus_id) if corpus_id is not None else 0, int(now)]
+        if attempts_column:
+            # CROSS JOIN pins the queue as the outer loop so the scan stays on its key.
+            join_sql = "CROSS JOIN works w ON w.id = q.work_id"
+            filters.append(f"COALESCE(w.{attempts_column}, 0) < ?")
+            params.append(int(max_attempts))
+        if target_ids:
+            filters.append(f"q.work_id IN ({','.join('?' * len(target_ids))})")
+            params.extend(target_ids)
+        cur.execute(
+            f"""
+            SELECT q.work_id
+              FROM {table} q
+              {join_sql}
+             WHERE {" AND ".join(filters)}
+             ORDER BY q.priority, q.ready_at, q.work_id
+             LIMIT ?
+            """,
+            params + [int(limit)],
+        )
+        return [int(r[0]) for r in cur.fetchall()]
+
     def claim_enrich_batch(
         self,
         *,
@@ -1749,7 +3594,7 @@ class DatabaseManager:
         lease_expires_at = now + int(max(1, lease_seconds))
         eligible_state_sql = """
             (
-              COALESCE(metadata_status, 'pending') = 'pending'
+              (COALESCE(metadata_status, 'pending') = 'pending' AND COALESCE(metadata_next_eligible_at, 0) <= ?)
               OR (
                    metadata_status = 'in_progress'
                    AND metadata_lease_expires_at IS NOT NULL
@@ -1757,7 +3602,7 @@ class DatabaseManager:
                  )
             )
         """
-        params: list = [now]
+        params: list = [now, now]
         attempts_sql = ""
         if max_attempts is not None:
             attempts_sql = " AND COALESCE(metadata_attempt_count, 0) < ?"
@@ -1766,34 +3611,16 @@ class DatabaseManager:
         cur = self.conn.cursor()
         try:
             cur.execute("BEGIN IMMEDIATE")
-            where_clauses = [eligible_state_sql]
-            query_params: list = list(params)
-            where_clauses.append("COALESCE(nm.download_status, 'not_requested') = 'not_requested'")
-
-            if corpus_id is not None:
-                where_clauses.append(
-                    "EXISTS (SELECT 1 FROM corpus_works cw WHERE cw.work_id = nm.id AND cw.corpus_id = ?)"
-                )
-                query_params.append(int(corpus_id))
-
-            if target_ids:
-                placeholders = ",".join("?" for _ in target_ids)
-                where_clauses.append(f"nm.id IN ({placeholders})")
-                query_params.extend(target_ids)
-
-            where_sql = " AND ".join(where_clauses)
-            cur.execute(
-                f"""
-                SELECT nm.id
-                  FROM works nm
-                 WHERE {where_sql}
-                   {attempts_sql}
-                 ORDER BY nm.id ASC
-                 LIMIT ?
-                """,
-                query_params + [int(limit)],
+            ids = self._select_ready_queue_ids(
+                cur,
+                "enrich_queue",
+                corpus_id=corpus_id,
+                now=now,
+                limit=limit,
+                attempts_column="metadata_attempt_count" if max_attempts is not None else None,
+                max_attempts=max_attempts,
+                target_ids=target_ids,
             )
-            ids = [int(r[0]) for r in cur.fetchall()]
             if not ids:
                 self.conn.commit()
                 return []
@@ -1861,6 +3688,36 @@ class DatabaseManager:
                 pass
             return []
 
+    def release_enrich_claims(self, work_ids: list[int], claimed_by: str) -> int:
+        """Hand rows claimed by ``claimed_by`` but never started back to the enrich queue.
+
+        The attempt the claim counted is refunded, so a worker that yields
+        mid-batch does not push rows towards quarantine.
+        """
+        ids = [int(value) for value in (work_ids or []) if int(value) > 0]
+        if not ids:
+            return 0
+        placeholders = ",".join(["?"] * len(ids))
+        cur = self.conn.cursor()
+        try:
+            cur.execute(
+                f"""UPDATE works
+                      SET metadata_status = 'pending',
+                          metadata_claimed_by = NULL,
+                          metadata_claimed_at = NULL,
+                          metadata_lease_expires_at = NULL,
+                          metadata_attempt_count = MAX(COALESCE(metadata_attempt_count, 0) - 1, 0)
+                    WHERE id IN ({placeholders})
+                      AND metadata_status = 'in_progress'
+                      AND metadata_claimed_by = ?""",
+                ids + [claimed_by],
+            )
+            self.conn.commit()
+            return int(cur.rowcount or 0)
+        except sqlite3.Error:
+            self.conn.rollback()
+            return 0
+
     def reset_enrich_claim(self, no_meta_id: int, *, state: str = "pending", error: str | None = None, selected: int = 0) -> tuple[bool, str | None]:
         cur = self.conn.cursor()
         try:
@@ -1921,7 +3778,7 @@ class DatabaseManager:
         else:
             cursor.execute(query)
         rows = cursor.fetchall()
-        return [dict(row) for row in rows]
+        return self.hydrate_work_payloads([dict(row) for row in rows])
 
     def _convert_inverted_index_to_text(self, inverted_index: dict | None) -> str | None:
         """Convert OpenAlex abstract_inverted_index dict to continuous text, or return None if input is None."""
@@ -2150,13 +4007,22 @@ class DatabaseManager:
             print(f"{RED}[DB Manager] Error moving entry {source_id} to failed: {e}{RESET}")
             return None, str(e)
 
-    def get_entry_by_id(self, table_name: str, entry_id: int) -> dict | None:
-        """Fetches a single entry from a table by its primary key ID."""
+    def get_entry_by_id(self, table_name: str, entry_id: int, *, with_payloads: bool = True) -> dict | None:
+        """Fetches a single entry from a table by its primary key ID.
+
+        For ``works`` the compressed JSON payloads are loaded too unless
+        ``with_payloads`` is False.
+        """
         cursor = self.conn.cursor()
         cursor.row_factory = sqlite3.Row
         cursor.execute(f"SELECT * FROM {table_name} WHERE id = ?", (entry_id,))
         row = cursor.fetchone()
-        return dict(row) if row else None
+        if not row:
+            return None
+        entry = dict(row)
+        if table_name == "works" and with_payloads:
+            self.hydrate_work_payloads([entry])
+        return entry
 
     def add_bibtex_entry_to_downloaded(
         self,
@@ -2174,6 +4040,40 @@ class DatabaseManager:
             ``created`` when a new work row is inserted and ``merged`` when the
             BibTeX entry updates an existing canonical work.
         """
+        data = self._bibtex_work_record(
+            entry,
+            pdf_base_dir=pdf_base_dir,
+            input_doi=input_doi,
+            input_openalex_id=input_openalex_id,
+            original_bibtex_entry_json=original_bibtex_entry_json,
+            source_bibtex_file=source_bibtex_file,
+        )
+        bibtex_key_val = self._clean_string_value(entry.key if hasattr(entry, 'key') else None)
+        title_val = data['title']
+        try:
+            work_id, matched_field = self._resolve_or_create_work(data, allow_merge=True, commit=True)
+            resolution = 'merged' if matched_field else 'created'
+            return work_id, None, resolution
+        except sqlite3.IntegrityError as e:
+            return None, str(e.args[0] if e.args else str(e)), None
+        except sqlite3.Error as e:
+            print(f"{RED}[DB Manager] Error adding BibTeX entry to works: {e} (Entry details: Key='{bibtex_key_val}', Title='{title_val}'){RESET}")
+            return None, str(e), None
+        except Exception as e:
+            print(f"{RED}[DB Manager] General error while adding BibTeX entry {bibtex_key_val if bibtex_key_val else 'N/A'}: {e}{RESET}")
+            return None, str(e), None
+
+    def _bibtex_work_record(
+        self,
+        entry: object,
+        *,
+        pdf_base_dir: Path | str | None = None,
+        input_doi: str | None = None,
+        input_openalex_id: str | None = None,
+        original_bibtex_entry_json: str | None = None,
+        source_bibtex_file: str | None = None,
+    ) -> dict:
+        """``works`` column values for a BibTeX entry imported as a downloaded work."""
         def get_primitive_val(data_object, default=None):
             if data_object is None:
                 return default
@@ -2246,7 +4146,7 @@ class DatabaseManager:
             else:
                 file_path_val = parsed_filename
 
-        data = {
+        return {
             'title': title_val,
             'authors': authors_json,
             'editors': editors_json,
@@ -2277,18 +4177,6 @@ class DatabaseManager:
             'bibtex_entry_json': bibtex_json,
             'status_notes': 'Imported from BibTeX file',
         }
-        try:
-            work_id, matched_field = self._resolve_or_create_work(data, allow_merge=True, commit=True)
-            resolution = 'merged' if matched_field else 'created'
-            return work_id, None, resolution
-        except sqlite3.IntegrityError as e:
-            return None, str(e.args[0] if e.args else str(e)), None
-        except sqlite3.Error as e:
-            print(f"{RED}[DB Manager] Error adding BibTeX entry to works: {e} (Entry details: Key='{bibtex_key_val}', Title='{title_val}'){RESET}")
-            return None, str(e), None
-        except Exception as e:
-            print(f"{RED}[DB Manager] General error while adding BibTeX entry {bibtex_key_val if bibtex_key_val else 'N/A'}: {e}{RESET}")
-            return None, str(e), None
 
     def add_entry_to_download_queue(
         self,
@@ -2529,16 +4417,139 @@ class DatabaseManager:
                     result.get('title'),
                     result.get('year'),
                     json.dumps(result.get('raw_json')) if result.get('raw_json') is not None else None,
+                    result.get('work_id'),
                 )
             )
         cursor.executemany(
-            """INSERT INTO search_results (search_run_id, openalex_id, doi, title, year, raw_json)
-               VALUES (?, ?, ?, ?, ?, ?)""",
+            """INSERT INTO search_results (search_run_id, openalex_id, doi, title, year, raw_json, work_id)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
             rows,
         )
         self.conn.commit()
         return len(rows)
 
+    def find_cached_search_run(
+        self,
+        query: str,
+        filters: dict | None = None,
+        max_age_days: float = 30,
+    ) -> tuple[int | None, list[dict]]:
+        """Latest recent run of ``query`` with identical ``filters`` whose results are all held locally.
+
+        Returns ``(run_id, results)`` with that run's results in stored order,
+        ``raw_json`` decoded and ``work_id`` re-resolved against the current works,
+        ready to pass back to ``add_search_results``. Returns ``(None, [])`` when
+        no such run exists or any of its results is missing locally, i.e. when
+        asking OpenAlex again could still bring in something new.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(
+            """SELECT id, filters_json FROM search_runs
+                WHERE query = ? AND created_at >= datetime('now', ?)
+                ORDER BY id DESC""",
+            (query, f"-{float(max_age_days)} days"),
+        )
+        wanted = filters or None
+        for run_id, filters_json in cursor.fetchall():
+            try:
+                stored = json.loads(filters_json) if filters_json else None
+            except (TypeError, ValueError):
+                continue
+            if (stored or None) != wanted:
+                continue
+            rows = cursor.execute(
+                """SELECT openalex_id, doi, title, year, raw_json, work_id
+                     FROM search_results WHERE search_run_id = ? ORDER BY id""",
+                (run_id,),
+            ).fetchall()
+            results = []
+            for openalex_id, doi, title, year, raw_json, work_id in rows:
+                try:
+                    raw = json.loads(raw_json) if raw_json else None
+                except (TypeError, ValueError):
+                    raw = None
+                results.append({
+                    'openalex_id': openalex_id, 'doi': doi, 'title': title,
+                    'year': year, 'raw_json': raw, 'work_id': work_id,
+                })
+            work_ids = self.local_work_ids(results)
+            if not results or not all(work_ids):
+                return None, []
+            for result, work_id in zip(results, work_ids):
+                result['work_id'] = work_id
+            return int(run_id), results
+        return None, []
+
+    def search_local(
+        self,
+        query: str,
+        corpus_id: int | None = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> tuple[list[dict], str | None]:
+        """Full-text search over local works using the keyword-search query grammar.
+
+        Matches title, abstract, authors, keywords and source through ``works_fts``
+        and ranks by BM25 with title and author hits weighted highest. Returns
+        ``(rows, error)``; a malformed query yields ``([], message)``.
+        """
+        from dl_lit.keyword_search import QuerySyntaxError, build_fts5_query
+
+        if not self._fts_available:
+            return [], "Full-text search is not available (SQLite built without FTS5)."
+        try:
+            match = build_fts5_query(query)
+        except QuerySyntaxError as e:
+            return [], f"Invalid query: {e}"
+        sql = """
+            SELECT w.id, w.title, w.authors, w.year, w.doi, w.openalex_id, w.source,
+                   w.metadata_status, w.download_status,
+                   bm25(works_fts, 10.0, 1.0, 5.0, 3.0, 2.0) AS score
+              FROM works_fts
+              JOIN works w ON w.id = works_fts.rowid
+             WHERE works_fts MATCH ?
+        """
+        params: list = [match]
+        if corpus_id is not None:
+            sql += " AND w.id IN (SELECT work_id FROM corpus_works WHERE corpus_id = ?)"
+            params.append(int(corpus_id))
+        sql += " ORDER BY score LIMIT ? OFFSET ?"
+        params.extend([max(0, int(limit)), max(0, int(offset))])
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(sql, params)
+        except sqlite3.OperationalError as e:
+            return [], f"Invalid query: {e}"
+        columns = [d[0] for d in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()], None
+
+    def local_work_ids(self, records: list[dict]) -> list[int | None]:
+        """Resolve records to existing work ids by OpenAlex ID or DOI in batched lookups.
+
+        Lets remote search results be checked against the local corpus without one
+        query per item; the result is aligned with ``records`` (``None`` = not held).
+        """
+        keys = [
+            (self._normalize_openalex_id(record.get('openalex_id')), self._normalize_doi(record.get('doi')))
+            for record in records
+        ]
+        by_openalex: dict[str, int] = {}
+        by_doi: dict[str, int] = {}
+        cursor = self.conn.cursor()
+        for column, values, found in (
+            ("openalex_id", {key[0] for key in keys if key[0]}, by_openalex),
+            ("normalized_doi", {key[1] for key in keys if key[1]}, by_doi),
+        ):
+            pending = sorted(values)
+            for start in range(0, len(pending), 500):
+                part = pending[start:start + 500]
+                cursor.execute(
+                    f"SELECT {column}, id FROM works WHERE {column} IN ({','.join('?' * len(part))})",
+                    part,
+                )
+                found.update((value, int(work_id)) for value, work_id in cursor.fetchall())
+        return [by_openalex.get(openalex_id) or by_doi.get(doi) for openalex_id, doi in keys]
+
     def get_all_downloaded_works_as_dicts(self) -> list[dict]:
         """Fetch downloaded works as dictionaries using the canonical works table."""
         self.conn.row_factory = sqlite3.Row
@@ -2588,7 +4599,7 @@ class DatabaseManager:
                 """
             )
             rows = cursor.fetchall()
-            return [dict(row) for row in rows]
+            return self.hydrate_work_payloads([dict(row) for row in rows], kinds=("bibtex_entry_json",))
         except sqlite3.Error as e:
             print(f"{RED}[DB Manager] Error fetching downloaded works: {e}{RESET}")
             return []
@@ -2647,6 +4658,17 @@ class DatabaseManager:
             print(f"{RED}[DB Manager] General error during save_to_disk: {e}{RESET}")
             return False
 
+    def snapshot(self, target_path: Path | str, **kwargs) -> dict:
+        """Write a verified online copy of the database to ``target_path``.
+
+        Unlike ``save_to_disk`` this copies in small page steps from a separate
+        read connection, so it is safe while other workers keep writing. Keyword
+        arguments go to ``dl_lit.snapshot.snapshot_database``.
+        """
+        self.conn.commit()
+        source = self.conn if self.is_in_memory else self.db_path
+        return snapshot_database(source, target_path, **kwargs)
+
     def get_all_from_queue(self) -> list[dict]:
         """Fetch all currently queued or in-progress works."""
         self.conn.row_factory = sqlite3.Row
@@ -2654,7 +4676,7 @@ class DatabaseManager:
         try:
             cursor.execute("SELECT * FROM works WHERE download_status IN ('queued', 'in_progress')")
             rows = cursor.fetchall()
-            return [dict(row) for row in rows]
+            return self.hydrate_work_payloads([dict(row) for row in rows])
         except sqlite3.Error as e:
             print(f"{RED}[DB Manager] SQLite error while fetching queue: {e}{RESET}")
             return []
@@ -2679,7 +4701,7 @@ class DatabaseManager:
 
         eligible_state_sql = """
             (
-              download_status = 'queued'
+              (download_status = 'queued' AND COALESCE(download_next_eligible_at, 0) <= ?)
               OR (
                    download_status = 'in_progress'
                    AND download_lease_expires_at IS NOT NULL
@@ -2688,7 +4710,7 @@ class DatabaseManager:
             )
         """
         attempts_sql = ""
-        params: list = [now]
+        params: list = [now, now]
         if max_attempts is not None:
             attempts_sql = " AND COALESCE(download_attempt_count, 0) < ?"
             params.append(int(max_attempts))
@@ -2696,35 +4718,15 @@ class DatabaseManager:
         cur = self.conn.cursor()
         try:
             cur.execute("BEGIN IMMEDIATE")
-
-            if corpus_id is not None:
-                cur.execute(
-                    f"""
-                    SELECT t.id
-                    FROM works t
-                    JOIN corpus_works cw ON cw.work_id = t.id
-                    WHERE cw.corpus_id = ?
-                      AND {eligible_state_sql}
-                      {attempts_sql}
-                    ORDER BY t.created_at ASC
-                    LIMIT ?
-                    """,
-                    [int(corpus_id)] + params + [int(limit)],
-                )
-            else:
-                cur.execute(
-                    f"""
-                    SELECT t.id
-                    FROM works t
-                    WHERE {eligible_state_sql}
-                      {attempts_sql}
-                    ORDER BY t.created_at ASC
-                    LIMIT ?
-                    """,
-                    params + [int(limit)],
-                )
-
-            ids = [int(r[0]) for r in cur.fetchall()]
+            ids = self._select_ready_queue_ids(
+                cur,
+                "download_queue",
+                corpus_id=corpus_id,
+                now=now,
+                limit=limit,
+                attempts_column="download_attempt_count" if max_attempts is not None else None,
+                max_attempts=max_attempts,
+            )
             if not ids:
                 self.conn.commit()
                 return []
@@ -2777,7 +4779,7 @@ class DatabaseManager:
                         "openalex_json": r[10],
                     }
                 )
-            return out
+            return self.hydrate_work_payloads(out, kinds=("openalex_json",))
         except sqlite3.Error:
             try:
                 self.conn.rollback()
@@ -2801,8 +4803,11 @@ class DatabaseManager:
         return self.move_entry_to_downloaded(queue_id, enriched_data, file_path, checksum, enriched_data.get('download_source', 'unknown'))
 
     def mark_download_failed(self, queue_id: int, reason: str) -> tuple[int | None, str | None]:
-        """Mark a queued work as failed."""
-        return self.move_entry_to_failed(queue_id, reason)
+        """Record a failed download; ``reason`` is the failure category (see ``record_stage_failure``)."""
+        status, err = self.record_stage_failure(queue_id, "download", reason)
+        if err:
+            return None, err
+        return int(queue_id), None
 
     def merge_duplicate_queued_work(
         self,
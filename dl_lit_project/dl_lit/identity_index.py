@@ -0,0 +1,379 @@
+import sqlite3
+
+
+class IdentityMaps:
+    """Hash maps over the identity keys used by duplicate detection.
+
+    Mirrors the lookup tiers of ``DatabaseManager._find_existing_work`` (DOI,
+    OpenAlex ID, title+contributors+year, title+contributors, title+year and the
+    ``work_aliases`` fallback) so each tier becomes a dict probe. Keys are the
+    already-normalized column values stored on ``works``/``work_aliases``.
+    """
+
+    def __init__(self):
+        self.by_doi: dict[str, set[int]] = {}
+        self.by_openalex: dict[str, set[int]] = {}
+        self.by_title_authors_year: dict[tuple[str, str, str], set[int]] = {}
+        self.by_title_authors: dict[tuple[str, str], set[int]] = {}
+        self.by_title_year: dict[tuple[str, str], set[int]] = {}
+        self.by_alias_title: dict[str, dict[int, tuple[int, object]]] = {}
+        self._work_keys: dict[int, tuple] = {}
+        self._alias_keys: dict[int, str] = {}
+
+    @staticmethod
+    def _year_key(year) -> str | None:
+        # Matches the ``CAST(year AS TEXT) = ?`` predicate of the SQL tiers.
+        if year is None:
+            return None
+        return str(year)
+
+    @staticmethod
+    def _add(mapping: dict, key, work_id: int) -> None:
+        mapping.setdefault(key, set()).add(work_id)
+
+    @staticmethod
+    def _discard(mapping: dict, key, work_id: int) -> None:
+        ids = mapping.get(key)
+        if ids is None:
+            return
+        ids.discard(work_id)
+        if not ids:
+            del mapping[key]
+
+    def clear(self) -> None:
+        self.by_doi.clear()
+        self.by_openalex.clear()
+        self.by_title_authors_year.clear()
+        self.by_title_authors.clear()
+        self.by_title_year.clear()
+        self.by_alias_title.clear()
+        self._work_keys.clear()
+        self._alias_keys.clear()
+
+    def add_work(self, work_id: int, doi, openalex_id, title, authors, year) -> None:
+        """Index a work row by its normalized identity columns (replacing older keys)."""
+        work_id = int(work_id)
+        self.remove_work(work_id)
+        year_key = self._year_key(year)
+        keys = (doi or None, openalex_id or None, title or None, authors or None, year_key)
+        self._work_keys[work_id] = keys
+        if keys[0]:
+            self._add(self.by_doi, keys[0], work_id)
+        if keys[1]:
+            self._add(self.by_openalex, keys[1], work_id)
+        if title:
+            if authors and year_key is not None:
+                self._add(self.by_title_authors_year, (title, authors, year_key), work_id)
+            if authors:
+                self._add(self.by_title_authors, (title, authors), work_id)
+            if year_key is not None:
+                self._add(self.by_title_year, (title, year_key), work_id)
+
+    def remove_work(self, work_id: int) -> None:
+        keys = self._work_keys.pop(int(work_id), None)
+        if not keys:
+            return
+        doi, openalex_id, title, authors, year_key = keys
+        if doi:
+            self._discard(self.by_doi, doi, work_id)
+        if openalex_id:
+            self._discard(self.by_openalex, openalex_id, work_id)
+        if title:
+            if authors and year_key is not None:
+                self._discard(self.by_title_authors_year, (title, authors, year_key), work_id)
+            if authors:
+                self._discard(self.by_title_authors, (title, authors), work_id)
+            if year_key is not None:
+                self._discard(self.by_title_year, (title, year_key), work_id)
+
+    def add_alias(self, alias_id: int, work_table, work_id, normalized_alias_title, alias_year) -> None:
+        alias_id = int(alias_id)
+        self.remove_alias(alias_id)
+        if work_table != "works" or not normalized_alias_title or work_id is None:
+            return
+        self._alias_keys[alias_id] = normalized_alias_title
+        self.by_alias_title.setdefault(normalized_alias_title, {})[alias_id] = (int(work_id), alias_year)
+
+    def remove_alias(self, alias_id: int) -> None:
+        title = self._alias_keys.pop(int(alias_id), None)
+        if title is None:
+            return
+        entries = self.by_alias_title.get(title)
+        if entries is None:
+            return
+        entries.pop(int(alias_id), None)
+        if not entries:
+            del self.by_alias_title[title]
+
+    @staticmethod
+    def _pick(ids: set[int] | None, exclude_id: int | None) -> int | None:
+        if not ids:
+            return None
+        if exclude_id is None:
+            return min(ids)
+        candidates = [work_id for work_id in ids if work_id != exclude_id]
+        return min(candidates) if candidates else None
+
+    def load(self, conn: sqlite3.Connection) -> None:
+        """Index every work and alias row of ``conn`` (after clearing the maps)."""
+        self.clear()
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT id, normalized_doi, openalex_id, normalized_title, normalized_authors, year FROM works"
+        )
+        for row in cur:
+            self.add_work(*row)
+        cur.execute(
+            "SELECT id, work_table, work_id, normalized_alias_title, alias_year FROM work_aliases"
+        )
+        for row in cur:
+            self.add_alias(*row)
+
+    def lookup(
+        self,
+        *,
+        normalized_doi: str | None,
+        normalized_openalex: str | None,
+        normalized_title: str | None,
+        normalized_contributors: str | None,
+        year_str: str | None,
+        exclude_id: int | None = None,
+    ) -> tuple[int | None, str | None]:
+        """Resolve the first matching tier, returning ``(work_id, matched_field)``."""
+        exclude_id = int(exclude_id) if exclude_id else None
+        if normalized_doi:
+            found = self._pick(self.by_doi.get(normalized_doi), exclude_id)
+            if found:
+                return found, "normalized_doi"
+        if normalized_openalex:
+            found = self._pick(self.by_openalex.get(normalized_openalex), exclude_id)
+            if found:
+                return found, "openalex_id"
+        if not normalized_title:
+            return None, None
+        if year_str and normalized_contributors:
+            found = self._pick(
+                self.by_title_authors_year.get((normalized_title, normalized_contributors, year_str)),
+                exclude_id,
+            )
+            if found:
+                return found, "title_authors_year"
+        if normalized_contributors:
+            found = self._pick(self.by_title_authors.get((normalized_title, normalized_contributors)), exclude_id)
+            if found:
+                return found, "title_authors"
+        if year_str:
+            found = self._pick(self.by_title_year.get((normalized_title, year_str)), exclude_id)
+            if found:
+                return found, "title_year"
+        entries = self.by_alias_title.get(normalized_title)
+        if entries:
+            year_bounds = None
+            if year_str and year_str.isdigit():
+                year_bounds = (int(year_str) - 1, int(year_str) + 1)
+            for alias_id in sorted(entries):
+                work_id, alias_year = entries[alias_id]
+                if year_bounds is not None and alias_year is not None:
+                    if not isinstance(alias_year, (int, float)) or not (year_bounds[0] <= alias_year <= year_bounds[1]):
+                        continue
+                if exclude_id is not None and work_id == exclude_id:
+                    return None, None
+                return work_id, "alias_title"
+        return None, None
+
+
+class WorkIdentityIndex(IdentityMaps):
+    """Connection-bound ``IdentityMaps`` that keeps itself in sync with the DB.
+
+    Writes made through the owning connection are picked up by TEMP triggers that
+    call back into Python and mark the touched rows dirty; dirty rows are re-read
+    by primary key before the next lookup. Writes from other processes are
+    detected through ``PRAGMA data_version``; the index then re-reads only the
+    works and aliases inserted above its id high-water marks plus the rows named
+    in ``work_identity_changes`` (identity-key updates and deletes logged by
+    triggers) since its last sequence mark. It falls back to a full rebuild when
+    that log is missing or was trimmed past the mark. Rows refreshed while a
+    transaction is open are re-read once the transaction ends, so a rollback
+    cannot leave uncommitted keys behind.
+    """
+
+    _TRIGGER_NAMES = (
+        "_dl_identity_works_ai",
+        "_dl_identity_works_au",
+        "_dl_identity_works_ad",
+        "_dl_identity_aliases_ai",
+        "_dl_identity_aliases_au",
+        "_dl_identity_aliases_ad",
+    )
+
+    def __init__(self, conn: sqlite3.Connection):
+        super().__init__()
+        self.conn = conn
+        self._dirty_works: set[int] = set()
+        self._dirty_aliases: set[int] = set()
+        self._provisional_works: set[int] = set()
+        self._provisional_aliases: set[int] = set()
+        self._data_version: int | None = None
+        # (works.id, work_aliases.id, work_identity_changes.seq) already applied.
+        self._marks: tuple[int, int, int] | None = None
+        self._loaded = False
+        self._install_triggers()
+
+    def _touch_work(self, work_id) -> None:
+        if work_id is not None:
+            self._dirty_works.add(int(work_id))
+
+    def _touch_alias(self, alias_id) -> None:
+        if alias_id is not None:
+            self._dirty_aliases.add(int(alias_id))
+
+    def _install_triggers(self) -> None:
+        self.conn.create_function("_dl_identity_touch_work", 1, self._touch_work)
+        self.conn.create_function("_dl_identity_touch_alias", 1, self._touch_alias)
+        key_columns = "normalized_doi, openalex_id, normalized_title, normalized_authors, year"
+        statements = [
+            "CREATE TEMP TRIGGER IF NOT EXISTS _dl_identity_works_ai AFTER INSERT ON main.works "
+            "BEGIN SELECT _dl_identity_touch_work(NEW.id); END",
+            f"CREATE TEMP TRIGGER IF NOT EXISTS _dl_identity_works_au AFTER UPDATE OF {key_columns} ON main.works "
+            "BEGIN SELECT _dl_identity_touch_work(NEW.id); END",
+            "CREATE TEMP TRIGGER IF NOT EXISTS _dl_identity_works_ad AFTER DELETE ON main.works "
+            "BEGIN SELECT _dl_identity_touch_work(OLD.id); END",
+            "CREATE TEMP TRIGGER IF NOT EXISTS _dl_identity_aliases_ai AFTER INSERT ON main.work_aliases "
+            "BEGIN SELECT _dl_identity_touch_alias(NEW.id); END",
+            "CREATE TEMP TRIGGER IF NOT EXISTS _dl_identity_aliases_au AFTER UPDATE ON main.work_aliases "
+            "BEGIN SELECT _dl_identity_touch_alias(NEW.id); END",
+            "CREATE TEMP TRIGGER IF NOT EXISTS _dl_identity_aliases_ad AFTER DELETE ON main.work_aliases "
+            "BEGIN SELECT _dl_identity_touch_alias(OLD.id); END",
+        ]
+        for statement in statements:
+            self.conn.execute(statement)
+
+    def drop_triggers(self) -> None:
+        """Remove the TEMP triggers (used when the index is disabled)."""
+        for name in self._TRIGGER_NAMES:
+            self.conn.execute(f"DROP TRIGGER IF EXISTS temp.{name}")
+
+    def invalidate(self) -> None:
+        """Force a full rebuild on the next lookup."""
+        self._loaded = False
+
+    def _watermarks(self) -> tuple[tuple[int, int, int], int | None] | None:
+        """Current id/sequence marks and the oldest logged seq, or None without a change log."""
+        try:
+            oldest, newest = self.conn.execute(
+                "SELECT MIN(seq), MAX(seq) FROM work_identity_changes"
+            ).fetchone()
+        except sqlite3.OperationalError:
+            return None
+        works = self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM works").fetchone()[0]
+        aliases = self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM work_aliases").fetchone()[0]
+        return (works, aliases, newest or 0), oldest
+
+    def _set_marks(self, marks: tuple[int, int, int] | None) -> None:
+        # Ids read inside an open transaction may be rolled back and reused, so
+        # marks only move on committed state.
+        if not self.conn.in_transaction:
+            self._marks = marks
+
+    def _catch_up(self) -> bool:
+        """Mark rows written by other connections dirty; False when a rebuild is needed."""
+        if self._marks is None:
+            return False
+        current = self._watermarks()
+        if current is None:
+            return False
+        marks, oldest = current
+        work_mark, alias_mark, change_mark = self._marks
+        if oldest is not None and oldest > change_mark + 1:
+            return False
+        cur = self.conn.cursor()
+        cur.execute("SELECT id FROM works WHERE id > ?", (work_mark,))
+        self._dirty_works.update(row[0] for row in cur)
+        cur.execute("SELECT id FROM work_aliases WHERE id > ?", (alias_mark,))
+        self._dirty_aliases.update(row[0] for row in cur)
+        cur.execute(
+            "SELECT table_name, row_id FROM work_identity_changes WHERE seq > ?",
+            (change_mark,),
+        )
+        for table_name, row_id in cur:
+            if table_name == "works":
+                self._dirty_works.add(int(row_id))
+            else:
+                self._dirty_aliases.add(int(row_id))
+        self._set_marks(marks)
+        return True
+
+    def _rebuild(self) -> None:
+        # Read the marks first so rows committed during the load are replayed, not lost.
+        current = self._watermarks()
+        self._marks = None
+        self.load(self.conn)
+        self._set_marks(current[0] if current else None)
+        self._dirty_works.clear()
+        self._dirty_aliases.clear()
+        self._provisional_works.clear()
+        self._provisional_aliases.clear()
+        self._loaded = True
+
+    def _refresh(self, ids: set[int], query: str, remove, add) -> None:
+        cur = self.conn.cursor()
+        pending = sorted(ids)
+        for start in range(0, len(pending), 500):
+            chunk = pending[start:start + 500]
+            for row_id in chunk:
+                remove(row_id)
+            placeholders = ",".join("?" * len(chunk))
+            cur.execute(query.format(placeholders=placeholders), chunk)
+            for row in cur.fetchall():
+                add(*row)
+
+    def sync(self) -> None:
+        """Bring the maps up to date with the database before a lookup."""
+        version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        if not self._loaded:
+            self._data_version = version
+            self._rebuild()
+            return
+        if version != self._data_version:
+            self._data_version = version
+            if not self._catch_up():
+                self._rebuild()
+                return
+
+        in_transaction = self.conn.in_transaction
+        if not in_transaction and (self._provisional_works or self._provisional_aliases):
+            # Re-read rows touched inside a transaction that has since committed or rolled back.
+            self._dirty_works |= self._provisional_works
+            self._dirty_aliases |= self._provisional_aliases
+            self._provisional_works.clear()
+            self._provisional_aliases.clear()
+
+        if self._dirty_works:
+            dirty = set(self._dirty_works)
+            self._dirty_works.clear()
+            self._refresh(
+                dirty,
+                """SELECT id, normalized_doi, openalex_id, normalized_title, normalized_authors, year
+                     FROM works WHERE id IN ({placeholders})""",
+                self.remove_work,
+                self.add_work,
+            )
+            if in_transaction:
+                self._provisional_works |= dirty
+        if self._dirty_aliases:
+            dirty = set(self._dirty_aliases)
+            self._dirty_aliases.clear()
+            self._refresh(
+                dirty,
+                """SELECT id, work_table, work_id, normalized_alias_title, alias_year
+                     FROM work_aliases WHERE id IN ({placeholders})""",
+                self.remove_alias,
+                self.add_alias,
+            )
+            if in_transaction:
+                self._provisional_aliases |= dirty
+
+    def find(self, **kwargs) -> tuple[int | None, str | None]:
+        """Sync with the database, then resolve via ``lookup``."""
+        self.sync()
+        return self.lookup(**kwargs)
@@ -110,6 +110,39 @@ def build_openalex_query_text(query: str) -> str:
     return " ".join(cleaned_terms)
 
 
+def build_fts5_query(query: str) -> str:
+    """Translate the boolean query grammar into an SQLite FTS5 MATCH expression.
+
+    Every term becomes a quoted FTS5 string (a trailing ``*`` keeps prefix search), so
+    punctuation and FTS5 keywords inside terms are matched literally. FTS5 only has a
+    binary NOT, so ``a NOT b`` (``a AND NOT b`` after normalisation) is supported while
+    a NOT that does not follow another operand is rejected.
+    """
+    normalize_query(query)
+    tokens = _insert_implicit_and(_tokenize(query))
+    parts: list[str] = []
+    for tok in tokens:
+        if tok == "NOT":
+            if parts and parts[-1] == "AND":
+                parts.pop()
+            if not parts or parts[-1] in ("AND", "OR", "NOT", "("):
+                raise QuerySyntaxError("NOT must follow another term for local search")
+            parts.append("NOT")
+        elif tok in ("AND", "OR", "(", ")"):
+            parts.append(tok)
+        else:
+            prefix = tok.endswith("*") and not tok.startswith('"')
+            term = tok.rstrip("*") if prefix else tok
+            if term.startswith('"') and term.endswith('"') and len(term) > 1:
+                term = term[1:-1]
+            term = term.strip()
+            if not term:
+                raise QuerySyntaxError("Query does not contain searchable terms")
+            quoted = '"' + term.replace('"', '""') + '"'
+            parts.append(quoted + "*" if prefix else quoted)
+    return " ".join(parts)
+
+
 def _openalex_request(endpoint: str, params: dict, rate_limiter, retries: int = 3) -> dict:
     return openalex_request_json(
         endpoint=endpoint,
@@ -262,6 +295,21 @@ def openalex_result_to_record(item: dict, run_id: int | None = None) -> dict:
     }
 
 
+def cached_result_to_record(row: dict, run_id: int | None = None) -> dict:
+    """Rebuild a search result/queue record from a stored ``search_results`` row."""
+    if isinstance(row.get("raw_json"), dict):
+        return openalex_result_to_record(row["raw_json"], run_id=run_id)
+    return {
+        "openalex_id": row.get("openalex_id"),
+        "doi": row.get("doi"),
+        "title": row.get("title"),
+        "year": row.get("year"),
+        "openalex_json": None,
+        "ingest_source": "keyword_search",
+        "run_id": run_id,
+    }
+
+
 def dedupe_results(results: Iterable[dict]) -> list[dict]:
     seen = set()
     deduped = []
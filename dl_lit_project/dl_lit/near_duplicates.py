@@ -0,0 +1,268 @@
+import hashlib
+import sqlite3
+import zlib
+
+import numpy as np
+
+
+NUM_PERM = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+MIN_SIMILARITY = 0.8
+# Very short titles ("introduction", "preface") collide too easily to be merged on shape alone.
+MIN_TITLE_LENGTH = 12
+# Buckets this large are dominated by boilerplate titles; comparing them all is quadratic.
+MAX_BUCKET_SIZE = 200
+
+_PRIME = np.uint64((1 << 61) - 1)
+_rng = np.random.default_rng(20240611)
+_PERM_A = _rng.integers(1, (1 << 32) - 1, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, (1 << 32) - 1, size=NUM_PERM, dtype=np.uint64)
+
+
+def title_shingles(normalized_title: str | None) -> set[str]:
+    """Character shingles of a normalized title (whitespace collapsed)."""
+    if not normalized_title:
+        return set()
+    text = " ".join(normalized_title.split())
+    if len(text) <= SHINGLE_SIZE:
+        return {text}
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def minhash_signature(shingles: set[str]) -> np.ndarray:
+    """MinHash signature (``NUM_PERM`` uint32 values) of a shingle set."""
+    if not shingles:
+        return np.full(NUM_PERM, 0xFFFFFFFF, dtype=np.uint32)
+    hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+    permuted = (hashes[:, None] * _PERM_A[None, :] + _PERM_B[None, :]) % _PRIME
+    return (permuted.min(axis=0) & np.uint64(0xFFFFFFFF)).astype(np.uint32)
+
+
+def band_buckets(signature: np.ndarray) -> list[tuple[int, int]]:
+    """LSH ``(band, bucket)`` keys; titles sharing any key become candidates."""
+    keys = []
+    for band in range(BANDS):
+        chunk = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND].tobytes()
+        bucket = int.from_bytes(hashlib.blake2b(chunk, digest_size=8).digest(), "big", signed=True)
+        keys.append((band, bucket))
+    return keys
+
+
+def jaccard(left: set[str], right: set[str]) -> float:
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+def _years_compatible(left, right) -> bool:
+    try:
+        return abs(int(left) - int(right)) <= 1
+    except (TypeError, ValueError):
+        return True
+
+
+def _identifiers_conflict(left: dict, right: dict) -> bool:
+    for key in ("normalized_doi", "openalex_id"):
+        if left.get(key) and right.get(key) and left[key] != right[key]:
+            return True
+    return False
+
+
+class NearDuplicateIndex:
+    """MinHash/LSH index over ``works.normalized_title`` stored in side tables.
+
+    Signatures live in ``work_title_minhash`` and band buckets in ``work_title_lsh``
+    so candidate retrieval is an indexed lookup instead of a scan over all titles.
+    Candidates are always verified against the current ``works`` row (exact shingle
+    Jaccard, compatible year, no conflicting DOI/OpenAlex ID), so stale index rows
+    can only cause misses, never false matches; ``sync`` catches up rows written
+    outside this connection.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, min_similarity: float = MIN_SIMILARITY):
+        self.conn = conn
+        self.min_similarity = float(min_similarity)
+
+    def index_works(self, rows) -> int:
+        """(Re)index ``(work_id, normalized_title)`` pairs; the caller commits."""
+        signature_params = []
+        band_params = []
+        work_ids = []
+        for work_id, normalized_title in rows:
+            work_id = int(work_id)
+            work_ids.append((work_id,))
+            if not normalized_title or len(normalized_title) < MIN_TITLE_LENGTH:
+                signature_params.append((work_id, normalized_title, None))
+                continue
+            signature = minhash_signature(title_shingles(normalized_title))
+            signature_params.append((work_id, normalized_title, signature.tobytes()))
+            band_params.extend((band, bucket, work_id) for band, bucket in band_buckets(signature))
+        if not work_ids:
+            return 0
+        cur = self.conn.cursor()
+        cur.executemany("DELETE FROM work_title_lsh WHERE work_id = ?", work_ids)
+        cur.executemany(
+            """INSERT OR REPLACE INTO work_title_minhash (work_id, normalized_title, signature, updated_at)
+               VALUES (?, ?, ?, CURRENT_TIMESTAMP)""",
+            signature_params,
+        )
+        cur.executemany("INSERT OR IGNORE INTO work_title_lsh (band, bucket, work_id) VALUES (?, ?, ?)", band_params)
+        return len(work_ids)
+
+    def refresh(self, rows) -> int:
+        """Re-sign the ``(work_id, normalized_title)`` pairs whose title differs from the signed one; the caller commits."""
+        rows = [(int(work_id), normalized_title) for work_id, normalized_title in rows]
+        if not rows:
+            return 0
+        signed = {}
+        cur = self.conn.cursor()
+        ids = sorted({work_id for work_id, _ in rows})
+        for start in range(0, len(ids), 500):
+            part = ids[start:start + 500]
+            cur.execute(
+                f"SELECT work_id, normalized_title FROM work_title_minhash WHERE work_id IN ({','.join('?' * len(part))})",
+                part,
+            )
+            signed.update(cur.fetchall())
+        stale = [(work_id, title) for work_id, title in rows if work_id not in signed or signed[work_id] != title]
+        return self.index_works(stale)
+
+    def sync(self, batch_size: int = 2000) -> int:
+        """Index works that are new or whose title changed, and drop deleted ones."""
+        cur = self.conn.cursor()
+        cur.execute(
+            """SELECT w.id, w.normalized_title
+                 FROM works w
+                 LEFT JOIN work_title_minhash m ON m.work_id = w.id
+                WHERE m.work_id IS NULL OR m.normalized_title IS NOT w.normalized_title"""
+        )
+        pending = cur.fetchall()
+        for start in range(0, len(pending), batch_size):
+            self.index_works(pending[start:start + batch_size])
+            self.conn.commit()
+        cur.execute("DELETE FROM work_title_lsh WHERE work_id NOT IN (SELECT id FROM works)")
+        cur.execute("DELETE FROM work_title_minhash WHERE work_id NOT IN (SELECT id FROM works)")
+        self.conn.commit()
+        return len(pending)
+
+    def _fetch_candidates(self, work_ids) -> dict[int, dict]:
+        cur = self.conn.cursor()
+        rows: dict[int, dict] = {}
+        pending = sorted(set(work_ids))
+        for start in range(0, len(pending), 500):
+            part = pending[start:start + 500]
+            cur.execute(
+                f"""SELECT id, normalized_title, year, normalized_doi, openalex_id, metadata_status, download_status
+                      FROM works WHERE id IN ({','.join('?' * len(part))})""",
+                part,
+            )
+            columns = [d[0] for d in cur.description]
+            for row in cur.fetchall():
+                rows[int(row[0])] = dict(zip(columns, row))
+        return rows
+
+    def find(
+        self,
+        normalized_title: str | None,
+        *,
+        year=None,
+        normalized_doi: str | None = None,
+        openalex_id: str | None = None,
+        exclude_id: int | None = None,
+    ) -> tuple[int | None, float | None]:
+        """Best verified near-duplicate for a title, as ``(work_id, similarity)``."""
+        if not normalized_title or len(normalized_title) < MIN_TITLE_LENGTH:
+            return None, None
+        shingles = title_shingles(normalized_title)
+        keys = band_buckets(minhash_signature(shingles))
+        cur = self.conn.cursor()
+        clauses = " OR ".join(["(band = ? AND bucket = ?)"] * len(keys))
+        cur.execute(
+            f"SELECT DISTINCT work_id FROM work_title_lsh WHERE {clauses}",
+            [value for key in keys for value in key],
+        )
+        candidate_ids = [int(row[0]) for row in cur.fetchall() if not exclude_id or int(row[0]) != int(exclude_id)]
+        incoming = {"normalized_doi": normalized_doi, "openalex_id": openalex_id}
+        best_id, best_score = None, None
+        for work_id, row in sorted(self._fetch_candidates(candidate_ids).items()):
+            if not _years_compatible(year, row["year"]) or _identifiers_conflict(incoming, row):
+                continue
+            score = jaccard(shingles, title_shingles(row["normalized_title"]))
+            if score >= self.min_similarity and (best_score is None or score > best_score):
+                best_id, best_score = work_id, score
+        return best_id, best_score
+
+    @staticmethod
+    def _canonical_rank(row: dict) -> tuple:
+        return (
+            0 if row.get("normalized_doi") or row.get("openalex_id") else 1,
+            0 if row.get("download_status") == "downloaded" else 1,
+            0 if row.get("metadata_status") == "matched" else 1,
+            int(row["id"]),
+        )
+
+    def merge_plan(self) -> list[dict]:
+        """Offline sweep: verified near-duplicate pairs as ``_merge_records`` kwargs.
+
+        Each connected group of similar titles keeps one canonical work (identifiers,
+        downloaded file and matched metadata win, then the lowest id); only members
+        verified directly against that canonical are planned for merging.
+        """
+        cur = self.conn.cursor()
+        cur.execute(
+            """SELECT band, bucket, group_concat(work_id)
+                 FROM work_title_lsh
+                GROUP BY band, bucket
+               HAVING COUNT(*) > 1 AND COUNT(*) <= ?""",
+            (MAX_BUCKET_SIZE,),
+        )
+        pairs: set[tuple[int, int]] = set()
+        for _, _, members in cur.fetchall():
+            ids = sorted(int(value) for value in str(members).split(","))
+            for i, left in enumerate(ids):
+                for right in ids[i + 1:]:
+                    pairs.add((left, right))
+        if not pairs:
+            return []
+
+        rows = self._fetch_candidates({work_id for pair in pairs for work_id in pair})
+        shingles = {work_id: title_shingles(row["normalized_title"]) for work_id, row in rows.items()}
+        similar: dict[int, dict[int, float]] = {}
+        for left, right in sorted(pairs):
+            if left not in rows or right not in rows:
+                continue
+            if not _years_compatible(rows[left]["year"], rows[right]["year"]) or _identifiers_conflict(rows[left], rows[right]):
+                continue
+            score = jaccard(shingles[left], shingles[right])
+            if score >= self.min_similarity:
+                similar.setdefault(left, {})[right] = score
+                similar.setdefault(right, {})[left] = score
+
+        plan = []
+        seen: set[int] = set()
+        for start in sorted(similar):
+            if start in seen:
+                continue
+            group, stack = set(), [start]
+            while stack:
+                work_id = stack.pop()
+                if work_id in group:
+                    continue
+                group.add(work_id)
+                stack.extend(similar[work_id])
+            seen |= group
+            canonical_id = min(group, key=lambda work_id: self._canonical_rank(rows[work_id]))
+            for duplicate_id, score in sorted(similar[canonical_id].items()):
+                plan.append(
+                    {
+                        "canonical_table": "works",
+                        "canonical_id": canonical_id,
+                        "duplicate_table": "works",
+                        "duplicate_id": duplicate_id,
+                        "match_field": "title_minhash",
+                        "notes": f"similarity={score:.3f}",
+                    }
+                )
+        return plan
@@ -21,7 +21,7 @@ from bs4 import BeautifulSoup
 
 from .db_manager import DatabaseManager
 from .pdf_downloader import PDFDownloader
-from .utils import ServiceRateLimiter, get_global_rate_limiter
+from .utils import ConcurrencyLimits, ServiceRateLimiter, get_concurrency_limits, get_global_rate_limiter
 try:
     # bibtexparser 1.x does not ship middlewares; keep optional so downloads can run without it.
     from bibtexparser.middlewares import SeparateCoAuthors, LatexEncodingMiddleware  # type: ignore
@@ -63,7 +63,7 @@ from google import genai
 
 
 class BibliographyEnhancer:
-    def __init__(self, db_manager: DatabaseManager, rate_limiter: ServiceRateLimiter, email: str = None, output_folder: str | Path = None, proxies: dict = None):
+    def __init__(self, db_manager: DatabaseManager, rate_limiter: ServiceRateLimiter, email: str = None, output_folder: str | Path = None, proxies: dict = None, concurrency: ConcurrencyLimits | None = None):
         self.email = email if email else 'spott@wzb.eu'
         self.unpaywall_headers = {'email': self.email}
         self.headers = {
@@ -73,6 +73,8 @@ class BibliographyEnhancer:
         # Use injected dependencies for database and rate limiting
         self.db_manager = db_manager
         self.rate_limiter = rate_limiter
+        # Adaptive in-flight limit per download host ("download:<host>").
+        self.concurrency = concurrency or get_concurrency_limits()
         
         # PROJECT_ID = "your-project-id"
         # vertexai.init()
@@ -368,9 +370,10 @@ class BibliographyEnhancer:
         return status_code in {401, 402, 403, 407, 451, 500, 502, 503, 504}
 
     def _request_get_direct(self, url: str, **kwargs) -> requests.Response:
-        with requests.Session() as session:
+        with self.concurrency.for_host("download", url).track() as probe, requests.Session() as session:
             session.trust_env = False
-            return session.get(url, **kwargs)
+            probe.response = session.get(url, **kwargs)
+            return probe.response
 
     def _request_get_vpn(self, url: str, **kwargs) -> requests.Response:
         if not self.proxies:
@@ -379,10 +382,11 @@ class BibliographyEnhancer:
             raise requests.exceptions.RequestException(
                 "eduVPN not connected (or could not be verified); refusing desktop proxy route"
             )
-        with requests.Session() as session:
+        with self.concurrency.for_host("download", url).track() as probe, requests.Session() as session:
             session.trust_env = False
             session.proxies.update(self.proxies)
-            return session.get(url, **kwargs)
+            probe.response = session.get(url, **kwargs)
+            return probe.response
 
     @staticmethod
     def _run_shell_cmd(command: str, timeout_seconds: int) -> tuple[bool, str]:
@@ -505,6 +509,7 @@ class BibliographyEnhancer:
                 download_dir=downloads_dir,
                 rate_limiter=self.rate_limiter,
                 mailto=self.email,
+                concurrency=self.concurrency,
             )
         return self._pdf_downloader
 
@@ -0,0 +1,74 @@
+import sqlite3
+import zlib
+
+
+# Large JSON documents kept out of the narrow ``works`` rows; each kind is named
+# after the legacy ``works`` column it replaces.
+PAYLOAD_KINDS = ("openalex_json", "crossref_json", "bibtex_entry_json")
+CODEC_RAW = "raw"
+CODEC_ZLIB = "zlib"
+# Below this size the zlib header outweighs the savings.
+MIN_COMPRESS_BYTES = 128
+ZLIB_LEVEL = 6
+
+
+def encode_payload(text: str) -> tuple[str, bytes]:
+    """Return ``(codec, data)`` for a payload string."""
+    raw = str(text).encode("utf-8")
+    if len(raw) < MIN_COMPRESS_BYTES:
+        return CODEC_RAW, raw
+    packed = zlib.compress(raw, ZLIB_LEVEL)
+    if len(packed) >= len(raw):
+        return CODEC_RAW, raw
+    return CODEC_ZLIB, packed
+
+
+def decode_payload(codec: str, data) -> str | None:
+    if data is None:
+        return None
+    raw = bytes(data)
+    if codec == CODEC_ZLIB:
+        raw = zlib.decompress(raw)
+    elif codec != CODEC_RAW:
+        raise ValueError(f"Unknown payload codec: {codec}")
+    return raw.decode("utf-8")
+
+
+def fetch_payloads(conn: sqlite3.Connection, work_ids, kinds=PAYLOAD_KINDS) -> dict[int, dict[str, str]]:
+    """Decoded payloads as ``{work_id: {kind: text}}`` using batched lookups."""
+    pending = sorted({int(work_id) for work_id in work_ids if work_id is not None})
+    kinds = [kind for kind in kinds if kind in PAYLOAD_KINDS]
+    out: dict[int, dict[str, str]] = {}
+    if not pending or not kinds:
+        return out
+    has_table = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'work_payloads' LIMIT 1"
+    ).fetchone()
+    if not has_table:
+        return out
+    kind_sql = ",".join("?" * len(kinds))
+    for start in range(0, len(pending), 500):
+        part = pending[start:start + 500]
+        rows = conn.execute(
+            f"""SELECT work_id, kind, codec, data FROM work_payloads
+                 WHERE work_id IN ({','.join('?' * len(part))}) AND kind IN ({kind_sql})""",
+            part + kinds,
+        ).fetchall()
+        for work_id, kind, codec, data in rows:
+            out.setdefault(int(work_id), {})[kind] = decode_payload(codec, data)
+    return out
+
+
+def hydrate_payloads(conn: sqlite3.Connection, rows: list[dict], kinds=PAYLOAD_KINDS) -> list[dict]:
+    """Fill payload keys of ``works`` row dicts in place from ``work_payloads``.
+
+    A value still stored inline on the ``works`` row (not yet compacted) wins.
+    """
+    wanted = [row for row in rows if row.get("id") is not None and any(row.get(kind) is None for kind in kinds)]
+    payloads = fetch_payloads(conn, [row["id"] for row in wanted], kinds)
+    for row in wanted:
+        stored = payloads.get(int(row["id"]), {})
+        for kind in kinds:
+            if row.get(kind) is None:
+                row[kind] = stored.get(kind)
+    return rows
@@ -1,7 +1,7 @@
 import requests
 import hashlib
 from pathlib import Path
-from .utils import ServiceRateLimiter
+from .utils import ConcurrencyLimits, ServiceRateLimiter, get_concurrency_limits
 try:
     import fitz  # PyMuPDF
     PYMUPDF_AVAILABLE = True
@@ -17,17 +17,19 @@ RESET = '\033[0m'
 class PDFDownloader:
     """Manages the downloading of PDF files from various sources."""
 
-    def __init__(self, download_dir: str | Path, rate_limiter: ServiceRateLimiter, mailto: str = "your.email@example.com"):
+    def __init__(self, download_dir: str | Path, rate_limiter: ServiceRateLimiter, mailto: str = "your.email@example.com", concurrency: ConcurrencyLimits | None = None):
         """
         Initializes the downloader.
         Args:
             download_dir: The base directory where PDFs will be saved.
             rate_limiter: A configured ServiceRateLimiter instance.
             mailto: An email address for API politeness headers.
+            concurrency: Adaptive per-host download limits (defaults to the process-wide set).
         """
         self.download_dir = Path(download_dir)
         self.download_dir.mkdir(parents=True, exist_ok=True)
         self.rate_limiter = rate_limiter
+        self.concurrency = concurrency or get_concurrency_limits()
         self.headers = {
             'User-Agent': f'dl-lit/0.1 (mailto:{mailto})'
         }
@@ -104,9 +106,9 @@ class PDFDownloader:
             print(f"[Downloader] Attempting to download from {source}: {pdf_url}")
             # Use a generic rate limit for downloads, as we don't know the host in advance
             self.rate_limiter.wait_if_needed('default') 
-            with requests.Session() as session:
+            with self.concurrency.for_host("download", pdf_url).track() as probe, requests.Session() as session:
                 session.trust_env = False
-                response = session.get(pdf_url, headers=self.headers, timeout=60, allow_redirects=True)
+                response = probe.response = session.get(pdf_url, headers=self.headers, timeout=60, allow_redirects=True)
             response.raise_for_status()
 
             pdf_content = response.content
@@ -0,0 +1,179 @@
+import json
+import sqlite3
+from pathlib import Path
+
+
+ARCHIVE_SCHEMA = "archive"
+# Finished jobs are summarized well before they are archived; the archive keeps
+# the full result_json captured at compaction time.
+FINISHED_JOB_STATUSES = ("completed", "failed", "cancelled")
+# table -> (timestamp expression the age is measured on, extra eligibility predicate)
+RETENTION_POLICIES = {
+    "pipeline_jobs": ("finished_at", f"status IN {FINISHED_JOB_STATUSES}"),
+    "merge_log": ("created_at", None),
+    "ingest_entries": ("created_at", None),
+    "search_results": (
+        "(SELECT created_at FROM search_runs r WHERE r.id = search_results.search_run_id)",
+        None,
+    ),
+}
+# Days of history kept in the working database; 0 keeps everything. Ingest
+# entries and search results feed the seed candidate lists, so they are only
+# archived when asked for.
+DEFAULT_RETENTION_DAYS = {"pipeline_jobs": 30, "merge_log": 90, "ingest_entries": 0, "search_results": 0}
+DEFAULT_COMPACT_AFTER_DAYS = 7
+DEFAULT_VACUUM_PAGES = 2000
+
+
+def archive_path_for(db_path: str | Path) -> Path:
+    """``data/literature.db`` -> ``data/literature_archive.db``."""
+    path = Path(db_path)
+    return path.with_name(f"{path.stem}_archive{path.suffix or '.db'}")
+
+
+def summarize_result_json(text: str | None) -> str | None:
+    """Collapse per-item arrays in a job result to counts; scalars and small maps stay."""
+    if text is None:
+        return None
+    try:
+        data = json.loads(text)
+    except (TypeError, ValueError):
+        data = None
+    if not isinstance(data, dict):
+        return json.dumps({"compacted": True, "result_json_bytes": len(text)})
+    if data.get("compacted"):
+        return text
+    summary = {}
+    for key, value in data.items():
+        if isinstance(value, list):
+            summary[f"{key}_count"] = len(value)
+        else:
+            summary[key] = value
+    summary["compacted"] = True
+    return json.dumps(summary, ensure_ascii=False)
+
+
+def _table_columns(conn: sqlite3.Connection, schema: str, table: str) -> list[tuple[str, str]]:
+    return [(row[1], row[2] or "") for row in conn.execute(f"PRAGMA {schema}.table_info({table})").fetchall()]
+
+
+def _ensure_archive_table(conn: sqlite3.Connection, table: str) -> list[str]:
+    """Create or widen ``archive.<table>`` to match main; returns the shared column list."""
+    columns = _table_columns(conn, "main", table)
+    existing = {name for name, _ in _table_columns(conn, ARCHIVE_SCHEMA, table)}
+    if not existing:
+        defs = ", ".join(
+            f"{name} INTEGER PRIMARY KEY" if name == "id" else f"{name} {col_type}".strip()
+            for name, col_type in columns
+        )
+        conn.execute(f"CREATE TABLE {ARCHIVE_SCHEMA}.{table} ({defs}, archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)")
+    else:
+        for name, col_type in columns:
+            if name not in existing:
+                conn.execute(f"ALTER TABLE {ARCHIVE_SCHEMA}.{table} ADD COLUMN {name} {col_type}".strip())
+    return [name for name, _ in columns]
+
+
+def _eligible_ids(conn, table: str, days: int, batch_size: int, after_id: int, extra: str | None = None) -> list[int]:
+    # Walking the primary key from after_id keeps each batch from rescanning
+    # rows an earlier batch already skipped.
+    age_expr, predicate = RETENTION_POLICIES[table]
+    clauses = ["id > ?", f"{age_expr} < datetime('now', ?)"]
+    if predicate:
+        clauses.append(predicate)
+    if extra:
+        clauses.append(extra)
+    rows = conn.execute(
+        f"SELECT id FROM {table} WHERE {' AND '.join(clauses)} ORDER BY id LIMIT ?",
+        (int(after_id), f"-{int(days)} days", int(batch_size)),
+    ).fetchall()
+    return [int(row[0]) for row in rows]
+
+
+def _copy_to_archive(conn, table: str, columns: list[str], ids: list[int]) -> None:
+    # OR IGNORE keeps the first (fullest) copy when a row was archived before.
+    column_sql = ", ".join(columns)
+    conn.execute(
+        f"""INSERT OR IGNORE INTO {ARCHIVE_SCHEMA}.{table} ({column_sql})
+            SELECT {column_sql} FROM main.{table} WHERE id IN ({','.join('?' * len(ids))})""",
+        ids,
+    )
+
+
+def run_retention(
+    conn: sqlite3.Connection,
+    archive_path: str | Path,
+    *,
+    days: dict[str, int] | None = None,
+    compact_after_days: int = DEFAULT_COMPACT_AFTER_DAYS,
+    batch_size: int = 500,
+    vacuum_pages: int = DEFAULT_VACUUM_PAGES,
+) -> dict:
+    """Compact old job results and move expired rows into the archive database.
+
+    Work is done in ``batch_size`` chunks, each committed on its own, so the
+    writer lock is never held for a whole table. Rows are copied into the
+    archive before they are deleted, so an interrupted run loses nothing.
+    Freed pages are returned with ``PRAGMA incremental_vacuum`` when the database
+    uses incremental auto-vacuum.
+    """
+    days = {**DEFAULT_RETENTION_DAYS, **(days or {})}
+    stats = {"compacted_jobs": 0, "archived": {}, "vacuumed_pages": 0}
+    batch_size = max(1, int(batch_size))
+    conn.commit()
+    conn.execute("ATTACH DATABASE ? AS archive", (str(archive_path),))
+    try:
+        present = {row[0] for row in conn.execute("SELECT name FROM main.sqlite_master WHERE type = 'table'")}
+        if compact_after_days and "pipeline_jobs" in present:
+            columns = _ensure_archive_table(conn, "pipeline_jobs")
+            last_id = 0
+            while True:
+                ids = _eligible_ids(
+                    conn, "pipeline_jobs", compact_after_days, batch_size, last_id,
+                    extra="result_json IS NOT NULL AND result_json NOT LIKE '%\"compacted\": true%'",
+                )
+                if not ids:
+                    break
+                _copy_to_archive(conn, "pipeline_jobs", columns, ids)
+                rows = conn.execute(
+                    f"SELECT id, result_json FROM pipeline_jobs WHERE id IN ({','.join('?' * len(ids))})", ids
+                ).fetchall()
+                conn.executemany(
+                    "UPDATE pipeline_jobs SET result_json = ? WHERE id = ?",
+                    [(summarize_result_json(text), job_id) for job_id, text in rows],
+                )
+                conn.commit()
+                stats["compacted_jobs"] += len(rows)
+                last_id = ids[-1]
+
+        for table in RETENTION_POLICIES:
+            keep_days = int(days.get(table) or 0)
+            if keep_days <= 0 or table not in present:
+                continue
+            if table == "search_results" and "search_runs" not in present:
+                continue
+            columns = _ensure_archive_table(conn, table)
+            moved = 0
+            last_id = 0
+            while True:
+                ids = _eligible_ids(conn, table, keep_days, batch_size, last_id)
+                if not ids:
+                    break
+                _copy_to_archive(conn, table, columns, ids)
+                conn.commit()
+                conn.execute(f"DELETE FROM main.{table} WHERE id IN ({','.join('?' * len(ids))})", ids)
+                conn.commit()
+                moved += len(ids)
+                last_id = ids[-1]
+            stats["archived"][table] = moved
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+    finally:
+        conn.execute("DETACH DATABASE archive")
+
+    if vacuum_pages and conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+        before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        conn.execute(f"PRAGMA incremental_vacuum({int(vacuum_pages)})").fetchall()
+        stats["vacuumed_pages"] = before - conn.execute("PRAGMA freelist_count").fetchone()[0]
+    return stats
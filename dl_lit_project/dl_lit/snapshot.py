@@ -0,0 +1,113 @@
+import os
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+
+
+# Pages copied per backup step and the pause between steps. 256 pages of 4 KiB
+# is ~1 MiB per step; the pause lets the enrich and download writers commit
+# without waiting on the copy.
+DEFAULT_SNAPSHOT_PAGES = 256
+DEFAULT_SNAPSHOT_SLEEP = 0.02
+
+
+class SnapshotError(RuntimeError):
+    """The snapshot could not be written or failed its integrity check."""
+
+
+def snapshot_path_for(db_path: str | Path, when: datetime | None = None) -> Path:
+    """``data/literature.db`` -> ``data/snapshots/literature_20260101T120000.db``."""
+    path = Path(db_path)
+    stamp = (when or datetime.now()).strftime("%Y%m%dT%H%M%S")
+    return path.parent / "snapshots" / f"{path.stem}_{stamp}{path.suffix or '.db'}"
+
+
+def verify_snapshot(path: str | Path, *, quick: bool = False) -> list[str]:
+    """Run ``PRAGMA integrity_check`` (or ``quick_check``) and return the problems found."""
+    conn = sqlite3.connect(f"file:{Path(path)}?mode=ro", uri=True)
+    try:
+        pragma = "quick_check" if quick else "integrity_check"
+        rows = [row[0] for row in conn.execute(f"PRAGMA {pragma}").fetchall()]
+    finally:
+        conn.close()
+    return [] if rows == ["ok"] else rows
+
+
+def snapshot_database(
+    source: str | Path | sqlite3.Connection,
+    target_path: str | Path,
+    *,
+    pages: int = DEFAULT_SNAPSHOT_PAGES,
+    sleep: float = DEFAULT_SNAPSHOT_SLEEP,
+    verify: bool = True,
+    quick_check: bool = False,
+    progress=None,
+) -> dict:
+    """Copy a live database to ``target_path`` with the online backup API.
+
+    The copy runs in steps of ``pages`` pages with a ``sleep`` second pause after
+    each one, so writers are never held up for the whole copy. A file source is
+    read through its own connection inside one read transaction: under WAL that
+    pins a consistent view without blocking writers, and the backup does not
+    restart every time a worker commits. The copy is written next to the target
+    and only renamed over it once it has passed the integrity check, so an
+    interrupted or failed run leaves the previous snapshot in place.
+    ``progress(remaining, total)`` is called after every step.
+    """
+    target = Path(target_path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    partial = target.with_name(f"{target.name}.partial")
+    partial.unlink(missing_ok=True)
+
+    own_source = not isinstance(source, sqlite3.Connection)
+    if own_source:
+        try:
+            src = sqlite3.connect(f"file:{Path(source)}?mode=ro", uri=True, timeout=30.0)
+        except sqlite3.Error as exc:
+            raise SnapshotError(f"Cannot open {source} for a snapshot: {exc}") from exc
+    else:
+        src = source
+    pause = max(0.0, float(sleep))
+    steps = 0
+
+    def _on_step(status, remaining, total):
+        nonlocal steps
+        steps += 1
+        if progress is not None:
+            progress(remaining, total)
+        if remaining and pause:
+            time.sleep(pause)
+
+    started = time.monotonic()
+    dest = sqlite3.connect(partial)
+    try:
+        if own_source:
+            src.execute("BEGIN")
+            src.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+        src.backup(dest, pages=max(1, int(pages)), progress=_on_step, sleep=pause)
+        # The copied header still says WAL; a snapshot should be one self-contained file.
+        dest.execute("PRAGMA journal_mode = DELETE").fetchone()
+        page_count = dest.execute("PRAGMA page_count").fetchone()[0]
+    except sqlite3.Error as exc:
+        dest.close()
+        partial.unlink(missing_ok=True)
+        raise SnapshotError(f"Backup to {target} failed: {exc}") from exc
+    finally:
+        if own_source:
+            src.close()
+    dest.close()
+
+    problems = verify_snapshot(partial, quick=quick_check) if verify else []
+    if problems:
+        partial.unlink(missing_ok=True)
+        raise SnapshotError(f"Snapshot {target} failed integrity check: {'; '.join(problems[:5])}")
+    os.replace(partial, target)
+    return {
+        "path": str(target),
+        "pages": page_count,
+        "bytes": target.stat().st_size,
+        "steps": steps,
+        "seconds": round(time.monotonic() - started, 3),
+        "verified": bool(verify),
+    }
@@ -1,10 +1,13 @@
+import asyncio
 import re
 from pathlib import Path
 import time
 import threading
 from collections import deque
+from contextlib import asynccontextmanager, contextmanager
 from datetime import datetime, timedelta
 import os
+import sqlite3
 from urllib.parse import parse_qsl, urlsplit, urlunsplit
 
 import requests
@@ -20,6 +23,14 @@ class OpenAlexRateLimitExceeded(RuntimeError):
 _missing_openalex_api_key_warned = False
 
 
+def _request_units(units) -> int:
+    try:
+        units = int(units)
+    except Exception:
+        return 1
+    return units if units > 0 else 1
+
+
 class ServiceRateLimiter:
     """
     A thread-safe rate limiter for multiple services with different rate limits.
@@ -41,16 +52,7 @@ class ServiceRateLimiter:
         self.last_request_ts = {service: 0.0 for service in service_config}
         self.blocked_until_ts = {service: 0.0 for service in service_config}
 
-    def wait_if_needed(self, service_name, units=1):
-        """
-        Blocks until a request can be made to the specified service without exceeding its rate limit.
-        """
-        # Get the config for the service, or fall back to default
-        config = self.service_config.get(service_name, self.service_config.get('default'))
-        if not config:
-            return True  # If no config, allow the request to proceed
-
-        # Ensure the service is initialized in our logs and locks
+    def _ensure_service(self, service_name):
         if service_name not in self.locks:
             self.locks[service_name] = threading.Lock()
             self.request_logs[service_name] = deque()
@@ -58,15 +60,12 @@ class ServiceRateLimiter:
             self.last_request_ts[service_name] = 0.0
             self.blocked_until_ts[service_name] = 0.0
 
+    def _take(self, service_name, config, units) -> tuple[float, str | None]:
+        """Spend ``units`` if the window allows it now; otherwise return the wait and its reason."""
+        self._ensure_service(service_name)
         limit = config['limit']
         window = timedelta(seconds=config['window'])
         min_interval = float(config.get('min_interval', 0) or 0)
-        try:
-            units = int(units)
-        except Exception:
-            units = 1
-        if units <= 0:
-            units = 1
 
         with self.locks[service_name]:
             now = datetime.now()
@@ -74,26 +73,14 @@ class ServiceRateLimiter:
 
             blocked_until = self.blocked_until_ts.get(service_name, 0.0)
             if blocked_until > now_ts:
-                wait_seconds = blocked_until - now_ts
-                print(
-                    f"Service '{service_name}' is temporarily unavailable. Waiting for {wait_seconds:.2f} seconds."
-                )
-                time.sleep(wait_seconds)
-                now = datetime.now()
-                now_ts = time.monotonic()
+                return blocked_until - now_ts, "blocked"
 
             # Some APIs enforce strict per-request spacing and will still 429
             # even when an average RPS bucket is respected.
             if min_interval > 0:
                 elapsed = now_ts - self.last_request_ts[service_name]
                 if elapsed < min_interval:
-                    wait_seconds = min_interval - elapsed
-                    print(
-                        f"Rate spacing for '{service_name}' reached. Waiting for {wait_seconds:.2f} seconds."
-                    )
-                    time.sleep(wait_seconds)
-                    now = datetime.now()
-                    now_ts = time.monotonic()
+                    return min_interval - elapsed, "spacing"
 
             # Remove old requests from the log that are outside the time window
             while self.request_logs[service_name] and (now - self.request_logs[service_name][0][0]) > window:
@@ -103,24 +90,51 @@ class ServiceRateLimiter:
             # If the log is full, we need to wait
             if self.request_totals[service_name] + units > limit and self.request_logs[service_name]:
                 time_of_oldest_request, _ = self.request_logs[service_name][0]
-                time_to_wait = (time_of_oldest_request + window) - now
-
-                if time_to_wait.total_seconds() > 0:
-                    print(f"Rate limit for '{service_name}' reached. Waiting for {time_to_wait.total_seconds():.2f} seconds.")
-                    time.sleep(time_to_wait.total_seconds())
-                    # Recalculate after waiting to keep totals accurate.
-                    now = datetime.now()
-                    while self.request_logs[service_name] and (now - self.request_logs[service_name][0][0]) > window:
-                        _, old_units = self.request_logs[service_name].popleft()
-                        self.request_totals[service_name] = max(0, self.request_totals[service_name] - old_units)
+                time_to_wait = ((time_of_oldest_request + window) - now).total_seconds()
+                if time_to_wait > 0:
+                    return time_to_wait, "limit"
 
             # Log the new request time
-            self.request_logs[service_name].append((datetime.now(), units))
+            self.request_logs[service_name].append((now, units))
             self.request_totals[service_name] += units
-            self.last_request_ts[service_name] = time.monotonic()
-            
-            # Return True to indicate the request can proceed
-            return True
+            self.last_request_ts[service_name] = now_ts
+            return 0.0, None
+
+    def reserve(self, service_name, units=1) -> float:
+        """Non-blocking ``wait_if_needed``.
+
+        Records the request and returns 0.0 when it may be made now; otherwise
+        records nothing and returns the seconds to wait before asking again.
+        Async callers sleep on that value instead of blocking their thread.
+        """
+        config = self.service_config.get(service_name, self.service_config.get('default'))
+        if not config:
+            return 0.0
+        wait_seconds, _ = self._take(service_name, config, _request_units(units))
+        return wait_seconds
+
+    def wait_if_needed(self, service_name, units=1):
+        """
+        Blocks until a request can be made to the specified service without exceeding its rate limit.
+        """
+        # Get the config for the service, or fall back to default
+        config = self.service_config.get(service_name, self.service_config.get('default'))
+        if not config:
+            return True  # If no config, allow the request to proceed
+        units = _request_units(units)
+
+        while True:
+            wait_seconds, reason = self._take(service_name, config, units)
+            if wait_seconds <= 0:
+                # Return True to indicate the request can proceed
+                return True
+            if reason == "blocked":
+                print(f"Service '{service_name}' is temporarily unavailable. Waiting for {wait_seconds:.2f} seconds.")
+            elif reason == "spacing":
+                print(f"Rate spacing for '{service_name}' reached. Waiting for {wait_seconds:.2f} seconds.")
+            else:
+                print(f"Rate limit for '{service_name}' reached. Waiting for {wait_seconds:.2f} seconds.")
+            time.sleep(wait_seconds)
 
     def impose_block(self, service_name, wait_seconds):
         if wait_seconds is None:
@@ -132,13 +146,7 @@ class ServiceRateLimiter:
         if delay <= 0:
             return
 
-        if service_name not in self.locks:
-            self.locks[service_name] = threading.Lock()
-            self.request_logs[service_name] = deque()
-            self.request_totals[service_name] = 0
-            self.last_request_ts[service_name] = 0.0
-            self.blocked_until_ts[service_name] = 0.0
-
+        self._ensure_service(service_name)
         with self.locks[service_name]:
             blocked_until = time.monotonic() + delay
             self.blocked_until_ts[service_name] = max(
@@ -163,8 +171,439 @@ class ServiceRateLimiter:
         time.sleep(delay)
 
 
+class SharedServiceRateLimiter(ServiceRateLimiter):
+    """``ServiceRateLimiter`` whose budgets live in a small SQLite file.
+
+    Every process that opens the same file draws on one token bucket per
+    service (capacity ``limit``, refilled at ``limit / window`` per second) and
+    honors one ``impose_block`` deadline. The enrich and download workers, the
+    backend-spawned scripts and the backfills then share the host's real quota
+    instead of each assuming all of it. If the file cannot be written, a call
+    falls back to the in-process limiter rather than failing the request.
+    """
+
+    def __init__(self, service_config, path: str | Path):
+        super().__init__(service_config)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=10.0, isolation_level=None, check_same_thread=False)
+        self._conn_lock = threading.Lock()
+        # Bucket state is disposable; losing the last few updates in a crash is harmless.
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = OFF")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS rate_buckets (
+                service TEXT PRIMARY KEY,
+                tokens REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                last_request_at REAL NOT NULL DEFAULT 0,
+                blocked_until REAL NOT NULL DEFAULT 0
+            )
+            """
+        )
+
+    def _take(self, service_name, config, units) -> tuple[float, str | None]:
+        try:
+            return self._take_shared(service_name, config, units)
+        except sqlite3.Error:
+            return super()._take(service_name, config, units)
+
+    def _take_shared(self, service_name, config, units) -> tuple[float, str | None]:
+        """Spend ``units`` if the bucket allows it now; otherwise return the wait and its reason."""
+        limit = float(config['limit'])
+        rate = limit / float(config['window'])
+        min_interval = float(config.get('min_interval', 0) or 0)
+        with self._conn_lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                row = self._conn.execute(
+                    "SELECT tokens, updated_at, last_request_at, blocked_until FROM rate_buckets WHERE service = ?",
+                    (service_name,),
+                ).fetchone()
+                tokens, updated_at, last_request_at, blocked_until = row or (limit, now, 0.0, 0.0)
+                tokens = min(limit, tokens + max(0.0, now - updated_at) * rate)
+                # A request larger than the bucket waits for a full bucket and drives it negative.
+                needed = min(float(units), limit)
+                if blocked_until > now:
+                    wait, reason = blocked_until - now, "blocked"
+                elif min_interval > 0 and now - last_request_at < min_interval:
+                    wait, reason = min_interval - (now - last_request_at), "spacing"
+                elif tokens < needed:
+                    wait, reason = (needed - tokens) / rate, "limit"
+                else:
+                    wait, reason = 0.0, None
+                    tokens -= units
+                    last_request_at = now
+                self._conn.execute(
+                    """
+                    INSERT INTO rate_buckets (service, tokens, updated_at, last_request_at)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(service) DO UPDATE SET
+                        tokens = excluded.tokens,
+                        updated_at = excluded.updated_at,
+                        last_request_at = excluded.last_request_at
+                    """,
+                    (service_name, tokens, now, last_request_at),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return wait, reason
+
+    def impose_block(self, service_name, wait_seconds):
+        if wait_seconds is None:
+            return
+        try:
+            delay = max(0.0, float(wait_seconds))
+        except Exception:
+            return
+        if delay <= 0:
+            return
+        super().impose_block(service_name, delay)
+        config = self.service_config.get(service_name, self.service_config.get('default')) or {'limit': 1}
+        now = time.time()
+        try:
+            with self._conn_lock:
+                self._conn.execute(
+                    """
+                    INSERT INTO rate_buckets (service, tokens, updated_at, blocked_until)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(service) DO UPDATE SET blocked_until = MAX(blocked_until, excluded.blocked_until)
+                    """,
+                    (service_name, float(config['limit']), now, now + delay),
+                )
+        except sqlite3.Error:
+            pass
+
+    def remaining_block_seconds(self, service_name):
+        local = super().remaining_block_seconds(service_name)
+        try:
+            with self._conn_lock:
+                row = self._conn.execute(
+                    "SELECT blocked_until FROM rate_buckets WHERE service = ?", (service_name,)
+                ).fetchone()
+        except sqlite3.Error:
+            return local
+        return max(local, (row[0] if row else 0.0) - time.time(), 0.0)
+
+
+# Ceiling per upstream when RAG_FEEDER_<SERVICE>_MAX_CONCURRENCY is unset.
+DEFAULT_MAX_CONCURRENCY = {
+    'openalex': 64,
+    'crossref': 32,
+    'semantic_scholar': 4,
+    'download': 32,
+}
+DEFAULT_INITIAL_CONCURRENCY = 4
+
+# Responses that mean "slow down" rather than "this request failed".
+_THROTTLE_STATUSES = frozenset({429, 503})
+_ERROR_STATUSES = frozenset({500, 502, 504})
+
+
+class _RequestProbe:
+    """What ``AdaptiveConcurrencyLimit.track`` learns about the request it wraps."""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.response = None
+
+
+def _is_timeout(exc: BaseException) -> bool:
+    # requests.Timeout, httpx.TimeoutException and the builtin all say so in their names.
+    return isinstance(exc, TimeoutError) or 'Timeout' in type(exc).__name__
+
+
+def _resolve_waiter(waiter) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class AdaptiveConcurrencyLimit:
+    """
+    An AIMD cap on how many requests one upstream service has in flight.
+
+    Callers hold a slot around each request, either with ``track()`` /
+    ``track_async()`` or with ``slot()`` plus an explicit ``observe``. The
+    limit starts at ``initial`` and doubles per round trip (slow start) until
+    the first congestion signal. After that, each healthy success adds
+    ``1 / limit``. Growth happens only while the limit is actually what
+    callers queue on.
+
+    A 429 or 503, a ``Retry-After`` header, or a timeout multiplies the limit
+    by ``backoff``. This happens at most once per cooldown, so a burst of
+    throttled replies to requests already in flight counts as one signal.
+
+    A success is healthy when recent latency (fast EWMA) is within
+    ``latency_tolerance`` of the long-run latency (slow EWMA) and the recent
+    5xx / transport error rate is under ``max_error_rate``. Unhealthy
+    responses hold the limit; only congestion signals cut it.
+
+    The limit is per process. Every process sharing an upstream backs off on
+    its 429s, which is what lets AIMD flows settle on fair shares. The shared
+    rate limiter still caps requests per second underneath.
+    """
+    def __init__(
+        self,
+        service,
+        *,
+        initial=DEFAULT_INITIAL_CONCURRENCY,
+        minimum=1,
+        maximum=64,
+        backoff=0.5,
+        latency_tolerance=2.0,
+        max_error_rate=0.1,
+        cooldown=None,
+    ):
+        self.service = service
+        self.minimum = max(1, int(minimum))
+        self.maximum = max(self.minimum, int(maximum))
+        self.limit = float(min(self.maximum, max(self.minimum, int(initial))))
+        self.backoff = min(0.95, max(0.05, float(backoff)))
+        self.latency_tolerance = max(1.0, float(latency_tolerance))
+        self.max_error_rate = float(max_error_rate)
+        self.cooldown = cooldown
+        self.slow_start = True
+        self.in_flight = 0
+        self.fast_latency = None
+        self.slow_latency = None
+        self.error_rate = 0.0
+        self.counts = {'ok': 0, 'errors': 0, 'throttled': 0, 'timeouts': 0, 'increases': 0, 'decreases': 0}
+        self.last_decrease_reason = None
+        self._last_decrease_at = 0.0
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._thread_waiters = 0
+        self._async_waiters = deque()
+
+    @property
+    def current(self) -> int:
+        return int(self.limit)
+
+    def _try_acquire(self) -> bool:
+        if self.in_flight < int(self.limit):
+            self.in_flight += 1
+            return True
+        return False
+
+    def acquire(self):
+        with self._available:
+            while not self._try_acquire():
+                self._thread_waiters += 1
+                try:
+                    self._available.wait()
+                finally:
+                    self._thread_waiters -= 1
+
+    async def acquire_async(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                if self._try_acquire():
+                    return
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                with self._lock:
+                    try:
+                        self._async_waiters.remove((loop, waiter))
+                    except ValueError:
+                        # Already woken: pass the wakeup on instead of losing it.
+                        self._wake_locked()
+                raise
+
+    def release(self):
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+            self._wake_locked()
+
+    def _wake_locked(self):
+        free = int(self.limit) - self.in_flight
+        if free <= 0:
+            return
+        self._available.notify(free)
+        for _ in range(min(free, len(self._async_waiters))):
+            loop, waiter = self._async_waiters.popleft()
+            loop.call_soon_threadsafe(_resolve_waiter, waiter)
+
+    @contextmanager
+    def slot(self):
+        self.acquire()
+        try:
+            yield self
+        finally:
+            self.release()
+
+    @contextmanager
+    def track(self):
+        """Hold a slot around one request and observe it: set ``probe.response`` inside the block."""
+        self.acquire()
+        try:
+            probe = _RequestProbe()
+            try:
+                yield probe
+            except Exception as exc:
+                self.observe(timed_out=_is_timeout(exc), error=True)
+                raise
+            if probe.response is not None:
+                self.observe_response(probe.response, time.monotonic() - probe.started)
+        finally:
+            self.release()
+
+    @asynccontextmanager
+    async def track_async(self):
+        """``track`` for coroutines; waiting for a slot does not block the event loop."""
+        await self.acquire_async()
+        try:
+            probe = _RequestProbe()
+            try:
+                yield probe
+            except Exception as exc:
+                self.observe(timed_out=_is_timeout(exc), error=True)
+                raise
+            if probe.response is not None:
+                self.observe_response(probe.response, time.monotonic() - probe.started)
+        finally:
+            self.release()
+
+    def observe_response(self, response, latency=None):
+        """``observe`` for a ``requests`` or ``httpx`` response."""
+        status = getattr(response, 'status_code', None)
+        retry_after = None
+        if status in _THROTTLE_STATUSES:
+            retry_after = _parse_header_seconds(response.headers.get('Retry-After'))
+        self.observe(latency, status=status, retry_after=retry_after)
+
+    def observe(self, latency=None, *, status=None, retry_after=None, timed_out=False, error=False):
+        """Feed one finished request back into the limit while its slot is still held."""
+        with self._lock:
+            if timed_out:
+                self.counts['timeouts'] += 1
+                self._decrease_locked('timeout')
+                return
+            if status in _THROTTLE_STATUSES or retry_after is not None:
+                self.counts['throttled'] += 1
+                self._decrease_locked('retry_after' if retry_after is not None else f'http_{status}')
+                return
+            failed = bool(error) or status in _ERROR_STATUSES
+            self.error_rate += 0.2 * ((1.0 if failed else 0.0) - self.error_rate)
+            if failed:
+                self.counts['errors'] += 1
+                return
+            self.counts['ok'] += 1
+            if latency is not None:
+                latency = max(0.0, float(latency))
+                if self.fast_latency is None:
+                    self.fast_latency = self.slow_latency = latency
+                else:
+                    self.fast_latency += 0.2 * (latency - self.fast_latency)
+                    self.slow_latency += 0.02 * (latency - self.slow_latency)
+            saturated = self.in_flight >= int(self.limit) or self._thread_waiters or self._async_waiters
+            if saturated and self.limit < self.maximum and self._healthy_locked():
+                before = int(self.limit)
+                step = 1.0 if self.slow_start else 1.0 / self.limit
+                self.limit = min(float(self.maximum), self.limit + step)
+                if int(self.limit) > before:
+                    self.counts['increases'] += 1
+                    self._wake_locked()
+
+    def _healthy_locked(self) -> bool:
+        if self.error_rate > self.max_error_rate:
+            return False
+        if not self.slow_latency:
+            return True
+        return self.fast_latency <= self.slow_latency * self.latency_tolerance
+
+    def _decrease_locked(self, reason):
+        now = time.monotonic()
+        cooldown = self.cooldown
+        if cooldown is None:
+            cooldown = min(5.0, max(0.5, self.fast_latency or 0.0))
+        if now - self._last_decrease_at < cooldown:
+            return
+        self._last_decrease_at = now
+        self.slow_start = False
+        self.limit = max(float(self.minimum), self.limit * self.backoff)
+        self.counts['decreases'] += 1
+        self.last_decrease_reason = reason
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'limit': int(self.limit),
+                'in_flight': self.in_flight,
+                'max': self.maximum,
+                'slow_start': self.slow_start,
+                'latency_ms': round(self.fast_latency * 1000, 1) if self.fast_latency is not None else None,
+                'baseline_ms': round(self.slow_latency * 1000, 1) if self.slow_latency is not None else None,
+                'error_rate': round(self.error_rate, 3),
+                'last_decrease': self.last_decrease_reason,
+                **self.counts,
+            }
+
+
+class ConcurrencyLimits:
+    """
+    One ``AdaptiveConcurrencyLimit`` per upstream service, created on first use.
+
+    Each service reads ``RAG_FEEDER_<SERVICE>_MAX_CONCURRENCY`` and
+    ``RAG_FEEDER_<SERVICE>_MIN_CONCURRENCY``. All services share
+    ``RAG_FEEDER_CONCURRENCY_INITIAL``, ``RAG_FEEDER_CONCURRENCY_BACKOFF`` and
+    ``RAG_FEEDER_CONCURRENCY_LATENCY_TOLERANCE``. Keyword overrides take
+    precedence over the environment.
+
+    A key of the form ``"<service>:<host>"`` (see ``for_host``) gets its own
+    limit configured like ``<service>``, so one throttling host does not cut
+    the limit for every other host of that service.
+    """
+    def __init__(self, **overrides):
+        self.overrides = overrides
+        self._limits = {}
+        self._lock = threading.Lock()
+
+    def _config(self, service) -> dict:
+        base = service.split(':', 1)[0]
+        prefix = f"RAG_FEEDER_{base.upper()}"
+        return {
+            'initial': _env_int('RAG_FEEDER_CONCURRENCY_INITIAL', DEFAULT_INITIAL_CONCURRENCY),
+            'minimum': _env_int(f'{prefix}_MIN_CONCURRENCY', 1),
+            'maximum': _env_int(f'{prefix}_MAX_CONCURRENCY', DEFAULT_MAX_CONCURRENCY.get(base, 16)),
+            'backoff': _env_float('RAG_FEEDER_CONCURRENCY_BACKOFF', 0.5, minimum=0.05),
+            'latency_tolerance': _env_float('RAG_FEEDER_CONCURRENCY_LATENCY_TOLERANCE', 2.0, minimum=1.0),
+            **self.overrides,
+        }
+
+    def get(self, service) -> AdaptiveConcurrencyLimit:
+        with self._lock:
+            limit = self._limits.get(service)
+            if limit is None:
+                limit = self._limits[service] = AdaptiveConcurrencyLimit(service, **self._config(service))
+            return limit
+
+    def for_host(self, service, url) -> AdaptiveConcurrencyLimit:
+        """The ``service`` limit for the host of ``url`` (a URL or bare host name)."""
+        text = str(url or '').strip()
+        host = (urlsplit(text if '//' in text else f'//{text}').hostname or 'unknown').lower()
+        return self.get(f"{service}:{host}")
+
+    def ceiling(self, service) -> int:
+        """The configured maximum for ``service``, without creating its limit."""
+        return max(1, int(self._config(service)['maximum']))
+
+    def stats(self) -> dict:
+        with self._lock:
+            limits = list(self._limits.values())
+        return {limit.service: limit.stats() for limit in limits}
+
+
 # Global shared rate limiter instance for the entire application
 _global_rate_limiter = None
+_global_concurrency_limits = None
 
 
 def _env_int(name: str, default: int, minimum: int = 1) -> int:
@@ -318,24 +757,24 @@ def _apply_openalex_response_limits(
     return wait_seconds
 
 
-def openalex_request_json(
+def prepare_openalex_request(
     *,
     endpoint: str | None = None,
     url: str | None = None,
     params: dict | None = None,
     headers: dict | None = None,
-    timeout: float = 30,
-    session=None,
-    rate_limiter: ServiceRateLimiter | None = None,
-    retries: int = 3,
     mailto: str | None = None,
-):
+) -> tuple[str, dict, dict, bool]:
+    """Resolve an OpenAlex call to ``(url, params, headers, billable)``.
+
+    Shared by ``openalex_request_json`` and its asyncio twin so both add the
+    API key and classify billable requests the same way.
+    """
     if endpoint and url:
         raise ValueError('Provide either endpoint or url, not both')
     if not endpoint and not url:
         raise ValueError('Either endpoint or url is required')
 
-    rate_limiter = rate_limiter or get_global_rate_limiter()
     request_headers = {'Accept': 'application/json'}
     if headers:
         request_headers.update(headers)
@@ -352,53 +791,102 @@ def openalex_request_json(
 
     request_url = url or f"{OPENALEX_BASE_URL}/{endpoint.lstrip('/')}"
     request_url, request_params = _merge_query_params(request_url, extra_params)
-    wait_cap_seconds = _env_float('RAG_FEEDER_OPENALEX_MAX_WAIT_SEC', 15.0)
-    http = session or requests
     billable_request = not _is_openalex_lookup_request(request_url, request_params)
+    return request_url, request_params, request_headers, billable_request
+
 
+def check_openalex_billable_block(rate_limiter, billable_request: bool, wait_cap_seconds: float) -> None:
+    """Raise ``OpenAlexRateLimitExceeded`` instead of waiting out a long billable block."""
     remaining_block = rate_limiter.remaining_block_seconds('openalex_billable') if (rate_limiter and billable_request) else 0.0
     if remaining_block > wait_cap_seconds:
         raise OpenAlexRateLimitExceeded(_openalex_quota_message(remaining_block))
 
+
+def openalex_retry_delay(
+    response,
+    rate_limiter,
+    *,
+    attempt: int,
+    retries: int,
+    billable_request: bool,
+    wait_cap_seconds: float,
+) -> float | None:
+    """Seconds to wait before retrying ``response``, or None when it is final.
+
+    Raises for a final error response and for throttling that outlasts the cap.
+    """
+    wait_seconds = _apply_openalex_response_limits(
+        response,
+        rate_limiter,
+        billable_request=billable_request,
+    )
+
+    if response.status_code == 429:
+        if wait_seconds is None:
+            wait_seconds = 2 ** attempt
+        if billable_request and wait_seconds > wait_cap_seconds:
+            raise OpenAlexRateLimitExceeded(_openalex_quota_message(wait_seconds))
+        if attempt == retries - 1:
+            raise OpenAlexRateLimitExceeded(_openalex_quota_message(wait_seconds))
+        return wait_seconds
+
+    if response.status_code in (500, 502, 503, 504):
+        if attempt == retries - 1:
+            response.raise_for_status()
+        return 2 ** attempt
+
+    response.raise_for_status()
+    return None
+
+
+def openalex_request_json(
+    *,
+    endpoint: str | None = None,
+    url: str | None = None,
+    params: dict | None = None,
+    headers: dict | None = None,
+    timeout: float = 30,
+    session=None,
+    rate_limiter: ServiceRateLimiter | None = None,
+    retries: int = 3,
+    mailto: str | None = None,
+    concurrency_limit: AdaptiveConcurrencyLimit | None = None,
+):
+    request_url, request_params, request_headers, billable_request = prepare_openalex_request(
+        endpoint=endpoint, url=url, params=params, headers=headers, mailto=mailto
+    )
+    rate_limiter = rate_limiter or get_global_rate_limiter()
+    concurrency_limit = concurrency_limit or get_concurrency_limits().get('openalex')
+    wait_cap_seconds = _env_float('RAG_FEEDER_OPENALEX_MAX_WAIT_SEC', 15.0)
+    http = session or requests
+
+    check_openalex_billable_block(rate_limiter, billable_request, wait_cap_seconds)
+
     last_error = None
     for attempt in range(retries):
         try:
             if rate_limiter:
-                remaining_block = rate_limiter.remaining_block_seconds('openalex_billable') if billable_request else 0.0
-                if remaining_block > wait_cap_seconds:
-                    raise OpenAlexRateLimitExceeded(_openalex_quota_message(remaining_block))
+                check_openalex_billable_block(rate_limiter, billable_request, wait_cap_seconds)
                 rate_limiter.wait_if_needed('openalex')
 
-            response = http.get(
-                request_url,
-                headers=request_headers,
-                params=request_params,
-                timeout=timeout,
-            )
-            wait_seconds = _apply_openalex_response_limits(
+            with concurrency_limit.track() as probe:
+                response = probe.response = http.get(
+                    request_url,
+                    headers=request_headers,
+                    params=request_params,
+                    timeout=timeout,
+                )
+            delay = openalex_retry_delay(
                 response,
                 rate_limiter,
+                attempt=attempt,
+                retries=retries,
                 billable_request=billable_request,
+                wait_cap_seconds=wait_cap_seconds,
             )
-
-            if response.status_code == 429:
-                if wait_seconds is None:
-                    wait_seconds = 2 ** attempt
-                if billable_request and wait_seconds > wait_cap_seconds:
-                    raise OpenAlexRateLimitExceeded(_openalex_quota_message(wait_seconds))
-                if attempt == retries - 1:
-                    raise OpenAlexRateLimitExceeded(_openalex_quota_message(wait_seconds))
-                time.sleep(wait_seconds)
-                continue
-
-            if response.status_code in (500, 502, 503, 504):
-                if attempt == retries - 1:
-                    response.raise_for_status()
-                time.sleep(2 ** attempt)
-                continue
-
-            response.raise_for_status()
-            return response.json()
+            if delay is None:
+                return response.json()
+            time.sleep(delay)
         except OpenAlexRateLimitExceeded:
             raise
         except requests.RequestException as exc:
@@ -412,6 +900,25 @@ def openalex_request_json(
     raise RuntimeError('OpenAlex request failed after retries')
 
 
+def rate_limit_store_path() -> Path | None:
+    """File backing the cross-process limiter, or None for a per-process one.
+
+    ``RAG_FEEDER_RATE_LIMIT_DB`` names it explicitly. Otherwise it sits next to
+    ``RAG_FEEDER_DB_PATH`` as ``rate_limits.db``, which the workers and every
+    backend-spawned script already share. ``RAG_FEEDER_RATE_LIMIT_BACKEND=memory``
+    opts out.
+    """
+    if _env_str('RAG_FEEDER_RATE_LIMIT_BACKEND', 'shared').lower() in {'memory', 'process', 'local'}:
+        return None
+    explicit = _env_str('RAG_FEEDER_RATE_LIMIT_DB')
+    if explicit:
+        return Path(explicit)
+    db_path = _env_str('RAG_FEEDER_DB_PATH')
+    if db_path:
+        return Path(db_path).with_name('rate_limits.db')
+    return None
+
+
 def get_global_rate_limiter():
     """Get the shared rate limiter instance for the entire application."""
     global _global_rate_limiter
@@ -428,7 +935,7 @@ def get_global_rate_limiter():
         gemini_per_minute = _env_int('RAG_FEEDER_GEMINI_PER_MIN', 2000)
         gemini_daily = _env_int('RAG_FEEDER_GEMINI_DAILY', 100000)
         gemini_tokens_per_min = _env_int('RAG_FEEDER_GEMINI_TOKENS_PER_MIN', 3000000)
-        _global_rate_limiter = ServiceRateLimiter({
+        service_config = {
             'default': {'limit': default_rps, 'window': 1},
             'openalex': {'limit': openalex_rps, 'window': 1},
             'crossref': {'limit': crossref_rps, 'window': 1},
@@ -447,10 +954,26 @@ def get_global_rate_limiter():
             'gemini': {'limit': gemini_per_minute, 'window': 60},
             'gemini_daily': {'limit': gemini_daily, 'window': 86400},
             'gemini_tokens': {'limit': gemini_tokens_per_min, 'window': 60},
-        })
+        }
+        store_path = rate_limit_store_path()
+        if store_path is not None:
+            try:
+                _global_rate_limiter = SharedServiceRateLimiter(service_config, store_path)
+            except (OSError, sqlite3.Error) as exc:
+                print(f"[WARN] Shared rate limiter unavailable at {store_path} ({exc}); using a per-process limiter.")
+        if _global_rate_limiter is None:
+            _global_rate_limiter = ServiceRateLimiter(service_config)
     return _global_rate_limiter
 
 
+def get_concurrency_limits() -> ConcurrencyLimits:
+    """Get the per-service adaptive concurrency limits shared by this process."""
+    global _global_concurrency_limits
+    if _global_concurrency_limits is None:
+        _global_concurrency_limits = ConcurrencyLimits()
+    return _global_concurrency_limits
+
+
 def parse_bibtex_file_field(file_field_str: str | None) -> str | None:
     """Parses the BibTeX 'file' field to extract the file path.
 
@@ -0,0 +1,131 @@
+import os
+import selectors
+import socket
+import sqlite3
+import time
+from pathlib import Path
+
+
+# How often an idle worker reads PRAGMA data_version between socket events.
+DEFAULT_WAKEUP_POLL_MS = 50
+
+
+def wakeup_dir_for(db_path: str | Path) -> Path:
+    """``data/literature.db`` -> ``data/literature_wakeup`` (``RAG_FEEDER_WAKEUP_DIR`` overrides)."""
+    override = os.getenv("RAG_FEEDER_WAKEUP_DIR")
+    if override:
+        return Path(override)
+    path = Path(db_path)
+    return path.with_name(f"{path.stem}_wakeup")
+
+
+def notify_workers(db_path: str | Path, message: bytes = b"job") -> int:
+    """Wake every worker listening for ``db_path``; returns how many were reached.
+
+    Sockets nobody listens on any more (a worker that died without cleaning up)
+    are removed.
+    """
+    reached = 0
+    for path in sorted(wakeup_dir_for(db_path).glob("*.sock")):
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.settimeout(0.2)
+        try:
+            client.connect(str(path))
+            client.sendall(message)
+            reached += 1
+        except (ConnectionRefusedError, FileNotFoundError):
+            path.unlink(missing_ok=True)
+        except OSError:
+            pass
+        finally:
+            client.close()
+    return reached
+
+
+class JobWakeup:
+    """Blocks an idle worker until there may be something to claim.
+
+    A wait ends early on either of two signals. The first is a producer
+    connecting to this worker's Unix socket under ``wakeup_dir_for(db_path)``;
+    ``notify_workers`` and the Node backend do this after inserting into
+    ``pipeline_jobs``. The second is a change of ``PRAGMA data_version``, which
+    SQLite bumps whenever another connection commits. That catches producers
+    that do not notify. It is read on a private connection that never writes,
+    so watching it takes no lock. Without ``AF_UNIX`` only the second signal is
+    used.
+    """
+
+    def __init__(self, db_path: str | Path, name: str, *, poll_ms: int = DEFAULT_WAKEUP_POLL_MS):
+        self.poll_seconds = max(1, int(poll_ms)) / 1000.0
+        self.socket_path: Path | None = None
+        self._server = None
+        self._selector = selectors.DefaultSelector()
+        server = None
+        try:
+            directory = wakeup_dir_for(db_path)
+            directory.mkdir(parents=True, exist_ok=True)
+            path = directory / f"{name}.sock"
+            path.unlink(missing_ok=True)
+            server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            server.bind(str(path))
+            server.listen(16)
+            server.setblocking(False)
+            self._selector.register(server, selectors.EVENT_READ)
+            self._server, self.socket_path = server, path
+        except (OSError, AttributeError):
+            if server is not None:
+                server.close()
+        self._conn = sqlite3.connect(str(db_path), timeout=3.0, check_same_thread=False)
+        self._data_version = self._read_data_version()
+
+    def _read_data_version(self):
+        try:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+        except sqlite3.Error:
+            return None
+
+    def _drain(self) -> bool:
+        woke = False
+        while True:
+            try:
+                client, _ = self._server.accept()
+            except OSError:
+                return woke
+            woke = True
+            try:
+                client.setblocking(False)
+                client.recv(64)
+            except OSError:
+                pass
+            finally:
+                client.close()
+
+    def wait(self, timeout: float) -> str:
+        """Wait up to ``timeout`` seconds; returns ``'notify'``, ``'data_version'`` or ``'timeout'``."""
+        deadline = time.monotonic() + max(0.0, float(timeout))
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return "timeout"
+            step = min(self.poll_seconds, remaining)
+            if self._server is not None:
+                if self._selector.select(step) and self._drain():
+                    self._data_version = self._read_data_version()
+                    return "notify"
+            else:
+                time.sleep(step)
+            version = self._read_data_version()
+            if version != self._data_version:
+                self._data_version = version
+                return "data_version"
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._selector.unregister(self._server)
+            self._server.close()
+            self._server = None
+        self._selector.close()
+        if self.socket_path is not None:
+            self.socket_path.unlink(missing_ok=True)
+            self.socket_path = None
+        self._conn.close()
@@ -0,0 +1,155 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+import requests
+
+from dl_lit.async_enrichment import AsyncEnrichmentEngine
+from dl_lit.OpenAlexScraper import OpenAlexCrossrefSearcher
+from dl_lit.utils import AdaptiveConcurrencyLimit, ConcurrencyLimits, ServiceRateLimiter
+
+
+def _saturate(limit, latency=0.1, count=1):
+    """Report ``count`` successes while every slot is taken."""
+    for _ in range(count):
+        held = limit.current
+        for _ in range(held):
+            limit.acquire()
+        limit.observe(latency)
+        for _ in range(held):
+            limit.release()
+
+
+def test_limit_grows_only_while_it_is_the_bottleneck():
+    limit = AdaptiveConcurrencyLimit("openalex", initial=2, maximum=8)
+    with limit.slot():
+        limit.observe(0.1)
+    assert limit.current == 2
+
+    _saturate(limit, count=2)
+    # Slow start: one slot per saturated success.
+    assert limit.current == 4
+    _saturate(limit, count=10)
+    assert limit.current == 8
+    assert limit.stats()["increases"] == 6
+
+
+def test_throttling_halves_the_limit_once_per_cooldown():
+    limit = AdaptiveConcurrencyLimit("openalex", initial=16, maximum=64, cooldown=0.2)
+    for _ in range(5):
+        limit.observe(status=429)
+    assert limit.current == 8
+    assert limit.stats()["throttled"] == 5 and limit.stats()["decreases"] == 1
+
+    time.sleep(0.25)
+    limit.observe(retry_after=3.0)
+    assert limit.current == 4
+    assert limit.stats()["last_decrease"] == "retry_after"
+
+    # After the first cut, growth is additive: about one slot per limit's worth of successes.
+    _saturate(limit, count=5)
+    assert limit.current == 5 and not limit.slow_start
+
+
+def test_timeouts_cut_and_slow_responses_hold_the_limit():
+    limit = AdaptiveConcurrencyLimit("download", initial=8, maximum=32, cooldown=0)
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        with limit.track():
+            raise requests.exceptions.ReadTimeout("read timed out")
+    assert limit.current == 4 and limit.stats()["timeouts"] == 1
+    assert limit.in_flight == 0
+
+    _saturate(limit, latency=0.1, count=20)
+    grown = limit.current
+    # Latency jumping well past its running baseline stops the climb without cutting.
+    _saturate(limit, latency=2.0, count=10)
+    assert limit.current == grown
+
+    for _ in range(3):
+        limit.observe(status=500)
+    _saturate(limit, latency=0.1, count=5)
+    assert limit.current == grown and limit.stats()["errors"] == 3
+
+
+def test_threads_never_exceed_the_limit():
+    limit = AdaptiveConcurrencyLimit("download", initial=3, maximum=3)
+    active, peak, lock = [0], [0], threading.Lock()
+
+    def work():
+        with limit.slot():
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+
+    threads = [threading.Thread(target=work) for _ in range(12)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak[0] == 3
+
+
+def test_engine_requests_hold_slots_and_back_off_on_429():
+    limits = ConcurrencyLimits(initial=2, maximum=2, cooldown=10)
+    openalex = limits.get("openalex")
+    searcher = OpenAlexCrossrefSearcher(
+        mailto="test@example.com", rate_limiter=ServiceRateLimiter({"default": {"limit": 10000, "window": 1}})
+    )
+    active, peak, calls = [0], [0], []
+
+    async def handler(request: httpx.Request):
+        calls.append(request)
+        first = len(calls) == 1
+        active[0] += 1
+        peak[0] = max(peak[0], active[0])
+        await asyncio.sleep(0.02)
+        active[0] -= 1
+        if first:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        doi = request.url.params.get("filter", "")[4:]
+        work = {"id": "https://openalex.org/W1", "doi": f"https://doi.org/{doi}", "display_name": "T"}
+        return httpx.Response(200, json={"results": [work]})
+
+    async def main():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with AsyncEnrichmentEngine(searcher, client=client, concurrency=limits) as engine:
+            refs = [{"title": f"Paper {i}", "doi": f"10.1000/{i}"} for i in range(6)]
+            return await engine.process_references(refs, fetch_references=False)
+
+    results = asyncio.run(main())
+    assert all(results)
+    assert peak[0] <= 2
+    stats = limits.stats()["openalex"]
+    assert stats["throttled"] == 1 and stats["decreases"] == 1
+    assert stats["last_decrease"] == "retry_after" and not openalex.slow_start
+    assert stats["in_flight"] == 0
+
+
+def test_download_limits_are_keyed_per_host(monkeypatch):
+    from dl_lit.new_dl import BibliographyEnhancer
+
+    monkeypatch.setenv("RAG_FEEDER_DOWNLOAD_MAX_CONCURRENCY", "12")
+    limits = ConcurrencyLimits(initial=8, cooldown=10)
+    enhancer = BibliographyEnhancer.__new__(BibliographyEnhancer)
+    enhancer.concurrency = limits
+
+    def fake_get(session, url, **kwargs):
+        response = requests.Response()
+        response.status_code = 429 if "mirror.example" in url else 200
+        return response
+
+    monkeypatch.setattr(requests.Session, "get", fake_get)
+    assert enhancer._request_get_direct("https://mirror.example/paper.pdf").status_code == 429
+    assert enhancer._request_get_direct("https://publisher.example/paper.pdf").status_code == 200
+
+    stats = limits.stats()
+    assert set(stats) == {"download:mirror.example", "download:publisher.example"}
+    assert stats["download:mirror.example"]["limit"] == 4
+    assert stats["download:publisher.example"]["limit"] == 8
+    assert stats["download:publisher.example"]["max"] == limits.ceiling("download") == 12
+    assert limits.for_host("download", "Publisher.Example") is limits.get("download:publisher.example")
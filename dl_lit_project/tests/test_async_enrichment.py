@@ -0,0 +1,122 @@
+import asyncio
+import time
+
+import httpx
+
+from dl_lit.async_enrichment import AsyncEnrichmentEngine
+from dl_lit.OpenAlexScraper import OpenAlexCrossrefSearcher
+from dl_lit.utils import ServiceRateLimiter
+
+FAST = {"default": {"limit": 10000, "window": 1}}
+
+
+def _work(doi, title="Governing the Commons", referenced=()):
+    return {
+        "id": f"https://openalex.org/W{abs(hash(doi)) % 10**8}",
+        "doi": f"https://doi.org/{doi}",
+        "display_name": title,
+        "publication_year": 1990,
+        "authorships": [{"author": {"display_name": "Elinor Ostrom"}}],
+        "referenced_works": list(referenced),
+        "cited_by_api_url": None,
+    }
+
+
+def _openalex_app(delay=0.0, calls=None):
+    async def handler(request: httpx.Request):
+        if calls is not None:
+            calls.append(request)
+        await asyncio.sleep(delay)
+        flt = request.url.params.get("filter", "")
+        if flt.startswith("doi:"):
+            return httpx.Response(200, json={"results": [_work(flt[4:], referenced=["https://openalex.org/W1"])]})
+        if flt.startswith("openalex_id:"):
+            ids = flt.split(":", 1)[1].split("|")
+            return httpx.Response(200, json={"results": [{"id": i, "display_name": f"Ref {i}"} for i in ids]})
+        return httpx.Response(404)
+
+    return handler
+
+
+def _run(engine_factory, coro_factory):
+    async def main():
+        async with engine_factory() as engine:
+            return await coro_factory(engine)
+
+    return asyncio.run(main())
+
+
+def test_references_run_concurrently_on_one_thread():
+    limiter = ServiceRateLimiter(FAST)
+    searcher = OpenAlexCrossrefSearcher(mailto="test@example.com", rate_limiter=limiter)
+    client = httpx.AsyncClient(transport=httpx.MockTransport(_openalex_app(delay=0.2)))
+    refs = [{"title": f"Paper {i}", "doi": f"10.1000/{i}"} for i in range(40)]
+
+    started = time.monotonic()
+    results = _run(
+        lambda: AsyncEnrichmentEngine(searcher, client=client),
+        lambda engine: engine.process_references(refs, fetch_references=True, return_diagnostics=True),
+    )
+    elapsed = time.monotonic() - started
+
+    # Two sequential 0.2s requests per reference (DOI lookup, referenced works); 40 serially would take 16s.
+    assert elapsed < 3
+    assert [enriched["doi"] for enriched, _ in results] == [f"https://doi.org/10.1000/{i}" for i in range(40)]
+    assert all(diag["status"] == "matched" for _, diag in results)
+    assert results[0][0]["referenced_works"][0]["openalex_id"] == "https://openalex.org/W1"
+
+
+def test_shared_limiter_paces_the_engine():
+    limiter = ServiceRateLimiter({"default": {"limit": 1000, "window": 1}, "openalex": {"limit": 5, "window": 1}})
+    searcher = OpenAlexCrossrefSearcher(mailto="test@example.com", rate_limiter=limiter)
+    calls = []
+    client = httpx.AsyncClient(transport=httpx.MockTransport(_openalex_app(calls=calls)))
+    refs = [{"title": f"Paper {i}", "doi": f"10.1000/{i}"} for i in range(8)]
+
+    started = time.monotonic()
+    results = _run(lambda: AsyncEnrichmentEngine(searcher, client=client), lambda e: e.process_references(refs, fetch_references=False))
+    assert all(results)
+    assert len(calls) == 8
+    # Five requests fit the first window; the other three wait for it to roll over.
+    assert time.monotonic() - started >= 0.9
+
+
+def test_reserve_does_not_spend_when_it_asks_to_wait():
+    limiter = ServiceRateLimiter({"default": {"limit": 2, "window": 1}})
+    assert limiter.reserve("openalex") == 0.0
+    assert limiter.reserve("openalex") == 0.0
+    wait = limiter.reserve("openalex")
+    assert 0 < wait <= 1
+    assert limiter.request_totals["openalex"] == 2
+
+
+def test_title_only_reference_falls_back_to_crossref_after_throttling():
+    limiter = ServiceRateLimiter(FAST)
+    searcher = OpenAlexCrossrefSearcher(mailto="test@example.com", rate_limiter=limiter)
+    crossref_calls = []
+
+    def handler(request: httpx.Request):
+        if request.url.host == "api.semanticscholar.org":
+            return httpx.Response(404)
+        crossref_calls.append(request)
+        if len(crossref_calls) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        item = {
+            "DOI": "10.2307/3146384",
+            "title": ["Governing the Commons"],
+            "author": [{"given": "Elinor", "family": "Ostrom"}],
+            "published-print": {"date-parts": [[1990]]},
+            "type": "book",
+        }
+        return httpx.Response(200, json={"message": {"items": [item]}})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    ref = {"title": "Governing the Commons", "authors": ["Elinor Ostrom"], "year": 1990}
+    enriched, diagnostics = _run(
+        lambda: AsyncEnrichmentEngine(searcher, client=client),
+        lambda engine: engine.process_reference(ref, fetch_references=False, return_diagnostics=True),
+    )
+    assert diagnostics["attempted_steps"] == ["s2_match", 8]
+    assert enriched["doi"] == "10.2307/3146384"
+    assert len(crossref_calls) == 2
+
@@ -0,0 +1,102 @@
+import json
+import sqlite3
+
+from click.testing import CliRunner
+
+from dl_lit import db_manager as db_module
+from dl_lit.bulk_load import split_bibtex
+from dl_lit.cli import cli
+from dl_lit.db_manager import DatabaseManager
+
+BIBTEX = """@string{jie = {Journal of Institutional Economics}}
+@article{north1991, title={Institutions}, author={North, Douglass}, journal=jie, year={1991}, doi={10.1257/JEP.5.1.97}}
+@comment{ignored}
+@book{williamson1985, title={The Economic Institutions of Capitalism}, author={Williamson, Oliver}, year={1985}}
+@book{williamson1985b, title={The Economic Institutions of Capitalism}, author={Williamson, Oliver}, year={1985}, publisher={Free Press}}
+"""
+
+
+def test_split_bibtex_repeats_macros_in_every_chunk():
+    chunks = split_bibtex(BIBTEX, entries_per_chunk=2)
+    assert len(chunks) == 2
+    assert all(chunk.startswith("@string{jie") for chunk in chunks)
+    assert "@comment" not in "".join(chunks)
+
+
+def test_bulk_import_merges_with_existing_rules(tmp_path):
+    bib = tmp_path / "legacy.bib"
+    bib.write_text(BIBTEX, encoding="utf-8")
+    refs = tmp_path / "refs.json"
+    refs.write_text(json.dumps([{"title": "Transaction Cost Economics", "year": 1979}, {"year": 2000}]), encoding="utf-8")
+    db_path = tmp_path / "literature.db"
+    db = DatabaseManager(db_path)
+    try:
+        existing, _ = db.create_pending_work({"title": "Institutions (draft)", "doi": "10.1257/jep.5.1.97", "corpus_id": 1})
+        stats = db.bulk_import_files([bib, refs], corpus_id=2, workers=2, defer_indexes=True)
+        assert (stats["created"], stats["merged"], stats["failed"]) == (2, 2, 1)
+        assert stats["indexes_rebuilt"] > 0
+
+        merged = db.conn.execute(
+            "SELECT download_status, metadata_status, source FROM works WHERE id = ?", (existing,)
+        ).fetchone()
+        assert merged == ("downloaded", "matched", "Journal of Institutional Economics")
+        rows = db.conn.execute("SELECT title, download_status FROM works ORDER BY id").fetchall()
+        assert [title for title, _ in rows] == [
+            "Institutions (draft)", "The Economic Institutions of Capitalism", "Transaction Cost Economics",
+        ]
+        publisher = db.conn.execute("SELECT publisher FROM works WHERE id = 2").fetchone()[0]
+        assert publisher == "Free Press"
+        assert db.get_work_payload(2, "bibtex_entry_json")
+        links = db.conn.execute("SELECT corpus_id, work_id FROM corpus_works ORDER BY corpus_id, work_id").fetchall()
+        assert links == [(1, 1), (2, 1), (2, 2), (2, 3)]
+        names = {row[0] for row in db.conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert {"idx_works_title_year_int", "idx_works_download_status"} <= names
+        assert not (tmp_path / "literature.db.bulk-staging").exists()
+    finally:
+        db.close_connection()
+
+    result = CliRunner().invoke(cli, ["bulk-import", str(bib), "--db-path", str(db_path), "--workers", "1"])
+    assert result.exit_code == 0, result.output
+    assert "0 created, 3 merged" in result.output
+
+
+def test_bulk_load_rebases_onto_works_written_while_it_resolved(tmp_path, monkeypatch):
+    db_path = tmp_path / "literature.db"
+    db = DatabaseManager(db_path)
+    existing, _ = db.create_pending_work({"title": "Institutions", "doi": "10.1257/jep.5.1.97"})
+    staging = db_module.open_staging_db
+
+    def other_writer_then_stage(path, columns):
+        # Runs between resolution and the write lock.
+        other = sqlite3.connect(db_path)
+        other.execute("INSERT INTO works (title, normalized_title, normalized_doi) VALUES ('Markets', 'markets', '10.1/MARKETS')")
+        other.execute("INSERT INTO works (title, normalized_title) VALUES ('Unrelated', 'unrelated')")
+        other.execute("UPDATE works SET abstract = 'Written meanwhile' WHERE id = ?", (existing,))
+        other.commit()
+        other.close()
+        return staging(path, columns)
+
+    monkeypatch.setattr(db_module, "open_staging_db", other_writer_then_stage)
+    refs = [
+        {"title": "Institutions", "doi": "10.1257/jep.5.1.97", "publisher": "AEA"},
+        {"title": "Markets and Hierarchies", "doi": "10.1/markets"},
+        {"title": "Firms", "translated_title": "Unternehmen", "translated_language": "de"},
+    ]
+    try:
+        records = [
+            {**db._build_raw_work_payload(ref), **{k: ref[k] for k in db_module.TRANSLATION_ALIAS_KEYS if k in ref}}
+            for ref in refs
+        ]
+        stats = db.bulk_load(records, corpus_id=3)
+        assert (stats["created"], stats["merged"], stats["failed"]) == (1, 2, 0)
+
+        rows = db.conn.execute("SELECT id, title, abstract, publisher FROM works ORDER BY id").fetchall()
+        assert [row[1] for row in rows] == ["Institutions", "Markets", "Unrelated", "Firms"]
+        assert rows[0][2:] == ("Written meanwhile", "AEA")
+        firms_id = rows[3][0]
+        links = db.conn.execute("SELECT work_id FROM corpus_works WHERE corpus_id = 3 ORDER BY work_id").fetchall()
+        assert [row[0] for row in links] == [existing, rows[1][0], firms_id]
+        alias = db.conn.execute("SELECT work_id, alias_language FROM work_aliases WHERE normalized_alias_title = 'unternehmen'").fetchone()
+        assert alias == (firms_id, "de")
+    finally:
+        db.close_connection()
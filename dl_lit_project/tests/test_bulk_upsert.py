@@ -0,0 +1,86 @@
+from dl_lit.db_manager import DatabaseManager
+
+
+REFS = [
+    {"title": "Shared Doi", "authors": ["A"], "year": 2001, "doi": "10.1/shared"},
+    {"title": "Shared Doi (reprint)", "doi": "10.1/SHARED", "abstract": "filled later"},
+    {"title": "Same Title", "authors": ["B"], "year": "2002"},
+    {"title": "Same Title", "authors": ["B"], "year": 2002, "publisher": "P"},
+    {"title": "Loose Match", "year": 2003},
+    {"title": "Loose Match", "authors": ["C"], "year": 2003},
+    {"title": "Original Title", "year": 2004, "translated_title": "Translated Title", "translated_year": 2005},
+    {"title": "Translated Title", "year": 2005},
+    {"title": ""},
+]
+
+
+def _snapshot(db):
+    cur = db.conn.cursor()
+    works = cur.execute(
+        "SELECT id, title, normalized_doi, normalized_authors, year, abstract, publisher FROM works ORDER BY id"
+    ).fetchall()
+    aliases = cur.execute("SELECT work_id, normalized_alias_title, alias_year FROM work_aliases ORDER BY id").fetchall()
+    merges = cur.execute("SELECT canonical_id, match_field, action FROM merge_log ORDER BY id").fetchall()
+    corpus = cur.execute("SELECT corpus_id, work_id FROM corpus_works ORDER BY work_id").fetchall()
+    return works, aliases, merges, corpus
+
+
+def test_bulk_upsert_matches_row_by_row_path(tmp_path):
+    serial = DatabaseManager(tmp_path / "serial.db")
+    bulk = DatabaseManager(tmp_path / "bulk.db")
+    try:
+        for ref in REFS:
+            serial.create_pending_work({**ref, "corpus_id": 7})
+        outcomes = bulk.upsert_works_bulk(REFS, corpus_id=7, chunk_size=4)
+
+        assert _snapshot(bulk) == _snapshot(serial)
+        assert [o["status"] for o in outcomes] == [
+            "created", "merged", "created", "merged", "created", "merged", "created", "merged", "failed",
+        ]
+        assert outcomes[1]["matched_field"] == "normalized_doi"
+        assert outcomes[1]["work_id"] == outcomes[0]["work_id"]
+        assert outcomes[3]["matched_field"] == "title_authors_year"
+        assert outcomes[7]["matched_field"] == "alias_title"
+        assert outcomes[8]["error"] == "Title is required"
+    finally:
+        serial.close_connection()
+        bulk.close_connection()
+
+
+def test_bulk_upsert_falls_back_to_single_rows_on_write_error(tmp_path):
+    db = DatabaseManager(tmp_path / "test.db")
+    try:
+        doi_id, _ = db.create_pending_work({"title": "Has Doi", "doi": "10.9/a"})
+        oa_id, _ = db.create_pending_work({"title": "Has OpenAlex", "openalex_id": "W123"})
+        outcomes = db.upsert_works_bulk(
+            [
+                {"title": "Fresh One", "year": 2020},
+                # Merges into the DOI match but carries another work's OpenAlex ID,
+                # which violates the unique index and fails the chunk.
+                {"title": "Has Doi", "doi": "10.9/a", "openalex_id": "https://openalex.org/W123"},
+                {"title": "Fresh Two", "year": 2021},
+            ],
+            chunk_size=10,
+        )
+        assert [o["status"] for o in outcomes] == ["created", "failed", "created"]
+        assert "UNIQUE" in outcomes[1]["error"]
+        assert db.conn.execute("SELECT openalex_id FROM works WHERE id = ?", (doi_id,)).fetchone()[0] is None
+        assert db.conn.execute("SELECT COUNT(*) FROM works").fetchone()[0] == 4
+        assert oa_id != doi_id
+    finally:
+        db.close_connection()
+
+
+def test_add_pending_works_from_json_uses_bulk_counts(tmp_path):
+    import json
+
+    path = tmp_path / "refs.json"
+    path.write_text(json.dumps(REFS), encoding="utf-8")
+    db = DatabaseManager(tmp_path / "test.db")
+    try:
+        added, skipped, errors = db.add_pending_works_from_json(path, source_pdf="paper.pdf")
+        # Low-confidence merges count as added, high-confidence merges and missing titles as skipped.
+        assert (added, skipped, errors) == (6, 3, [])
+        assert db.conn.execute("SELECT COUNT(*) FROM works WHERE source_pdf = 'paper.pdf'").fetchone()[0] == 4
+    finally:
+        db.close_connection()
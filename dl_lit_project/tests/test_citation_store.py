@@ -0,0 +1,100 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+from dl_lit.citation_graph import CitationCSR, export_citation_csr, load_citation_csr
+from dl_lit.db_manager import DatabaseManager
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[2] / "backend" / "scripts"
+
+
+def _edges(db):
+    return sorted(db.conn.execute("SELECT source_work_id, target_work_id, relationship FROM work_citations").fetchall())
+
+
+def test_triggers_resolve_edges_to_work_ids(tmp_path):
+    db = DatabaseManager(tmp_path / "test.db")
+    try:
+        a, _ = db.create_pending_work({"title": "Work A", "openalex_id": "W1"})
+        b, _ = db.create_pending_work({"title": "Work B", "doi": "10.1000/b"})
+        c, _ = db.create_pending_work({"title": "Work C"})
+        db._insert_citation_edge("W1", db._make_node_id(None, "10.1000/b", None, None), "references")
+        db._insert_citation_edge(f"works:{c}", "W1", "cited_by")
+        db._insert_citation_edge("W1", "W999", "references")
+        db.conn.commit()
+
+        assert _edges(db) == [(a, b, 0), (c, a, 1)]
+        external = db.conn.execute(
+            "SELECT u.source_work_id, x.external_id FROM work_citations_unresolved u "
+            "JOIN citation_external_ids x ON x.id = u.external_id"
+        ).fetchall()
+        assert external == [(a, "W999")]
+
+        # Enriching C with the missing OpenAlex id resolves the pending edge.
+        db.conn.execute("UPDATE works SET openalex_id = 'W999' WHERE id = ?", (c,))
+        db.conn.commit()
+        assert _edges(db) == [(a, b, 0), (a, c, 0), (c, a, 1)]
+        assert db.conn.execute("SELECT COUNT(*) FROM work_citations_unresolved").fetchone()[0] == 0
+
+        live = _edges(db)
+        assert db.rebuild_citation_store() == {"resolved": 3, "unresolved": 0}
+        assert _edges(db) == live
+
+        db.conn.execute("DELETE FROM works WHERE id = ?", (b,))
+        db.conn.commit()
+        assert _edges(db) == [(a, c, 0), (c, a, 1)]
+    finally:
+        db.close_connection()
+
+
+def test_csr_export_matches_store_and_refreshes_when_stale(tmp_path):
+    db = DatabaseManager(tmp_path / "test.db")
+    try:
+        ids = [db.create_pending_work({"title": f"Work {n}", "openalex_id": f"W{n}"})[0] for n in range(1, 5)]
+        for source, target in [(1, 2), (1, 3), (3, 2), (4, 1)]:
+            db._insert_citation_edge(f"W{source}", f"W{target}", "references")
+        db.conn.commit()
+
+        meta = export_citation_csr(db.conn, tmp_path / "csr")
+        assert meta["edges"] == 4
+        out = CitationCSR.open(tmp_path / "csr", "out")
+        assert out.neighbors(ids[0]).tolist() == [ids[1], ids[2]]
+        assert out.neighbors(ids[1]).tolist() == []
+        assert out.neighbors(10_000).tolist() == []
+        incoming = CitationCSR.open(tmp_path / "csr", "in")
+        assert incoming.neighbors(ids[1]).tolist() == [ids[0], ids[2]]
+        assert sorted(zip(out.edge_sources().tolist(), out.targets.tolist())) == [
+            (s, t) for s, t, _ in _edges(db)
+        ]
+
+        db._insert_citation_edge("W2", "W4", "references")
+        db.conn.commit()
+        refreshed = load_citation_csr(db.conn, tmp_path / "csr")
+        assert refreshed.num_edges == 5 and refreshed.neighbors(ids[1]).tolist() == [ids[3]]
+    finally:
+        db.close_connection()
+
+
+def test_backfill_counts_edges_not_trigger_rows(tmp_path, monkeypatch, capsys):
+    db_path = tmp_path / "test.db"
+    db = DatabaseManager(db_path)
+    try:
+        for title, openalex_id in (("Work A", "W1"), ("Work B", "W2")):
+            db.create_pending_work({"title": title, "openalex_id": openalex_id})
+        db.conn.execute("UPDATE works SET metadata_status = 'matched', download_status = 'downloaded'")
+        db.conn.commit()
+    finally:
+        db.close_connection()
+
+    monkeypatch.syspath_prepend(str(SCRIPTS_DIR))
+    spec = importlib.util.spec_from_file_location("backfill_citation_edges_test", SCRIPTS_DIR / "backfill_citation_edges.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    results = {"results": [{"id": "https://openalex.org/W1", "referenced_works": ["https://openalex.org/W2"]}]}
+    monkeypatch.setattr(module, "openalex_request_json", lambda **kwargs: results)
+    monkeypatch.setattr(sys, "argv", ["backfill_citation_edges.py", "--db-path", str(db_path)])
+    module.main()
+
+    # Each edge also writes a work_citations row through a trigger; only the edge counts.
+    assert "Added 1 in-corpus citation edges" in capsys.readouterr().err
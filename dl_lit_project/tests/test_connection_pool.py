@@ -0,0 +1,134 @@
+import sqlite3
+import threading
+
+import pytest
+
+from dl_lit.db_manager import DatabaseManager
+
+
+def test_readers_are_per_thread_and_read_only(tmp_path):
+    db = DatabaseManager(tmp_path / "test.db")
+    pool = db.enable_connection_pool()
+    try:
+        work_id, _ = db.create_pending_work({"title": "Shared Work", "year": 2001})
+        main_reader = pool.reader()
+        assert pool.reader() is main_reader
+        assert main_reader.conn is not db.conn
+
+        seen = {}
+
+        def lookup():
+            reader = pool.reader()
+            seen["reader"] = reader
+            seen["match"] = reader.check_if_exists(doi=None, openalex_id=None, title="Shared Work", year=2001)
+
+        thread = threading.Thread(target=lookup)
+        thread.start()
+        thread.join()
+        assert seen["reader"] is not main_reader
+        assert seen["match"] == ("works", work_id, "title_year")
+
+        with pytest.raises(sqlite3.OperationalError):
+            main_reader.conn.execute("DELETE FROM works")
+    finally:
+        db.close_connection()
+
+
+def test_group_commit_writer_isolates_failed_jobs(tmp_path):
+    db = DatabaseManager(tmp_path / "test.db")
+    pool = db.enable_connection_pool(max_delay_ms=50)
+    try:
+        def broken(writer):
+            writer.create_pending_work({"title": "Rolled Back"})
+            raise RuntimeError("boom")
+
+        futures = [pool.submit(lambda writer, i=i: writer.create_pending_work({"title": f"Work {i}", "year": 2000 + i})) for i in range(5)]
+        futures.insert(2, pool.submit(broken))
+        # _merge_records issues its own BEGIN/COMMIT; inside a group it must stay scoped to its savepoint.
+        futures.append(pool.submit(lambda writer: writer._merge_records("works", 1, "works", 2, "test")))
+
+        with pytest.raises(RuntimeError):
+            futures[2].result(timeout=10)
+        created = [futures[i].result(timeout=10) for i in (0, 1, 3, 4, 5)]
+        assert all(work_id and err is None for work_id, err in created)
+        assert futures[-1].result(timeout=10) == (True, None)
+
+        titles = [row[0] for row in pool.reader().conn.execute("SELECT title FROM works ORDER BY id")]
+        assert titles == ["Work 0", "Work 2", "Work 3", "Work 4"]
+        assert pool.reader().conn.execute("SELECT COUNT(*) FROM merge_log WHERE action = 'merged'").fetchone()[0] == 1
+    finally:
+        db.close_connection()
+
+
+def test_savepoint_failures_fail_the_group_and_keep_the_writer_alive(tmp_path):
+    db = DatabaseManager(tmp_path / "test.db")
+    pool = db.enable_connection_pool(max_delay_ms=50)
+    try:
+        def releases_group_savepoint(writer):
+            writer.create_pending_work({"title": "Lost"})
+            # Releasing the pool's savepoint from inside the job makes the pool's own RELEASE fail.
+            writer.conn._conn.execute("RELEASE dl_group_write")
+
+        futures = pool.submit_many([
+            lambda writer: writer.create_pending_work({"title": "Neighbour"}),
+            releases_group_savepoint,
+        ])
+        for future in futures:
+            with pytest.raises(sqlite3.OperationalError):
+                future.result(timeout=10)
+
+        work_id, err = pool.write(lambda writer: writer.create_pending_work({"title": "After"}), timeout=10)
+        assert work_id and err is None
+        titles = [row[0] for row in pool.reader().conn.execute("SELECT title FROM works")]
+        assert titles == ["After"]
+    finally:
+        db.close_connection()
+
+
+def test_group_writes_route_executemany_and_reject_executescript(tmp_path):
+    db = DatabaseManager(tmp_path / "test.db")
+    pool = db.enable_connection_pool()
+    try:
+        def bulk(writer):
+            writer.conn.cursor().executemany("COMMIT", [()])
+            writer.conn.executemany("INSERT INTO works (title) VALUES (?)", [("A",), ("B",)])
+            raise RuntimeError("undo")
+
+        with pytest.raises(RuntimeError):
+            pool.write(bulk, timeout=10)
+        with pytest.raises(sqlite3.ProgrammingError):
+            pool.write(lambda writer: writer.conn.executescript("DELETE FROM works;"), timeout=10)
+        with pytest.raises(sqlite3.ProgrammingError):
+            pool.write(lambda writer: writer.conn.cursor().executescript("DELETE FROM works;"), timeout=10)
+        assert pool.reader().conn.execute("SELECT COUNT(*) FROM works").fetchone()[0] == 0
+    finally:
+        db.close_connection()
+
+
+def test_result_sink_flushes_by_size_and_time(tmp_path):
+    from dl_lit.connection_pool import ResultSink
+
+    db = DatabaseManager(tmp_path / "test.db")
+    pool = db.enable_connection_pool()
+    commits = []
+    pool._writer_conn.set_trace_callback(lambda sql: commits.append(sql) if sql.strip().upper() == "COMMIT" else None)
+    try:
+        sink = ResultSink(pool, max_items=3, max_delay_ms=60_000)
+        futures = [sink.add(lambda writer, i=i: writer.create_pending_work({"title": f"Sized {i}"})) for i in range(3)]
+        assert [f.result(timeout=10)[1] for f in futures] == [None, None, None]
+        assert len(commits) == 1
+
+        timed = ResultSink(pool, max_items=100, max_delay_ms=20)
+        late = timed.add(lambda writer: writer.create_pending_work({"title": "Timed"}))
+        assert late.result(timeout=10)[0]
+        assert len(commits) == 2
+
+        # Unflushed transitions are not visible (their rows stay covered by the claim lease).
+        held = ResultSink(pool, max_items=100, max_delay_ms=60_000)
+        pending = held.add(lambda writer: writer.create_pending_work({"title": "Held"}))
+        assert not pending.done()
+        assert pool.reader().conn.execute("SELECT COUNT(*) FROM works WHERE title = 'Held'").fetchone()[0] == 0
+        held.flush()
+        assert pending.result(timeout=10)[0]
+    finally:
+        db.close_connection()
@@ -0,0 +1,106 @@
+import importlib.util
+import sqlite3
+from pathlib import Path
+from types import SimpleNamespace
+
+from dl_lit.db_manager import DatabaseManager
+
+
+SCRIPT_PATH = Path(__file__).resolve().parents[2] / "backend" / "scripts" / "corpus_list.py"
+SPEC = importlib.util.spec_from_file_location("dt_corpus_list", SCRIPT_PATH)
+CORPUS_LIST = importlib.util.module_from_spec(SPEC)
+assert SPEC and SPEC.loader
+SPEC.loader.exec_module(CORPUS_LIST)
+
+
+def _args(**overrides):
+    args = dict(limit=2, offset=0, corpus_id=None, cursor="", status="", year_from=None, year_to=None, source="")
+    args.update(overrides)
+    return SimpleNamespace(**args)
+
+
+def _connect(tmp_path, works):
+    db_path = tmp_path / "list.db"
+    db = DatabaseManager(db_path)
+    db.conn.executemany(
+        "INSERT INTO works (id, title, year, metadata_status, download_status) VALUES (?, ?, ?, ?, ?)",
+        works,
+    )
+    db.conn.commit()
+    db.close_connection()
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def test_keyset_pages_order_text_years_like_integer_years(tmp_path):
+    conn = _connect(tmp_path, [
+        (1, "A", 2001, "matched", "not_requested"),
+        (2, "B", "1999", "matched", "not_requested"),
+        (3, "C", "n.d.", "matched", "not_requested"),
+        (4, "D", 2000, "matched", "not_requested"),
+        (5, "E", "2003", "matched", "not_requested"),
+        (6, "F", None, "matched", "not_requested"),
+    ])
+    try:
+        seen, cursor = [], ""
+        while True:
+            rows, cursor = CORPUS_LIST.fetch_page(conn, _args(cursor=cursor))
+            seen.extend(row["id"] for row in rows)
+            assert all("sort_year" not in row for row in rows)
+            if not cursor:
+                break
+        assert seen == [5, 1, 4, 2, 6, 3]
+
+        rows, _ = CORPUS_LIST.fetch_page(conn, _args(limit=10, year_from=2000, year_to=2002))
+        assert [row["id"] for row in rows] == [1, 4]
+    finally:
+        conn.close()
+
+
+class _RecordingConnection:
+    """Passes statements through to ``conn`` and keeps them for EXPLAIN."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.statements = []
+
+    def execute(self, sql, params=()):
+        self.statements.append((sql, params))
+        return self.conn.execute(sql, params)
+
+
+def test_corpus_page_walks_the_year_sort_index(tmp_path):
+    conn = _connect(tmp_path, [(i, f"W{i}", 1990 + i % 30, "matched", "not_requested") for i in range(1, 201)])
+    try:
+        conn.executemany("INSERT INTO corpus_works (corpus_id, work_id) VALUES (1, ?)", [(i,) for i in range(1, 201, 2)])
+        conn.commit()
+        recorder = _RecordingConnection(conn)
+        rows, cursor = CORPUS_LIST.fetch_page(recorder, _args(corpus_id=1, limit=5))
+        rows, _ = CORPUS_LIST.fetch_page(recorder, _args(corpus_id=1, limit=5, cursor=cursor))
+        assert len(rows) == 5 and all(row["id"] % 2 for row in rows)
+
+        for sql, params in recorder.statements:
+            plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+            assert any("idx_works_year_sort" in detail for detail in plan), plan
+            assert not any("TEMP B-TREE" in detail for detail in plan), plan
+    finally:
+        conn.close()
+
+
+def test_status_filter_matches_status_from_row_for_untidy_values(tmp_path):
+    conn = _connect(tmp_path, [
+        (1, "A", 2000, "Matched ", "not_requested"),
+        (2, "B", 2000, "matched", " Downloaded"),
+        (3, "C", 2000, "FAILED", "not_requested"),
+        (4, "D", 2000, " Pending", "Quarantined"),
+    ])
+    try:
+        rows = conn.execute("SELECT id, metadata_status, download_status FROM works").fetchall()
+        expected = {row["id"]: CORPUS_LIST.status_from_row(dict(row)) for row in rows}
+        for status in CORPUS_LIST.STATUS_PREDICATES:
+            listed, _ = CORPUS_LIST.fetch_page(conn, _args(limit=10, status=status))
+            assert {row["id"] for row in listed} == {i for i, s in expected.items() if s == status}
+        assert expected == {1: "matched", 2: "downloaded", 3: "failed_enrichment", 4: "failed_download"}
+    finally:
+        conn.close()
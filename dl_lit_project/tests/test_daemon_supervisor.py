@@ -0,0 +1,100 @@
+import importlib.util
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+
+WORKER_PATH = Path(__file__).resolve().parents[2] / "backend" / "scripts" / "daemon" / "worker.py"
+SPEC = importlib.util.spec_from_file_location("dt_pipeline_worker_supervisor", WORKER_PATH)
+WORKER_MODULE = importlib.util.module_from_spec(SPEC)
+assert SPEC and SPEC.loader
+SPEC.loader.exec_module(WORKER_MODULE)
+DaemonSupervisor = WORKER_MODULE.DaemonSupervisor
+
+# Stand-in child: heartbeats once as "<role>.<n>", then idles or exits with a code.
+CHILD_SCRIPT = """
+import json, sqlite3, sys, time
+db_path, name, exit_code = sys.argv[1], sys.argv[2], int(sys.argv[3])
+conn = sqlite3.connect(db_path, timeout=5)
+conn.execute(
+    "INSERT INTO daemon_heartbeat (daemon_name, worker_id, status, details_json) VALUES (?, ?, 'running', ?) "
+    "ON CONFLICT(daemon_name) DO UPDATE SET status = excluded.status, details_json = excluded.details_json",
+    (name, name, json.dumps({"state": "db_batch"})),
+)
+conn.commit()
+if exit_code:
+    sys.exit(exit_code)
+time.sleep(60)
+"""
+
+
+class FakeSupervisor(DaemonSupervisor):
+    exit_codes: dict = {}
+
+    def child_command(self, index):
+        code = self.exit_codes.get(index, 0)
+        return [sys.executable, "-c", CHILD_SCRIPT, str(self.db_path), f"{self.daemon_name}.{index}", str(code)]
+
+
+def _heartbeat(db_path, name):
+    row = sqlite3.connect(db_path).execute(
+        "SELECT status, details_json FROM daemon_heartbeat WHERE daemon_name = ?", (name,)
+    ).fetchone()
+    return row[0], json.loads(row[1])
+
+
+def _wait_for(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_supervisor_starts_children_and_publishes_one_heartbeat(tmp_path):
+    db_path = tmp_path / "test.db"
+    supervisor = FakeSupervisor(str(db_path), "enrich", 3)
+    try:
+        supervisor.poll_once()
+        pids = {child["process"].pid for child in supervisor.children.values()}
+        assert len(pids) == 3
+
+        assert _wait_for(lambda: len(supervisor._child_heartbeats()) == 3)
+        supervisor.poll_once()
+        status, details = _heartbeat(db_path, "enrich")
+        assert status == "running"
+        assert details["processes"] == 3 and details["running"] == 3
+        assert [child["instance"] for child in details["children"]] == [1, 2, 3]
+        assert {child["pid"] for child in details["children"]} == pids
+    finally:
+        supervisor.stop(timeout=5)
+    status, details = _heartbeat(db_path, "enrich")
+    assert status == "stopped"
+    assert not any(child["alive"] for child in details["children"])
+
+
+def test_crashed_child_is_restarted_with_backoff(tmp_path):
+    db_path = tmp_path / "test.db"
+    supervisor = FakeSupervisor(str(db_path), "download", 2)
+    supervisor.exit_codes = {2: 3}
+    try:
+        supervisor.poll_once()
+        crashed = supervisor.children[2]
+        assert _wait_for(lambda: crashed["process"].poll() is not None)
+
+        supervisor.poll_once()
+        assert crashed["process"] is None
+        assert crashed["last_exit"] == 3 and crashed["crashes"] == 1
+        assert crashed["restart_at"] > time.monotonic()
+        _, details = _heartbeat(db_path, "download")
+        assert details["children"][1]["status"] == "restarting"
+        assert supervisor.children[1]["process"].poll() is None
+
+        crashed["restart_at"] = 0.0
+        supervisor.poll_once()
+        assert crashed["process"] is not None and crashed["restarts"] == 1
+    finally:
+        supervisor.stop(timeout=5)
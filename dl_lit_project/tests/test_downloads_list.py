@@ -0,0 +1,94 @@
+import importlib.util
+import sqlite3
+from pathlib import Path
+from types import SimpleNamespace
+
+from dl_lit.db_manager import DatabaseManager
+
+
+SCRIPT_PATH = Path(__file__).resolve().parents[2] / "backend" / "scripts" / "downloads_list.py"
+SPEC = importlib.util.spec_from_file_location("dt_downloads_list", SCRIPT_PATH)
+DOWNLOADS_LIST = importlib.util.module_from_spec(SPEC)
+assert SPEC and SPEC.loader
+SPEC.loader.exec_module(DOWNLOADS_LIST)
+
+
+def _args(**overrides):
+    args = dict(limit=2, offset=0, corpus_id=None, cursor="")
+    args.update(overrides)
+    return SimpleNamespace(**args)
+
+
+class _RecordingConnection:
+    """Passes statements through to ``conn`` and keeps them for EXPLAIN."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.statements = []
+
+    def execute(self, sql, params=()):
+        self.statements.append((sql, params))
+        return self.conn.execute(sql, params)
+
+
+def _connect(tmp_path):
+    db_path = tmp_path / "downloads.db"
+    db = DatabaseManager(db_path)
+    db.conn.executemany(
+        "INSERT INTO works (id, title, metadata_status, download_status, downloaded_at) VALUES (?, ?, 'matched', ?, ?)",
+        [
+            (1, "Queued old", "queued", None),
+            (2, "Downloaded early", "downloaded", "2026-01-01T09:00:00"),
+            (3, "Running", "in_progress", None),
+            (4, "Queued new", "queued", None),
+            (5, "Downloaded late", "downloaded", "2026-03-01T09:00:00"),
+            (6, "Not requested", "not_requested", None),
+            (7, "Downloaded same time", "downloaded", "2026-01-01T09:00:00"),
+            (8, "Downloaded undated", "downloaded", None),
+        ],
+    )
+    db.conn.executemany("INSERT INTO corpus_works (corpus_id, work_id) VALUES (1, ?)", [(i,) for i in (1, 2, 3, 5)])
+    db.conn.commit()
+    db.close_connection()
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def test_cursor_pages_walk_the_groups_in_queue_order(tmp_path):
+    conn = _connect(tmp_path)
+    try:
+        seen, cursor = [], ""
+        while True:
+            rows, cursor = DOWNLOADS_LIST.fetch_page(conn, _args(cursor=cursor))
+            seen.extend(row["id"] for row in rows)
+            if not cursor:
+                break
+        assert seen == [3, 4, 1, 5, 7, 2, 8]
+
+        offset_pages = [
+            [row["id"] for row in DOWNLOADS_LIST.fetch_page(conn, _args(limit=3, offset=offset))[0]]
+            for offset in (0, 3, 6)
+        ]
+        assert offset_pages == [[3, 4, 1], [5, 7, 2], [8]]
+
+        rows, cursor = DOWNLOADS_LIST.fetch_page(conn, _args(corpus_id=1, limit=10))
+        assert [row["id"] for row in rows] == [3, 1, 5, 2] and cursor is None
+    finally:
+        conn.close()
+
+
+def test_download_pages_read_the_order_index_without_sorting(tmp_path):
+    conn = _connect(tmp_path)
+    try:
+        recorder = _RecordingConnection(conn)
+        _, cursor = DOWNLOADS_LIST.fetch_page(recorder, _args(corpus_id=1, limit=1))
+        DOWNLOADS_LIST.fetch_page(recorder, _args(corpus_id=1, limit=1, cursor=cursor))
+        DOWNLOADS_LIST.fetch_page(recorder, _args(limit=1, offset=3))
+
+        for sql, params in recorder.statements:
+            plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+            assert any("idx_works_download_order" in detail for detail in plan), plan
+            assert not any("TEMP B-TREE" in detail for detail in plan), plan
+    finally:
+        conn.close()
@@ -0,0 +1,135 @@
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+
+from dl_lit.db_manager import DatabaseManager
+
+
+WORKER_PATH = Path(__file__).resolve().parents[2] / "backend" / "scripts" / "daemon" / "worker.py"
+SPEC = importlib.util.spec_from_file_location("dt_pipeline_worker_fair_share", WORKER_PATH)
+WORKER_MODULE = importlib.util.module_from_spec(SPEC)
+assert SPEC and SPEC.loader
+SPEC.loader.exec_module(WORKER_MODULE)
+PipelineDaemon = WORKER_MODULE.PipelineDaemon
+
+
+@pytest.fixture
+def scheduler(tmp_path):
+    db = DatabaseManager(tmp_path / "jobs.db")
+    daemon = PipelineDaemon.__new__(PipelineDaemon)
+    daemon.db = db
+    daemon.worker_id = "fair-worker"
+    daemon.role = "all"
+    try:
+        yield db, daemon
+    finally:
+        db.close_connection()
+
+
+def _enqueue(db, corpus_id, job_type, limit=None):
+    params = {} if limit is None else {"limit": limit}
+    cur = db.conn.execute(
+        "INSERT INTO pipeline_jobs (corpus_id, job_type, status, parameters_json) VALUES (?, ?, 'pending', ?)",
+        (corpus_id, job_type, json.dumps(params)),
+    )
+    db.conn.commit()
+    return cur.lastrowid
+
+
+def _drain(daemon, count):
+    order = []
+    for _ in range(count):
+        job = daemon.fetch_next_job()
+        if job is None:
+            break
+        order.append(job)
+        daemon.mark_job_completed(job["id"], {"ok": True})
+    return order
+
+
+def test_a_corpus_with_many_large_jobs_does_not_starve_the_others(scheduler):
+    db, daemon = scheduler
+    flood = [_enqueue(db, 1, "download", limit=150) for _ in range(5)]
+    first = daemon.fetch_next_job()
+    assert first["id"] == flood[0]
+
+    # Queued after the flood, but its tag is the current virtual time, not the end of corpus 1's backlog.
+    small = _enqueue(db, 2, "download", limit=20)
+    daemon.mark_job_completed(first["id"], {"ok": True})
+    order = [job["id"] for job in _drain(daemon, 10)]
+    assert order[0] == small
+    assert order[1:] == flood[1:]
+
+
+def test_weights_share_claims_in_proportion(scheduler):
+    db, daemon = scheduler
+    db.set_pipeline_fair_share(1, weight=2.0)
+    for _ in range(6):
+        _enqueue(db, 1, "enrich", limit=10)
+        _enqueue(db, 2, "enrich", limit=10)
+
+    first_six = [job["corpus_id"] for job in _drain(daemon, 6)]
+    assert first_six.count(1) == 4 and first_six.count(2) == 2
+
+
+def test_running_cap_skips_a_busy_corpus(scheduler, monkeypatch):
+    db, daemon = scheduler
+    db.set_pipeline_fair_share(1, max_running=1)
+    _enqueue(db, 1, "download", limit=5)
+    _enqueue(db, 1, "download", limit=5)
+    other = _enqueue(db, 2, "download", limit=500)
+
+    first = daemon.fetch_next_job()
+    assert first["corpus_id"] == 1
+    assert first["schedule"]["running"] == 1 and first["schedule"]["max_running"] == 1
+    assert daemon.fetch_next_job()["id"] == other
+    assert daemon.fetch_next_job() is None
+
+    daemon.mark_job_completed(first["id"], {"ok": True})
+    assert daemon.fetch_next_job()["corpus_id"] == 1
+
+    # An environment-wide default applies to flows without their own cap.
+    monkeypatch.setenv("RAG_FEEDER_CORPUS_MAX_RUNNING_JOBS", "1")
+    _enqueue(db, 2, "download", limit=5)
+    assert daemon.fetch_next_job() is None
+    db.set_pipeline_fair_share(2, max_running=2)
+    assert daemon.fetch_next_job()["corpus_id"] == 2
+
+
+def test_waiting_jobs_age_into_higher_classes(scheduler, monkeypatch):
+    db, daemon = scheduler
+    monkeypatch.setenv("RAG_FEEDER_JOB_AGING_SECONDS", "60")
+    tick = _enqueue(db, None, "pipeline_tick")
+    for _ in range(4):
+        _enqueue(db, 3, "enrich", limit=10)
+
+    def backdate():
+        db.conn.execute("UPDATE pipeline_jobs SET aged_at = datetime('now', '-120 seconds') WHERE id = ?", (tick,))
+        db.conn.commit()
+
+    first = _drain(daemon, 1)[0]
+    assert first["job_type"] == "enrich" and first["schedule"]["class"] == "interactive"
+
+    backdate()
+    assert _drain(daemon, 1)[0]["job_type"] == "enrich"
+    assert db.conn.execute("SELECT priority_class FROM pipeline_jobs WHERE id = ?", (tick,)).fetchone()[0] == 1
+
+    backdate()
+    promoted = _drain(daemon, 1)[0]
+    assert promoted["id"] == tick and promoted["schedule"]["class"] == "interactive"
+
+
+def test_running_counts_follow_status_changes_from_any_writer(scheduler):
+    db, daemon = scheduler
+    job = _enqueue(db, 4, "enrich", limit=1)
+    claimed = daemon.fetch_next_job()
+    assert claimed["id"] == job
+    running = lambda: db.conn.execute("SELECT running FROM pipeline_fair_share WHERE flow_id = 4").fetchone()[0]
+    assert running() == 1
+
+    # The Node backend cancels by updating the row directly.
+    db.conn.execute("UPDATE pipeline_jobs SET status = 'cancelled' WHERE id = ?", (job,))
+    db.conn.commit()
+    assert running() == 0
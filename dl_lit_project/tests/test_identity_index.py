@@ -0,0 +1,120 @@
+import sqlite3
+
+from dl_lit.db_manager import DatabaseManager
+
+
+def _lookup(db, **kwargs):
+    return db._find_existing_work(**kwargs)
+
+
+def test_identity_index_matches_sql_tiers(tmp_path):
+    db = DatabaseManager(tmp_path / "test.db")
+    indexed = DatabaseManager(tmp_path / "test.db", identity_index=True)
+    try:
+        doi_id, _ = db.create_pending_work({"title": "Doi Work", "authors": ["A"], "year": 2001, "doi": "10.1/abc"})
+        tay_id, _ = db.create_pending_work({"title": "Title Authors Year", "authors": ["B"], "year": 2002})
+        ty_id, _ = db.create_pending_work({"title": "Title Year Only", "year": 2003})
+        db.add_work_alias("works", tay_id, "Alias Title", alias_year=2002)
+
+        probes = [
+            {"doi": "https://doi.org/10.1/ABC"},
+            {"title": "Title Authors Year", "authors": ["B"], "year": 2002},
+            {"title": "Title Authors Year", "authors": ["B"], "year": 1990},
+            {"title": "Title Year Only", "year": "2003"},
+            {"title": "Alias Title", "year": 2003},
+            {"title": "Alias Title", "year": 2010},
+            {"title": "Title Authors Year", "authors": ["B"], "year": 2002, "exclude_id": tay_id},
+            {"title": "Unknown"},
+        ]
+        for probe in probes:
+            assert _lookup(indexed, **probe) == _lookup(db, **probe), probe
+        assert _lookup(indexed, doi="10.1/abc") == (doi_id, "normalized_doi")
+        assert _lookup(indexed, title="Title Year Only", year=2003) == (ty_id, "title_year")
+    finally:
+        indexed.close_connection()
+        db.close_connection()
+
+
+def test_identity_index_tracks_local_writes_and_rollbacks(tmp_path):
+    db = DatabaseManager(tmp_path / "test.db", identity_index=True)
+    try:
+        assert _lookup(db, doi="10.2/x") == (None, None)
+
+        cur = db.conn.cursor()
+        cur.execute("INSERT INTO works (title, normalized_title, normalized_doi) VALUES ('Raw', 'raw', '10.2/X')")
+        raw_id = int(cur.lastrowid)
+        db.conn.commit()
+        assert _lookup(db, doi="10.2/x") == (raw_id, "normalized_doi")
+
+        db.conn.execute("UPDATE works SET normalized_doi = '10.2/Y' WHERE id = ?", (raw_id,))
+        assert _lookup(db, doi="10.2/y") == (raw_id, "normalized_doi")
+        db.conn.rollback()
+        assert _lookup(db, doi="10.2/y") == (None, None)
+        assert _lookup(db, doi="10.2/x") == (raw_id, "normalized_doi")
+
+        ok, _ = db.delete_work(raw_id)
+        assert ok
+        assert _lookup(db, doi="10.2/x") == (None, None)
+    finally:
+        db.close_connection()
+
+
+def test_identity_index_picks_up_other_connections(tmp_path):
+    db_path = tmp_path / "test.db"
+    db = DatabaseManager(db_path, identity_index=True)
+    try:
+        assert _lookup(db, openalex_id="W42") == (None, None)
+        other = sqlite3.connect(db_path)
+        other.execute("INSERT INTO works (title, openalex_id) VALUES ('External', 'W42')")
+        other.commit()
+        other.close()
+        found_id, field = _lookup(db, openalex_id="https://openalex.org/W42")
+        assert found_id is not None and field == "openalex_id"
+    finally:
+        db.close_connection()
+
+
+def test_identity_index_catches_up_without_rebuilding(tmp_path, monkeypatch):
+    db_path = tmp_path / "test.db"
+    db = DatabaseManager(db_path, identity_index=True)
+    try:
+        kept_id, _ = db.create_pending_work({"title": "Kept Work", "year": 2001, "doi": "10.3/kept"})
+        assert _lookup(db, doi="10.3/kept") == (kept_id, "normalized_doi")
+
+        def no_rebuild():
+            raise AssertionError("unexpected full rebuild")
+
+        monkeypatch.setattr(db.identity_index, "_rebuild", no_rebuild)
+        other = sqlite3.connect(db_path)
+        try:
+            other.execute("INSERT INTO works (title, normalized_title, normalized_doi) VALUES ('New', 'new', '10.3/NEW')")
+            other.execute("UPDATE works SET normalized_doi = '10.3/MOVED' WHERE id = ?", (kept_id,))
+            other.commit()
+            assert _lookup(db, doi="10.3/new")[1] == "normalized_doi"
+            assert _lookup(db, doi="10.3/kept") == (None, None)
+            assert _lookup(db, doi="10.3/moved") == (kept_id, "normalized_doi")
+
+            # Writes to unrelated tables only cost a watermark check.
+            other.execute("INSERT INTO app_meta (key, value) VALUES ('unrelated', '1')")
+            other.commit()
+            assert _lookup(db, doi="10.3/moved") == (kept_id, "normalized_doi")
+
+            other.execute("DELETE FROM works WHERE id = ?", (kept_id,))
+            other.commit()
+            assert _lookup(db, doi="10.3/moved") == (None, None)
+
+            # A log trimmed past the index's mark forces a rebuild.
+            monkeypatch.undo()
+            rebuilds = []
+            original = db.identity_index._rebuild
+            monkeypatch.setattr(db.identity_index, "_rebuild", lambda: (rebuilds.append(1), original())[1])
+            other.execute("UPDATE works SET normalized_doi = '10.3/AGAIN' WHERE normalized_doi = '10.3/NEW'")
+            other.execute("UPDATE works SET normalized_doi = '10.3/FINAL' WHERE normalized_doi = '10.3/AGAIN'")
+            other.execute("DELETE FROM work_identity_changes WHERE seq < (SELECT MAX(seq) FROM work_identity_changes)")
+            other.commit()
+            assert _lookup(db, doi="10.3/final")[1] == "normalized_doi"
+            assert rebuilds == [1]
+        finally:
+            other.close()
+    finally:
+        db.close_connection()
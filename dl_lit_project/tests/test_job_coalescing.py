@@ -0,0 +1,95 @@
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+
+from dl_lit.db_manager import DatabaseManager
+
+
+WORKER_PATH = Path(__file__).resolve().parents[2] / "backend" / "scripts" / "daemon" / "worker.py"
+SPEC = importlib.util.spec_from_file_location("dt_pipeline_worker_coalescing", WORKER_PATH)
+WORKER_MODULE = importlib.util.module_from_spec(SPEC)
+assert SPEC and SPEC.loader
+SPEC.loader.exec_module(WORKER_MODULE)
+PipelineDaemon = WORKER_MODULE.PipelineDaemon
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    db = DatabaseManager(tmp_path / "jobs.db")
+    daemon = PipelineDaemon.__new__(PipelineDaemon)
+    daemon.db = db
+    daemon.worker_id = "coalesce-worker"
+    daemon.role = "all"
+    try:
+        yield daemon
+    finally:
+        db.close_connection()
+
+
+def _jobs(daemon):
+    rows = daemon.db.conn.execute("SELECT id, job_type, status, parameters_json FROM pipeline_jobs ORDER BY id").fetchall()
+    return [(row[0], row[1], row[2], json.loads(row[3])) for row in rows]
+
+
+def test_repeated_targeted_requests_merge_into_one_pending_job(daemon):
+    first = daemon.enqueue_job(1, "enrich", {"limit": 3, "workers": 6, "pending_work_ids": [5, 3, 9]})
+    second = daemon.enqueue_job(1, "enrich", {"limit": 2, "workers": 6, "pending_work_ids": [9, "11"]})
+    assert second == first
+
+    (job_id, _, status, params), = _jobs(daemon)
+    assert job_id == first and status == "pending"
+    assert params == {"limit": 4, "workers": 6, "pending_work_ids": [3, 5, 9, 11]}
+
+
+def test_budget_jobs_add_limits_and_incompatible_requests_stay_separate(daemon):
+    budget = daemon.enqueue_job(1, "enrich", {"limit": 50, "workers": 6, "expansion": {"depth": 1}})
+    assert daemon.enqueue_job(1, "enrich", {"limit": 25, "workers": 6, "expansion": {"depth": 1}}) == budget
+    assert daemon.enqueue_job(1, "enrich", {"workers": 6, "expansion": {"depth": 1}}) == budget
+
+    assert daemon.enqueue_job(1, "enrich", {"limit": 5, "workers": 2, "expansion": {"depth": 1}}) != budget
+    assert daemon.enqueue_job(2, "enrich", {"limit": 5, "workers": 6, "expansion": {"depth": 1}}) != budget
+    assert daemon.enqueue_job(1, "enrich", {"limit": 1, "workers": 6, "expansion": {"depth": 1}, "pending_work_ids": [7]}) != budget
+    assert daemon.enqueue_job(1, "download", {"batchSize": 3}) != budget
+
+    jobs = _jobs(daemon)
+    assert len(jobs) == 5
+    assert jobs[0][3]["limit"] == 85
+
+
+def test_claimed_jobs_are_not_merged_into(daemon):
+    running = daemon.enqueue_job(1, "enrich", {"limit": 10})
+    assert daemon.fetch_next_job()["id"] == running
+
+    continuation = daemon.enqueue_job(1, "enrich", {"limit": 4})
+    assert continuation != running
+    assert daemon.enqueue_job(1, "enrich", {"limit": 6}) == continuation
+    assert [params["limit"] for _, _, _, params in _jobs(daemon)] == [10, 10]
+
+
+def test_merged_budget_moves_the_flow_finish_tag(daemon):
+    daemon.db.set_pipeline_fair_share(1, weight=2.0)
+    daemon.enqueue_job(1, "enrich", {"limit": 40})
+    finish = lambda: daemon.db.conn.execute("SELECT finish_tag FROM pipeline_fair_share WHERE flow_id = 1").fetchone()[0]
+    assert finish() == pytest.approx(20.0)
+
+    daemon.enqueue_job(1, "enrich", {"limit": 60})
+    assert finish() == pytest.approx(50.0)
+    # The next corpus-1 request queues behind the merged job's full cost.
+    daemon.enqueue_job(1, "enrich", {"limit": 5, "pending_work_ids": [1]})
+    tag = daemon.db.conn.execute("SELECT MAX(start_tag) FROM pipeline_jobs WHERE corpus_id = 1").fetchone()[0]
+    assert tag == pytest.approx(50.0)
+
+
+def test_merge_lookup_uses_an_index(daemon):
+    plan = daemon.db.conn.execute(
+        """EXPLAIN QUERY PLAN
+           SELECT id FROM pipeline_jobs
+            WHERE corpus_id IS ? AND job_type = ? AND status = 'pending'
+            ORDER BY id LIMIT 1""",
+        (1, "enrich"),
+    ).fetchall()
+    details = [row[3] for row in plan]
+    assert any("idx_pipeline_jobs_coalesce" in detail for detail in details)
+    assert not any(detail.startswith("SCAN pipeline_jobs") for detail in details)
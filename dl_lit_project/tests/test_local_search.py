@@ -0,0 +1,113 @@
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from dl_lit.cli import cli
+from dl_lit.db_manager import DatabaseManager
+from dl_lit.keyword_search import QuerySyntaxError, build_fts5_query
+
+
+def test_build_fts5_query_quotes_terms_and_maps_not():
+    assert build_fts5_query('institutional econ* NOT "public choice"') == '"institutional" AND "econ"* NOT "public choice"'
+    assert build_fts5_query("(coase OR williamson) baumol's") == '( "coase" OR "williamson" ) AND "baumol\'s"'
+    with pytest.raises(QuerySyntaxError):
+        build_fts5_query("NOT markets")
+
+
+def test_search_local_tracks_inserts_updates_and_corpus(tmp_path):
+    db = DatabaseManager(tmp_path / "test.db")
+    try:
+        firm_id, _ = db.create_pending_work(
+            {"title": "The Nature of the Firm", "authors": ["Ronald Coase"], "year": 1937, "corpus_id": 1}
+        )
+        markets_id, _ = db.create_pending_work(
+            {"title": "Markets and Hierarchies", "authors": ["Oliver Williamson"], "year": 1975, "abstract": "Transaction costs of the firm."}
+        )
+
+        rows, err = db.search_local("firm")
+        assert err is None
+        assert [row["id"] for row in rows] == [firm_id, markets_id]  # title hits outrank abstract hits
+        rows, _ = db.search_local("firm NOT coase")
+        assert [row["id"] for row in rows] == [markets_id]
+        rows, _ = db.search_local("firm", corpus_id=1)
+        assert [row["id"] for row in rows] == [firm_id]
+
+        db.conn.execute("UPDATE works SET title = 'Problem of Social Cost' WHERE id = ?", (firm_id,))
+        db.conn.execute("DELETE FROM works WHERE id = ?", (markets_id,))
+        db.conn.commit()
+        assert db.search_local("firm") == ([], None)
+        assert [row["id"] for row in db.search_local("social cost")[0]] == [firm_id]
+
+        rows, err = db.search_local("(firm")
+        assert rows == [] and err.startswith("Invalid query")
+    finally:
+        db.close_connection()
+
+
+def test_local_work_ids_and_search_local_command(tmp_path):
+    db_path = tmp_path / "test.db"
+    db = DatabaseManager(db_path)
+    try:
+        work_id, _ = db.create_pending_work({"title": "The Problem of Social Cost", "doi": "10.1086/466560", "openalex_id": "W2027148345"})
+        records = [
+            {"openalex_id": "https://openalex.org/W2027148345"},
+            {"doi": "10.1086/466560"},
+            {"openalex_id": "W1", "doi": "10.1/none"},
+        ]
+        assert db.local_work_ids(records) == [work_id, work_id, None]
+    finally:
+        db.close_connection()
+
+    out_path = tmp_path / "hits.json"
+    result = CliRunner().invoke(cli, ["search-local", "--db-path", str(db_path), "--query", "social", "--output", str(out_path)])
+    assert result.exit_code == 0, result.output
+    assert [row["id"] for row in json.loads(out_path.read_text(encoding="utf-8"))] == [work_id]
+
+
+def test_local_first_replays_a_cached_run_only_when_every_result_is_local(tmp_path, monkeypatch):
+    db_path = tmp_path / "test.db"
+    db = DatabaseManager(db_path)
+    work_id, _ = db.create_pending_work({"title": "The Nature of the Firm", "openalex_id": "W1"})
+    db.close_connection()
+
+    calls = []
+    items = [{"id": "https://openalex.org/W1", "display_name": "The Nature of the Firm", "publication_year": 1937}]
+
+    def fake_search(**kwargs):
+        calls.append(kwargs)
+        return list(items)
+
+    monkeypatch.setattr("dl_lit.keyword_search.search_openalex", fake_search)
+    args = ["keyword-search", "--db-path", str(db_path), "--query", "firm", "--max-results", "5", "--local-first"]
+
+    # No earlier run: the first search always goes to OpenAlex.
+    assert CliRunner().invoke(cli, args).exit_code == 0
+    assert len(calls) == 1
+
+    result = CliRunner().invoke(cli, args)
+    assert result.exit_code == 0, result.output
+    assert "skipping OpenAlex" in result.output
+    assert len(calls) == 1
+
+    # A different filter set is a different search.
+    assert CliRunner().invoke(cli, args + ["--year-from", "1930"]).exit_code == 0
+    assert len(calls) == 2
+
+    db = DatabaseManager(db_path)
+    try:
+        runs = db.conn.execute("SELECT id, filters_json FROM search_runs ORDER BY id").fetchall()
+        assert json.loads(runs[1][1])["cached_run_id"] == runs[0][0]
+        local_rows = db.conn.execute(
+            "SELECT openalex_id, work_id FROM search_results WHERE search_run_id = ?", (runs[1][0],)
+        ).fetchall()
+        assert local_rows == [("https://openalex.org/W1", work_id)]
+
+        # Once a cached result is no longer held locally, OpenAlex is asked again.
+        db.conn.execute("DELETE FROM works WHERE id = ?", (work_id,))
+        db.conn.commit()
+        assert db.find_cached_search_run("firm", json.loads(runs[0][1])) == (None, [])
+    finally:
+        db.close_connection()
+    assert CliRunner().invoke(cli, args).exit_code == 0
+    assert len(calls) == 3
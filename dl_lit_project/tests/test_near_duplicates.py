@@ -0,0 +1,78 @@
+import json
+
+from click.testing import CliRunner
+
+from dl_lit.cli import cli
+from dl_lit.db_manager import DatabaseManager
+
+
+TITLE = "Transaction Costs and the Boundaries of the Firm"
+OCR_TITLE = "Transaction Costs and the Boundarles of the Firm"
+
+
+def test_near_duplicate_tier_matches_noisy_titles(tmp_path):
+    db = DatabaseManager(tmp_path / "test.db", near_duplicates=True)
+    try:
+        work_id, _ = db.create_pending_work({"title": TITLE, "authors": ["Oliver Williamson"], "year": 1985})
+
+        assert db.check_if_exists(doi=None, openalex_id=None, title=OCR_TITLE, year=1986) == ("works", work_id, "title_minhash")
+        assert db.check_if_exists(doi=None, openalex_id=None, title=OCR_TITLE, year=2010) == (None, None, None)
+        assert db.check_if_exists(doi=None, openalex_id=None, title="Boundaries of the Firm Revisited", year=1985) == (None, None, None)
+
+        db.conn.execute("UPDATE works SET normalized_doi = '10.1/A' WHERE id = ?", (work_id,))
+        db.conn.commit()
+        assert db.check_if_exists(doi="10.1/b", openalex_id=None, title=OCR_TITLE, year=1985) == (None, None, None)
+
+        # Low-confidence tier: logged as a possible duplicate, then folded into the existing work.
+        merged_id, err = db.create_pending_work({"title": OCR_TITLE, "year": 1985})
+        assert (merged_id, err) == (work_id, None)
+        action = db.conn.execute("SELECT action, match_field FROM merge_log ORDER BY id DESC LIMIT 1").fetchone()
+        assert action == ("possible_duplicate", "title_minhash")
+    finally:
+        db.close_connection()
+
+
+def test_dedupe_sweep_plans_and_applies_merges(tmp_path):
+    db_path = tmp_path / "test.db"
+    db = DatabaseManager(db_path)
+    try:
+        first_id, _ = db.create_pending_work({"title": OCR_TITLE, "year": 1985, "corpus_id": 3})
+        canonical_id, _ = db.create_pending_work({"title": TITLE, "year": 1985, "doi": "10.1/firm"})
+        other_id, _ = db.create_pending_work({"title": "Markets and Hierarchies", "year": 1975})
+    finally:
+        db.close_connection()
+
+    runner = CliRunner()
+    plan_path = tmp_path / "plan.json"
+    result = runner.invoke(cli, ["dedupe-sweep", "--db-path", str(db_path), "--output", str(plan_path)])
+    assert result.exit_code == 0, result.output
+    plan = json.loads(plan_path.read_text(encoding="utf-8"))
+    assert [(step["canonical_id"], step["duplicate_id"], step["match_field"]) for step in plan] == [
+        (canonical_id, first_id, "title_minhash")
+    ]
+
+    result = runner.invoke(cli, ["dedupe-sweep", "--db-path", str(db_path), "--apply"])
+    assert result.exit_code == 0, result.output
+
+    db = DatabaseManager(db_path)
+    try:
+        ids = [row[0] for row in db.conn.execute("SELECT id FROM works ORDER BY id")]
+        assert ids == sorted([canonical_id, other_id])
+        assert db.conn.execute("SELECT corpus_id, work_id FROM corpus_works").fetchall() == [(3, canonical_id)]
+        assert db.conn.execute("SELECT COUNT(*) FROM work_title_minhash WHERE work_id = ?", (first_id,)).fetchone()[0] == 0
+    finally:
+        db.close_connection()
+
+
+def test_enrichment_re_signs_a_changed_title(tmp_path):
+    db = DatabaseManager(tmp_path / "test.db", near_duplicates=True)
+    try:
+        work_id, _ = db.create_pending_work({"title": "Transaction Cost Economics", "year": 1985})
+        db.apply_enriched_metadata(work_id, {"title": TITLE, "year": 1985})
+
+        signed = db.conn.execute("SELECT normalized_title FROM work_title_minhash WHERE work_id = ?", (work_id,)).fetchone()
+        assert signed == (db._normalize_text(TITLE),)
+        assert db.check_if_exists(doi=None, openalex_id=None, title=OCR_TITLE, year=1985) == ("works", work_id, "title_minhash")
+        assert db.near_duplicate_index.refresh([(work_id, signed[0])]) == 0
+    finally:
+        db.close_connection()
@@ -3,6 +3,8 @@ import sqlite3
 from pathlib import Path
 from types import SimpleNamespace
 
+from dl_lit.db_manager import create_fair_share_scheduling, create_job_coalescing
+
 
 WORKER_PATH = Path(__file__).resolve().parents[2] / "backend" / "scripts" / "daemon" / "worker.py"
 SPEC = importlib.util.spec_from_file_location("dt_pipeline_worker", WORKER_PATH)
@@ -30,6 +32,8 @@ def make_conn():
         )
         """
     )
+    create_fair_share_scheduling(conn)
+    create_job_coalescing(conn)
     return conn
 
 
@@ -0,0 +1,133 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+from dl_lit.db_manager import DatabaseManager
+
+
+WORKER_PATH = Path(__file__).resolve().parents[2] / "backend" / "scripts" / "daemon" / "worker.py"
+SPEC = importlib.util.spec_from_file_location("dt_pipeline_worker_plans", WORKER_PATH)
+WORKER_MODULE = importlib.util.module_from_spec(SPEC)
+assert SPEC and SPEC.loader
+SPEC.loader.exec_module(WORKER_MODULE)
+PipelineDaemon = WORKER_MODULE.PipelineDaemon
+
+_SKIP_PREFIXES = ("BEGIN", "COMMIT", "ROLLBACK", "END", "PRAGMA", "SAVEPOINT", "RELEASE", "CREATE", "DROP", "ANALYZE")
+
+
+@pytest.fixture
+def seeded(tmp_path):
+    db = DatabaseManager(tmp_path / "plans.db")
+    for i in range(60):
+        db.create_pending_work(
+            {"title": f"Work {i}", "authors": [f"Author {i}"], "year": 2000 + i % 5, "corpus_id": 1 + i % 2}
+        )
+    db.create_pending_work({"title": "Undated Work", "year": "2003a", "corpus_id": 1})
+    matched = [row[0] for row in db.conn.execute("SELECT id FROM works ORDER BY id LIMIT 10").fetchall()]
+    db.conn.executemany("UPDATE works SET metadata_status = 'matched' WHERE id = ?", [(i,) for i in matched[:5]])
+    db.conn.executemany(
+        "UPDATE works SET metadata_status = 'matched', download_status = 'queued' WHERE id = ?",
+        [(i,) for i in matched[5:]],
+    )
+    for corpus_id, job_type in [(1, "enrich"), (None, "pipeline_tick"), (2, "download"), (None, "download")]:
+        db.conn.execute(
+            "INSERT INTO pipeline_jobs (corpus_id, job_type, status, parameters_json) VALUES (?, ?, 'pending', '{}')",
+            (corpus_id, job_type),
+        )
+    db.conn.commit()
+
+    daemon = PipelineDaemon.__new__(PipelineDaemon)
+    daemon.db = db
+    daemon.worker_id = "plans-worker"
+    daemon.job_timeout_seconds = 300
+    daemon.role = "all"
+    try:
+        yield db, daemon
+    finally:
+        db.close_connection()
+
+
+def _claim_as(daemon, role):
+    daemon.role = role
+    job = daemon.fetch_next_job()
+    daemon.role = "all"
+    if job:
+        daemon.mark_job_failed(job["id"], "plan check")
+
+
+HOT_PATHS = {
+    "find_title_authors_year": lambda db, d: db._find_exact_work(title="Work 3", authors=["Author 3"], year=2003),
+    "find_title_year": lambda db, d: db._find_exact_work(title="Work 4", year="2004"),
+    "find_title_text_year": lambda db, d: db._find_exact_work(title="Undated Work", year="2003a"),
+    "fetch_matched_work_batch": lambda db, d: db.fetch_matched_work_batch(10),
+    "fetch_pending_metadata_batch": lambda db, d: db.fetch_pending_metadata_batch(10),
+    "claim_enrich_batch": lambda db, d: db.claim_enrich_batch(limit=3, corpus_id=1, claimed_by="p", max_attempts=3),
+    "claim_download_batch": lambda db, d: db.claim_download_batch(limit=3, corpus_id=None, claimed_by="p", max_attempts=3),
+    "get_corpus_status_counts": lambda db, d: db.get_corpus_status_counts(2),
+    "fetch_next_job": lambda db, d: d.mark_job_completed(d.fetch_next_job()["id"], {"ok": True}),
+    "fetch_next_job_enrich_role": lambda db, d: _claim_as(d, "enrich"),
+    "fetch_next_job_download_role": lambda db, d: _claim_as(d, "download"),
+    "recover_stale_running_jobs": lambda db, d: d._recover_stale_running_jobs(),
+    "has_pending_interactive_jobs": lambda db, d: d._has_pending_interactive_jobs(),
+    "has_pending_corpus_download_jobs": lambda db, d: d._has_pending_corpus_download_jobs(),
+    "enqueue_job": lambda db, d: d.enqueue_job(1, "enrich", {"limit": 5}),
+    "do_mark": lambda db, d: d.do_mark(1, 10),
+}
+
+
+def _traced_statements(db, action) -> list[str]:
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+    try:
+        action()
+    finally:
+        db.conn.set_trace_callback(None)
+    # Trigger bodies are reported as "-- TRIGGER ..." comments; they are planned with their statement.
+    return [
+        sql for sql in statements
+        if not sql.lstrip().startswith("--") and sql.split(None, 1)[0].upper() not in _SKIP_PREFIXES
+    ]
+
+
+def _plan(conn, sql) -> list[str]:
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()]
+
+
+@pytest.mark.parametrize("name", sorted(HOT_PATHS))
+def test_hot_statements_never_scan_a_table(seeded, name):
+    db, daemon = seeded
+    statements = _traced_statements(db, lambda: HOT_PATHS[name](db, daemon))
+    assert statements, f"{name} issued no SQL"
+
+    regressions = []
+    for sql in statements:
+        scans = [
+            detail for detail in _plan(db.conn, sql)
+            if detail.startswith("SCAN ") and not detail.startswith("SCAN sqlite_")
+        ]
+        if scans:
+            regressions.append((" ".join(sql.split())[:160], scans))
+    assert regressions == []
+
+
+def test_job_claim_reads_pending_jobs_in_index_order(seeded):
+    db, daemon = seeded
+    statements = _traced_statements(db, daemon.fetch_next_job)
+    claim = next(sql for sql in statements if "ORDER BY" in sql)
+    plan = _plan(db.conn, claim)
+    assert any("idx_pipeline_jobs_claim" in detail for detail in plan)
+    assert not any("TEMP B-TREE" in detail for detail in plan)
+
+
+def test_year_lookup_uses_the_integer_column_and_keeps_text_years_distinct(seeded):
+    db, _ = seeded
+    statements = _traced_statements(db, lambda: db._find_exact_work(title="Work 4", year=2004))
+    assert any("year_int = 2004" in sql for sql in statements)
+    assert not any("CAST(year" in sql for sql in statements)
+
+    undated = db.conn.execute("SELECT id, year_int FROM works WHERE normalized_title = 'undated work'").fetchone()
+    assert undated[1] is None
+    assert db._find_exact_work(title="Undated Work", year="2003a") == (undated[0], "title_year")
+    assert db._find_exact_work(title="Undated Work", year="2003") == (None, None)
+    assert db._find_exact_work(title="Work 4", year="02004") == (None, None)
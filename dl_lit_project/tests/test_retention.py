@@ -0,0 +1,58 @@
+import json
+import sqlite3
+
+from click.testing import CliRunner
+
+from dl_lit.cli import cli
+from dl_lit.db_manager import DatabaseManager
+
+
+def _seed_history(db):
+    result = json.dumps({"processed": 3, "results": [{"id": i} for i in range(3)]})
+    db.conn.executemany(
+        "INSERT INTO pipeline_jobs (id, job_type, status, result_json, finished_at) VALUES (?, 'download', ?, ?, datetime('now', ?))",
+        [
+            (1, "completed", result, "-60 days"),
+            (2, "completed", result, "-10 days"),
+            (3, "running", result, "-60 days"),
+            (4, "failed", result, "-1 days"),
+        ],
+    )
+    db.conn.executemany(
+        "INSERT INTO merge_log (canonical_table, canonical_id, duplicate_table, action, created_at) VALUES ('works', 1, 'works', 'merged', datetime('now', ?))",
+        [("-200 days",), ("-5 days",)],
+    )
+    db.conn.commit()
+
+
+def test_retention_compacts_and_archives_old_rows(tmp_path):
+    db_path = tmp_path / "literature.db"
+    db = DatabaseManager(db_path)
+    try:
+        _seed_history(db)
+    finally:
+        db.close_connection()
+
+    result = CliRunner().invoke(cli, ["retention", "--db-path", str(db_path)])
+    assert result.exit_code == 0, result.output
+
+    conn = sqlite3.connect(db_path)
+    try:
+        jobs = dict(conn.execute("SELECT id, result_json FROM pipeline_jobs").fetchall())
+        assert sorted(jobs) == [2, 3, 4]
+        assert json.loads(jobs[2]) == {"processed": 3, "results_count": 3, "compacted": True}
+        assert json.loads(jobs[3])["results"] and json.loads(jobs[4])["results"]
+        assert conn.execute("SELECT COUNT(*) FROM merge_log").fetchone()[0] == 1
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    finally:
+        conn.close()
+
+    archive = sqlite3.connect(tmp_path / "literature_archive.db")
+    try:
+        archived = dict(archive.execute("SELECT id, result_json FROM pipeline_jobs").fetchall())
+        # The archive keeps the full result captured before compaction.
+        assert sorted(archived) == [1, 2]
+        assert len(json.loads(archived[1])["results"]) == 3
+        assert archive.execute("SELECT COUNT(*) FROM merge_log").fetchone()[0] == 1
+    finally:
+        archive.close()
@@ -0,0 +1,51 @@
+from click.testing import CliRunner
+
+from dl_lit.cli import cli
+from dl_lit.db_manager import QUARANTINE_AFTER_FAILURES, RETRY_BASE_SECONDS, DatabaseManager
+
+
+def _claim(db):
+    return [row["id"] for row in db.claim_download_batch(limit=5, corpus_id=1, claimed_by="w", lease_seconds=60)]
+
+
+def test_retryable_failures_back_off_then_quarantine(tmp_path):
+    db_path = tmp_path / "test.db"
+    db = DatabaseManager(db_path)
+    try:
+        work_id, _ = db.create_pending_work({"title": "Flaky Work", "corpus_id": 1})
+        db.enqueue_for_download(work_id)
+
+        for failure in range(1, QUARANTINE_AFTER_FAILURES):
+            assert _claim(db) == [work_id]
+            assert db.record_stage_failure(work_id, "download", "timeout", now=1000) == ("queued", None)
+            ready_at, = db.conn.execute("SELECT ready_at FROM download_queue WHERE corpus_id = 1").fetchone()
+            assert ready_at == 1000 + RETRY_BASE_SECONDS * 2 ** (failure - 1)
+            db.conn.execute("UPDATE works SET download_next_eligible_at = 0 WHERE id = ?", (work_id,))
+            db.conn.commit()
+
+        # A backed-off work is invisible to claims until its time comes.
+        db.conn.execute("UPDATE works SET download_next_eligible_at = strftime('%s', 'now') + 600 WHERE id = ?", (work_id,))
+        db.conn.commit()
+        assert _claim(db) == []
+        db.conn.execute("UPDATE works SET download_next_eligible_at = NULL WHERE id = ?", (work_id,))
+        db.conn.commit()
+
+        assert _claim(db) == [work_id]
+        assert db.record_stage_failure(work_id, "download", "timeout")[0] == "quarantined"
+        assert _claim(db) == []
+        assert [row["id"] for row in db.get_quarantined_works("download")] == [work_id]
+
+        other, _ = db.create_pending_work({"title": "Missing Work", "corpus_id": 1})
+        assert db.record_stage_failure(other, "download", "not_found") == ("failed", None)
+    finally:
+        db.close_connection()
+
+    result = CliRunner().invoke(cli, ["quarantine", "--db-path", str(db_path), "--release", str(work_id)])
+    assert result.exit_code == 0, result.output
+
+    db = DatabaseManager(db_path)
+    try:
+        assert db.get_quarantined_works() == []
+        assert _claim(db) == [work_id]
+    finally:
+        db.close_connection()
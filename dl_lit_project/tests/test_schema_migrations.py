@@ -0,0 +1,115 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+from click.testing import CliRunner
+
+from dl_lit.cli import cli
+from dl_lit.db_manager import SCHEMA_MIGRATIONS, SCHEMA_VERSION, DatabaseManager
+
+
+def test_current_database_skips_ddl_on_connect(tmp_path, monkeypatch):
+    db_path = tmp_path / "test.db"
+    db = DatabaseManager(db_path)
+    try:
+        assert db.schema_version() == SCHEMA_VERSION
+    finally:
+        db.close_connection()
+
+    def fail(self):
+        raise AssertionError("schema DDL re-run on a current database")
+
+    monkeypatch.setattr(DatabaseManager, "_create_schema", fail)
+    db = DatabaseManager(db_path)
+    try:
+        assert db._fts_available
+        work_id, _ = db.create_pending_work({"title": "Still Works"})
+        assert work_id is not None
+    finally:
+        db.close_connection()
+
+
+def test_migrate_command_upgrades_an_unversioned_database(tmp_path):
+    db_path = tmp_path / "test.db"
+    db = DatabaseManager(db_path)
+    db.conn.execute("DELETE FROM app_meta WHERE key = 'schema_version'")
+    db.conn.execute("DROP INDEX idx_works_year_sort")
+    db.conn.commit()
+    db.close_connection()
+
+    db = DatabaseManager(db_path, auto_migrate=False)
+    try:
+        assert db.schema_version() == 0
+    finally:
+        db.close_connection()
+
+    result = CliRunner().invoke(cli, ["migrate", "--db-path", str(db_path)])
+    assert result.exit_code == 0, result.output
+
+    db = DatabaseManager(db_path, auto_migrate=False)
+    try:
+        assert db.schema_version() == SCHEMA_VERSION
+        assert db.conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'idx_works_year_sort'").fetchone()
+        assert db.migrate() == []
+    finally:
+        db.close_connection()
+
+
+def test_failing_step_rolls_back_the_whole_migration(tmp_path, monkeypatch):
+    db_path = tmp_path / "test.db"
+
+    def broken(self, *, commit=True):
+        self.conn.execute("CREATE TABLE half_applied (id INTEGER)")
+        raise sqlite3.OperationalError("step failed")
+
+    monkeypatch.setattr(DatabaseManager, SCHEMA_MIGRATIONS[-1][2], broken)
+    with pytest.raises(sqlite3.OperationalError):
+        DatabaseManager(db_path)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    finally:
+        conn.close()
+    assert not tables & {"works", "app_meta", "half_applied"}
+
+    monkeypatch.undo()
+    db = DatabaseManager(db_path)
+    try:
+        assert db.schema_version() == SCHEMA_VERSION
+    finally:
+        db.close_connection()
+
+
+def test_concurrent_migrations_run_each_step_once(tmp_path, monkeypatch):
+    db_path = tmp_path / "test.db"
+    calls = []
+    create_schema = DatabaseManager._create_schema
+
+    def slow_create_schema(self, *, commit=True):
+        calls.append(threading.get_ident())
+        time.sleep(0.2)
+        create_schema(self, commit=commit)
+
+    monkeypatch.setattr(DatabaseManager, "_create_schema", slow_create_schema)
+    managers = [DatabaseManager(db_path, auto_migrate=False) for _ in range(2)]
+    barrier = threading.Barrier(2)
+    results = []
+
+    def run(db):
+        barrier.wait()
+        results.append(db.migrate())
+
+    threads = [threading.Thread(target=run, args=(db,)) for db in managers]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(calls) == 1
+        assert sorted(results, key=len) == [[], [version for version, _, _ in SCHEMA_MIGRATIONS]]
+        assert managers[0].schema_version() == SCHEMA_VERSION
+    finally:
+        for db in managers:
+            db.close_connection()
@@ -0,0 +1,72 @@
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from dl_lit import utils
+from dl_lit.utils import ServiceRateLimiter, SharedServiceRateLimiter
+
+
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+CONFIG = {
+    "default": {"limit": 5, "window": 1},
+    "openalex": {"limit": 5, "window": 1},
+    "spaced": {"limit": 100, "window": 1, "min_interval": 0.2},
+}
+
+
+def test_two_limiters_on_one_file_share_a_single_budget(tmp_path):
+    path = tmp_path / "rate_limits.db"
+    first = SharedServiceRateLimiter(CONFIG, path)
+    second = SharedServiceRateLimiter(CONFIG, path)
+
+    started = time.monotonic()
+    for limiter in (first, second, first, second, first):
+        limiter.wait_if_needed("openalex")
+    assert time.monotonic() - started < 0.15
+
+    # The bucket is empty for both: the next request waits for one token (~0.2s at 5/s).
+    second.wait_if_needed("openalex")
+    assert time.monotonic() - started >= 0.15
+
+
+def test_min_interval_is_enforced_across_limiters(tmp_path):
+    path = tmp_path / "rate_limits.db"
+    first = SharedServiceRateLimiter(CONFIG, path)
+    second = SharedServiceRateLimiter(CONFIG, path)
+
+    first.wait_if_needed("spaced")
+    started = time.monotonic()
+    second.wait_if_needed("spaced")
+    assert time.monotonic() - started >= 0.15
+
+
+def test_block_imposed_by_another_process_is_honored(tmp_path):
+    path = tmp_path / "rate_limits.db"
+    script = (
+        "import sys; from dl_lit.utils import SharedServiceRateLimiter; "
+        "SharedServiceRateLimiter({'default': {'limit': 5, 'window': 1}}, sys.argv[1]).impose_block('openalex', 0.4)"
+    )
+    subprocess.run([sys.executable, "-c", script, str(path)], check=True, cwd=PROJECT_DIR)
+
+    limiter = SharedServiceRateLimiter(CONFIG, path)
+    assert 0.1 < limiter.remaining_block_seconds("openalex") <= 0.4
+    assert limiter.remaining_block_seconds("crossref") == 0.0
+    started = time.monotonic()
+    limiter.wait_if_needed("openalex")
+    assert time.monotonic() - started >= 0.1
+    assert limiter.remaining_block_seconds("openalex") == 0.0
+
+
+def test_global_limiter_is_shared_next_to_the_database(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils, "_global_rate_limiter", None)
+    monkeypatch.delenv("RAG_FEEDER_RATE_LIMIT_DB", raising=False)
+    monkeypatch.delenv("RAG_FEEDER_RATE_LIMIT_BACKEND", raising=False)
+    monkeypatch.setenv("RAG_FEEDER_DB_PATH", str(tmp_path / "literature.db"))
+    limiter = utils.get_global_rate_limiter()
+    assert isinstance(limiter, SharedServiceRateLimiter)
+    assert limiter.path == tmp_path / "rate_limits.db"
+
+    monkeypatch.setattr(utils, "_global_rate_limiter", None)
+    monkeypatch.setenv("RAG_FEEDER_RATE_LIMIT_BACKEND", "memory")
+    assert type(utils.get_global_rate_limiter()) is ServiceRateLimiter
@@ -0,0 +1,71 @@
+import sqlite3
+
+import pytest
+from click.testing import CliRunner
+
+from dl_lit.cli import cli
+from dl_lit.db_manager import DatabaseManager
+from dl_lit.snapshot import SnapshotError, snapshot_database
+
+
+def _make_source(path, rows=2000):
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, body TEXT)")
+    conn.executemany("INSERT INTO t (body) VALUES (?)", [("x" * 400,)] * rows)
+    conn.commit()
+    return conn
+
+
+def test_snapshot_copies_in_steps_while_a_writer_commits(tmp_path):
+    source = tmp_path / "literature.db"
+    writer = _make_source(source)
+    target = tmp_path / "snap" / "copy.db"
+    seen = []
+
+    def progress(remaining, total):
+        seen.append(remaining)
+        # A commit between steps must neither block nor restart the copy.
+        writer.execute("INSERT INTO t (body) VALUES ('late')")
+        writer.commit()
+
+    try:
+        stats = snapshot_database(source, target, pages=20, sleep=0, progress=progress)
+    finally:
+        writer.close()
+
+    assert stats["verified"] and stats["steps"] == len(seen) > 1
+    assert seen[-1] == 0 and not (tmp_path / "snap" / "copy.db.partial").exists()
+    copy = sqlite3.connect(target)
+    try:
+        assert copy.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 2000
+        assert copy.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    finally:
+        copy.close()
+
+
+def test_failed_snapshot_keeps_previous_copy(tmp_path):
+    target = tmp_path / "copy.db"
+    target.write_bytes(b"previous")
+    with pytest.raises(SnapshotError):
+        snapshot_database(tmp_path / "missing.db", target)
+    assert target.read_bytes() == b"previous"
+
+
+def test_snapshot_command_and_api(tmp_path):
+    db_path = tmp_path / "literature.db"
+    db = DatabaseManager(db_path)
+    try:
+        stats = db.snapshot(tmp_path / "api.db", pages=8, sleep=0)
+        assert stats["verified"]
+    finally:
+        db.close_connection()
+
+    target = tmp_path / "cli.db"
+    result = CliRunner().invoke(cli, ["snapshot", "--db-path", str(db_path), "--target", str(target), "--quick"])
+    assert result.exit_code == 0, result.output
+    copy = sqlite3.connect(target)
+    try:
+        assert copy.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'works'").fetchone()[0] == 1
+    finally:
+        copy.close()
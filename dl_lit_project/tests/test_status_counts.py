@@ -0,0 +1,59 @@
+from click.testing import CliRunner
+
+from dl_lit.cli import cli
+from dl_lit.db_manager import DatabaseManager
+
+
+def _counters(db):
+    rows = db.conn.execute("SELECT DISTINCT corpus_id FROM corpus_status_counts WHERE n > 0").fetchall()
+    return {corpus_id: db.get_corpus_status_counts(corpus_id or None) for (corpus_id,) in rows}
+
+
+def test_triggers_keep_counts_in_step_with_a_rebuild(tmp_path):
+    db = DatabaseManager(tmp_path / "test.db")
+    try:
+        first, _ = db.create_pending_work({"title": "First Work", "corpus_id": 1})
+        second, _ = db.create_pending_work({"title": "Second Work", "corpus_id": 2})
+        db.conn.execute("INSERT INTO corpus_works (corpus_id, work_id) VALUES (1, ?)", (second,))
+        # A link written before its work only counts once the work exists.
+        db.conn.execute("INSERT INTO corpus_works (corpus_id, work_id) VALUES (3, 99)")
+        db.conn.execute("INSERT INTO works (id, title) VALUES (99, 'Late Work')")
+        db.conn.execute("UPDATE works SET metadata_status = 'matched', download_status = 'queued' WHERE id = ?", (first,))
+        db.conn.commit()
+
+        assert db.get_corpus_status_counts(1) == {("matched", "queued"): 1, ("pending", "not_requested"): 1}
+        assert db.get_corpus_status_counts(3) == {("pending", "not_requested"): 1}
+        assert db.get_corpus_status_counts() == {("matched", "queued"): 1, ("pending", "not_requested"): 2}
+
+        assert db._merge_records("works", first, "works", second, "test") == (True, None)
+        db.conn.execute("UPDATE corpus_works SET corpus_id = 4 WHERE corpus_id = 3")
+        db.conn.execute("DELETE FROM works WHERE id = 99")
+        db.conn.commit()
+
+        live = _counters(db)
+        db.rebuild_corpus_status_counts()
+        assert live == _counters(db)
+        assert db.get_corpus_status_counts(2) == {("matched", "queued"): 1}
+        assert db.get_corpus_status_counts(4) == {}
+    finally:
+        db.close_connection()
+
+
+def test_rebuild_command_repairs_drift(tmp_path):
+    db_path = tmp_path / "test.db"
+    db = DatabaseManager(db_path)
+    try:
+        db.create_pending_work({"title": "Counted Work", "corpus_id": 5})
+        db.conn.execute("UPDATE corpus_status_counts SET n = 42")
+        db.conn.commit()
+    finally:
+        db.close_connection()
+
+    result = CliRunner().invoke(cli, ["rebuild-status-counts", "--db-path", str(db_path)])
+    assert result.exit_code == 0, result.output
+
+    db = DatabaseManager(db_path)
+    try:
+        assert db.get_corpus_status_counts(5) == {("pending", "not_requested"): 1}
+    finally:
+        db.close_connection()
@@ -0,0 +1,158 @@
+import asyncio
+import threading
+import time
+import importlib.util
+from pathlib import Path
+
+from dl_lit.connection_pool import ResultSink
+from dl_lit.db_manager import DatabaseManager
+from dl_lit.OpenAlexScraper import OpenAlexCrossrefSearcher
+from dl_lit.utils import ServiceRateLimiter
+
+
+WORKER_PATH = Path(__file__).resolve().parents[2] / "backend" / "scripts" / "daemon" / "worker.py"
+SPEC = importlib.util.spec_from_file_location("dt_pipeline_worker_streaming_enrich", WORKER_PATH)
+WORKER_MODULE = importlib.util.module_from_spec(SPEC)
+assert SPEC and SPEC.loader
+SPEC.loader.exec_module(WORKER_MODULE)
+PipelineDaemon = WORKER_MODULE.PipelineDaemon
+
+
+def _daemon(tmp_path, count):
+    db = DatabaseManager(tmp_path / "test.db")
+    ids = [db.create_pending_work({"title": f"Paper {i}", "authors": ["A. Author"], "year": 2000 + i})[0] for i in range(count)]
+    daemon = PipelineDaemon.__new__(PipelineDaemon)
+    daemon.db = db
+    daemon.db_pool = db.enable_connection_pool()
+    daemon.result_sink = ResultSink(daemon.db_pool)
+    daemon.worker_id = "enrich-test"
+    daemon.rate_limiter = ServiceRateLimiter({"default": {"limit": 10000, "window": 1}})
+    daemon.searcher = OpenAlexCrossrefSearcher(mailto="test@example.com", rate_limiter=daemon.rate_limiter)
+    daemon.enrich_pipeline = None
+    return daemon, ids
+
+
+def _no_match(entry):
+    return None, {"status": "no_match"}, (False, {"pending_work_id": int(entry["id"])})
+
+
+def test_claimer_keeps_consumers_busy_without_exceeding_the_queue(tmp_path, monkeypatch):
+    monkeypatch.setenv("RAG_FEEDER_ENRICH_MAX_IN_FLIGHT", "4")
+    daemon, ids = _daemon(tmp_path, 20)
+    claims, peak, snapshots = [], [0], []
+    claim_rows = daemon._claim_enrich_rows
+
+    def claim(limit, corpus_id, target_ids):
+        claims.append(limit)
+        return claim_rows(limit, corpus_id, target_ids)
+
+    async def enrich(engine, entry, options):
+        pipeline = daemon.enrich_pipeline
+        peak[0] = max(peak[0], pipeline.enriching)
+        snapshots.append(daemon._with_live_stats({"state": "enriching"}))
+        await asyncio.sleep(0.01)
+        return _no_match(entry)
+
+    daemon._claim_enrich_rows = claim
+    daemon._enrich_single_async = enrich
+    try:
+        result = daemon.do_enrich(None, 20, 4, {})
+    finally:
+        daemon.db.close_connection()
+
+    assert result["processed"] == 20 and result["failed"] == 20
+    assert not result["deferred"]
+    assert len(claims) > 1 and max(claims) <= 4
+    assert peak[0] == 4
+    stats = snapshots[-1]["pipeline"]
+    assert stats["consumers"] == 4 and stats["claim_queue_capacity"] == 4
+    assert {"claim_queue", "enriching", "persist_queue", "persisting", "sink_buffered"} <= set(stats)
+    assert daemon._with_live_stats({"state": "idle"}) == {"state": "idle"}
+
+
+def test_slow_row_does_not_hold_back_the_rest(tmp_path, monkeypatch):
+    monkeypatch.setenv("RAG_FEEDER_ENRICH_MAX_IN_FLIGHT", "2")
+    daemon, ids = _daemon(tmp_path, 8)
+    finished = []
+
+    async def enrich(engine, entry, options):
+        await asyncio.sleep(0.5 if int(entry["id"]) == ids[0] else 0.01)
+        finished.append(int(entry["id"]))
+        return _no_match(entry)
+
+    daemon._enrich_single_async = enrich
+    try:
+        result = daemon.do_enrich(None, 8, 2, {})
+    finally:
+        daemon.db.close_connection()
+
+    # With waves of two, the slow row would block its partner's successors; here
+    # the second consumer works through everything else while it waits.
+    assert result["processed"] == 8
+    assert finished[-1] == ids[0]
+    assert sorted(finished[:-1]) == sorted(ids[1:])
+
+
+def test_deferred_run_releases_unstarted_claims(tmp_path, monkeypatch):
+    monkeypatch.setenv("RAG_FEEDER_ENRICH_MAX_IN_FLIGHT", "2")
+    monkeypatch.setenv("RAG_FEEDER_ENRICH_QUEUE_SIZE", "6")
+    monkeypatch.setattr(WORKER_MODULE, "ENRICH_YIELD_CHECK_SECONDS", 0.0)
+    daemon, ids = _daemon(tmp_path, 10)
+
+    async def enrich(engine, entry, options):
+        await asyncio.sleep(0.02)
+        return _no_match(entry)
+
+    daemon._enrich_single_async = enrich
+    daemon._enrich_yield_reason = lambda corpus_id, processed, remaining: "pending_download"
+    try:
+        result = daemon.do_enrich(None, 10, 2, {})
+        rows = daemon.db.conn.execute(
+            "SELECT id, metadata_status, metadata_claimed_by, metadata_attempt_count FROM works ORDER BY id"
+        ).fetchall()
+    finally:
+        daemon.db.close_connection()
+
+    assert result["deferred"] and result["deferred_reason"] == "pending_download"
+    assert 0 < result["processed"] < 10
+    assert result["remaining_limit"] == 10 - result["processed"]
+    unstarted = set(result["remaining_pending_work_ids"])
+    assert unstarted
+    for row_id, status, claimed_by, attempts in rows:
+        if row_id in unstarted:
+            assert (status, claimed_by, attempts or 0) == ("pending", None, 0)
+
+
+def test_failed_lookup_runs_the_raw_download_off_the_event_loop(tmp_path, monkeypatch):
+    monkeypatch.setenv("RAG_FEEDER_ENRICH_MAX_IN_FLIGHT", "2")
+    daemon, ids = _daemon(tmp_path, 4)
+    fallback_threads, lookups_during_fallback = [], []
+    in_fallback = threading.Event()
+
+    async def enrich(engine, entry, options):
+        if in_fallback.is_set():
+            lookups_during_fallback.append(int(entry["id"]))
+        await asyncio.sleep(0.01)
+        if int(entry["id"]) == ids[0]:
+            raise RuntimeError("lookup exploded")
+        return _no_match(entry)
+
+    def raw_download(entry):
+        fallback_threads.append(threading.current_thread())
+        in_fallback.set()
+        time.sleep(0.3)
+        in_fallback.clear()
+        return False, {"pending_work_id": int(entry["id"]), "action": "raw_download_failed"}
+
+    daemon._enrich_single_async = enrich
+    daemon._attempt_raw_download = raw_download
+    try:
+        result = daemon.do_enrich(None, 4, 2, {})
+    finally:
+        daemon.db.close_connection()
+
+    assert result["processed"] == 4 and result["failed"] == 4
+    assert "lookup exploded" in result["errors"]
+    assert fallback_threads and fallback_threads[0] is not threading.main_thread()
+    # The other consumer kept looking rows up while the fallback download ran.
+    assert lookups_during_fallback
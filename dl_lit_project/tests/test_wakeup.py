@@ -0,0 +1,109 @@
+import importlib.util
+import socket
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from dl_lit.db_manager import DatabaseManager
+from dl_lit.wakeup import JobWakeup, notify_workers, wakeup_dir_for
+
+
+WORKER_PATH = Path(__file__).resolve().parents[2] / "backend" / "scripts" / "daemon" / "worker.py"
+SPEC = importlib.util.spec_from_file_location("dt_pipeline_worker_wakeup", WORKER_PATH)
+WORKER_MODULE = importlib.util.module_from_spec(SPEC)
+assert SPEC and SPEC.loader
+SPEC.loader.exec_module(WORKER_MODULE)
+PipelineDaemon = WORKER_MODULE.PipelineDaemon
+
+
+def _later(delay, fn):
+    thread = threading.Thread(target=lambda: (time.sleep(delay), fn()))
+    thread.start()
+    return thread
+
+
+def test_notify_wakes_a_waiting_worker_and_close_removes_its_socket(tmp_path):
+    db_path = tmp_path / "test.db"
+    sqlite3.connect(db_path).close()
+    wakeup = JobWakeup(db_path, "enrich-1")
+    try:
+        assert wakeup.socket_path.parent == wakeup_dir_for(db_path)
+        thread = _later(0.05, lambda: notify_workers(db_path))
+        started = time.monotonic()
+        assert wakeup.wait(5) == "notify"
+        assert time.monotonic() - started < 1
+        thread.join()
+        assert wakeup.wait(0.1) == "timeout"
+    finally:
+        wakeup.close()
+    assert notify_workers(db_path) == 0
+    assert list(wakeup_dir_for(db_path).glob("*.sock")) == []
+
+
+def test_foreign_commit_wakes_a_waiting_worker(tmp_path):
+    db_path = tmp_path / "test.db"
+    writer = sqlite3.connect(db_path, check_same_thread=False)
+    writer.execute("CREATE TABLE t (x)")
+    writer.commit()
+    wakeup = JobWakeup(db_path, "download-1", poll_ms=10)
+    try:
+        def commit():
+            writer.execute("INSERT INTO t VALUES (1)")
+            writer.commit()
+
+        thread = _later(0.05, commit)
+        assert wakeup.wait(5) == "data_version"
+        thread.join()
+    finally:
+        wakeup.close()
+        writer.close()
+
+
+def test_notify_removes_sockets_nobody_listens_on(tmp_path):
+    db_path = tmp_path / "test.db"
+    directory = wakeup_dir_for(db_path)
+    directory.mkdir()
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(directory / "pipeline-999.sock"))
+    stale.close()
+
+    assert notify_workers(db_path) == 0
+    assert not (directory / "pipeline-999.sock").exists()
+
+
+def test_idle_worker_reads_until_a_job_is_enqueued(tmp_path):
+    db = DatabaseManager(tmp_path / "test.db")
+    daemon = PipelineDaemon.__new__(PipelineDaemon)
+    daemon.db = db
+    daemon.role = "download"
+    daemon.running = True
+    daemon.idle_recheck_seconds = 0.05
+    daemon.wakeup = JobWakeup(db.db_path, "download-test", poll_ms=10)
+    daemon._heartbeat = lambda *args, **kwargs: None
+    producer = sqlite3.connect(db.db_path, check_same_thread=False)
+    try:
+        assert daemon._has_claimable_work() is False
+
+        def enqueue():
+            producer.execute(
+                "INSERT INTO pipeline_jobs (corpus_id, job_type, status, parameters_json) VALUES (1, 'enrich', 'pending', '{}')"
+            )
+            producer.commit()
+            time.sleep(0.2)
+            producer.execute(
+                "INSERT INTO pipeline_jobs (corpus_id, job_type, status, parameters_json) VALUES (1, 'download', 'pending', '{}')"
+            )
+            producer.commit()
+
+        thread = _later(0.05, enqueue)
+        started = time.monotonic()
+        assert daemon._wait_for_work() == "data_version"
+        # The enrich job alone does not wake a download worker.
+        assert time.monotonic() - started >= 0.2
+        thread.join()
+        assert daemon._has_claimable_work() is True
+    finally:
+        daemon.wakeup.close()
+        producer.close()
+        db.close_connection()
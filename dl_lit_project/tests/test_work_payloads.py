@@ -0,0 +1,55 @@
+import json
+
+from dl_lit.db_manager import DatabaseManager
+
+
+OPENALEX = json.dumps({"id": "https://openalex.org/W1", "abstract_inverted_index": {f"word{i}": [i] for i in range(400)}})
+
+
+def test_payloads_are_stored_compressed_off_the_works_row(tmp_path):
+    db = DatabaseManager(tmp_path / "test.db")
+    try:
+        work_id, _ = db.create_pending_work({"title": "Payload Work", "year": 2001, "openalex_json": OPENALEX})
+        inline, = db.conn.execute("SELECT openalex_json FROM works WHERE id = ?", (work_id,)).fetchone()
+        codec, size = db.conn.execute(
+            "SELECT codec, length(data) FROM work_payloads WHERE work_id = ? AND kind = 'openalex_json'", (work_id,)
+        ).fetchone()
+        assert inline is None
+        assert codec == "zlib" and size < len(OPENALEX) / 3
+        assert db.get_work_payload(work_id, "openalex_json") == OPENALEX
+        assert db.get_entry_by_id("works", work_id)["openalex_json"] == OPENALEX
+        assert db.get_entry_by_id("works", work_id, with_payloads=False)["openalex_json"] is None
+
+        # Merges keep the stored payload and add missing kinds.
+        outcome, = db.upsert_works_bulk([{"title": "Payload Work", "year": 2001, "openalex_json": "{}", "bibtex_entry_json": '{"ID": "pw"}'}])
+        assert outcome["status"] == "merged"
+        assert db.get_work_payloads([work_id]) == {work_id: {"openalex_json": OPENALEX, "bibtex_entry_json": '{"ID": "pw"}'}}
+
+        db.conn.execute("DELETE FROM works WHERE id = ?", (work_id,))
+        db.conn.commit()
+        assert db.conn.execute("SELECT COUNT(*) FROM work_payloads").fetchone()[0] == 0
+    finally:
+        db.close_connection()
+
+
+def test_compact_moves_legacy_inline_payloads(tmp_path):
+    db = DatabaseManager(tmp_path / "test.db")
+    try:
+        db.conn.execute(
+            "INSERT INTO works (id, title, openalex_json, bibtex_entry_json) VALUES (7, 'Legacy', ?, '{\"ID\": \"legacy\"}')",
+            (OPENALEX,),
+        )
+        db.conn.commit()
+        assert db.get_entry_by_id("works", 7)["openalex_json"] == OPENALEX
+
+        assert db.compact_work_payloads(batch_size=1) == 1
+        assert db.conn.execute("SELECT openalex_json, bibtex_entry_json FROM works WHERE id = 7").fetchone() == (None, None)
+        entry = db.get_entry_by_id("works", 7)
+        assert (entry["openalex_json"], entry["bibtex_entry_json"]) == (OPENALEX, '{"ID": "legacy"}')
+        assert db.compact_work_payloads() == 0
+
+        db._update_work_record(7, {"bibtex_entry_json": None})
+        db.conn.commit()
+        assert db.get_work_payloads([7]) == {7: {"openalex_json": OPENALEX}}
+    finally:
+        db.close_connection()
@@ -0,0 +1,57 @@
+import time
+
+from dl_lit.db_manager import DatabaseManager
+
+
+def _queue(db, table):
+    return sorted(db.conn.execute(f"SELECT corpus_id, ready_at, work_id FROM {table}").fetchall())
+
+
+def test_triggers_keep_queues_in_step_with_a_rebuild(tmp_path):
+    db = DatabaseManager(tmp_path / "test.db")
+    try:
+        pending, _ = db.create_pending_work({"title": "Pending Work", "corpus_id": 1})
+        queued, _ = db.create_pending_work({"title": "Queued Work", "corpus_id": 2})
+        db.conn.execute("UPDATE works SET metadata_status = 'matched', download_status = 'queued' WHERE id = ?", (queued,))
+        db.conn.execute("INSERT INTO corpus_works (corpus_id, work_id) VALUES (3, ?)", (pending,))
+        db.conn.commit()
+
+        assert _queue(db, "enrich_queue") == [(0, 0, pending), (1, 0, pending), (3, 0, pending)]
+        assert _queue(db, "download_queue") == [(0, 0, queued), (2, 0, queued)]
+
+        db.conn.execute("DELETE FROM corpus_works WHERE corpus_id = 3")
+        db.conn.execute(
+            "UPDATE works SET metadata_status = 'in_progress', metadata_lease_expires_at = 500 WHERE id = ?", (pending,)
+        )
+        db.conn.execute("UPDATE works SET download_status = 'downloaded' WHERE id = ?", (queued,))
+        db.conn.commit()
+
+        live = (_queue(db, "enrich_queue"), _queue(db, "download_queue"))
+        assert live == ([(0, 500, pending), (1, 500, pending)], [])
+        db.rebuild_work_queues()
+        assert live == (_queue(db, "enrich_queue"), _queue(db, "download_queue"))
+    finally:
+        db.close_connection()
+
+
+def test_claims_read_the_queue_and_reclaim_expired_leases(tmp_path):
+    db = DatabaseManager(tmp_path / "test.db")
+    try:
+        ids = [db.create_pending_work({"title": f"Work {i}", "corpus_id": 1 + i % 2})[0] for i in range(4)]
+
+        first = db.claim_enrich_batch(limit=5, corpus_id=1, claimed_by="w1", lease_seconds=60)
+        assert [row["id"] for row in first] == [ids[0], ids[2]]
+        assert db.claim_enrich_batch(limit=5, corpus_id=1, claimed_by="w2", lease_seconds=60) == []
+        rest = db.claim_enrich_batch(limit=5, corpus_id=None, claimed_by="w2", lease_seconds=60)
+        assert [row["id"] for row in rest] == [ids[1], ids[3]]
+
+        db.conn.execute("UPDATE works SET metadata_lease_expires_at = ? WHERE id = ?", (int(time.time()) - 10, ids[2]))
+        db.conn.commit()
+        again = db.claim_enrich_batch(limit=5, corpus_id=1, claimed_by="w3", lease_seconds=60, max_attempts=2)
+        assert [row["id"] for row in again] == [ids[2]]
+
+        db.conn.execute("UPDATE works SET metadata_lease_expires_at = ? WHERE id = ?", (int(time.time()) - 10, ids[2]))
+        db.conn.commit()
+        assert db.claim_enrich_batch(limit=5, corpus_id=1, claimed_by="w4", lease_seconds=60, max_attempts=2) == []
+    finally:
+        db.close_connection()
@@ -649,10 +649,11 @@ export async function fetchRecursionConfig() {
   return response.json()
 }
 
-export async function fetchCorpus({ limit = 200, offset = 0 } = {}) {
+export async function fetchCorpus({ limit = 200, offset = 0, cursor = null } = {}) {
   const params = new URLSearchParams()
   params.set('limit', String(limit))
   params.set('offset', String(offset))
+  if (cursor) params.set('cursor', String(cursor))
   const response = await fetchWithTimeout(`${API_BASE}/api/corpus?${params.toString()}`)
   await throwIfUnauthorized(response)
   if (!response.ok) {
@@ -663,7 +664,8 @@ export async function fetchCorpus({ limit = 200, offset = 0 } = {}) {
   const total = Number.isFinite(Number(payload?.total)) ? Number(payload.total) : data.length
   const stageTotals = payload?.stage_totals || null
   const statusCounts = payload?.status_counts || null
-  return { data, total, source: payload.source || 'api', stageTotals, statusCounts }
+  const nextCursor = payload?.next_cursor || null
+  return { data, total, source: payload.source || 'api', stageTotals, statusCounts, nextCursor }
 }
 
 export async function fetchDownloadQueue() {